@@ -0,0 +1,319 @@
+# Estadísticas de remuneraciones por departamento y cargo con NumPy.
+#
+# Uso:
+#   python analitica.py                                  (por id_departamento)
+#   python analitica.py --por id_departamento,codigo_cargo --bandas 750000,1500000,3000000
+#   python analitica.py --where "codigo_cargo = :cargo" --bind cargo=2 --json
+#
+# En lugar de construir un objeto Empleado por fila, las columnas necesarias
+# se leen como arreglos (por bloques de fetchmany, o como data frame Arrow
+# con oracledb cuando hay pyarrow) y todos los cálculos son operaciones
+# vectorizadas: bincount para sumas y conteos, lexsort para percentiles por
+# grupo y digitize para las bandas de sueldo.
+import argparse
+import json
+from datetime import date
+
+import numpy as np
+
+import conexion
+from conexion import DatabaseError, get_connection, mensaje_error
+from exportar import argumento_bind
+from instrumentacion import medir
+
+TAMANO_LOTE = 50_000
+PERCENTILES = (25, 50, 75, 90)
+LIMITES_BANDAS = (750_000, 1_500_000, 3_000_000, 4_500_000)
+SIN_VALOR = -1          # departamento o cargo NULL
+
+COLUMNAS = ("salario", "id_departamento", "codigo_cargo", "fecha_inicio")
+AGRUPABLES = ("id_departamento", "codigo_cargo")
+
+
+# ==============================
+# LECTURA EN COLUMNAS
+# ==============================
+def _enteros(valores):
+    if None in valores:
+        arreglo = np.array(valores, dtype=np.float64)
+        return np.where(np.isnan(arreglo), SIN_VALOR, arreglo).astype(np.int64)
+    return np.array(valores, dtype=np.int64)
+
+
+# np.array(fechas, dtype="datetime64[D]") es lento con objetos date; se pasa
+# por el número de día (toordinal) y se reinterpreta como datetime64[D].
+_EPOCA = date(1970, 1, 1).toordinal()
+_NAT = np.iinfo(np.int64).min       # representación interna de NaT
+
+
+def _fechas(valores):
+    dias = [f.toordinal() - _EPOCA if f is not None else _NAT for f in valores]
+    return np.array(dias, dtype=np.int64).view("datetime64[D]")
+
+
+def _columnas_vacias():
+    return {
+        "salario": np.empty(0, np.float64),
+        "id_departamento": np.empty(0, np.int64),
+        "codigo_cargo": np.empty(0, np.int64),
+        "fecha_inicio": np.empty(0, "datetime64[D]")
+    }
+
+
+# Arma los arreglos bloque a bloque: la lista de tuplas de cada fetchmany se
+# descarta apenas se convierte, así nunca están todas las filas como tuplas.
+def _leer_por_bloques(cursor, sql, binds, tamano_lote):
+    cursor.arraysize = tamano_lote
+    cursor.prefetchrows = tamano_lote + 1
+    cursor.execute(sql, binds)
+    partes = {col: [] for col in COLUMNAS}
+    while True:
+        bloque = cursor.fetchmany(tamano_lote)
+        if not bloque:
+            break
+        salario, departamento, cargo, fecha = zip(*bloque)
+        partes["salario"].append(np.array(salario, dtype=np.float64))
+        partes["id_departamento"].append(_enteros(departamento))
+        partes["codigo_cargo"].append(_enteros(cargo))
+        partes["fecha_inicio"].append(_fechas(fecha))
+    if not partes["salario"]:
+        return _columnas_vacias()
+    return {col: np.concatenate(arreglos) for col, arreglos in partes.items()}
+
+
+# Oracle: oracledb entrega el resultado completo como data frame Arrow, sin
+# pasar por objetos Python por fila.
+def _leer_arrow(connection, sql, binds, tamano_lote):
+    import pyarrow as pa
+    tabla = pa.table(connection.fetch_df_all(sql, binds, arraysize=tamano_lote))
+    tabla = tabla.rename_columns([nombre.lower() for nombre in tabla.column_names])
+    if tabla.num_rows == 0:
+        return _columnas_vacias()
+
+    def numeros(col):
+        return tabla.column(col).to_numpy(zero_copy_only=False).astype(np.float64)
+
+    departamento = numeros("id_departamento")
+    cargo = numeros("codigo_cargo")
+    return {
+        "salario": numeros("salario"),
+        "id_departamento": np.where(np.isnan(departamento), SIN_VALOR, departamento).astype(np.int64),
+        "codigo_cargo": np.where(np.isnan(cargo), SIN_VALOR, cargo).astype(np.int64),
+        "fecha_inicio": tabla.column("fecha_inicio").to_numpy(zero_copy_only=False).astype("datetime64[D]")
+    }
+
+
+# Devuelve un diccionario columna -> arreglo NumPy (salario float64 con NaN
+# para NULL, departamento y cargo int64 con SIN_VALOR, fecha_inicio
+# datetime64[D] con NaT), o None si hubo un error.
+@medir("analitica.leer")
+def leer_columnas(where=None, binds=None, tamano_lote=TAMANO_LOTE):
+    sql = f"SELECT {', '.join(COLUMNAS)} FROM empleado"
+    if where:
+        sql += f" WHERE {where}"
+
+    connection = get_connection()
+    if not connection:
+        return None
+
+    cursor = None
+    try:
+        if conexion.BACKEND == "oracle" and hasattr(connection, "fetch_df_all"):
+            try:
+                return _leer_arrow(connection, sql, binds or {}, tamano_lote)
+            except ImportError:
+                pass        # sin pyarrow se arman los arreglos por bloques
+        cursor = connection.cursor()
+        return _leer_por_bloques(cursor, sql, binds or {}, tamano_lote)
+    except DatabaseError as e:
+        print("Error al leer empleados:", mensaje_error(e))
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+# ==============================
+# AGRUPACIÓN
+# ==============================
+# Numera los grupos 0..n-1 según las columnas "por". Devuelve (valores de
+# cada columna por grupo, grupo de cada fila, cantidad de grupos).
+def _grupos(columnas, por):
+    filas = len(columnas["salario"])
+    codigo = np.zeros(filas, np.int64)
+    unicos_por_columna = []
+    for nombre in por:
+        unicos, inverso = np.unique(columnas[nombre], return_inverse=True)
+        codigo = codigo * len(unicos) + inverso
+        unicos_por_columna.append(unicos)
+    codigos, grupo = np.unique(codigo, return_inverse=True)
+
+    claves = []
+    resto = codigos
+    for unicos in reversed(unicos_por_columna):
+        resto, indice = np.divmod(resto, len(unicos))
+        claves.append(unicos[indice])
+    claves.reverse()
+    return claves, grupo, len(codigos)
+
+
+def _percentiles_por_grupo(salario_ordenado, inicio, cantidad, percentiles):
+    tiene = cantidad > 0
+    resultado = {}
+    for p in percentiles:
+        # interpolación lineal entre vecinos, igual que np.percentile
+        posicion = inicio + (cantidad - 1) * (p / 100)
+        abajo = np.floor(posicion).astype(np.int64)
+        arriba = np.ceil(posicion).astype(np.int64)
+        valores = np.full(len(cantidad), np.nan)
+        a = salario_ordenado[abajo[tiene]]
+        b = salario_ordenado[arriba[tiene]]
+        valores[tiene] = a + (b - a) * (posicion - abajo)[tiene]
+        resultado[p] = valores
+    return resultado
+
+
+def _antiguedad_anios(fechas, referencia):
+    dias = (np.datetime64(referencia, "D") - fechas).astype(np.float64)
+    dias[np.isnat(fechas)] = np.nan
+    return dias / 365.25
+
+
+def _numero(valor):
+    valor = float(valor)
+    return None if np.isnan(valor) else valor
+
+
+# Dotación, total, promedio, mínimo, percentiles, máximo y antigüedad
+# promedio (años a la fecha de referencia) por grupo. Los sueldos NULL se
+# cuentan en la dotación pero no en las estadísticas de sueldo.
+# Devuelve una lista de diccionarios, uno por grupo, ordenada por grupo.
+@medir("analitica.estadisticas")
+def estadisticas_por_grupo(columnas, por=("id_departamento",), percentiles=PERCENTILES,
+                           fecha_referencia=None):
+    claves, grupo, n = _grupos(columnas, por)
+    dotacion = np.bincount(grupo, minlength=n)
+
+    salario = columnas["salario"]
+    con_salario = ~np.isnan(salario)
+    g = grupo[con_salario]
+    s = salario[con_salario]
+    cantidad = np.bincount(g, minlength=n)
+    total = np.bincount(g, weights=s, minlength=n)
+    orden = np.lexsort((s, g))          # por grupo y, dentro del grupo, por sueldo
+    inicio = np.cumsum(cantidad) - cantidad
+    cuantiles = _percentiles_por_grupo(s[orden], inicio, cantidad, (0,) + tuple(percentiles) + (100,))
+
+    anios = _antiguedad_anios(columnas["fecha_inicio"], fecha_referencia or date.today())
+    con_fecha = ~np.isnan(anios)
+    suma_anios = np.bincount(grupo[con_fecha], weights=anios[con_fecha], minlength=n)
+    cantidad_anios = np.bincount(grupo[con_fecha], minlength=n)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        promedio = total / cantidad
+        antiguedad = suma_anios / cantidad_anios
+
+    resultado = []
+    for i in range(n):
+        fila = {nombre: int(valores[i]) for nombre, valores in zip(por, claves)}
+        fila["dotacion"] = int(dotacion[i])
+        fila["total_salarios"] = float(total[i])
+        fila["promedio"] = _numero(promedio[i])
+        fila["minimo"] = _numero(cuantiles[0][i])
+        for p in percentiles:
+            fila[f"p{p}"] = _numero(cuantiles[p][i])
+        fila["maximo"] = _numero(cuantiles[100][i])
+        fila["antiguedad_promedio"] = _numero(antiguedad[i])
+        resultado.append(fila)
+    return resultado
+
+
+def nombres_bandas(limites):
+    nombres = [f"< {limites[0]:,}"]
+    nombres += [f"{a:,} - {b:,}" for a, b in zip(limites, limites[1:])]
+    nombres.append(f">= {limites[-1]:,}")
+    return [nombre.replace(",", ".") for nombre in nombres]
+
+
+# Cantidad de empleados por banda de sueldo ([a, b) entre límites
+# consecutivos), en total o por grupo si se indica "por".
+@medir("analitica.bandas")
+def bandas_salariales(columnas, limites=LIMITES_BANDAS, por=None):
+    salario = columnas["salario"]
+    con_salario = ~np.isnan(salario)
+    banda = np.digitize(salario[con_salario], limites)
+    nombres = nombres_bandas(limites)
+    if not por:
+        conteo = np.bincount(banda, minlength=len(nombres))
+        return [dict(zip(nombres, (int(c) for c in conteo)))]
+
+    claves, grupo, n = _grupos(columnas, por)
+    conteo = np.bincount(grupo[con_salario] * len(nombres) + banda,
+                         minlength=n * len(nombres)).reshape(n, len(nombres))
+    resultado = []
+    for i in range(n):
+        fila = {nombre: int(valores[i]) for nombre, valores in zip(por, claves)}
+        fila.update(zip(nombres, (int(c) for c in conteo[i])))
+        resultado.append(fila)
+    return resultado
+
+
+# ==============================
+# PROGRAMA
+# ==============================
+def _celda(valor):
+    if valor is None:
+        return "-"
+    if isinstance(valor, float):
+        return f"{valor:,.1f}".replace(",", "_").replace(".", ",").replace("_", ".")
+    return str(valor)
+
+
+def _imprimir_tabla(filas):
+    if not filas:
+        print("No hay empleados para los filtros indicados.")
+        return
+    columnas = list(filas[0])
+    celdas = [[_celda(fila[col]) for col in columnas] for fila in filas]
+    anchos = [max(len(col), *(len(fila[i]) for fila in celdas)) for i, col in enumerate(columnas)]
+    print(" | ".join(col.rjust(ancho) for col, ancho in zip(columnas, anchos)))
+    print("-+-".join("-" * ancho for ancho in anchos))
+    for fila in celdas:
+        print(" | ".join(texto.rjust(ancho) for texto, ancho in zip(fila, anchos)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estadísticas de remuneraciones de empleados.")
+    parser.add_argument("--por", default="id_departamento",
+                        help=f"columnas de agrupación separadas por coma ({', '.join(AGRUPABLES)})")
+    parser.add_argument("--bandas", help="límites de las bandas de sueldo separados por coma")
+    parser.add_argument("--where", help="condición SQL sobre empleado, ej. \"codigo_cargo = :cargo\"")
+    parser.add_argument("--bind", type=argumento_bind, action="append", default=[], help="nombre=valor")
+    parser.add_argument("--json", action="store_true", help="imprimir el resultado en JSON")
+    args = parser.parse_args()
+
+    por = tuple(col.strip() for col in args.por.split(",") if col.strip())
+    invalidas = [col for col in por if col not in AGRUPABLES]
+    if invalidas:
+        print(f"No se puede agrupar por: {', '.join(invalidas)}")
+        return
+    limites = tuple(int(x) for x in args.bandas.split(",")) if args.bandas else LIMITES_BANDAS
+
+    columnas = leer_columnas(args.where, dict(args.bind))
+    if columnas is None:
+        return
+    estadisticas = estadisticas_por_grupo(columnas, por)
+    bandas = bandas_salariales(columnas, limites, por)
+
+    if args.json:
+        print(json.dumps({"estadisticas": estadisticas, "bandas": bandas}, ensure_ascii=False, indent=2))
+        return
+    print(f"\nRemuneraciones por {', '.join(por)} ({len(columnas['salario'])} empleados)")
+    _imprimir_tabla(estadisticas)
+    print("\nEmpleados por banda de sueldo")
+    _imprimir_tabla(bandas)
+
+
+if __name__ == "__main__":
+    main()
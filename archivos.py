@@ -0,0 +1,52 @@
+import csv
+import json
+
+
+# Fila que no se pudo leer (JSON mal formado, una línea que no es un objeto
+# o una línea CSV ilegible). La entrega leer_filas(..., errores=True) en
+# lugar de la fila, para que quien carga la rechace y siga con el resto.
+class FilaInvalida:
+    __slots__ = ("mensaje",)
+
+    def __init__(self, mensaje):
+        self.mensaje = mensaje
+
+
+def _objeto_json(linea):
+    fila = json.loads(linea)
+    if not isinstance(fila, dict):
+        raise ValueError(f"se esperaba un objeto JSON, no {type(fila).__name__}")
+    return fila
+
+
+# Lee un archivo CSV (con encabezado) o JSONL fila a fila, sin cargarlo
+# completo en memoria. Cada fila se entrega como diccionario. Una fila
+# ilegible lanza ValueError (la lectura termina ahí), o con errores=True se
+# entrega como FilaInvalida y la lectura continúa.
+def leer_filas(ruta, errores=False):
+    if ruta.lower().endswith(".jsonl"):
+        with open(ruta, encoding="utf-8") as archivo:
+            for linea in archivo:
+                linea = linea.strip()
+                if not linea:
+                    continue
+                try:
+                    yield _objeto_json(linea)
+                except ValueError as e:
+                    if not errores:
+                        raise
+                    yield FilaInvalida(f"JSON inválido: {e}")
+    else:
+        with open(ruta, newline="", encoding="utf-8") as archivo:
+            lector = csv.DictReader(archivo)
+            while True:
+                try:
+                    fila = next(lector)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    if not errores:
+                        raise ValueError(f"CSV inválido: {e}")
+                    yield FilaInvalida(f"CSV inválido: {e}")
+                    continue
+                yield fila
@@ -0,0 +1,320 @@
+# Registro de auditoría: quién creó, modificó, eliminó o desactivó cada
+# empleado, cliente y usuario, y cuándo.
+#
+# Los programas CRUD llaman a registrar() después del commit; eso solo pone
+# el evento en una cola en memoria. Un hilo escritor lo inserta en la tabla
+# auditoria con executemany, en lotes de TAMANO_LOTE eventos o cada
+# INTERVALO segundos (lo que ocurra primero), así la operación no paga un
+# INSERT y un commit más.
+#
+# La cola tiene un máximo (MAX_PENDIENTES). Si está llena, registrar()
+# espera hasta ESPERA_MAXIMA segundos a que el escritor la vacíe; si aun así
+# no hay lugar, el evento se escribe en el archivo local ARCHIVO (una línea
+# JSON por evento). Lo mismo hace el escritor con el lote completo si no hay
+# conexión o la base falla. Los eventos del archivo se reenvían a la base en
+# cuanto un lote vuelve a escribirse bien.
+#
+# El usuario de cada evento es el de "with como(usuario):" (el servicio HTTP
+# lo toma del encabezado X-Usuario) o, si no hay, el usuario del sistema.
+# El detalle de una actualización lista las columnas modificadas, nunca sus
+# valores.
+#
+# Está activa por defecto; CRUD_AUDITORIA=0 la desactiva y
+# CRUD_AUDITORIA_ARCHIVO cambia la ruta del archivo de desborde.
+import atexit
+import contextvars
+import getpass
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import conexion
+from conexion import DatabaseError, get_connection, mensaje_error
+from instrumentacion import medir
+
+ACTIVA = os.environ.get("CRUD_AUDITORIA", "1") != "0"
+ARCHIVO = os.environ.get("CRUD_AUDITORIA_ARCHIVO", "auditoria_pendiente.jsonl")
+TAMANO_LOTE = 500
+INTERVALO = 1.0         # segundos como máximo que un evento espera en la cola
+MAX_PENDIENTES = 10_000
+ESPERA_MAXIMA = 0.05    # segundos que registrar() espera si la cola está llena
+
+CREAR = "CREAR"
+ACTUALIZAR = "ACTUALIZAR"
+ELIMINAR = "ELIMINAR"
+DESACTIVAR = "DESACTIVAR"
+
+INSERT_AUDITORIA = """
+    INSERT INTO auditoria (fecha, usuario, operacion, tabla, clave, detalle)
+    VALUES (:fecha, :usuario, :operacion, :tabla, :clave, :detalle)
+"""
+
+_usuario = contextvars.ContextVar("usuario_auditoria", default=None)
+_cola = queue.Queue(maxsize=MAX_PENDIENTES)
+_lock = threading.Lock()
+_lock_archivo = threading.Lock()
+_hilo = None
+_sin_base = False
+_contadores = {"encolados": 0, "escritos": 0, "lotes": 0, "esperas": 0,
+               "desbordes": 0, "reenviados": 0, "descartados": 0, "errores": 0}
+_CAMPOS = ("usuario", "operacion", "tabla", "clave", "detalle")
+
+
+def activar():
+    global ACTIVA
+    ACTIVA = True
+
+
+def desactivar():
+    global ACTIVA
+    ACTIVA = False
+
+
+def _sumar(contador, cantidad=1):
+    with _lock:
+        _contadores[contador] += cantidad
+
+
+# ==============================
+# USUARIO
+# ==============================
+try:
+    _USUARIO_SISTEMA = getpass.getuser()
+except (KeyError, OSError):
+    _USUARIO_SISTEMA = "desconocido"
+
+
+# Uso: with como("12345678-9"): emp.update()
+@contextmanager
+def como(usuario):
+    token = _usuario.set(usuario)
+    try:
+        yield
+    finally:
+        _usuario.reset(token)
+
+
+def usuario_actual():
+    return _usuario.get() or _USUARIO_SISTEMA
+
+
+# ==============================
+# REGISTRO
+# ==============================
+# operacion: CREAR, ACTUALIZAR, ELIMINAR o DESACTIVAR; clave: el RUT
+def registrar(operacion, tabla, clave, detalle=None):
+    if not ACTIVA:
+        return
+    if _hilo is None or not _hilo.is_alive():
+        _iniciar()
+    evento = {
+        "fecha": datetime.now(),
+        "usuario": usuario_actual(),
+        "operacion": operacion,
+        "tabla": tabla,
+        "clave": clave,
+        "detalle": detalle
+    }
+    try:
+        _cola.put_nowait(evento)
+    except queue.Full:
+        _sumar("esperas")
+        try:
+            _cola.put(evento, timeout=ESPERA_MAXIMA)
+        except queue.Full:
+            _desbordar([evento])
+            return
+    _sumar("encolados")
+
+
+def _iniciar():
+    global _hilo
+    with _lock:
+        if _hilo is None or not _hilo.is_alive():
+            _hilo = threading.Thread(target=_escritor, name="auditoria", daemon=True)
+            _hilo.start()
+
+
+# ==============================
+# ESCRITOR
+# ==============================
+# Junta eventos hasta TAMANO_LOTE o hasta INTERVALO segundos desde el
+# primero. Un threading.Event en la cola pide escribir lo que haya (vaciar);
+# None termina el hilo. Un error inesperado se informa y el hilo sigue: si
+# terminara, los eventos quedarían en la cola sin escribirse.
+def _escritor():
+    while True:
+        lote, avisos, fin = [], [], False
+        limite = None
+        while len(lote) < TAMANO_LOTE:
+            try:
+                if limite is None:
+                    evento = _cola.get()
+                else:
+                    evento = _cola.get(timeout=max(0, limite - time.monotonic()))
+            except queue.Empty:
+                break
+            if evento is None:
+                fin = True
+                break
+            if isinstance(evento, threading.Event):
+                avisos.append(evento)
+                break
+            lote.append(evento)
+            if limite is None:
+                limite = time.monotonic() + INTERVALO
+        if lote:
+            try:
+                _escribir(lote)
+            except Exception as e:
+                _sumar("errores")
+                print("Error en el escritor de auditoría:", e)
+        for aviso in avisos:
+            aviso.set()
+        if fin:
+            return
+
+
+def _escribir(lote):
+    global _sin_base
+    try:
+        escrito = _insertar(lote)
+    except Exception as e:
+        _sumar("errores")
+        print("Error al escribir la auditoría:", e)
+        escrito = False
+    if escrito:
+        _sumar("escritos", len(lote))
+        _sumar("lotes")
+        if _sin_base:
+            _sin_base = False
+            print("Auditoría: la base volvió a estar disponible.")
+        if os.path.exists(ARCHIVO) or os.path.exists(ARCHIVO + ".reenvio"):
+            _reenviar()
+        return
+    if not _sin_base:
+        _sin_base = True
+        print(f"Auditoría: no se pudo escribir en la base; los eventos se guardan en {ARCHIVO}.")
+    _desbordar(lote)
+
+
+# Inserta los eventos con un commit. Devuelve False si no hubo conexión o
+# la base falló. Sin backend abierto no se abre uno nuevo: los eventos van
+# al archivo (cerrar_backend y usar_backend antes escriben lo pendiente).
+@medir("auditoria.escribir")
+def _insertar(eventos):
+    if not conexion.hay_backend():
+        return False
+    connection = get_connection()
+    if not connection:
+        return False
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        for inicio in range(0, len(eventos), TAMANO_LOTE):
+            cursor.executemany(INSERT_AUDITORIA, eventos[inicio:inicio + TAMANO_LOTE])
+        connection.commit()
+        return True
+    except DatabaseError as e:
+        _sumar("errores")
+        if not _sin_base:
+            print("Error al escribir la auditoría:", mensaje_error(e))
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+# ==============================
+# ARCHIVO DE DESBORDE
+# ==============================
+def _desbordar(eventos):
+    with _lock_archivo:
+        with open(ARCHIVO, "a", encoding="utf-8") as archivo:
+            for evento in eventos:
+                archivo.write(json.dumps({**evento, "fecha": evento["fecha"].isoformat()},
+                                         ensure_ascii=False) + "\n")
+    _sumar("desbordes", len(eventos))
+
+
+# El archivo se renombra antes de leerlo, así los eventos que se desborden
+# mientras tanto van a un archivo nuevo. Todo se inserta con un solo commit:
+# si falla, el archivo renombrado queda para el próximo intento y ningún
+# evento se escribe dos veces. Las líneas que no se pueden leer (por
+# ejemplo, cortadas porque el proceso terminó a mitad de la escritura) se
+# apartan en ARCHIVO.descartados.
+def _reenviar():
+    pendiente = ARCHIVO + ".reenvio"
+    with _lock_archivo:
+        if not os.path.exists(pendiente):
+            if not os.path.exists(ARCHIVO):
+                return
+            os.replace(ARCHIVO, pendiente)
+    eventos, descartadas = [], []
+    with open(pendiente, encoding="utf-8", errors="replace") as archivo:
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            try:
+                evento = json.loads(linea)
+                eventos.append({**{campo: evento.get(campo) for campo in _CAMPOS},
+                                "fecha": datetime.fromisoformat(evento["fecha"])})
+            except (ValueError, TypeError, KeyError, AttributeError):
+                descartadas.append(linea if linea.endswith("\n") else linea + "\n")
+    if _insertar(eventos):
+        if descartadas:
+            with open(ARCHIVO + ".descartados", "a", encoding="utf-8") as archivo:
+                archivo.writelines(descartadas)
+            _sumar("descartados", len(descartadas))
+            print(f"Auditoría: {len(descartadas)} líneas ilegibles apartadas en {ARCHIVO}.descartados.")
+        os.remove(pendiente)
+        _sumar("reenviados", len(eventos))
+
+
+# ==============================
+# CONTROL
+# ==============================
+# Espera a que se escriban (o desborden) los eventos encolados hasta ahora.
+# Devuelve False si no terminó en "timeout" segundos.
+def vaciar(timeout=10.0):
+    if _hilo is None or not _hilo.is_alive():
+        if _cola.empty():
+            return True
+        _iniciar()
+    aviso = threading.Event()
+    try:
+        _cola.put(aviso, timeout=timeout)
+    except queue.Full:
+        return False
+    return aviso.wait(timeout)
+
+
+# Escribe lo pendiente y termina el hilo escritor (se llama al salir)
+def detener(timeout=10.0):
+    global _hilo
+    if _hilo is None:
+        return
+    vaciar(timeout)
+    try:
+        _cola.put(None, timeout=timeout)
+        _hilo.join(timeout)
+    except queue.Full:
+        pass
+    _hilo = None
+
+
+def estadisticas():
+    with _lock:
+        resultado = dict(_contadores)
+    resultado["pendientes"] = _cola.qsize()
+    resultado["activa"] = ACTIVA
+    return resultado
+
+
+conexion.antes_de_cerrar(vaciar)
+atexit.register(detener)
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FuturoTimeout
+
+import bcrypt
+
+# ==============================
+# CONFIGURACIÓN
+# ==============================
+COSTO_BCRYPT = 12                        # factor de trabajo para hashes nuevos
+PROCESOS = os.cpu_count() or 1           # procesos que calculan bcrypt
+MAX_PENDIENTES = PROCESOS * 4            # solicitudes en cola antes de rechazar
+TIMEOUT = 5.0                            # s máximos por solicitud (incluye la espera)
+TAMANO_BLOQUE_HASH = 4                   # contraseñas por solicitud en hashear_lote
+
+
+# Funciones que corren en los procesos del pool (deben ser de nivel módulo)
+def _hashear(password, costo):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=costo)).decode('utf-8')
+
+
+def _hashear_bloque(passwords, costo):
+    return [_hashear(password, costo) for password in passwords]
+
+
+def _verificar(password, password_hash):
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+def costo_de_hash(password_hash):
+    # formato: $2b$12$<salt+hash>
+    try:
+        return int(password_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+# ==============================
+# SERVICIO DE AUTENTICACIÓN
+# ==============================
+# Ejecuta bcrypt en un pool de procesos para no bloquear al hilo que llama
+# y poder usar todos los núcleos. La cola es acotada: si hay MAX_PENDIENTES
+# solicitudes en curso se espera y luego se lanza TimeoutError. El plazo
+# (TIMEOUT) es para toda la solicitud: la espera por cupo más bcrypt.
+class ServicioAutenticacion:
+    # Los parámetros en None toman el valor actual de la configuración del módulo
+    def __init__(self, procesos=None, max_pendientes=None, timeout=None, costo=None):
+        self.procesos = PROCESOS if procesos is None else procesos
+        self.timeout = TIMEOUT if timeout is None else timeout
+        self.costo = COSTO_BCRYPT if costo is None else costo
+        self._cupos = threading.BoundedSemaphore(MAX_PENDIENTES if max_pendientes is None else max_pendientes)
+        self._executor = ProcessPoolExecutor(max_workers=self.procesos)
+        # hilos donde las corrutinas esperan cupo sin bloquear el event loop
+        self._esperas = ThreadPoolExecutor(thread_name_prefix="cupo-bcrypt")
+        self._lock = threading.Lock()
+        self.en_curso = 0
+        self.rechazos = 0
+
+    def _restante(self, limite):
+        return max(0.0, limite - time.monotonic())
+
+    def _ejecutar(self, funcion, *args):
+        limite = time.monotonic() + self.timeout
+        if not self._cupos.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rechazos += 1
+            raise TimeoutError("Servicio de autenticación saturado.")
+        with self._lock:
+            self.en_curso += 1
+        try:
+            futuro = self._executor.submit(funcion, *args)
+            try:
+                return futuro.result(timeout=self._restante(limite))
+            except FuturoTimeout:
+                futuro.cancel()
+                with self._lock:
+                    self.rechazos += 1
+                raise TimeoutError("Tiempo de espera agotado en bcrypt.")
+        finally:
+            with self._lock:
+                self.en_curso -= 1
+            self._cupos.release()
+
+    # Espera un cupo en un hilo de _esperas, hasta "limite". Si la corrutina
+    # se cancela mientras tanto, el hilo sigue esperando: el cupo que llegue
+    # a tomar se devuelve al terminar, así no se pierde.
+    async def _tomar_cupo_async(self, limite):
+        if self._cupos.acquire(blocking=False):
+            return True
+        espera = self._esperas.submit(lambda: self._cupos.acquire(timeout=self._restante(limite)))
+        try:
+            return await asyncio.wrap_future(espera)
+        except asyncio.CancelledError:
+            espera.add_done_callback(self._devolver_cupo)
+            raise
+
+    def _devolver_cupo(self, espera):
+        if not espera.cancelled() and espera.result():
+            self._cupos.release()
+
+    # Igual que _ejecutar pero sin bloquear el event loop: la espera por cupo
+    # y por el resultado se hacen con await.
+    async def _ejecutar_async(self, funcion, *args):
+        limite = time.monotonic() + self.timeout
+        if not await self._tomar_cupo_async(limite):
+            with self._lock:
+                self.rechazos += 1
+            raise TimeoutError("Servicio de autenticación saturado.")
+        with self._lock:
+            self.en_curso += 1
+        try:
+            futuro = self._executor.submit(funcion, *args)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(futuro), self._restante(limite))
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self.rechazos += 1
+                raise TimeoutError("Tiempo de espera agotado en bcrypt.")
+        finally:
+            with self._lock:
+                self.en_curso -= 1
+            self._cupos.release()
+
+    # en_curso > procesos significa que hay solicitudes esperando CPU
+    def estadisticas(self):
+        return {"procesos": self.procesos, "en_curso": self.en_curso, "rechazos": self.rechazos}
+
+    def hashear(self, password):
+        return self._ejecutar(_hashear, password, self.costo)
+
+    def verificar(self, password, password_hash):
+        return self._ejecutar(_verificar, password, password_hash)
+
+    # Hashea una lista de contraseñas repartida en todos los procesos, en
+    # bloques de TAMANO_BLOQUE_HASH. Cada bloque es una solicitud más (ocupa
+    # un cupo), así un alta masiva no deja sin atender a los login. Devuelve
+    # los hash en el mismo orden, con None en los bloques que no se pudieron
+    # calcular (servicio saturado o tiempo agotado).
+    def hashear_lote(self, passwords):
+        bloques = [passwords[i:i + TAMANO_BLOQUE_HASH] for i in range(0, len(passwords), TAMANO_BLOQUE_HASH)]
+
+        def calcular(bloque):
+            try:
+                return self._ejecutar(_hashear_bloque, bloque, self.costo)
+            except TimeoutError:
+                return [None] * len(bloque)
+
+        with ThreadPoolExecutor(max_workers=self.procesos) as hilos:
+            return [h for hashes in hilos.map(calcular, bloques) for h in hashes]
+
+    async def hashear_async(self, password):
+        return await self._ejecutar_async(_hashear, password, self.costo)
+
+    async def verificar_async(self, password, password_hash):
+        return await self._ejecutar_async(_verificar, password, password_hash)
+
+    # True si el hash fue generado con un costo distinto al configurado
+    def necesita_rehash(self, password_hash):
+        return costo_de_hash(password_hash) != self.costo
+
+    def cerrar(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._esperas.shutdown(wait=False, cancel_futures=True)
+
+
+_servicio = None
+_servicio_lock = threading.Lock()
+
+
+def get_servicio():
+    global _servicio
+    with _servicio_lock:
+        if _servicio is None:
+            _servicio = ServicioAutenticacion()
+        return _servicio
+
+
+def cerrar_servicio():
+    global _servicio
+    with _servicio_lock:
+        if _servicio is not None:
+            _servicio.cerrar()
+            _servicio = None
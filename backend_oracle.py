@@ -0,0 +1,163 @@
+import threading
+
+import oracledb
+
+# ==============================
+# CONFIGURACIÓN
+# ==============================
+HOST = "195.26.252.168"
+PUERTO = 1521
+SERVICIO = "XEPDB1"
+USUARIO = "PAOLA_TORRENT"
+PASSWORD = "12345"
+
+# Parámetros del pool de sesiones
+POOL_MIN = 1
+POOL_MAX = 8
+POOL_INCREMENT = 1
+POOL_TIMEOUT_ESPERA = 5000      # ms que espera acquire() cuando el pool está lleno
+POOL_PING_INTERVALO = 60        # s de inactividad antes de hacer ping a una sesión
+
+
+def _dsn():
+    return oracledb.makedsn(HOST, PUERTO, service_name=SERVICIO)
+
+
+# ==============================
+# BACKEND ORACLE
+# ==============================
+# Sesiones desde un pool de oracledb. Al llamar connection.close() la sesión
+# vuelve al pool en lugar de cerrarse.
+class BackendOracle:
+    nombre = "oracle"
+    errores_integridad = (oracledb.IntegrityError,)
+    errores_bd = (oracledb.DatabaseError,)
+
+    def __init__(self, minimo=POOL_MIN, maximo=POOL_MAX, incremento=POOL_INCREMENT,
+                 timeout_espera=POOL_TIMEOUT_ESPERA, ping_intervalo=POOL_PING_INTERVALO):
+        self.parametros = {
+            "min": minimo,
+            "max": maximo,
+            "increment": incremento,
+            "wait_timeout": timeout_espera,
+            "ping_interval": ping_intervalo
+        }
+        self._pool = None
+        self._lock = threading.Lock()
+        self.agotamientos = 0
+
+    def _nuevo_pool(self):
+        return oracledb.create_pool(
+            user=USUARIO,
+            password=PASSWORD,
+            dsn=_dsn(),
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            **self.parametros
+        )
+
+    # Crea el pool de nuevo: cierra el anterior aunque tenga sesiones en uso.
+    # Solo para quien lo pide explícitamente; get_pool nunca lo llama.
+    def crear_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close(force=True)
+                self._pool = None
+            self._pool = self._nuevo_pool()
+            return self._pool
+
+    # Crea el pool la primera vez. Se vuelve a revisar dentro del lock: si
+    # dos hilos llegan a la vez, solo uno lo crea y el otro usa ese mismo.
+    def get_pool(self):
+        pool = self._pool
+        if pool is not None:
+            return pool
+        with self._lock:
+            if self._pool is None:
+                try:
+                    self._pool = self._nuevo_pool()
+                except oracledb.DatabaseError as e:
+                    error, = e.args
+                    print(f"Error al crear el pool de conexiones: {error.message}")
+                    return None
+            return self._pool
+
+    def get_connection(self):
+        pool = self.get_pool()
+        if pool is None:
+            return None
+        try:
+            return pool.acquire()
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            if error.full_code == "DPY-4005":     # se agotó la espera de una sesión libre
+                with self._lock:
+                    self.agotamientos += 1
+            print(f"Error al conectar con la base de datos: {error.message}")
+            return None
+
+    def estadisticas(self):
+        pool = self._pool
+        return {
+            "en_uso": pool.busy if pool else 0,
+            "maximo": self.parametros["max"],
+            "agotamientos": self.agotamientos
+        }
+
+    def cerrar(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close(force=True)
+                self._pool = None
+
+
+# ==============================
+# BACKEND ORACLE ASÍNCRONO
+# ==============================
+# Pool asíncrono de oracledb (modo thin). Las conexiones se usan con await:
+#   connection = await backend.get_connection()
+#   cursor = connection.cursor(); await cursor.execute(...)
+#   await connection.close()     # vuelve al pool
+class BackendOracleAsync:
+    nombre = "oracle"
+    errores_integridad = (oracledb.IntegrityError,)
+    errores_bd = (oracledb.DatabaseError,)
+
+    def __init__(self, minimo=POOL_MIN, maximo=POOL_MAX, incremento=POOL_INCREMENT,
+                 timeout_espera=POOL_TIMEOUT_ESPERA, ping_intervalo=POOL_PING_INTERVALO):
+        self._pool = oracledb.create_pool_async(
+            user=USUARIO,
+            password=PASSWORD,
+            dsn=_dsn(),
+            min=minimo,
+            max=maximo,
+            increment=incremento,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=timeout_espera,
+            ping_interval=ping_intervalo
+        )
+
+    async def get_connection(self):
+        try:
+            return await self._pool.acquire()
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            print(f"Error al conectar con la base de datos: {error.message}")
+            return None
+
+    async def cerrar(self):
+        await self._pool.close(force=True)
+
+
+# Conexión directa sin pool (camino antiguo), se mantiene para comparar en benchmarks
+def get_connection_directa():
+    try:
+        conn = oracledb.connect(
+            user=USUARIO,
+            password=PASSWORD,
+            dsn=_dsn()
+        )
+        return conn
+    except oracledb.DatabaseError as e:
+        error, = e.args
+        print(f"Error al conectar con la base de datos: {error.message}")
+        return None
@@ -0,0 +1,558 @@
+# Backend local con SQLite que reemplaza a Oracle para pruebas de carga,
+# profiling y benchmarks reproducibles sin acceso al servidor.
+#
+# Crea las tablas empleado, cliente, usuario y auditoria (y las de referencia
+# cargo, departamento y rol) con las mismas columnas que en Oracle. Los cursores
+# imitan lo que usan los programas de oracledb: rowfactory, arraysize,
+# prefetchrows, executemany(batcherrors=True, arraydmlrowcounts=True),
+# getbatcherrors(), getarraydmlrowcounts() y cursor.var() con
+# UPDATE ... RETURNING ... INTO.
+#
+# ORA_ROWSCN se imita con la columna scn de empleado, cliente y usuario: los
+# triggers le asignan el siguiente valor de secuencia_scn en cada INSERT y
+# UPDATE. Como en SQLite las escrituras van de a una, un valor mayor es un
+# cambio posterior.
+import asyncio
+import queue
+import re
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cargo (
+    codigo_cargo INTEGER PRIMARY KEY,
+    nombre_cargo TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS departamento (
+    id_departamento INTEGER PRIMARY KEY,
+    nombre_departamento TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rol (
+    codigo_rol TEXT PRIMARY KEY,
+    nombre_rol TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS empleado (
+    rut_empleado TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    direccion TEXT,
+    telefono TEXT,
+    email TEXT,
+    fecha_inicio DATE,
+    salario REAL,
+    codigo_cargo INTEGER REFERENCES cargo (codigo_cargo),
+    id_departamento INTEGER REFERENCES departamento (id_departamento),
+    version INTEGER DEFAULT 0 NOT NULL,
+    scn INTEGER DEFAULT 0 NOT NULL
+);
+CREATE INDEX IF NOT EXISTS empleado_nombre_ix ON empleado (nombre, rut_empleado);
+CREATE TABLE IF NOT EXISTS cliente (
+    rut_cliente TEXT PRIMARY KEY,
+    rut_vendedor TEXT,
+    razon_social TEXT,
+    cantidad_trabajadores INTEGER,
+    nombre_contacto TEXT,
+    email_contacto TEXT,
+    telefono_contacto TEXT,
+    version INTEGER DEFAULT 0 NOT NULL,
+    scn INTEGER DEFAULT 0 NOT NULL
+);
+CREATE TABLE IF NOT EXISTS usuario (
+    rut_usuario TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL,
+    codigo_rol TEXT REFERENCES rol (codigo_rol),
+    fecha_ingreso TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    estado TEXT DEFAULT 'A' NOT NULL,
+    scn INTEGER DEFAULT 0 NOT NULL
+);
+CREATE TABLE IF NOT EXISTS auditoria (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fecha TIMESTAMP NOT NULL,
+    usuario TEXT NOT NULL,
+    operacion TEXT NOT NULL,
+    tabla TEXT NOT NULL,
+    clave TEXT NOT NULL,
+    detalle TEXT
+);
+CREATE TABLE IF NOT EXISTS secuencia_scn (valor INTEGER NOT NULL);
+INSERT INTO secuencia_scn SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM secuencia_scn);
+"""
+
+# Triggers que mantienen la columna scn (ver ORA_ROWSCN arriba). Se crean
+# después de _migrar, que agrega la columna a las bases antiguas.
+TRIGGERS_SCN = "".join(f"""
+CREATE TRIGGER IF NOT EXISTS {tabla}_scn_{nombre} AFTER {evento} ON {tabla}
+BEGIN
+    UPDATE secuencia_scn SET valor = valor + 1;
+    UPDATE {tabla} SET scn = (SELECT valor FROM secuencia_scn) WHERE rowid = NEW.rowid;
+END;
+""" for tabla in ("empleado", "cliente", "usuario")
+    for nombre, evento in (("ins", "INSERT"), ("upd", "UPDATE")))
+
+CARGOS = [(1, "Gerente"), (2, "Jefe de área"), (3, "Analista"), (4, "Vendedor"), (5, "Asistente")]
+DEPARTAMENTOS = [(1, "Administración"), (2, "Ventas"), (3, "Operaciones"), (4, "Finanzas"), (5, "TI")]
+ROLES = [("ADMIN", "Administrador"), ("USER", "Usuario")]
+
+# Columnas agregadas después de la primera versión del esquema: se agregan a
+# las bases existentes al abrirlas
+COLUMNAS_NUEVAS = [
+    ("empleado", "version", "INTEGER DEFAULT 0 NOT NULL"),
+    ("cliente", "version", "INTEGER DEFAULT 0 NOT NULL"),
+    ("empleado", "scn", "INTEGER DEFAULT 0 NOT NULL"),
+    ("cliente", "scn", "INTEGER DEFAULT 0 NOT NULL"),
+    ("usuario", "scn", "INTEGER DEFAULT 0 NOT NULL"),
+]
+
+
+# ==============================
+# TIPOS DE FECHA
+# ==============================
+def _convertir_fecha(valor):
+    texto = valor.decode()
+    return date.fromisoformat(texto) if len(texto) == 10 else datetime.fromisoformat(texto)
+
+
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(" "))
+sqlite3.register_converter("DATE", _convertir_fecha)
+sqlite3.register_converter("TIMESTAMP", lambda v: datetime.fromisoformat(v.decode()))
+
+
+# ==============================
+# TRADUCCIÓN DE SQL
+# ==============================
+# Sentencias completas de Oracle sin equivalente directo (ej. MERGE) se
+# registran con su versión SQLite (los programas lo hacen con
+# conexion.equivalente_sqlite). El resto se traduce con reemplazos simples.
+_equivalentes = {}
+_traducidas = {}
+_retornos = {}
+# RETURNING ... INTO :variables (SQLite entrega las filas como un SELECT)
+_RETORNO = re.compile(r"\s+RETURNING\s+(.+?)\s+INTO\s+((?::\w+\s*,\s*)*:\w+)\s*$", re.I | re.S)
+_REEMPLAZOS = [
+    (_RETORNO, r"\nRETURNING \1"),
+    (re.compile(r"FETCH\s+FIRST\s+(:\w+)\s+ROWS\s+ONLY", re.I), r"LIMIT \1"),
+    (re.compile(r"\s+FROM\s+dual\b", re.I), ""),
+    (re.compile(r"\bSYSTIMESTAMP\b|\bSYSDATE\b", re.I), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bORA_ROWSCN\b", re.I), "scn"),
+]
+_BIND = re.compile(r"(?<![:\w]):(\w+)")
+
+
+def registrar_equivalente(sql_oracle, sql_sqlite):
+    _equivalentes[sql_oracle] = sql_sqlite
+    _traducidas.pop(sql_oracle, None)
+
+
+def traducir(sql):
+    traducida = _traducidas.get(sql)
+    if traducida is None:
+        traducida = _equivalentes.get(sql, sql)
+        for patron, reemplazo in _REEMPLAZOS:
+            traducida = patron.sub(reemplazo, traducida)
+        _traducidas[sql] = traducida
+    return traducida
+
+
+# Nombres de las variables de RETURNING ... INTO de la sentencia, en orden
+def _variables_retorno(sql):
+    nombres = _retornos.get(sql)
+    if nombres is None:
+        coincidencia = _RETORNO.search(sql)
+        nombres = [n.strip()[1:] for n in coincidencia.group(2).split(",")] if coincidencia else []
+        _retornos[sql] = nombres
+    return nombres
+
+
+# oracledb permite pasar una lista para binds con nombre (se asignan en
+# orden de aparición); sqlite3 necesita un diccionario.
+def _binds(sql, parametros):
+    if parametros is None or isinstance(parametros, dict):
+        return parametros if parametros is not None else ()
+    nombres = list(dict.fromkeys(_BIND.findall(sql)))
+    if not nombres:
+        return parametros
+    return dict(zip(nombres, parametros))
+
+
+# Variable de salida de cursor.var(). Después de un RETURNING ... INTO
+# getvalue() entrega la lista de valores de las filas afectadas, como oracledb.
+class VariableSQLite:
+    def __init__(self, tipo):
+        self.tipo = tipo
+        self._valor = None
+
+    def getvalue(self, pos=0):
+        return self._valor
+
+    def setvalue(self, pos, valor):
+        self._valor = valor
+
+
+class ErrorLote:
+    def __init__(self, offset, message):
+        self.offset = offset
+        self.message = message
+        self.code = 0
+
+
+# ==============================
+# CURSOR Y CONEXIÓN
+# ==============================
+class CursorSQLite:
+    def __init__(self, cursor, conexion=None):
+        self._cursor = cursor
+        self._conexion = conexion
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.rowfactory = None
+        self._errores_lote = []
+        self._conteos = []
+        self._rowcount = -1
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._rowcount
+
+    def var(self, tipo, *args, **kwargs):
+        return VariableSQLite(tipo)
+
+    def execute(self, sql, parameters=None, **kwargs):
+        salidas = _variables_retorno(sql)
+        sql = traducir(sql)
+        parametros = parameters if parameters is not None else kwargs or None
+        if self._conexion is not None and not _es_lectura(sql):
+            self._conexion._antes_de_escribir()
+        self._cursor.execute(sql, _binds(sql, parametros))
+        if salidas:
+            filas = self._cursor.fetchall()
+            for i, nombre in enumerate(salidas):
+                parametros[nombre].setvalue(0, [fila[i] for fila in filas])
+            self._rowcount = len(filas)
+            return None
+        self._rowcount = self._cursor.rowcount
+        return self if self._cursor.description else None
+
+    # Con batcherrors=True las filas que fallan no detienen el resto y se
+    # informan en getbatcherrors(), como en oracledb. Con
+    # arraydmlrowcounts=True getarraydmlrowcounts() entrega las filas
+    # afectadas por cada elemento (0 en los que fallaron); para eso se
+    # ejecutan de a uno.
+    def executemany(self, sql, parameters, batcherrors=False, arraydmlrowcounts=False, **kwargs):
+        sql = traducir(sql)
+        filas = [_binds(sql, p) for p in parameters]
+        self._errores_lote = []
+        self._conteos = []
+        if self._conexion is not None:
+            self._conexion._antes_de_escribir()
+        if not batcherrors and not arraydmlrowcounts:
+            self._cursor.executemany(sql, filas)
+            self._rowcount = self._cursor.rowcount
+            return
+        if not arraydmlrowcounts:
+            punto = f"lote_{uuid.uuid4().hex}"
+            self._cursor.execute(f"SAVEPOINT {punto}")
+            try:
+                self._cursor.executemany(sql, filas)
+                self._rowcount = self._cursor.rowcount
+                self._cursor.execute(f"RELEASE {punto}")
+                return
+            except sqlite3.Error:
+                self._cursor.execute(f"ROLLBACK TO {punto}")
+                self._cursor.execute(f"RELEASE {punto}")
+        total = 0
+        for i, binds in enumerate(filas):
+            try:
+                self._cursor.execute(sql, binds)
+                total += self._cursor.rowcount
+                self._conteos.append(self._cursor.rowcount)
+            except sqlite3.Error as e:
+                if not batcherrors:
+                    raise
+                self._errores_lote.append(ErrorLote(i, str(e)))
+                self._conteos.append(0)
+        self._rowcount = total
+
+    def getbatcherrors(self):
+        return self._errores_lote
+
+    def getarraydmlrowcounts(self):
+        return self._conteos
+
+    def _fila(self, row):
+        if row is None or self.rowfactory is None:
+            return row
+        return self.rowfactory(*row)
+
+    def fetchone(self):
+        return self._fila(self._cursor.fetchone())
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size or self.arraysize)
+        return rows if self.rowfactory is None else [self.rowfactory(*r) for r in rows]
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        return rows if self.rowfactory is None else [self.rowfactory(*r) for r in rows]
+
+    def __iter__(self):
+        if self.rowfactory is None:
+            return iter(self._cursor)
+        return (self.rowfactory(*r) for r in self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+
+def _es_lectura(sql):
+    return sql.lstrip()[:6].upper().startswith(("SELECT", "WITH", "PRAGMA"))
+
+
+class ConexionSQLite:
+    def __init__(self, backend, connection):
+        self._backend = backend
+        self._connection = connection
+        self._escribiendo = False
+
+    def cursor(self):
+        return CursorSQLite(self._connection.cursor(), self)
+
+    # En la base en memoria compartida, SQLite no espera a que otra conexión
+    # suelte una tabla bloqueada: falla al instante con "database table is
+    # locked" (el timeout solo aplica a archivos). Por eso ahí las
+    # transacciones de escritura van de a una: la primera escritura toma el
+    # turno, que se suelta con commit, rollback o close, y se espera como
+    # máximo "timeout" segundos, igual que con un archivo.
+    def _antes_de_escribir(self):
+        escritura = self._backend._escritura
+        if escritura is None or self._escribiendo:
+            return
+        if not escritura.acquire(timeout=self._backend.timeout):
+            raise sqlite3.OperationalError("database is locked")
+        self._escribiendo = True
+
+    def _fin_transaccion(self):
+        if self._escribiendo:
+            self._escribiendo = False
+            self._backend._escritura.release()
+
+    def commit(self):
+        try:
+            self._connection.commit()
+        finally:
+            self._fin_transaccion()
+
+    def rollback(self):
+        try:
+            self._connection.rollback()
+        finally:
+            self._fin_transaccion()
+
+    # Igual que una sesión del pool de Oracle: vuelve al pool
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.rollback()
+            finally:
+                self._fin_transaccion()
+            self._backend._devolver(self._connection)
+            self._connection = None
+
+
+# ==============================
+# BACKEND SQLITE
+# ==============================
+# ruta=":memory:" usa una base en memoria compartida entre las conexiones del
+# proceso (se mantiene una conexión abierta para que no se pierda) y las
+# transacciones de escritura se hacen de a una. Para cargas concurrentes
+# conviene una ruta de archivo, que usa WAL.
+# Como el pool de Oracle, entrega como máximo "maximo" sesiones a la vez y
+# espera hasta "timeout_espera" segundos a que se libere una.
+class BackendSQLite:
+    nombre = "sqlite"
+    errores_integridad = (sqlite3.IntegrityError,)
+    errores_bd = (sqlite3.Error,)
+
+    def __init__(self, ruta=":memory:", maximo=8, timeout=5.0, timeout_espera=5.0):
+        self.ruta = ruta
+        self.maximo = maximo
+        self.timeout = timeout
+        self.timeout_espera = timeout_espera
+        self._sesiones = threading.BoundedSemaphore(maximo)
+        self.en_uso = 0
+        self.agotamientos = 0
+        self._en_memoria = ruta == ":memory:"
+        self._uri = f"file:crud_{uuid.uuid4().hex}?mode=memory&cache=shared" if self._en_memoria else ruta
+        self._libres = queue.LifoQueue(maxsize=maximo)
+        self._lock = threading.Lock()
+        self._escritura = threading.Lock() if self._en_memoria else None
+        self._ancla = self._conectar()
+        if not self._en_memoria:
+            self._ancla.execute("PRAGMA journal_mode=WAL")
+        self._ancla.executescript(ESQUEMA)
+        self._migrar(self._ancla)
+        self._ancla.executescript(TRIGGERS_SCN)
+        self._poblar_referencias(self._ancla)
+
+    def _conectar(self):
+        connection = sqlite3.connect(
+            self._uri,
+            uri=self._en_memoria,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False
+        )
+        connection.execute("PRAGMA foreign_keys = ON")
+        return connection
+
+    def _migrar(self, connection):
+        for tabla, columna, tipo in COLUMNAS_NUEVAS:
+            existentes = [fila[1] for fila in connection.execute(f"PRAGMA table_info({tabla})")]
+            if columna not in existentes:
+                connection.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {tipo}")
+        connection.commit()
+
+    def _poblar_referencias(self, connection):
+        connection.executemany("INSERT OR IGNORE INTO cargo VALUES (?, ?)", CARGOS)
+        connection.executemany("INSERT OR IGNORE INTO departamento VALUES (?, ?)", DEPARTAMENTOS)
+        connection.executemany("INSERT OR IGNORE INTO rol VALUES (?, ?)", ROLES)
+        connection.commit()
+
+    def get_connection(self):
+        if not self._sesiones.acquire(timeout=self.timeout_espera):
+            with self._lock:
+                self.agotamientos += 1
+            print("Error al conectar con la base de datos: no hay sesiones libres en el pool.")
+            return None
+        try:
+            connection = self._libres.get_nowait()
+        except queue.Empty:
+            try:
+                connection = self._conectar()
+            except sqlite3.Error as e:
+                self._sesiones.release()
+                print(f"Error al conectar con la base de datos: {e}")
+                return None
+        with self._lock:
+            self.en_uso += 1
+        return ConexionSQLite(self, connection)
+
+    def _devolver(self, connection):
+        try:
+            self._libres.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+        with self._lock:
+            self.en_uso -= 1
+        self._sesiones.release()
+
+    def estadisticas(self):
+        return {"en_uso": self.en_uso, "maximo": self.maximo, "agotamientos": self.agotamientos}
+
+    def cerrar(self):
+        while True:
+            try:
+                self._libres.get_nowait().close()
+            except queue.Empty:
+                break
+        if self._ancla is not None:
+            self._ancla.close()
+            self._ancla = None
+
+
+# ==============================
+# BACKEND SQLITE ASÍNCRONO
+# ==============================
+# Misma interfaz que el pool asíncrono de oracledb, sobre un BackendSQLite.
+# sqlite3 es bloqueante, así que cada llamada corre en un pool de hilos.
+class CursorSQLiteAsync:
+    def __init__(self, cursor, ejecutar):
+        self._cursor = cursor
+        self._ejecutar = ejecutar
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __setattr__(self, nombre, valor):
+        if nombre.startswith("_"):
+            object.__setattr__(self, nombre, valor)
+        else:
+            setattr(self._cursor, nombre, valor)
+
+    async def execute(self, sql, parameters=None):
+        return await self._ejecutar(self._cursor.execute, sql, parameters)
+
+    async def executemany(self, sql, parameters, batcherrors=False):
+        return await self._ejecutar(self._cursor.executemany, sql, parameters, batcherrors)
+
+    async def fetchone(self):
+        return await self._ejecutar(self._cursor.fetchone)
+
+    async def fetchmany(self, size=None):
+        return await self._ejecutar(self._cursor.fetchmany, size)
+
+    async def fetchall(self):
+        return await self._ejecutar(self._cursor.fetchall)
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConexionSQLiteAsync:
+    def __init__(self, connection, ejecutar, al_cerrar):
+        self._connection = connection
+        self._ejecutar = ejecutar
+        self._al_cerrar = al_cerrar
+
+    def cursor(self):
+        return CursorSQLiteAsync(self._connection.cursor(), self._ejecutar)
+
+    async def commit(self):
+        await self._ejecutar(self._connection.commit)
+
+    async def rollback(self):
+        await self._ejecutar(self._connection.rollback)
+
+    async def close(self):
+        if self._connection is not None:
+            await self._ejecutar(self._connection.close)
+            self._connection = None
+            self._al_cerrar()
+
+
+class BackendSQLiteAsync:
+    nombre = "sqlite"
+    errores_integridad = BackendSQLite.errores_integridad
+    errores_bd = BackendSQLite.errores_bd
+
+    def __init__(self, backend):
+        self.backend = backend
+        # La espera por una sesión libre se hace en el event loop (no en un
+        # hilo), así los hilos quedan para las sesiones que ya están en uso.
+        self._sesiones = asyncio.Semaphore(backend.maximo)
+        self._hilos = ThreadPoolExecutor(max_workers=backend.maximo, thread_name_prefix="sqlite-async")
+
+    async def _ejecutar(self, funcion, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._hilos, funcion, *args)
+
+    async def get_connection(self):
+        try:
+            await asyncio.wait_for(self._sesiones.acquire(), self.backend.timeout_espera)
+        except asyncio.TimeoutError:
+            self.backend.agotamientos += 1
+            print("Error al conectar con la base de datos: no hay sesiones libres en el pool.")
+            return None
+        connection = await self._ejecutar(self.backend.get_connection)
+        if connection is None:
+            self._sesiones.release()
+            return None
+        return ConexionSQLiteAsync(connection, self._ejecutar, self._sesiones.release)
+
+    async def cerrar(self):
+        self._hilos.shutdown(wait=False)
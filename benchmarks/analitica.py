@@ -0,0 +1,137 @@
+# Estadísticas de remuneraciones: NumPy en columnas vs. un ciclo por objeto.
+#
+# Uso: python -m benchmarks.analitica [--filas 1000000] [--por id_departamento,codigo_cargo]
+#
+# La versión "objetos" es lo que se haría con la API actual: recorrer
+# objetos Empleado y acumular por grupo en diccionarios y listas. La versión
+# "columnas" es analitica.leer_columnas + estadisticas_por_grupo +
+# bandas_salariales. Se mide la lectura y el cálculo por separado, y se
+# comprueba que ambas den el mismo resultado.
+import argparse
+import math
+import time
+import tracemalloc
+from datetime import date
+
+import analitica
+import conexion
+from benchmarks import datos
+from conexion import get_connection
+from programa_crud_empleado import Empleado, empleados_desde_cursor
+
+
+def leer_objetos():
+    connection = get_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.arraysize = 10_000
+        cursor.execute(f"SELECT {', '.join(Empleado.COLUMNAS)} FROM empleado")
+        return list(empleados_desde_cursor(cursor))
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def estadisticas_objetos(empleados, por, limites, referencia):
+    grupos = {}
+    for emp in empleados:
+        clave = tuple(getattr(emp, col) for col in por)
+        g = grupos.get(clave)
+        if g is None:
+            g = grupos[clave] = {"dotacion": 0, "salarios": [], "anios": [], "bandas": [0] * (len(limites) + 1)}
+        g["dotacion"] += 1
+        if emp.salario is not None:
+            g["salarios"].append(emp.salario)
+            banda = 0
+            while banda < len(limites) and emp.salario >= limites[banda]:
+                banda += 1
+            g["bandas"][banda] += 1
+        if emp.fecha_inicio is not None:
+            g["anios"].append((referencia - emp.fecha_inicio).days / 365.25)
+
+    resultado = []
+    for clave in sorted(grupos):
+        g = grupos[clave]
+        salarios = sorted(g["salarios"])
+        fila = dict(zip(por, clave))
+        fila["dotacion"] = g["dotacion"]
+        fila["total_salarios"] = sum(salarios)
+        fila["promedio"] = fila["total_salarios"] / len(salarios) if salarios else None
+        for p in (0,) + analitica.PERCENTILES + (100,):
+            fila[f"p{p}"] = datos.percentil(salarios, p) if salarios else None
+        fila["antiguedad_promedio"] = sum(g["anios"]) / len(g["anios"]) if g["anios"] else None
+        fila["bandas"] = g["bandas"]
+        resultado.append(fila)
+    return resultado
+
+
+def _comparar(objetos, columnas, bandas, por):
+    for fila_obj, fila_col, fila_banda in zip(objetos, columnas, bandas):
+        for clave in ("dotacion", "total_salarios", "promedio", "p25", "p50", "p75", "p90", "antiguedad_promedio"):
+            a, b = fila_obj[clave], fila_col[clave]
+            if not math.isclose(a, b, rel_tol=1e-9):
+                return f"{clave} difiere en {[fila_obj[c] for c in por]}: {a} vs {b}"
+        if fila_obj["p0"] != fila_col["minimo"] or fila_obj["p100"] != fila_col["maximo"]:
+            return f"mínimo/máximo difiere en {[fila_obj[c] for c in por]}"
+        if fila_obj["bandas"] != [fila_banda[n] for n in analitica.nombres_bandas(analitica.LIMITES_BANDAS)]:
+            return f"bandas difieren en {[fila_obj[c] for c in por]}"
+    return None if len(objetos) == len(columnas) else "distinta cantidad de grupos"
+
+
+def _medir(funcion, *args):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    segundos = time.perf_counter() - inicio
+    _, maximo = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, segundos, maximo / 2**20
+
+
+def _tiempo(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analítica de remuneraciones: NumPy vs. objetos.")
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--por", default="id_departamento,codigo_cargo")
+    args = parser.parse_args()
+    por = tuple(args.por.split(","))
+    referencia = date.today()
+
+    conexion.usar_backend("sqlite", ruta=":memory:")
+    inicio = time.perf_counter()
+    datos.poblar(args.filas, usuarios=0, clientes=0)
+    print(f"Datos de prueba: {args.filas} empleados en {time.perf_counter() - inicio:.1f} s")
+
+    empleados, lectura_obj = _tiempo(leer_objetos)
+    objetos, calculo_obj = _tiempo(estadisticas_objetos, empleados, por, analitica.LIMITES_BANDAS, referencia)
+    del empleados
+    columnas, lectura_col = _tiempo(analitica.leer_columnas)
+    estadisticas, calculo_est = _tiempo(analitica.estadisticas_por_grupo, columnas, por,
+                                        analitica.PERCENTILES, referencia)
+    bandas, calculo_bandas = _tiempo(analitica.bandas_salariales, columnas, analitica.LIMITES_BANDAS, por)
+    calculo_col = calculo_est + calculo_bandas
+
+    # memoria de lectura en una pasada aparte (tracemalloc hace más lento todo)
+    _, _, memoria_obj = _medir(leer_objetos)
+    _, _, memoria_col = _medir(analitica.leer_columnas)
+
+    print(f"\n{'versión':<10} | {'lectura s':>10} | {'cálculo s':>10} | {'total s':>8} | {'memoria MiB':>11}")
+    print(f"{'objetos':<10} | {lectura_obj:10.3f} | {calculo_obj:10.3f} | {lectura_obj + calculo_obj:8.3f} | "
+          f"{memoria_obj:11.1f}")
+    print(f"{'columnas':<10} | {lectura_col:10.3f} | {calculo_col:10.3f} | {lectura_col + calculo_col:8.3f} | "
+          f"{memoria_col:11.1f}")
+    print(f"\nCálculo {calculo_obj / calculo_col:.0f}x más rápido, total "
+          f"{(lectura_obj + calculo_obj) / (lectura_col + calculo_col):.1f}x; {len(estadisticas)} grupos.")
+
+    diferencia = _comparar(objetos, estadisticas, bandas, por)
+    print("Resultados iguales." if diferencia is None else f"Los resultados no coinciden: {diferencia}")
+    conexion.cerrar_backend()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Throughput de la API asyncio (crud_async) contra la síncrona con hilos.
+#
+# Uso:
+#   python -m benchmarks.async_vs_sync --filas 10000 --operaciones 2000 --concurrencia 32
+#   python -m benchmarks.async_vs_sync --oracle --filas 10000     (datos ya cargados)
+#
+# Con la misma concurrencia, la versión síncrona usa un hilo por solicitud en
+# curso y la async tareas en un solo event loop. Se miden lecturas de
+# empleado/cliente (sin caché) y logins.
+#
+# Nota: con el backend SQLite local las llamadas async corren en un pool de
+# hilos (sqlite3 es bloqueante), así que ahí se mide sobre todo el costo
+# extra del event loop; la diferencia real aparece con Oracle, donde la
+# espera de red no ocupa un hilo.
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import autenticacion
+import conexion
+import crud_async
+from benchmarks import datos
+from programa_crud_cliente_exception import cache_clientes, read_cliente
+from programa_crud_empleado import cache_empleados, read_empleado
+from programa_crud_usuario import autenticar_usuario
+
+
+def _argumentos(nombre, filas, n, aleatorio):
+    if nombre == "empleado.read":
+        return [datos.rut_empleado(aleatorio.randrange(filas)) for _ in range(n)]
+    if nombre == "cliente.read":
+        return [datos.rut_cliente(aleatorio.randrange(filas)) for _ in range(n)]
+    return [datos.rut_usuario(aleatorio.randrange(filas)) for _ in range(n)]
+
+
+OPERACIONES = {
+    "empleado.read": (read_empleado, crud_async.read_empleado),
+    "cliente.read": (read_cliente, crud_async.read_cliente),
+    "usuario.login": (lambda rut: autenticar_usuario(rut, datos.PASSWORD),
+                      lambda rut: crud_async.autenticar_usuario(rut, datos.PASSWORD)),
+}
+
+
+def _sin_cache():
+    cache_empleados.maximo = 0
+    cache_clientes.maximo = 0
+
+
+def medir_sync(funcion, argumentos, concurrencia):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as hilos:
+        list(hilos.map(funcion, argumentos))
+    return len(argumentos) / (time.perf_counter() - inicio)
+
+
+async def _medir_async(funcion, argumentos, concurrencia):
+    cupos = asyncio.Semaphore(concurrencia)
+
+    async def uno(arg):
+        async with cupos:
+            await funcion(arg)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(uno(arg) for arg in argumentos))
+    return len(argumentos) / (time.perf_counter() - inicio)
+
+
+def medir_async(funcion, argumentos, concurrencia):
+    async def correr():
+        try:
+            return await _medir_async(funcion, argumentos, concurrencia)
+        finally:
+            await conexion.cerrar_backend_async()
+    return asyncio.run(correr())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara la API async con la síncrona.")
+    parser.add_argument("--filas", type=int, default=10000, help="filas por tabla")
+    parser.add_argument("--operaciones", type=int, default=2000, help="solicitudes por operación")
+    parser.add_argument("--concurrencia", type=int, default=32, help="solicitudes en curso a la vez")
+    parser.add_argument("--costo-bcrypt", type=int, default=4, help="costo bcrypt de los usuarios")
+    parser.add_argument("--oracle", action="store_true",
+                        help="usar Oracle con los datos de benchmarks.datos ya cargados")
+    args = parser.parse_args()
+
+    autenticacion.COSTO_BCRYPT = args.costo_bcrypt
+    if args.oracle:
+        conexion.usar_backend("oracle", maximo=args.concurrencia)
+    else:
+        conexion.usar_backend("sqlite", ruta=":memory:", maximo=args.concurrencia)
+        datos.poblar(args.filas, costo_bcrypt=args.costo_bcrypt)
+    _sin_cache()
+
+    aleatorio = random.Random(1234)
+    print(f"backend {conexion.BACKEND} | concurrencia {args.concurrencia} | cpus {os.cpu_count()}")
+    print(f"{'operación':<16} | {'sync ops/s':>11} | {'async ops/s':>11} | {'async/sync':>10}")
+    try:
+        for nombre, (sincrona, asincrona) in OPERACIONES.items():
+            argumentos = _argumentos(nombre, args.filas, args.operaciones, aleatorio)
+            with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+                ops_sync = medir_sync(sincrona, argumentos, args.concurrencia)
+                ops_async = medir_async(asincrona, argumentos, args.concurrencia)
+            print(f"{nombre:<16} | {ops_sync:11.1f} | {ops_async:11.1f} | {ops_async / ops_sync:9.2f}x")
+    finally:
+        autenticacion.cerrar_servicio()
+        conexion.cerrar_backend()
+
+
+if __name__ == "__main__":
+    main()
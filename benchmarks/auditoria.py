@@ -0,0 +1,122 @@
+# Costo de la auditoría en las operaciones CRUD.
+#
+# Uso: python -m benchmarks.auditoria [--operaciones 5000] [--eventos 100000]
+#
+# Mide Empleado.create, update y delete_empleado sin auditoría, con la
+# auditoría en cola (lo que hace registrar()) y, para comparar, escribiendo
+# cada evento con su propio INSERT y commit dentro de la operación. Después
+# mide cuántos eventos por segundo escribe el hilo escritor y cuántos por
+# segundo van al archivo de desborde cuando no hay base. Corre sobre el
+# backend SQLite en memoria; con Oracle el INSERT síncrono agrega además una
+# ida y vuelta por operación.
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import auditoria
+import conexion
+from benchmarks import datos
+from programa_crud_empleado import Empleado, delete_empleado, read_empleado
+from validacion_rut import formatear_rut
+
+
+def _tiempo(funcion):
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        funcion()
+    return time.perf_counter() - inicio
+
+
+def _ciclo(ruts, sincrona):
+    # con "sincrona" cada operación escribe su evento antes de volver
+    def escribir(operacion, rut):
+        if sincrona:
+            auditoria._insertar([{"fecha": datetime.now(), "usuario": auditoria.usuario_actual(),
+                                  "operacion": operacion, "tabla": "empleado", "clave": rut,
+                                  "detalle": None}])
+
+    def crear():
+        for i, rut in enumerate(ruts):
+            Empleado(rut, datos.nombre_persona(i), None, None, None, None, 1000, 1, 1).create()
+            escribir(auditoria.CREAR, rut)
+
+    def actualizar():
+        for rut in ruts:
+            emp = read_empleado(rut)
+            emp.salario += 1
+            emp.update()
+            escribir(auditoria.ACTUALIZAR, rut)
+
+    def eliminar():
+        for rut in ruts:
+            delete_empleado(rut)
+            escribir(auditoria.ELIMINAR, rut)
+
+    return {"create": _tiempo(crear), "update": _tiempo(actualizar), "delete": _tiempo(eliminar)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de la auditoría en las operaciones CRUD.")
+    parser.add_argument("--operaciones", type=int, default=5000, help="operaciones por tipo")
+    parser.add_argument("--eventos", type=int, default=100_000, help="eventos para medir al escritor")
+    args = parser.parse_args()
+
+    auditoria.ARCHIVO = os.path.join(tempfile.mkdtemp(prefix="auditoria_"), "pendiente.jsonl")
+    conexion.usar_backend("sqlite", ruta=":memory:")
+    datos.poblar(1000, usuarios=0, clientes=0)
+    n = args.operaciones
+
+    modos = (("sin auditoría", False, False), ("en cola", True, False), ("síncrona", False, True))
+    tiempos = {}
+    for i, (nombre, activa, sincrona) in enumerate(modos):
+        auditoria.ACTIVA = activa
+        ruts = [formatear_rut(40_000_000 + i * n + j) for j in range(n)]
+        tiempos[nombre] = _ciclo(ruts, sincrona)
+        auditoria.vaciar()
+
+    print(f"{n} operaciones por tipo (µs por operación)")
+    print(f"\n{'operación':<16} | " + " | ".join(f"{nombre:>13}" for nombre, _, _ in modos)
+          + f" | {'costo en cola':>13}")
+    for operacion in ("create", "update", "delete"):
+        base = tiempos["sin auditoría"][operacion]
+        valores = " | ".join(f"{tiempos[nombre][operacion] / n * 1e6:13.1f}" for nombre, _, _ in modos)
+        extra = (tiempos["en cola"][operacion] - base) / n * 1e6
+        print(f"empleado.{operacion:<7} | {valores} | {extra:+10.1f} µs")
+
+    # escritor: eventos encolados a ritmo máximo hasta que todos están en la base
+    auditoria.ACTIVA = True
+    antes = auditoria.estadisticas()
+    inicio = time.perf_counter()
+    for i in range(args.eventos):
+        auditoria.registrar(auditoria.ACTUALIZAR, "empleado", formatear_rut(i + 1), "salario")
+    encolado = time.perf_counter() - inicio
+    auditoria.vaciar(timeout=120)
+    total = time.perf_counter() - inicio
+    despues = auditoria.estadisticas()
+    escritos = despues["escritos"] - antes["escritos"]
+    lotes = despues["lotes"] - antes["lotes"]
+    print(f"\nEscritor: {args.eventos} eventos, {escritos} en la base en {lotes} lotes, "
+          f"{escritos / total:.0f} eventos/s; registrar() {encolado / args.eventos * 1e6:.1f} µs por evento "
+          f"({despues['esperas'] - antes['esperas']} esperas por cola llena, "
+          f"{despues['desbordes'] - antes['desbordes']} al archivo)")
+
+    # sin base: el escritor manda cada lote al archivo
+    conexion.cerrar_backend()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        inicio = time.perf_counter()
+        for i in range(args.eventos):
+            auditoria.registrar(auditoria.ACTUALIZAR, "empleado", formatear_rut(i + 1), "salario")
+        auditoria.vaciar(timeout=120)
+        total = time.perf_counter() - inicio
+    desbordes = auditoria.estadisticas()["desbordes"] - despues["desbordes"]
+    tamano = os.path.getsize(auditoria.ARCHIVO) / 2**20
+    print(f"Sin base: {desbordes} eventos al archivo, {desbordes / total:.0f} eventos/s ({tamano:.1f} MiB)")
+    os.remove(auditoria.ARCHIVO)
+    auditoria.detener()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Búsqueda por texto parcial: índice de trigramas en memoria vs. LIKE '%texto%'.
+#
+# Uso: python -m benchmarks.busqueda [--filas 200000] [--consultas 2000]
+#
+# Pobla empleados y clientes, construye los índices (tiempo y memoria) y
+# mide la latencia de consultas por prefijo, por nombre completo y con un
+# error de tipeo contra el índice, y de las mismas consultas con LIKE (que
+# no encuentra las que tienen errores). "encuentra" es la proporción de
+# consultas bien resueltas: por prefijo, que el primer resultado empiece con
+# el texto; nombre completo, que el primero sea ese nombre; con error de
+# tipeo, que el nombre correcto esté entre los resultados. También mide el
+# costo de mantener el índice al día en cada escritura.
+import argparse
+import random
+import time
+import tracemalloc
+
+import conexion
+from benchmarks import datos
+from busqueda import palabras
+from conexion import get_connection
+from programa_crud_cliente_exception import indice_clientes
+from programa_crud_empleado import indice_empleados
+
+CONSULTAS_LIKE = 50        # cada LIKE recorre la tabla: se miden menos
+
+
+def _con_error(palabra, aleatorio):
+    i = aleatorio.randrange(1, len(palabra))
+    letra = aleatorio.choice("abcdefghijklmnopqrstuvwxyz")
+    return palabra[:i] + letra + palabra[i + 1:]
+
+
+# (tipo, consulta, nombre buscado) a partir de nombres que existen
+def generar_consultas(nombres, cantidad, aleatorio):
+    consultas = []
+    for _ in range(cantidad):
+        nombre = aleatorio.choice(nombres)
+        partes = nombre.split()
+        tipo = aleatorio.choice(("prefijo", "completo", "tipeo"))
+        if tipo == "prefijo":
+            consulta = f"{partes[0]} {partes[1][:4]}"
+        elif tipo == "completo":
+            consulta = nombre
+        else:
+            consulta = " ".join(_con_error(p, aleatorio) if len(p) > 4 else p for p in partes)
+        consultas.append((tipo, consulta, nombre))
+    return consultas
+
+
+def _normal(texto):
+    return " ".join(palabras(texto))
+
+
+def _bien_resuelta(tipo, consulta, nombre, encontrados):
+    if not encontrados:
+        return False
+    if tipo == "prefijo":
+        return _normal(encontrados[0]).startswith(_normal(consulta))
+    if tipo == "completo":
+        return encontrados[0] == nombre
+    return nombre in encontrados
+
+
+def _like(cursor, consulta):
+    cursor.execute("""
+        SELECT rut_empleado, nombre, email FROM empleado
+        WHERE LOWER(nombre) LIKE :patron OR LOWER(email) LIKE :patron
+    """, {"patron": f"%{consulta.lower()}%"})
+    return cursor.fetchmany(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Índice de trigramas vs. LIKE.")
+    parser.add_argument("--filas", type=int, default=200_000)
+    parser.add_argument("--consultas", type=int, default=2000)
+    args = parser.parse_args()
+    aleatorio = random.Random(7)
+
+    conexion.usar_backend("sqlite", ruta=":memory:")
+    datos.poblar(args.filas, usuarios=0)
+
+    inicio = time.perf_counter()
+    indice_empleados.construir()
+    indice_clientes.construir()
+    construccion = time.perf_counter() - inicio
+    # memoria en una construcción aparte (tracemalloc la hace varias veces más lenta)
+    indice_empleados.descartar()
+    tracemalloc.start()
+    indice_empleados.construir()
+    memoria = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    print(f"Índices: {len(indice_empleados)} empleados y {len(indice_clientes)} clientes "
+          f"en {construccion:.1f} s; el de empleados ocupa {memoria:.0f} MiB")
+
+    connection = get_connection()
+    cursor = connection.cursor()
+    cursor.execute("SELECT nombre FROM empleado")
+    consultas = generar_consultas([nombre for nombre, in cursor.fetchall()], args.consultas, aleatorio)
+
+    tiempos = {}
+    encontrados = {}
+    for tipo, consulta, nombre in consultas:
+        inicio = time.perf_counter()
+        resultados = indice_empleados.buscar(consulta)
+        tiempos.setdefault(tipo, []).append((time.perf_counter() - inicio) * 1000)
+        encontrados.setdefault(tipo, []).append(
+            _bien_resuelta(tipo, consulta, nombre, [r["nombre"] for r in resultados]))
+
+    tiempos_like = {}
+    encontrados_like = {}
+    for tipo, consulta, nombre in consultas[:CONSULTAS_LIKE]:
+        inicio = time.perf_counter()
+        resultados = _like(cursor, consulta)
+        tiempos_like.setdefault(tipo, []).append((time.perf_counter() - inicio) * 1000)
+        encontrados_like.setdefault(tipo, []).append(
+            _bien_resuelta(tipo, consulta, nombre, [r[1] for r in resultados]))
+    cursor.close()
+    connection.close()
+
+    print(f"\n{'consulta':<10} | {'índice p50 ms':>13} | {'p99 ms':>8} | {'encuentra':>9} | "
+          f"{'LIKE p50 ms':>11} | {'encuentra':>9}")
+    for tipo in ("prefijo", "completo", "tipeo"):
+        if tipo not in tiempos:
+            continue
+        like = tiempos_like.get(tipo, [float("nan")])
+        tasa_like = sum(encontrados_like.get(tipo, [])) / max(1, len(encontrados_like.get(tipo, [])))
+        print(f"{tipo:<10} | {datos.percentil(tiempos[tipo], 50):13.3f} | {datos.percentil(tiempos[tipo], 99):8.3f} | "
+              f"{sum(encontrados[tipo]) / len(encontrados[tipo]):9.0%} | {datos.percentil(like, 50):11.1f} | "
+              f"{tasa_like:9.0%}")
+
+    # costo por escritura: reindexar una fila existente
+    filas = [(datos.rut_empleado(i), datos.nombre_persona(i), f"x{i}@empresa.cl") for i in range(10_000)]
+    inicio = time.perf_counter()
+    for rut, nombre, email in filas:
+        indice_empleados.guardar({"rut_empleado": rut, "nombre": nombre, "email": email})
+    print(f"\nActualización del índice: {(time.perf_counter() - inicio) / len(filas) * 1e6:.1f} µs por fila")
+    conexion.cerrar_backend()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+# Generador de carga concurrente con mezcla de operaciones, para planificar
+# capacidad. Corre sobre el backend SQLite local (archivo temporal en WAL).
+#
+# Uso:
+#   python -m benchmarks.carga --operadores 16 --duracion 30 --pausa 50
+#   python -m benchmarks.carga --tasa 500 --operadores 32 \
+#       --mezcla empleado.read=60,cliente.update=20,usuario.login=20
+#
+# Sin --tasa es de lazo cerrado: cada operador ejecuta una operación, espera
+# la pausa (think time) y repite. Con --tasa es de lazo abierto: las llegadas
+# siguen un proceso de Poisson a esa tasa y la latencia incluye la espera en cola.
+#
+# Cada intervalo informa throughput, p50/p95/p99, errores, sesiones en uso y
+# solicitudes bcrypt en curso, y marca puntos de saturación.
+import argparse
+import contextlib
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import autenticacion
+import conexion
+from benchmarks import datos
+from programa_crud_cliente_exception import Cliente, read_cliente, upsert_clientes
+from programa_crud_empleado import Empleado, pagina_empleados, read_empleado
+from programa_crud_usuario import autenticar_usuario
+
+MEZCLA = "empleado.read=40,cliente.read=20,empleado.update=10,cliente.update=10," \
+         "usuario.login=10,empleado.create=5,empleado.listar=5"
+
+
+# ==============================
+# OPERACIONES
+# ==============================
+# Cada función devuelve True si la operación terminó bien.
+class Operaciones:
+    def __init__(self, filas, semilla):
+        self.filas = filas
+        self._local = threading.local()
+        self._semilla = semilla
+        self._siguiente = filas
+        self._lock = threading.Lock()
+
+    def _aleatorio(self):
+        aleatorio = getattr(self._local, "aleatorio", None)
+        if aleatorio is None:
+            aleatorio = self._local.aleatorio = random.Random(self._semilla + threading.get_ident())
+        return aleatorio
+
+    def _rut_empleado(self):
+        return datos.rut_empleado(self._aleatorio().randrange(self.filas))
+
+    def _rut_cliente(self):
+        return datos.rut_cliente(self._aleatorio().randrange(self.filas))
+
+    def empleado_read(self):
+        return read_empleado(self._rut_empleado()) is not None
+
+    def empleado_update(self):
+        emp = read_empleado(self._rut_empleado())
+        if emp is None:
+            return False
+        emp.telefono = f"9{self._aleatorio().randrange(10**8):08d}"
+        return emp.update()
+
+    def empleado_create(self):
+        with self._lock:
+            i = self._siguiente
+            self._siguiente += 1
+        return Empleado(*datos.fila_empleado(i, self._aleatorio())).create()
+
+    def empleado_listar(self):
+        rows, _ = pagina_empleados(50, (datos.nombre_persona(self._aleatorio().randrange(100000)), ""))
+        return rows is not None
+
+    def cliente_read(self):
+        return read_cliente(self._rut_cliente()) is not None
+
+    def cliente_update(self):
+        cliente = read_cliente(self._rut_cliente())
+        if cliente is None:
+            return False
+        cliente.telefono_contacto = f"2{self._aleatorio().randrange(10**8):08d}"
+        return cliente.update()
+
+    def cliente_upsert(self):
+        i = self._aleatorio().randrange(self.filas * 2)
+        resultado = upsert_clientes([Cliente(*datos.fila_cliente(i, self._aleatorio()))])
+        return bool(resultado) and not resultado["fallidos"]
+
+    def usuario_login(self):
+        rut = datos.rut_usuario(self._aleatorio().randrange(self.filas))
+        return autenticar_usuario(rut, datos.PASSWORD) == "OK"
+
+    def obtener(self, nombre):
+        return getattr(self, nombre.replace(".", "_"))
+
+
+def leer_mezcla(texto):
+    mezcla = {}
+    for parte in texto.split(","):
+        nombre, peso = parte.split("=")
+        mezcla[nombre.strip()] = float(peso)
+    return mezcla
+
+
+# ==============================
+# REGISTRO DE RESULTADOS
+# ==============================
+class Registro:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencias = []
+        self._errores = 0
+        self.total = 0
+        self.total_errores = 0
+
+    def agregar(self, segundos, ok):
+        with self._lock:
+            self._latencias.append(segundos)
+            if not ok:
+                self._errores += 1
+
+    # Devuelve y reinicia los datos del intervalo
+    def cortar(self):
+        with self._lock:
+            latencias, errores = self._latencias, self._errores
+            self._latencias, self._errores = [], 0
+        self.total += len(latencias)
+        self.total_errores += errores
+        return sorted(latencias), errores
+
+
+# ==============================
+# GENERADORES
+# ==============================
+def _ejecutar(funcion, registro):
+    inicio = time.perf_counter()
+    try:
+        ok = bool(funcion())
+    except Exception:
+        ok = False
+    registro.agregar(time.perf_counter() - inicio, ok)
+
+
+def _operador_cerrado(operaciones, nombres, pesos, pausa, fin, registro, semilla):
+    aleatorio = random.Random(semilla)
+    while time.monotonic() < fin:
+        nombre = aleatorio.choices(nombres, pesos)[0]
+        _ejecutar(operaciones.obtener(nombre), registro)
+        if pausa:
+            time.sleep(aleatorio.expovariate(1 / pausa))
+
+
+def _llegadas(tasa, nombres, pesos, fin, cola, semilla):
+    aleatorio = random.Random(semilla)
+    siguiente = time.perf_counter()
+    while time.monotonic() < fin:
+        siguiente += aleatorio.expovariate(tasa)
+        espera = siguiente - time.perf_counter()
+        if espera > 0:
+            time.sleep(espera)
+        cola.put((aleatorio.choices(nombres, pesos)[0], siguiente))
+
+
+def _operador_abierto(operaciones, cola, registro):
+    while True:
+        trabajo = cola.get()
+        if trabajo is None:
+            return
+        nombre, llegada = trabajo
+        try:
+            ok = bool(operaciones.obtener(nombre)())
+        except Exception:
+            ok = False
+        # la latencia se mide desde la llegada programada (incluye la cola)
+        registro.agregar(time.perf_counter() - llegada, ok)
+
+
+# ==============================
+# SATURACIÓN
+# ==============================
+def _alertas(backend, servicio, agotamientos_antes, rechazos_antes, cola, operadores, historial):
+    alertas = []
+    estado = backend.estadisticas()
+    if estado["agotamientos"] > agotamientos_antes:
+        alertas.append(f"pool de conexiones agotado ({estado['agotamientos'] - agotamientos_antes} esperas fallidas)")
+    elif estado["en_uso"] >= estado["maximo"]:
+        alertas.append("pool de conexiones al máximo")
+    if servicio is not None:
+        auth = servicio.estadisticas()
+        if auth["rechazos"] > rechazos_antes:
+            alertas.append(f"bcrypt saturado ({auth['rechazos'] - rechazos_antes} solicitudes rechazadas)")
+        elif auth["en_curso"] > auth["procesos"]:
+            alertas.append(f"bcrypt saturado ({auth['en_curso']} en curso / {auth['procesos']} procesos)")
+    if cola is not None and cola.qsize() > operadores:
+        alertas.append(f"llegadas acumuladas en cola ({cola.qsize()})")
+    # throughput plano con p95 subiendo: se alcanzó la capacidad
+    if len(historial) >= 3:
+        (t1, p1), (t2, p2), (t3, p3) = historial[-3:]
+        if p3 > p1 * 1.5 and t3 <= t1 * 1.05:
+            alertas.append("p95 sube sin aumento de throughput")
+    return alertas
+
+
+def ejecutar_carga(operadores, duracion, mezcla, pausa_ms, tasa, intervalo, filas, semilla, salida):
+    nombres = list(mezcla)
+    pesos = [mezcla[n] for n in nombres]
+    operaciones = Operaciones(filas, semilla)
+    for nombre in nombres:
+        operaciones.obtener(nombre)     # valida la mezcla antes de empezar
+
+    registro = Registro()
+    fin = time.monotonic() + duracion
+    cola = queue.Queue() if tasa else None
+    hilos = []
+    if tasa:
+        hilos.append(threading.Thread(target=_llegadas, args=(tasa, nombres, pesos, fin, cola, semilla)))
+        hilos += [threading.Thread(target=_operador_abierto, args=(operaciones, cola, registro))
+                  for _ in range(operadores)]
+    else:
+        hilos += [threading.Thread(target=_operador_cerrado,
+                                   args=(operaciones, nombres, pesos, pausa_ms / 1000, fin, registro, semilla + i))
+                  for i in range(operadores)]
+    for hilo in hilos:
+        hilo.daemon = True
+        hilo.start()
+
+    backend = conexion.get_backend()
+    modo = f"lazo abierto, {tasa:.0f} llegadas/s" if tasa else f"lazo cerrado, pausa {pausa_ms:.0f} ms"
+    print(f"\n{operadores} operadores, {duracion:.0f} s, {modo}", file=salida)
+    print(f"{'t(s)':>5} | {'ops/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | "
+          f"{'errores':>7} | {'sesiones':>8} | {'bcrypt':>6} | alertas", file=salida)
+    print("-" * 110, file=salida)
+
+    inicio = time.monotonic()
+    historial = []
+    saturaciones = []
+    agotamientos = rechazos = 0
+    while time.monotonic() < fin:
+        time.sleep(min(intervalo, max(0.0, fin - time.monotonic())))
+        latencias, errores = registro.cortar()
+        throughput = len(latencias) / intervalo
+        p95 = datos.percentil(latencias, 95) * 1000
+        historial.append((throughput, p95))
+        servicio = autenticacion._servicio
+        alertas = _alertas(backend, servicio, agotamientos, rechazos, cola, operadores, historial)
+        agotamientos = backend.estadisticas()["agotamientos"]
+        rechazos = servicio.estadisticas()["rechazos"] if servicio else 0
+        transcurrido = time.monotonic() - inicio
+        if alertas:
+            saturaciones.append((transcurrido, alertas))
+        print(f"{transcurrido:5.0f} | {throughput:8.1f} | {datos.percentil(latencias, 50) * 1000:8.2f} | {p95:8.2f} | "
+              f"{datos.percentil(latencias, 99) * 1000:8.2f} | {errores:7d} | "
+              f"{backend.estadisticas()['en_uso']:>3}/{backend.estadisticas()['maximo']:<4} | "
+              f"{servicio.estadisticas()['en_curso'] if servicio else 0:>6} | {'; '.join(alertas)}",
+              file=salida)
+
+    if cola is not None:
+        for _ in range(operadores):
+            cola.put(None)
+    for hilo in hilos:
+        hilo.join(timeout=5)
+
+    print("-" * 110, file=salida)
+    print(f"Total: {registro.total} operaciones, {registro.total_errores} errores, "
+          f"{registro.total / duracion:.1f} ops/s promedio", file=salida)
+    if saturaciones:
+        print(f"Primer punto de saturación a los {saturaciones[0][0]:.0f} s: "
+              f"{'; '.join(saturaciones[0][1])}", file=salida)
+    return {"total": registro.total, "errores": registro.total_errores, "saturaciones": saturaciones}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga concurrente sobre el backend local.")
+    parser.add_argument("--operadores", type=int, default=8, help="hilos concurrentes")
+    parser.add_argument("--duracion", type=float, default=30, help="segundos de prueba")
+    parser.add_argument("--mezcla", default=MEZCLA, help="operacion=peso separados por coma")
+    parser.add_argument("--pausa", type=float, default=0, help="think time promedio en ms (lazo cerrado)")
+    parser.add_argument("--tasa", type=float, help="llegadas por segundo (lazo abierto)")
+    parser.add_argument("--intervalo", type=float, default=5, help="segundos entre reportes")
+    parser.add_argument("--filas", type=int, default=10000, help="filas por tabla en los datos de prueba")
+    parser.add_argument("--sesiones", type=int, default=8, help="máximo de sesiones del pool")
+    parser.add_argument("--procesos-bcrypt", type=int, help="procesos del servicio de autenticación")
+    parser.add_argument("--costo-bcrypt", type=int, default=10)
+    parser.add_argument("--semilla", type=int, default=1234)
+    args = parser.parse_args()
+
+    ruta = os.path.join(tempfile.mkdtemp(prefix="carga_"), "carga.db")
+    conexion.usar_backend("sqlite", ruta=ruta, maximo=args.sesiones, timeout_espera=1.0)
+    autenticacion.COSTO_BCRYPT = args.costo_bcrypt
+    if args.procesos_bcrypt:
+        autenticacion.PROCESOS = args.procesos_bcrypt
+        autenticacion.MAX_PENDIENTES = args.procesos_bcrypt * 4
+    datos.poblar(args.filas, semilla=args.semilla, costo_bcrypt=args.costo_bcrypt)
+    autenticacion.get_servicio()
+
+    salida = sys.stdout
+    # los programas imprimen en cada operación; se descarta esa salida
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        ejecutar_carga(args.operadores, args.duracion, leer_mezcla(args.mezcla), args.pausa,
+                       args.tasa, args.intervalo, args.filas, args.semilla, salida)
+
+    autenticacion.cerrar_servicio()
+    conexion.cerrar_backend()
+
+
+if __name__ == "__main__":
+    main()
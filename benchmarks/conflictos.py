@@ -0,0 +1,119 @@
+# Ediciones concurrentes sobre las mismas filas: UPDATE con versión
+# (concurrencia optimista) vs. el UPDATE simple que pisa los cambios.
+#
+# Uso: python -m benchmarks.conflictos [--hilos 8] [--calientes 20] [--duracion 10] [--pausa 5]
+#
+# Cada hilo repite: read_empleado de una de las "calientes" filas, espera
+# --pausa ms (el usuario editando), suma 1 al salario y update(). Corre sobre
+# el backend SQLite local (archivo temporal en WAL).
+#
+# Informa updates/s, latencia del update(), tasa de conflictos y
+# actualizaciones perdidas: updates que terminaron bien pero cuyo +1 no
+# quedó en la base porque otro lo pisó. Con versión, un conflicto se
+# reintenta leyendo de nuevo la fila.
+import argparse
+import contextlib
+import os
+import random
+import tempfile
+import threading
+import time
+
+import conexion
+from benchmarks import datos
+from programa_crud_empleado import read_empleado
+
+
+def _salarios(ruts):
+    connection = conexion.get_connection()
+    cursor = connection.cursor()
+    try:
+        nombres = ", ".join(f":k{i}" for i in range(len(ruts)))
+        cursor.execute(f"SELECT SUM(salario) FROM empleado WHERE rut_empleado IN ({nombres})", ruts)
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def _operador(ruts, con_version, pausa, reintentos, fin, semilla, resultado, lock):
+    aleatorio = random.Random(semilla)
+    latencias = []
+    exitosos = conflictos = errores = 0
+    while time.perf_counter() < fin:
+        rut = aleatorio.choice(ruts)
+        for _ in range(reintentos + 1):
+            emp = read_empleado(rut)
+            if emp is None:
+                errores += 1
+                break
+            time.sleep(pausa)
+            emp.salario += 1
+            if not con_version:
+                emp._version = None
+            inicio = time.perf_counter()
+            ok = emp.update()
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if ok:
+                exitosos += 1
+                break
+            if not emp.conflicto:
+                errores += 1
+                break
+            conflictos += 1
+    with lock:
+        resultado["latencias"] += latencias
+        resultado["exitosos"] += exitosos
+        resultado["conflictos"] += conflictos
+        resultado["errores"] += errores
+
+
+def medir(ruts, con_version, hilos, duracion, pausa, reintentos):
+    antes = _salarios(ruts)
+    resultado = {"latencias": [], "exitosos": 0, "conflictos": 0, "errores": 0}
+    lock = threading.Lock()
+    fin = time.perf_counter() + duracion
+    operadores = [
+        threading.Thread(target=_operador,
+                         args=(ruts, con_version, pausa, reintentos, fin, i, resultado, lock))
+        for i in range(hilos)
+    ]
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        for operador in operadores:
+            operador.start()
+        for operador in operadores:
+            operador.join()
+    resultado["segundos"] = time.perf_counter() - inicio
+    resultado["perdidas"] = resultado["exitosos"] - round(_salarios(ruts) - antes)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrencia optimista vs. UPDATE simple.")
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--calientes", type=int, default=20, help="filas que se editan")
+    parser.add_argument("--duracion", type=float, default=10, help="segundos por modo")
+    parser.add_argument("--pausa", type=float, default=5, help="ms entre leer y actualizar")
+    parser.add_argument("--reintentos", type=int, default=3, help="reintentos por conflicto")
+    args = parser.parse_args()
+
+    ruta = os.path.join(tempfile.mkdtemp(prefix="conflictos_"), "conflictos.db")
+    conexion.usar_backend("sqlite", ruta=ruta, maximo=args.hilos + 1)
+    datos.poblar(max(1000, args.calientes), usuarios=0, clientes=0)
+    ruts = [datos.rut_empleado(i) for i in range(args.calientes)]
+
+    print(f"{args.hilos} hilos sobre {args.calientes} filas, {args.pausa:g} ms entre leer y actualizar")
+    print(f"\n{'modo':<12} | {'updates/s':>9} | {'p50 ms':>7} | {'p99 ms':>7} | "
+          f"{'conflictos':>10} | {'perdidas':>8} | {'errores':>7}")
+    for nombre, con_version in (("sin versión", False), ("con versión", True)):
+        r = medir(ruts, con_version, args.hilos, args.duracion, args.pausa / 1000, args.reintentos)
+        intentos = len(r["latencias"])
+        print(f"{nombre:<12} | {r['exitosos'] / r['segundos']:9.0f} | "
+              f"{datos.percentil(r['latencias'], 50):7.3f} | {datos.percentil(r['latencias'], 99):7.3f} | "
+              f"{r['conflictos'] / max(1, intentos):10.1%} | {r['perdidas']:8d} | {r['errores']:7d}")
+    conexion.cerrar_backend()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# Benchmark de cada operación CRUD sobre el backend SQLite local.
+#
+# Uso:
+#   python -m benchmarks.crud --filas 1000 --salida resultados.json
+#   python -m benchmarks.crud --filas 100000 --comparar base.json --tolerancia 10
+#
+# Por operación informa ops/s, p50/p95/p99 (ms) y memoria máxima (tracemalloc,
+# en una pasada aparte para no distorsionar los tiempos). Con --comparar,
+# termina con código 1 si alguna operación empeora más que la tolerancia (%)
+# en ops/s o en p95 respecto del archivo base.
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+import autenticacion
+import conexion
+from benchmarks import datos
+from programa_crud_cliente_exception import Cliente, cache_clientes, delete_cliente, read_cliente
+from programa_crud_empleado import Empleado, cache_empleados, delete_empleado, iterar_empleados, read_empleado
+from programa_crud_usuario import autenticar_usuario, desactivar_usuario_rut, listar_usuarios, registrar_usuario
+
+
+# ==============================
+# OPERACIONES
+# ==============================
+# Cada operación es (nombre, preparar(n) -> lista de argumentos, ejecutar(arg)).
+# Las lecturas limpian el caché para medir el camino a la base.
+def _operaciones(filas, aleatorio):
+    nuevos_emp = iter(range(filas, filas * 10 + 10_000_000))
+    nuevos_cli = iter(range(filas, filas * 10 + 10_000_000))
+    nuevos_usu = iter(range(filas, filas * 10 + 10_000_000))
+    creados_emp = []
+    creados_cli = []
+
+    def existentes(n, funcion):
+        return [funcion(aleatorio.randrange(filas)) for _ in range(n)]
+
+    def crear_empleado(i):
+        creados_emp.append(datos.rut_empleado(i))
+        Empleado(*datos.fila_empleado(i, aleatorio)).create()
+
+    def leer_empleado(rut):
+        cache_empleados.limpiar()
+        read_empleado(rut)
+
+    def actualizar_empleado(rut):
+        emp = read_empleado(rut)
+        emp.telefono = f"9{aleatorio.randrange(10**8):08d}"
+        emp.update()
+
+    def listar(_):
+        for _ in iterar_empleados():
+            pass
+
+    def crear_cliente(i):
+        creados_cli.append(datos.rut_cliente(i))
+        Cliente(*datos.fila_cliente(i, aleatorio)).create()
+
+    def leer_cliente(rut):
+        cache_clientes.limpiar()
+        read_cliente(rut)
+
+    def actualizar_cliente(rut):
+        cliente = read_cliente(rut)
+        cliente.telefono_contacto = f"2{aleatorio.randrange(10**8):08d}"
+        cliente.update()
+
+    return [
+        ("empleado.create", lambda n: [next(nuevos_emp) for _ in range(n)], crear_empleado),
+        ("empleado.read", lambda n: existentes(n, datos.rut_empleado), leer_empleado),
+        ("empleado.update", lambda n: existentes(n, datos.rut_empleado), actualizar_empleado),
+        ("empleado.delete", lambda n: [creados_emp.pop() for _ in range(min(n, len(creados_emp)))],
+         delete_empleado),
+        ("empleado.listar", lambda n: [None] * max(1, min(n, 5)), listar),
+        ("cliente.create", lambda n: [next(nuevos_cli) for _ in range(n)], crear_cliente),
+        ("cliente.read", lambda n: existentes(n, datos.rut_cliente), leer_cliente),
+        ("cliente.update", lambda n: existentes(n, datos.rut_cliente), actualizar_cliente),
+        ("cliente.delete", lambda n: [creados_cli.pop() for _ in range(min(n, len(creados_cli)))],
+         delete_cliente),
+        ("usuario.create", lambda n: [next(nuevos_usu) for _ in range(n)],
+         lambda i: registrar_usuario(datos.rut_usuario(i), datos.PASSWORD, "USER")),
+        ("usuario.login", lambda n: existentes(n, datos.rut_usuario),
+         lambda rut: autenticar_usuario(rut, datos.PASSWORD)),
+        ("usuario.listar", lambda n: [None] * max(1, min(n, 5)), lambda _: listar_usuarios()),
+        ("usuario.desactivar", lambda n: existentes(n, datos.rut_usuario), desactivar_usuario_rut),
+    ]
+
+
+def _medir(preparar, ejecutar, n):
+    argumentos = preparar(n)
+    tiempos = []
+    # los programas imprimen en cada operación; se descarta esa salida
+    with contextlib.redirect_stdout(io.StringIO()) as salida:
+        inicio_total = time.perf_counter()
+        for arg in argumentos:
+            inicio = time.perf_counter()
+            ejecutar(arg)
+            tiempos.append(time.perf_counter() - inicio)
+            salida.seek(0)
+            salida.truncate()
+        total = time.perf_counter() - inicio_total
+    return {
+        "operaciones": len(tiempos),
+        "ops_seg": len(tiempos) / total if total else 0.0,
+        "p50_ms": datos.percentil(tiempos, 50) * 1000,
+        "p95_ms": datos.percentil(tiempos, 95) * 1000,
+        "p99_ms": datos.percentil(tiempos, 99) * 1000
+    }
+
+
+def _memoria_maxima(preparar, ejecutar, n):
+    argumentos = preparar(n)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        for arg in argumentos:
+            ejecutar(arg)
+        _, maximo = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return maximo / 2**20
+
+
+def ejecutar_benchmark(filas, operaciones, costo_bcrypt, ruta_sqlite, semilla=1234):
+    conexion.usar_backend("sqlite", ruta=ruta_sqlite)
+    autenticacion.COSTO_BCRYPT = costo_bcrypt
+    autenticacion.cerrar_servicio()
+
+    inicio = time.perf_counter()
+    datos.poblar(filas, semilla=semilla, costo_bcrypt=costo_bcrypt)
+    print(f"Datos de prueba: {filas} filas por tabla en {time.perf_counter() - inicio:.1f} s")
+
+    aleatorio = random.Random(semilla)
+    resultados = {}
+    for nombre, preparar, ejecutar in _operaciones(filas, aleatorio):
+        resultado = _medir(preparar, ejecutar, operaciones)
+        resultado["memoria_max_mib"] = _memoria_maxima(preparar, ejecutar, min(operaciones, 20))
+        resultados[nombre] = resultado
+        print(f"{nombre:<20} | {resultado['ops_seg']:10.1f} ops/s | p50 {resultado['p50_ms']:8.3f} ms | "
+              f"p95 {resultado['p95_ms']:8.3f} ms | p99 {resultado['p99_ms']:8.3f} ms | "
+              f"mem {resultado['memoria_max_mib']:7.2f} MiB")
+
+    autenticacion.cerrar_servicio()
+    conexion.cerrar_backend()
+    return {
+        "meta": {
+            "fecha": date.today().isoformat(),
+            "filas": filas,
+            "operaciones": operaciones,
+            "costo_bcrypt": costo_bcrypt,
+            "backend": "sqlite",
+            "python": platform.python_version(),
+            "cpus": os.cpu_count()
+        },
+        "resultados": resultados
+    }
+
+
+# ==============================
+# COMPARACIÓN CON LA BASE
+# ==============================
+# Devuelve la lista de regresiones (operación, métrica, base, actual, %).
+def comparar(base, actual, tolerancia):
+    regresiones = []
+    for nombre, datos_actual in actual["resultados"].items():
+        datos_base = base["resultados"].get(nombre)
+        if not datos_base:
+            continue
+        if datos_base["ops_seg"] > 0:
+            caida = (datos_base["ops_seg"] - datos_actual["ops_seg"]) / datos_base["ops_seg"] * 100
+            if caida > tolerancia:
+                regresiones.append((nombre, "ops_seg", datos_base["ops_seg"], datos_actual["ops_seg"], caida))
+        if datos_base["p95_ms"] > 0:
+            alza = (datos_actual["p95_ms"] - datos_base["p95_ms"]) / datos_base["p95_ms"] * 100
+            if alza > tolerancia:
+                regresiones.append((nombre, "p95_ms", datos_base["p95_ms"], datos_actual["p95_ms"], alza))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las operaciones CRUD.")
+    parser.add_argument("--filas", type=int, default=1000, help="filas por tabla (ej. 1000, 100000, 1000000)")
+    parser.add_argument("--operaciones", type=int, default=200, help="repeticiones por operación")
+    parser.add_argument("--costo-bcrypt", type=int, default=4, help="costo bcrypt para crear usuario y login")
+    parser.add_argument("--sqlite", default=":memory:", help="ruta de la base SQLite")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="archivo JSON base contra el cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=10.0, help="porcentaje de empeoramiento aceptado")
+    args = parser.parse_args()
+
+    resultado = ejecutar_benchmark(args.filas, args.operaciones, args.costo_bcrypt, args.sqlite)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2)
+        print(f"Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(base, resultado, args.tolerancia)
+        if regresiones:
+            print(f"\nRegresiones sobre {args.tolerancia:.0f}%:")
+            for nombre, metrica, valor_base, valor_actual, cambio in regresiones:
+                print(f"  {nombre:<20} {metrica:<8} base {valor_base:10.3f} -> {valor_actual:10.3f} ({cambio:+.1f}%)")
+            sys.exit(1)
+        print(f"\nSin regresiones sobre {args.tolerancia:.0f}% respecto de {args.comparar}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Datos sintéticos para benchmarks y pruebas de carga sobre el backend local.
+import math
+import random
+import unicodedata
+from datetime import date, timedelta
+
+import bcrypt
+
+from conexion import get_connection
+from validacion_rut import formatear_rut
+
+PASSWORD = "clave-benchmark"
+LOTE = 5000
+
+NOMBRES = (
+    "José", "María", "Juan", "Ana", "Luis", "Carmen", "Jorge", "Rosa", "Pedro", "Patricia",
+    "Carlos", "Claudia", "Manuel", "Verónica", "Francisco", "Marcela", "Sebastián", "Camila",
+    "Matías", "Valentina", "Diego", "Javiera", "Cristóbal", "Constanza", "Felipe", "Catalina",
+    "Andrés", "Daniela", "Héctor", "Fernanda", "Raúl", "Paula", "Ignacio", "Sofía", "Tomás",
+    "Isidora", "Álvaro", "Francisca", "Rodrigo", "Antonia"
+)
+APELLIDOS = (
+    "González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez",
+    "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Hernández", "Torres", "Araya",
+    "Flores", "Espinoza", "Valenzuela", "Castillo", "Tapia", "Reyes", "Gutiérrez", "Castro",
+    "Pizarro", "Álvarez", "Vásquez", "Sánchez", "Fernández", "Ramírez", "Carrasco", "Gómez",
+    "Cortés", "Herrera", "Núñez", "Jara", "Vergara", "Rivera", "Figueroa", "Riquelme", "García",
+    "Miranda", "Bravo", "Vera", "Molina", "Vega", "Campos", "Sandoval", "Orellana"
+)
+RUBROS = (
+    "Comercial", "Inversiones", "Constructora", "Transportes", "Servicios", "Agrícola",
+    "Distribuidora", "Inmobiliaria", "Ingeniería", "Importadora"
+)
+
+
+# Percentil p (0 a 100) con interpolación lineal entre las dos posiciones
+# vecinas, como PERCENTILE_CONT. Sin valores devuelve NaN.
+def percentil(valores, p):
+    if not valores:
+        return float("nan")
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * p / 100
+    abajo, arriba = math.floor(posicion), math.ceil(posicion)
+    return ordenados[abajo] + (ordenados[arriba] - ordenados[abajo]) * (posicion - abajo)
+
+
+# RUT con dígito verificador válido (módulo 11)
+def rut(numero):
+    return formatear_rut(numero)
+
+
+def rut_empleado(i):
+    return rut(10_000_000 + i)
+
+
+def rut_cliente(i):
+    return rut(70_000_000 + i)
+
+
+def rut_usuario(i):
+    return rut(10_000_000 + i)
+
+
+# Nombre y dos apellidos a partir de un número en [0, 100000)
+def nombre_persona(numero):
+    return (f"{NOMBRES[numero % 40]} {APELLIDOS[numero // 40 % 50]} "
+            f"{APELLIDOS[numero // 2000 % 50]}")
+
+
+def _email(texto, i, dominio):
+    sin_tildes = unicodedata.normalize("NFKD", texto.lower()).encode("ascii", "ignore").decode()
+    return f"{'.'.join(sin_tildes.split()[:2])}{i}@{dominio}"
+
+
+def fila_empleado(i, aleatorio):
+    nombre = nombre_persona(aleatorio.randrange(100000))
+    return (
+        rut_empleado(i), nombre, f"Calle {i}",
+        f"9{aleatorio.randrange(10**8):08d}", _email(nombre, i, "empresa.cl"),
+        date(2010, 1, 1) + timedelta(days=aleatorio.randrange(5000)),
+        float(aleatorio.randrange(500_000, 5_000_000)),
+        aleatorio.randint(1, 5), aleatorio.randint(1, 5)
+    )
+
+
+# Razón social y contacto salen de i (sin sorteos, para no alterar la
+# secuencia aleatoria del resto de las columnas)
+def fila_cliente(i, aleatorio):
+    razon_social = f"{RUBROS[i % 10]} {APELLIDOS[i // 10 % 50]} {APELLIDOS[i // 500 % 50]} SpA"
+    contacto = nombre_persona(i * 7919 % 100000)
+    return (
+        rut_cliente(i), rut_empleado(aleatorio.randrange(max(i, 1))), razon_social,
+        aleatorio.randrange(1, 5000), contacto, _email(contacto, i, "cliente.cl"),
+        f"2{aleatorio.randrange(10**8):08d}"
+    )
+
+
+def _insertar(connection, sql, filas):
+    cursor = connection.cursor()
+    try:
+        for i in range(0, len(filas), LOTE):
+            cursor.executemany(sql, filas[i:i + LOTE])
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+# Llena empleado, cliente y usuario con "filas" registros cada una (clientes
+# y usuarios se pueden limitar). Todos los usuarios comparten un hash (costo
+# bajo) para que poblar sea rápido.
+def poblar(filas, semilla=1234, costo_bcrypt=4, usuarios=None, clientes=None):
+    aleatorio = random.Random(semilla)
+    password_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=costo_bcrypt)).decode('utf-8')
+    usuarios = filas if usuarios is None else usuarios
+    clientes = filas if clientes is None else clientes
+    connection = get_connection()
+    try:
+        for inicio in range(0, filas, 100_000):
+            fin = min(filas, inicio + 100_000)
+            _insertar(connection, """
+                INSERT INTO empleado (rut_empleado, nombre, direccion, telefono, email, fecha_inicio,
+                                      salario, codigo_cargo, id_departamento)
+                VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9)
+            """, [fila_empleado(i, aleatorio) for i in range(inicio, fin)])
+            _insertar(connection, """
+                INSERT INTO cliente (rut_cliente, rut_vendedor, razon_social, cantidad_trabajadores,
+                                     nombre_contacto, email_contacto, telefono_contacto)
+                VALUES (:1, :2, :3, :4, :5, :6, :7)
+            """, [fila_cliente(i, aleatorio) for i in range(inicio, min(fin, clientes))])
+        for inicio in range(0, usuarios, 100_000):
+            fin = min(usuarios, inicio + 100_000)
+            _insertar(connection, """
+                INSERT INTO usuario (rut_usuario, password_hash, codigo_rol) VALUES (:1, :2, :3)
+            """, [(rut_usuario(i), password_hash, "USER") for i in range(inicio, fin)])
+    finally:
+        connection.close()
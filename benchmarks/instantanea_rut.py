@@ -0,0 +1,127 @@
+# Lecturas por RUT desde la instantánea mapeada en memoria vs. read_empleado.
+#
+# Uso: python -m benchmarks.instantanea_rut [--filas 200000] [--lecturas 200000] [--procesos 4]
+#
+# Pobla empleado, construye la instantánea (tiempo y tamaño) y mide µs por
+# lectura de RUT al azar (10% inexistentes) con InstantaneaRUT.leer, solo
+# la búsqueda binaria en el índice, y read_empleado sobre el backend SQLite
+# en memoria (con su caché LRU; con Oracle cada fallo del caché es además
+# una ida y vuelta). Luego abre la misma instantánea en --procesos procesos
+# y muestra, por proceso, las páginas del archivo en memoria (Rss) y su
+# parte proporcional (Pss): si las comparten, Pss es Rss / procesos.
+import argparse
+import contextlib
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from bisect import bisect_left
+
+import conexion
+from benchmarks import datos
+from instantanea_rut import InstantaneaRUT, construir
+from programa_crud_empleado import Empleado, cache_empleados, read_empleado
+
+
+def _ruts(filas, cantidad, aleatorio):
+    # 10% con números fuera de la tabla
+    return [datos.rut_empleado(aleatorio.randrange(filas) if aleatorio.random() < 0.9 else filas + i)
+            for i in range(cantidad)]
+
+
+def _microsegundos(funcion, ruts):
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        for rut in ruts:
+            funcion(rut)
+    return (time.perf_counter() - inicio) / len(ruts) * 1e6
+
+
+# Rss y Pss (KiB) del mapeo de "ruta" en este proceso, o None sin /proc
+def _memoria_mapeo(ruta):
+    if not os.path.exists("/proc/self/smaps"):
+        return None
+    rss = pss = 0
+    dentro = False
+    with open("/proc/self/smaps") as archivo:
+        for linea in archivo:
+            partes = linea.split()
+            if partes and "-" in partes[0] and not partes[0].endswith(":"):
+                dentro = linea.rstrip().endswith(ruta)
+            elif dentro and partes[0] == "Rss:":
+                rss += int(partes[1])
+            elif dentro and partes[0] == "Pss:":
+                pss += int(partes[1])
+    return rss, pss
+
+
+def _lector(ruta, ruts, barrera, resultados):
+    with InstantaneaRUT(ruta) as instantanea:
+        inicio = time.perf_counter()
+        for rut in ruts:
+            instantanea.leer(rut)
+        segundos = time.perf_counter() - inicio
+        barrera.wait()      # todos con el archivo mapeado y leído
+        resultados.put((len(ruts) / segundos, _memoria_mapeo(os.path.realpath(ruta))))
+        barrera.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instantánea por RUT mapeada en memoria vs. read_empleado.")
+    parser.add_argument("--filas", type=int, default=200_000)
+    parser.add_argument("--lecturas", type=int, default=200_000)
+    parser.add_argument("--procesos", type=int, default=4)
+    args = parser.parse_args()
+    aleatorio = random.Random(5)
+
+    conexion.usar_backend("sqlite", ruta=":memory:")
+    datos.poblar(args.filas, usuarios=0, clientes=0)
+    ruta = os.path.join(tempfile.mkdtemp(prefix="instantanea_rut_"), "empleados.rut")
+    resultado = construir(ruta, Empleado)
+    print(f"Instantánea: {resultado['filas']} empleados, {resultado['bytes'] / 2**20:.1f} MiB, "
+          f"construida en {resultado['segundos']:.1f} s")
+
+    ruts = _ruts(args.filas, args.lecturas, aleatorio)
+    instantanea = InstantaneaRUT(ruta)
+    numeros = [int(rut[:-2]) for rut in ruts]
+    claves = instantanea._claves
+    inicio = time.perf_counter()
+    for numero in numeros:
+        bisect_left(claves, numero)
+    busqueda = (time.perf_counter() - inicio) / len(numeros) * 1e6
+    mapeo = _microsegundos(instantanea.leer, ruts)
+    instantanea.cerrar()
+    cache_empleados.limpiar()
+    base = _microsegundos(read_empleado, ruts)
+
+    print(f"\n{'lectura':<32} | {'µs por RUT':>10} | {'RUT/s':>10}")
+    for nombre, micro in (("InstantaneaRUT.leer", mapeo), ("solo búsqueda en el índice", busqueda),
+                          ("read_empleado (SQLite + caché)", base)):
+        print(f"{nombre:<32} | {micro:10.2f} | {1e6 / micro:10.0f}")
+    conexion.cerrar_backend()
+
+    # varios procesos sobre el mismo archivo
+    contexto = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    barrera = contexto.Barrier(args.procesos)
+    resultados = contexto.Queue()
+    todos = [datos.rut_empleado(i) for i in range(args.filas)]
+    aleatorio.shuffle(todos)        # cada proceso lee todas las filas
+    procesos = [contexto.Process(target=_lector, args=(ruta, todos, barrera, resultados))
+                for _ in range(args.procesos)]
+    for proceso in procesos:
+        proceso.start()
+    medidas = [resultados.get() for _ in procesos]
+    for proceso in procesos:
+        proceso.join()
+
+    print(f"\n{args.procesos} procesos leyendo las {args.filas} filas: "
+          f"{sum(tasa for tasa, _ in medidas):.0f} RUT/s en total ({os.cpu_count()} CPU)")
+    for i, (tasa, memoria) in enumerate(medidas):
+        detalle = f"Rss {memoria[0] / 1024:.1f} MiB, Pss {memoria[1] / 1024:.1f} MiB" if memoria else "sin /proc"
+        print(f"  proceso {i}: {tasa:9.0f} RUT/s, mapeo: {detalle}")
+    os.remove(ruta)
+
+
+if __name__ == "__main__":
+    main()
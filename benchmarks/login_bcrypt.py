@@ -0,0 +1,46 @@
+# Mide logins/s (verificación bcrypt) con distintos tamaños del pool de
+# procesos de autenticacion.ServicioAutenticacion. No usa la base de datos.
+#
+# Uso: python -m benchmarks.login_bcrypt [logins] [costo]
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from autenticacion import ServicioAutenticacion, _verificar
+
+
+def _medir(verificar, logins, password, password_hash, hilos):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as clientes:
+        resultados = list(clientes.map(lambda _: verificar(password, password_hash), range(logins)))
+    segundos = time.perf_counter() - inicio
+    assert all(resultados)
+    return logins / segundos
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    costo = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    password = "clave-de-prueba"
+    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=costo)).decode('utf-8')
+    nucleos = os.cpu_count() or 1
+
+    print(f"\nLogins/s con costo bcrypt {costo} ({logins} logins, {nucleos} núcleos)")
+    print("-" * 60)
+    actual = _medir(_verificar, logins, password, password_hash, hilos=nucleos * 2)
+    print(f"{'Hilo que llama (actual)':<28} | {actual:8.1f} logins/s")
+
+    tamanos = sorted({1, 2, 4, nucleos} | {n for n in (8, 16) if n <= nucleos})
+    for procesos in tamanos:
+        servicio = ServicioAutenticacion(procesos=procesos, max_pendientes=logins, timeout=600)
+        servicio.verificar(password, password_hash)     # arranque de los procesos
+        tasa = _medir(servicio.verificar, logins, password, password_hash, hilos=procesos * 2)
+        servicio.cerrar()
+        print(f"{'Pool de ' + str(procesos) + ' procesos':<28} | {tasa:8.1f} logins/s")
+
+
+if __name__ == "__main__":
+    main()
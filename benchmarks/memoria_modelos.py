@@ -0,0 +1,76 @@
+# Memoria usada por 100k objetos Empleado y Cliente: clase con __dict__
+# (como era antes) vs la clase actual con __slots__. Medido con tracemalloc.
+#
+# Uso: python -m benchmarks.memoria_modelos [filas]
+import sys
+import tracemalloc
+from datetime import date
+
+from programa_crud_cliente_exception import Cliente
+from programa_crud_empleado import Empleado
+
+
+# Réplicas de las clases anteriores (atributos en __dict__)
+class EmpleadoConDict:
+    def __init__(self, rut_empleado, nombre, direccion, telefono, email,
+                 fecha_inicio, salario, codigo_cargo, id_departamento):
+        self.rut_empleado = rut_empleado
+        self.nombre = nombre
+        self.direccion = direccion
+        self.telefono = telefono
+        self.email = email
+        self.fecha_inicio = fecha_inicio
+        self.salario = salario
+        self.codigo_cargo = codigo_cargo
+        self.id_departamento = id_departamento
+
+
+class ClienteConDict:
+    def __init__(self, rut_cliente, rut_vendedor, razon_social, cantidad_trabajadores,
+                 nombre_contacto, email_contacto, telefono_contacto):
+        self.rut_cliente = rut_cliente
+        self.rut_vendedor = rut_vendedor
+        self.razon_social = razon_social
+        self.cantidad_trabajadores = cantidad_trabajadores
+        self.nombre_contacto = nombre_contacto
+        self.email_contacto = email_contacto
+        self.telefono_contacto = telefono_contacto
+
+
+def _filas_empleado(n):
+    fecha = date(2020, 1, 1)
+    return [(f"{i}-K", f"Empleado {i}", "Calle 1", "912345678", f"e{i}@mail.cl",
+             fecha, 1000000.0, 1, 1) for i in range(n)]
+
+
+def _filas_cliente(n):
+    return [(f"{i}-K", "1-9", f"Empresa {i}", 10, "Contacto", f"c{i}@mail.cl", "912345678")
+            for i in range(n)]
+
+
+# Mide solo los objetos: las filas (valores) se crean antes de empezar
+def _medir(clase, filas):
+    tracemalloc.start()
+    objetos = [clase(*row) for row in filas]
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objetos
+    return actual
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"\nMemoria de {n} objetos")
+    print("-" * 60)
+    for nombre, antes, despues, filas in (
+        ("Empleado", EmpleadoConDict, Empleado, _filas_empleado(n)),
+        ("Cliente", ClienteConDict, Cliente, _filas_cliente(n)),
+    ):
+        con_dict = _medir(antes, filas)
+        con_slots = _medir(despues, filas)
+        print(f"{nombre:<9} | __dict__: {con_dict / 2**20:7.1f} MiB | "
+              f"__slots__: {con_slots / 2**20:7.1f} MiB | ahorro: {1 - con_slots / con_dict:5.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Compara la latencia por llamada de una operación CRUD típica
+# (obtener conexión + SELECT + cerrar) usando conexión directa vs pool.
+#
+# Uso: python -m benchmarks.pool_conexiones [iteraciones]
+import sys
+import time
+
+from backend_oracle import BackendOracle, get_connection_directa
+from benchmarks.datos import percentil
+from conexion import DatabaseError, mensaje_error
+
+
+def _medir(obtener, iteraciones):
+    tiempos = []
+    for _ in range(iteraciones):
+        inicio = time.perf_counter()
+        connection = obtener()
+        if not connection:
+            return None
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1 FROM dual")
+        cursor.fetchone()
+        cursor.close()
+        connection.close()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return sorted(tiempos)
+
+
+def _reporte(nombre, tiempos):
+    promedio = sum(tiempos) / len(tiempos)
+    print(f"{nombre:<18} | prom: {promedio:8.2f} ms | p50: {percentil(tiempos, 50):8.2f} ms | "
+          f"p95: {percentil(tiempos, 95):8.2f} ms | max: {tiempos[-1]:8.2f} ms")
+
+
+def main():
+    iteraciones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    directa = _medir(get_connection_directa, iteraciones)
+    if directa is None:
+        print("No se pudo conectar con la base de datos.")
+        sys.exit(1)
+
+    backend = BackendOracle()
+    try:
+        backend.crear_pool()
+        # la primera sesión del pool ya quedó abierta al crearlo
+        pool = _medir(backend.get_connection, iteraciones)
+    except DatabaseError as e:
+        print("No se pudo crear el pool de sesiones:", mensaje_error(e))
+        sys.exit(1)
+    finally:
+        backend.cerrar()
+    if pool is None:
+        print("No se pudo obtener una sesión del pool.")
+        sys.exit(1)
+
+    print(f"\nLatencia por llamada ({iteraciones} iteraciones)")
+    print("-" * 90)
+    _reporte("Conexión directa", directa)
+    _reporte("Pool de sesiones", pool)
+    print(f"Mejora promedio: x{(sum(directa) / sum(pool)):.1f}")
+
+
+if __name__ == "__main__":
+    main()
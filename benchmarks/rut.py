@@ -0,0 +1,73 @@
+# Validación de RUT: ciclo normalizar_rut vs. normalizar_ruts (NumPy).
+#
+# Uso: python -m benchmarks.rut [--cantidad 2000000] [--invalidos 10]
+#
+# Genera RUT en formatos mezclados ("12.345.678-k", "12345678K",
+# " 12345678-5 ", ...) con un porcentaje de dígitos verificadores
+# incorrectos y texto basura, mide RUT/s de ambas versiones y comprueba que
+# den exactamente el mismo resultado.
+import argparse
+import random
+import time
+
+import validacion_rut
+from validacion_rut import formatear_rut, normalizar_rut, normalizar_ruts
+
+
+def _con_puntos(numero, dv):
+    return f"{numero:,}".replace(",", ".") + "-" + dv
+
+
+FORMATOS = (
+    lambda numero, dv: f"{numero}-{dv}",
+    lambda numero, dv: f"{numero}{dv}",
+    lambda numero, dv: f"{numero}-{dv.lower()}",
+    lambda numero, dv: f" {numero}-{dv} ",
+    _con_puntos,
+)
+BASURA = ("", "abc", "12.345", "-", "K", "0-0", "123456789012-3", "12345678-Ñ", "1234567-89")
+
+
+def generar(cantidad, porcentaje_invalidos, semilla=1):
+    aleatorio = random.Random(semilla)
+    ruts = []
+    for _ in range(cantidad):
+        numero = aleatorio.randrange(1_000_000, 99_999_999)
+        dv = formatear_rut(numero)[-1]
+        sorteo = aleatorio.randrange(100)
+        if sorteo < porcentaje_invalidos // 2:
+            ruts.append(aleatorio.choice(BASURA))
+            continue
+        if sorteo < porcentaje_invalidos:
+            dv = "K" if dv == "0" else "0"     # dígito verificador incorrecto
+        ruts.append(aleatorio.choice(FORMATOS)(numero, dv))
+    return ruts
+
+
+def _tiempo(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validación de RUT: ciclo vs. vectorizado.")
+    parser.add_argument("--cantidad", type=int, default=2_000_000)
+    parser.add_argument("--invalidos", type=int, default=10, help="porcentaje de RUT inválidos")
+    args = parser.parse_args()
+
+    ruts = generar(args.cantidad, args.invalidos)
+    ciclo, segundos_ciclo = _tiempo(lambda: [normalizar_rut(r) for r in ruts])
+    vectorizado, segundos_vector = _tiempo(normalizar_ruts, ruts)
+
+    print(f"{len(ruts)} RUT, {sum(r is None for r in ciclo)} inválidos")
+    print(f"\n{'versión':<12} | {'segundos':>9} | {'RUT/s':>12}")
+    print(f"{'ciclo':<12} | {segundos_ciclo:9.3f} | {len(ruts) / segundos_ciclo:12,.0f}")
+    nombre = "numpy" if validacion_rut.np is not None else "sin numpy"
+    print(f"{nombre:<12} | {segundos_vector:9.3f} | {len(ruts) / segundos_vector:12,.0f}")
+    print(f"\n{segundos_ciclo / segundos_vector:.1f}x más rápido.")
+    print("Resultados iguales." if ciclo == vectorizado else "Los resultados no coinciden.")
+
+
+if __name__ == "__main__":
+    main()
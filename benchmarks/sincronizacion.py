@@ -0,0 +1,82 @@
+# Sincronización incremental contra la copia completa de la tabla.
+#
+# Uso: python -m benchmarks.sincronizacion [--filas 200000] [--cambios 0,100,1000,10000]
+#
+# Pobla empleado, hace la primera sincronización (copia todo) y luego, para
+# cada cantidad de cambios, modifica esa cantidad de filas, elimina el 1% de
+# ellas con delete_empleado (quedan en la auditoría) y sincroniza. Informa
+# filas transferidas y tiempo por ejecución: deben crecer con los cambios y
+# no con el tamaño de la tabla. Al final mide una ejecución con diferencia
+# de claves y una copia completa. Corre sobre el backend SQLite en memoria,
+# donde ORA_ROWSCN se imita con la columna scn.
+import argparse
+import contextlib
+import os
+import random
+import tempfile
+
+import auditoria
+import conexion
+import sincronizacion
+from benchmarks import datos
+from conexion import get_connection
+from programa_crud_empleado import delete_empleado
+
+
+def _modificar(ruts, aleatorio, cantidad):
+    elegidos = aleatorio.sample(ruts, cantidad)
+    connection = get_connection()
+    cursor = connection.cursor()
+    cursor.executemany("UPDATE empleado SET salario = salario + 1 WHERE rut_empleado = :rut",
+                       [{"rut": rut} for rut in elegidos])
+    connection.commit()
+    cursor.close()
+    connection.close()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        for rut in elegidos[:cantidad // 100]:
+            delete_empleado(rut)
+            ruts.remove(rut)
+    auditoria.vaciar()
+
+
+def _fila(nombre, r):
+    print(f"{nombre:<22} | {r['cambiadas']:9d} | {r['eliminadas']:10d} | {r['transferidas']:12d} | "
+          f"{r['filas']:9d} | {r['segundos'] * 1000:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sincronización incremental vs. copia completa.")
+    parser.add_argument("--filas", type=int, default=200_000)
+    parser.add_argument("--cambios", default="0,100,1000,10000", help="filas modificadas por ejecución")
+    args = parser.parse_args()
+    aleatorio = random.Random(3)
+
+    conexion.usar_backend("sqlite", ruta=":memory:")
+    datos.poblar(args.filas, usuarios=0, clientes=0)
+    ruts = [datos.rut_empleado(i) for i in range(args.filas)]
+    ruta = os.path.join(tempfile.mkdtemp(prefix="sincronizacion_"), "instantanea.db")
+
+    def sincronizar(**opciones):
+        return sincronizacion.sincronizar(ruta, ["empleado"], diferencia_cada=10**9, **opciones)["empleado"]
+
+    print(f"empleado con {args.filas} filas")
+    print(f"\n{'ejecución':<22} | {'cambiadas':>9} | {'eliminadas':>10} | {'transferidas':>12} | "
+          f"{'filas':>9} | {'ms':>9}")
+    _fila("primera (copia todo)", sincronizar())
+    for cambios in (int(c) for c in args.cambios.split(",")):
+        if cambios:
+            _modificar(ruts, aleatorio, cambios)
+        _fila(f"{cambios} cambios", sincronizar())
+
+    destino = sincronizacion.abrir_instantanea(ruta)
+    connection = get_connection()
+    r = sincronizacion.sincronizar_tabla(connection, destino, "empleado", diferencia_cada=1)
+    connection.close()
+    destino.close()
+    _fila("diferencia de claves", r)
+    _fila("copia completa", sincronizar(completa=True))
+    conexion.cerrar_backend()
+
+
+if __name__ == "__main__":
+    main()
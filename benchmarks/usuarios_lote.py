@@ -0,0 +1,78 @@
+# Alta y baja de usuarios por lote vs. de a uno.
+#
+# Uso: python -m benchmarks.usuarios_lote [--usuarios 500] [--costo 8] [--procesos N]
+#
+# Alta: registrar_usuario en un ciclo (un bcrypt, un INSERT y un commit por
+# usuario) contra registrar_usuarios (bcrypt en todos los procesos y
+# executemany). Baja: desactivar_usuario_rut en un ciclo contra
+# desactivar_usuarios con la lista de RUT y con un criterio de rol. Corre
+# sobre el backend SQLite local; con Oracle la diferencia por idas y vueltas
+# es mayor.
+import argparse
+import contextlib
+import os
+import time
+
+import autenticacion
+import conexion
+from programa_crud_usuario import (
+    desactivar_usuario_rut, desactivar_usuarios, registrar_usuario, registrar_usuarios
+)
+from validacion_rut import formatear_rut
+
+
+def _usuarios(desde, cantidad, rol):
+    return [(formatear_rut(desde + i), f"clave-{i}", rol) for i in range(cantidad)]
+
+
+def _tiempo(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        resultado = funcion(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def _fila(nombre, cantidad, segundos, detalle=""):
+    print(f"{nombre:<34} | {segundos:8.3f} s | {cantidad / segundos:10.0f} usuarios/s {detalle}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alta y baja de usuarios por lote vs. de a uno.")
+    parser.add_argument("--usuarios", type=int, default=500)
+    parser.add_argument("--costo", type=int, default=8, help="costo bcrypt")
+    parser.add_argument("--procesos", type=int, help="procesos de bcrypt (por defecto, los núcleos)")
+    args = parser.parse_args()
+
+    autenticacion.COSTO_BCRYPT = args.costo
+    if args.procesos:
+        autenticacion.PROCESOS = args.procesos
+        autenticacion.MAX_PENDIENTES = args.procesos * 4
+    conexion.usar_backend("sqlite", ruta=":memory:")
+    servicio = autenticacion.get_servicio()
+    servicio.hashear("arranque")        # levanta los procesos antes de medir
+    n = args.usuarios
+
+    print(f"{n} usuarios, costo bcrypt {args.costo}, {servicio.procesos} procesos")
+    print("\nAlta")
+    uno_a_uno = _usuarios(20_000_000, n, "USER")
+    _, segundos = _tiempo(lambda: [registrar_usuario(*u) for u in uno_a_uno])
+    _fila("registrar_usuario (ciclo)", n, segundos)
+    resultado, segundos = _tiempo(registrar_usuarios, _usuarios(30_000_000, n, "ADMIN"))
+    _fila("registrar_usuarios (lote)", n, segundos,
+          f"(bcrypt {resultado['segundos_hash']:.3f} s, base {resultado['segundos_base']:.3f} s)")
+
+    print("\nBaja")
+    _, segundos = _tiempo(lambda: [desactivar_usuario_rut(rut) for rut, _, _ in uno_a_uno])
+    _fila("desactivar_usuario_rut (ciclo)", n, segundos)
+    ruts = [rut for rut, _, _ in _usuarios(30_000_000, n // 2, "ADMIN")]
+    resultado, segundos = _tiempo(desactivar_usuarios, ruts)
+    _fila("desactivar_usuarios (lista de RUT)", n // 2, segundos)
+    resultado, segundos = _tiempo(desactivar_usuarios, codigo_rol="ADMIN")
+    _fila("desactivar_usuarios (por rol)", max(1, resultado["desactivados"]), segundos)
+
+    autenticacion.cerrar_servicio()
+    conexion.cerrar_backend()
+
+
+if __name__ == "__main__":
+    main()
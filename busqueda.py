@@ -0,0 +1,311 @@
+# Búsqueda por texto parcial en memoria (índice de trigramas).
+#
+# read_empleado/read_cliente solo encuentran por RUT exacto, y un
+# LIKE '%texto%' en Oracle recorre la tabla completa en cada consulta. Aquí
+# cada tabla tiene un índice en memoria: se construye leyendo las columnas
+# de texto una vez (en el primer uso o con construir()) y luego lo mantienen
+# al día los create/update/delete de cada programa.
+#
+# El texto se pasa a minúsculas, sin tildes, y se separa en palabras. Cada
+# palabra aporta sus trigramas con dos "$" al inicio ("rosa" -> $$r, $ro,
+# ros, osa), así el comienzo de una palabra también es un trigrama y una
+# búsqueda por prefijo encuentra todos los suyos. Cada par de palabras
+# seguidas aporta además el final de una y el comienzo de la otra ("ana
+# rosa" -> "ana ros"), así las filas con las palabras en el mismo orden de la
+# consulta suman más. Una fila coincide si tiene al menos MINIMO de esos
+# términos de la consulta (tolera errores de tipeo) y se ordena por esa
+# proporción, con un bono si cada palabra de la consulta es prefijo de alguna
+# palabra de la fila, y luego por largo del texto.
+#
+# Memoria: cada fila tiene un número interno y cada trigrama guarda la lista
+# de números en un array('i') (4 bytes por entrada). Una fila modificada o
+# eliminada solo se marca como muerta y recibe un número nuevo; cuando las
+# muertas pasan de COMPACTAR se rearman las listas. Con NumPy el conteo de
+# trigramas por fila es un bincount; sin NumPy se usa collections.Counter.
+import heapq
+import math
+import string
+import threading
+from array import array
+from collections import Counter
+from itertools import chain
+
+import conexion
+from conexion import DatabaseError, get_connection, mensaje_error
+from instrumentacion import medir
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MINIMO = 0.6            # proporción mínima de trigramas de la consulta
+BONO_PREFIJO = 0.5      # si cada palabra de la consulta es prefijo de una palabra de la fila
+LIMITE = 10
+TAMANO_LOTE = 5000
+COMPACTAR = 0.25        # proporción de filas muertas que provoca rearmar las listas
+
+# minúsculas sin tildes; la puntuación separa palabras
+_TEXTO = str.maketrans(
+    "áéíóúüñàèìòùâêîôûäëïöç" + string.punctuation,
+    "aeiouunaeiouaeiouaeioc" + " " * len(string.punctuation)
+)
+
+
+# ==============================
+# TEXTO
+# ==============================
+def palabras(texto):
+    if not texto:
+        return []
+    return str(texto).lower().translate(_TEXTO).split()
+
+
+def trigramas(palabra):
+    relleno = "$$" + palabra
+    return {relleno[i:i + 3] for i in range(len(palabra))}
+
+
+# Trigramas de todos los valores (de las palabras y de los pares de palabras
+# seguidas) y el largo total de las palabras
+def _trigramas_de(valores):
+    resultado = set()
+    largo = 0
+    for valor in valores:
+        anterior = None
+        for palabra in palabras(valor):
+            resultado |= trigramas(palabra)
+            if anterior is not None:
+                resultado.add(anterior[-3:] + " " + palabra[:3])
+            anterior = palabra
+            largo += len(palabra)
+    return resultado, min(largo, 65535)
+
+
+# ==============================
+# ÍNDICE
+# ==============================
+# Índice de una tabla sobre las columnas "campos". Seguro entre hilos.
+# guardar/eliminar no hacen nada mientras el índice no se haya construido.
+class IndiceBusqueda:
+    def __init__(self, tabla, clave, campos):
+        self.tabla = tabla
+        self.clave = clave
+        self.campos = tuple(campos)
+        self._estado = None             # None, "construyendo" o "listo"
+        self._tocadas = set()           # claves escritas durante la construcción
+        self._backend = None
+        self._lock = threading.Lock()
+        self._lock_construccion = threading.RLock()
+        self._vaciar()
+
+    def _vaciar(self):
+        self._numeros = {}              # clave -> número interno vigente
+        self._claves = []               # número -> clave (None si está muerta)
+        self._valores = []              # número -> valores de los campos
+        self._largos = array("H")       # número -> largo del texto (para desempatar)
+        self._vivas = bytearray()       # número -> 1 si la fila está vigente
+        self._trigramas = {}            # trigrama -> array('i') de números
+        self._muertas = 0
+
+    def __len__(self):
+        return len(self._numeros)
+
+    def _quitar(self, clave):
+        numero = self._numeros.pop(clave, None)
+        if numero is not None:
+            self._claves[numero] = None
+            self._valores[numero] = None
+            self._vivas[numero] = 0
+            self._muertas += 1
+
+    def _agregar(self, clave, valores):
+        self._quitar(clave)
+        numero = len(self._claves)
+        conjunto, largo = _trigramas_de(valores)
+        self._numeros[clave] = numero
+        self._claves.append(clave)
+        self._valores.append(tuple(valores))
+        self._largos.append(largo)
+        self._vivas.append(1)
+        listas = self._trigramas
+        for trigrama in conjunto:
+            lista = listas.get(trigrama)
+            if lista is None:
+                lista = listas[trigrama] = array("i")
+            lista.append(numero)
+
+    # Rearma las listas solo con las filas vivas
+    def _compactar(self):
+        vivas = [(clave, self._valores[numero]) for clave, numero in self._numeros.items()]
+        self._vaciar()
+        for clave, valores in vivas:
+            self._agregar(clave, valores)
+
+    def _compactar_si_corresponde(self):
+        if self._muertas > 1000 and self._muertas > COMPACTAR * len(self._claves):
+            self._compactar()
+
+    # ==============================
+    # CONSTRUCCIÓN
+    # ==============================
+    # Lee la tabla por bloques. Las filas escritas mientras tanto (guardar o
+    # eliminar desde otro hilo) no se pisan con lo leído, que puede ser más
+    # antiguo. Devuelve la cantidad de filas indexadas, o None si falla.
+    @medir("busqueda.construir")
+    def construir(self):
+        with self._lock_construccion:
+            with self._lock:
+                self._vaciar()
+                self._tocadas = set()
+                self._estado = "construyendo"
+                self._backend = conexion.get_backend()
+
+            connection = get_connection()
+            if not connection:
+                with self._lock:
+                    self._estado = None
+                return None
+
+            cursor = None
+            try:
+                cursor = connection.cursor()
+                cursor.arraysize = TAMANO_LOTE
+                cursor.execute(f"SELECT {self.clave}, {', '.join(self.campos)} FROM {self.tabla}")
+                while True:
+                    filas = cursor.fetchmany(TAMANO_LOTE)
+                    if not filas:
+                        break
+                    with self._lock:
+                        for clave, *valores in filas:
+                            if clave not in self._tocadas:
+                                self._agregar(clave, valores)
+            except DatabaseError as e:
+                print(f"Error al construir el índice de {self.tabla}:", mensaje_error(e))
+                with self._lock:
+                    self._vaciar()
+                    self._estado = None
+                return None
+            finally:
+                if cursor:
+                    cursor.close()
+                connection.close()
+
+            with self._lock:
+                self._estado = "listo"
+                self._tocadas = set()
+                self._compactar_si_corresponde()
+                return len(self._numeros)
+
+    # Construye el índice si aún no existe o si se cambió de backend
+    def preparar(self):
+        if self._estado == "listo" and self._backend is conexion.get_backend():
+            return True
+        with self._lock_construccion:
+            if self._estado == "listo" and self._backend is conexion.get_backend():
+                return True
+            return self.construir() is not None
+
+    def descartar(self):
+        with self._lock:
+            self._vaciar()
+            self._estado = None
+
+    # ==============================
+    # ACTUALIZACIÓN
+    # ==============================
+    # "datos" es un objeto Empleado/Cliente o un diccionario de binds
+    def guardar(self, datos):
+        if isinstance(datos, dict):
+            clave, valores = datos[self.clave], [datos.get(campo) for campo in self.campos]
+        else:
+            clave, valores = getattr(datos, self.clave), [getattr(datos, campo) for campo in self.campos]
+        with self._lock:
+            if self._estado is None:
+                return
+            if self._estado == "construyendo":
+                self._tocadas.add(clave)
+            self._agregar(clave, valores)
+            self._compactar_si_corresponde()
+
+    def eliminar(self, clave):
+        with self._lock:
+            if self._estado is None:
+                return
+            if self._estado == "construyendo":
+                self._tocadas.add(clave)
+            self._quitar(clave)
+            self._compactar_si_corresponde()
+
+    # ==============================
+    # BÚSQUEDA
+    # ==============================
+    # Números de las filas con al menos "requeridos" trigramas de la
+    # consulta, los "cuantos" mejores por (coincidencias, largo más corto),
+    # con su cantidad de coincidencias.
+    def _mejores_numpy(self, listas, requeridos, cuantos):
+        vistas = [np.frombuffer(lista, dtype=np.int32) for lista in listas]
+        if not vistas:
+            return []
+        conteo = np.bincount(np.concatenate(vistas))
+        del vistas      # sin vistas abiertas los array('i') pueden volver a crecer
+        candidatas = np.flatnonzero(conteo >= requeridos)
+        candidatas = candidatas[np.frombuffer(self._vivas, dtype=np.uint8)[candidatas] == 1]
+        conteo = conteo[candidatas]
+        largos = np.frombuffer(self._largos, dtype=np.uint16)[candidatas]
+        orden = conteo * 65536 - largos
+        if len(candidatas) > cuantos:
+            elegidas = np.argpartition(-orden, cuantos - 1)[:cuantos]
+            candidatas, conteo = candidatas[elegidas], conteo[elegidas]
+        return list(zip(candidatas.tolist(), conteo.tolist()))
+
+    def _mejores_counter(self, listas, requeridos, cuantos):
+        conteo = Counter(chain.from_iterable(listas))
+        largos, vivas = self._largos, self._vivas
+        return heapq.nlargest(
+            cuantos,
+            ((numero, n) for numero, n in conteo.items() if n >= requeridos and vivas[numero]),
+            key=lambda par: (par[1], -largos[par[0]])
+        )
+
+    # Devuelve hasta "limite" diccionarios {clave, campos..., puntaje}, el
+    # mejor primero. puntaje va de MINIMO a 1 + BONO_PREFIJO.
+    @medir("busqueda.buscar")
+    def buscar(self, texto, limite=LIMITE, minimo=MINIMO):
+        consulta_palabras = palabras(texto)
+        if not consulta_palabras or not self.preparar():
+            return []
+        consulta, _ = _trigramas_de([texto])
+        total = len(consulta)
+        requeridos = max(1, math.ceil(total * minimo - 1e-9))
+        # se piden de más porque el bono de prefijo puede cambiar el orden
+        cuantos = limite * 4
+
+        with self._lock:
+            listas = [self._trigramas[t] for t in consulta if t in self._trigramas]
+            mejores = self._mejores_numpy if np is not None else self._mejores_counter
+            elegidas = []
+            for numero, coincidencias in mejores(listas, requeridos, cuantos):
+                clave = self._claves[numero]
+                valores = self._valores[numero]
+                puntaje = coincidencias / total
+                palabras_fila = [p for valor in valores for p in palabras(valor)]
+                if all(any(p.startswith(c) for p in palabras_fila) for c in consulta_palabras):
+                    puntaje += BONO_PREFIJO
+                elegidas.append((-puntaje, self._largos[numero], clave, valores))
+
+        resultados = []
+        for puntaje, _, clave, valores in heapq.nsmallest(limite, elegidas):
+            fila = {self.clave: clave, **dict(zip(self.campos, valores))}
+            fila["puntaje"] = round(-puntaje, 3)
+            resultados.append(fila)
+        return resultados
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "estado": self._estado or "sin_construir",
+                "filas": len(self._numeros),
+                "muertas": self._muertas,
+                "trigramas": len(self._trigramas)
+            }
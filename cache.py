@@ -0,0 +1,76 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+# Valores por defecto de los caché de lectura
+CACHE_MAXIMO = 10000       # entradas por caché
+CACHE_TTL = 300            # s que vive una entrada encontrada
+CACHE_TTL_NEGATIVO = 30    # s que vive un "no encontrado"
+
+
+# ==============================
+# CACHÉ LRU CON EXPIRACIÓN
+# ==============================
+# Caché en memoria con desalojo LRU por tamaño, expiración por TTL y
+# caché negativo (se recuerda que una clave no existe). Es seguro entre hilos.
+class CacheLRU:
+    def __init__(self, maximo=CACHE_MAXIMO, ttl=CACHE_TTL, ttl_negativo=CACHE_TTL_NEGATIVO):
+        self.maximo = maximo
+        self.ttl = ttl
+        self.ttl_negativo = ttl_negativo
+        self._datos = OrderedDict()     # clave -> (valor, vence)
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expiradas = 0
+
+    # Devuelve (encontrado, valor). encontrado=True con valor None
+    # significa que está en caché que la clave no existe.
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return False, None
+            valor, vence = entrada
+            if vence < time.monotonic():
+                del self._datos[clave]
+                self.expiradas += 1
+                self.fallos += 1
+                return False, None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+        # se entrega una copia para que modificar el objeto no altere el caché
+        return True, copy.copy(valor)
+
+    def guardar(self, clave, valor):
+        ttl = self.ttl if valor is not None else self.ttl_negativo
+        with self._lock:
+            self._datos[clave] = (copy.copy(valor), time.monotonic() + ttl)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self, clave):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._datos),
+                "maximo": self.maximo,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "expiradas": self.expiradas,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0
+            }
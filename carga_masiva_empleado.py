@@ -0,0 +1,207 @@
+# Carga masiva de empleados desde CSV o JSONL usando array DML.
+#
+# Uso: python carga_masiva_empleado.py archivo.csv [--lote 1000] [--rechazos rechazos.csv]
+#
+# El archivo debe traer las columnas de la tabla empleado
+# (rut_empleado, nombre, direccion, telefono, email, fecha_inicio,
+# salario, codigo_cargo, id_departamento). Las filas que fallan (incluidas
+# las líneas JSONL mal formadas) se escriben al archivo de rechazos junto
+# con el error y la carga continúa.
+# Los RUT se normalizan ("12.345.678-k" -> "12345678-K") y se validan por
+# lote antes del INSERT; los inválidos van directo a rechazos.
+import argparse
+import csv
+import time
+from datetime import date, datetime
+
+import auditoria
+from archivos import FilaInvalida, leer_filas
+from conexion import DatabaseError, get_connection, mensaje_error
+from instrumentacion import medir
+from programa_crud_empleado import INSERT_EMPLEADO, cache_empleados, indice_empleados
+from referencias import validar_empleado
+from validacion_rut import normalizar_ruts
+
+COLUMNAS = [
+    "rut_empleado", "nombre", "direccion",
+    "telefono", "email", "fecha_inicio",
+    "salario", "codigo_cargo", "id_departamento"
+]
+TAMANO_LOTE = 1000
+
+
+def _texto(valor):
+    if valor is None:
+        return None
+    valor = str(valor).strip()
+    return valor or None
+
+
+def _fecha(valor):
+    if valor is None or isinstance(valor, date):
+        return valor
+    valor = str(valor).strip()
+    if not valor:
+        return None
+    return datetime.strptime(valor, "%Y-%m-%d").date()
+
+
+def _numero(valor, tipo):
+    if valor is None or str(valor).strip() == "":
+        return None
+    return tipo(valor)
+
+
+# Convierte una fila del archivo a los binds del INSERT.
+# Lanza ValueError si algún campo no tiene el formato esperado.
+def convertir_fila(fila):
+    return {
+        "rut_empleado": _texto(fila.get("rut_empleado")),
+        "nombre": _texto(fila.get("nombre")),
+        "direccion": _texto(fila.get("direccion")),
+        "telefono": _texto(fila.get("telefono")),
+        "email": _texto(fila.get("email")),
+        "fecha_inicio": _fecha(fila.get("fecha_inicio")),
+        "salario": _numero(fila.get("salario"), float),
+        "codigo_cargo": _numero(fila.get("codigo_cargo"), int),
+        "id_departamento": _numero(fila.get("id_departamento"), int)
+    }
+
+
+# ==============================
+# RECHAZOS
+# ==============================
+class ArchivoRechazos:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.archivo = None
+        self.writer = None
+        self.total = 0
+
+    def escribir(self, numero_fila, fila, mensaje):
+        if self.writer is None:
+            self.archivo = open(self.ruta, "w", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.archivo)
+            self.writer.writerow(["fila"] + COLUMNAS + ["error"])
+        valores = [fila.get(col) if fila else None for col in COLUMNAS]
+        self.writer.writerow([numero_fila] + valores + [mensaje])
+        self.total += 1
+
+    def cerrar(self):
+        if self.archivo:
+            self.archivo.close()
+
+
+# ==============================
+# CARGA
+# ==============================
+def _insertar_lote(connection, lote, rechazos):
+    # todos los RUT del lote se validan de una vez; los inválidos no se envían
+    ruts = normalizar_ruts([binds["rut_empleado"] for _, _, binds in lote])
+    validos = []
+    for (numero_fila, fila, binds), rut in zip(lote, ruts):
+        if rut is None:
+            rechazos.escribir(numero_fila, fila, f"RUT inválido: {binds['rut_empleado']}")
+        else:
+            binds["rut_empleado"] = rut
+            validos.append((numero_fila, fila, binds))
+    lote = validos
+    if not lote:
+        return 0
+
+    cursor = connection.cursor()
+    try:
+        cursor.executemany(INSERT_EMPLEADO, [binds for _, _, binds in lote], batcherrors=True)
+        errores = cursor.getbatcherrors()
+        for error in errores:
+            numero_fila, fila, _ = lote[error.offset]
+            rechazos.escribir(numero_fila, fila, error.message)
+        connection.commit()
+        # los RUT nuevos pueden estar en caché como "no encontrado"
+        fallidas = {error.offset for error in errores}
+        for i, (_, _, binds) in enumerate(lote):
+            cache_empleados.invalidar(binds["rut_empleado"])
+            if i not in fallidas:
+                indice_empleados.guardar(binds)
+                auditoria.registrar(auditoria.CREAR, "empleado", binds["rut_empleado"], "carga masiva")
+        return len(lote) - len(errores)
+    except DatabaseError as e:
+        # Error que afecta al lote completo (no por fila): se rechaza todo el lote
+        connection.rollback()
+        for numero_fila, fila, _ in lote:
+            rechazos.escribir(numero_fila, fila, mensaje_error(e))
+        return 0
+    finally:
+        cursor.close()
+
+
+@medir("empleado.carga_masiva")
+def cargar_empleados(ruta, tamano_lote=TAMANO_LOTE, ruta_rechazos=None):
+    connection = get_connection()
+    if not connection:
+        return None
+
+    rechazos = ArchivoRechazos(ruta_rechazos or ruta + ".rechazos.csv")
+    leidas = 0
+    insertadas = 0
+    inicio = time.perf_counter()
+    try:
+        lote = []
+        for numero_fila, fila in enumerate(leer_filas(ruta, errores=True), start=1):
+            leidas += 1
+            if isinstance(fila, FilaInvalida):
+                rechazos.escribir(numero_fila, None, fila.mensaje)
+                continue
+            try:
+                binds = convertir_fila(fila)
+            except (ValueError, TypeError) as e:
+                rechazos.escribir(numero_fila, fila, f"Formato inválido: {e}")
+                continue
+            # claves foráneas contra el caché de referencias: no viaja al executemany
+            error = validar_empleado(binds["codigo_cargo"], binds["id_departamento"])
+            if error:
+                rechazos.escribir(numero_fila, fila, error)
+                continue
+            lote.append((numero_fila, fila, binds))
+            if len(lote) >= tamano_lote:
+                insertadas += _insertar_lote(connection, lote, rechazos)
+                lote = []
+        if lote:
+            insertadas += _insertar_lote(connection, lote, rechazos)
+    finally:
+        rechazos.cerrar()
+        connection.close()
+
+    segundos = time.perf_counter() - inicio
+    resultado = {
+        "leidas": leidas,
+        "insertadas": insertadas,
+        "rechazadas": rechazos.total,
+        "segundos": segundos,
+        "filas_por_segundo": leidas / segundos if segundos > 0 else 0.0,
+        "archivo_rechazos": rechazos.ruta if rechazos.total else None
+    }
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga masiva de empleados desde CSV o JSONL.")
+    parser.add_argument("archivo", help="archivo .csv o .jsonl")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="filas por executemany")
+    parser.add_argument("--rechazos", help="archivo CSV donde se escriben las filas rechazadas")
+    args = parser.parse_args()
+
+    resultado = cargar_empleados(args.archivo, args.lote, args.rechazos)
+    if resultado is None:
+        return
+
+    print(f"Filas leídas: {resultado['leidas']}")
+    print(f"Empleados insertados: {resultado['insertadas']}")
+    print(f"Filas rechazadas: {resultado['rechazadas']}")
+    if resultado["archivo_rechazos"]:
+        print(f"Detalle de rechazos en: {resultado['archivo_rechazos']}")
+    print(f"Tiempo: {resultado['segundos']:.2f} s ({resultado['filas_por_segundo']:.0f} filas/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,203 @@
-import oracledb
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
 
-def get_connection():
+import instrumentacion
+
+# ==============================
+# BACKEND
+# ==============================
+# Los programas CRUD obtienen sus conexiones aquí; el backend concreto se
+# elige por configuración:
+#   CRUD_BACKEND=oracle (por defecto) -> backend_oracle.BackendOracle
+#   CRUD_BACKEND=sqlite               -> backend_sqlite.BackendSQLite
+#   CRUD_SQLITE_RUTA=:memory:         -> archivo de la base SQLite
+#
+# Un backend tiene: nombre, get_connection() (conexión con la API de
+# oracledb; close() la devuelve al pool), cerrar(), errores_integridad
+# y errores_bd (tuplas de excepciones).
+BACKEND = os.environ.get("CRUD_BACKEND", "oracle")
+SQLITE_RUTA = os.environ.get("CRUD_SQLITE_RUTA", ":memory:")
+
+_backend = None
+_backend_async = None
+_backend_lock = threading.Lock()
+_antes_de_cerrar = []
+_equivalentes_sqlite = {}
+
+
+def _crear_backend(nombre, **opciones):
+    if nombre == "oracle":
+        from backend_oracle import BackendOracle
+        return BackendOracle(**opciones)
+    if nombre == "sqlite":
+        from backend_sqlite import BackendSQLite, registrar_equivalente
+        for sql_oracle, sql_sqlite in _equivalentes_sqlite.items():
+            registrar_equivalente(sql_oracle, sql_sqlite)
+        opciones.setdefault("ruta", SQLITE_RUTA)
+        return BackendSQLite(**opciones)
+    raise ValueError(f"Backend desconocido: {nombre}")
+
+
+# Sentencia de Oracle sin traducción directa a SQLite (ej. MERGE) y su
+# equivalente. Los programas la declaran aquí y se entrega al backend SQLite
+# cuando se selecciona, así no dependen de backend_sqlite.
+def equivalente_sqlite(sql_oracle, sql_sqlite):
+    _equivalentes_sqlite[sql_oracle] = sql_sqlite
+    if _backend is not None and _backend.nombre == "sqlite":
+        from backend_sqlite import registrar_equivalente
+        registrar_equivalente(sql_oracle, sql_sqlite)
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _crear_backend(BACKEND)
+    return _backend
+
+
+# True si hay un backend abierto (get_backend no crea uno nuevo)
+def hay_backend():
+    return _backend is not None
+
+
+# Registra una función que se llama antes de cerrar o cambiar el backend
+# (por ejemplo, para escribir la auditoría pendiente en la base actual)
+def antes_de_cerrar(funcion):
+    _antes_de_cerrar.append(funcion)
+
+
+def _avisar_cierre():
+    if _backend is not None:
+        for funcion in _antes_de_cerrar:
+            funcion()
+
+
+# Cambia el backend en uso (cierra el anterior). Ej: usar_backend("sqlite", ruta="prueba.db")
+def usar_backend(nombre, **opciones):
+    global _backend, _backend_async, BACKEND
+    _avisar_cierre()
+    with _backend_lock:
+        if _backend is not None:
+            _backend.cerrar()
+        _backend = _crear_backend(nombre, **opciones)
+        _backend_async = None
+        BACKEND = nombre
+    return _backend
+
+
+def cerrar_backend():
+    global _backend, _backend_async
+    _avisar_cierre()
+    with _backend_lock:
+        if _backend is not None:
+            _backend.cerrar()
+            _backend = None
+        # el backend async de SQLite usa al síncrono; sin él ya no sirve.
+        # Para cerrar el pool async de Oracle usar cerrar_backend_async().
+        _backend_async = None
+
+
+# ==============================
+# BACKEND ASÍNCRONO
+# ==============================
+# Mismo backend configurado, con la API async de oracledb:
+#   oracle -> backend_oracle.BackendOracleAsync (pool asíncrono propio)
+#   sqlite -> backend_sqlite.BackendSQLiteAsync (sobre el backend síncrono,
+#             así ambas API ven la misma base)
+def get_backend_async():
+    global _backend_async
+    if _backend_async is None:
+        if BACKEND == "oracle":
+            from backend_oracle import BackendOracleAsync
+            _backend_async = BackendOracleAsync()
+        elif BACKEND == "sqlite":
+            from backend_sqlite import BackendSQLiteAsync
+            _backend_async = BackendSQLiteAsync(get_backend())
+        else:
+            raise ValueError(f"Backend desconocido: {BACKEND}")
+    return _backend_async
+
+
+async def cerrar_backend_async():
+    global _backend_async
+    if _backend_async is not None:
+        backend, _backend_async = _backend_async, None
+        await backend.cerrar()
+
+
+# ==============================
+# ERRORES
+# ==============================
+# Se usan en los except de los programas: except DatabaseError as e:
+# Incluyen las excepciones de todos los backends instalados.
+def _errores(atributo):
+    clases = []
     try:
-        dsn = oracledb.makedsn("195.26.252.168", 1521, service_name="XEPDB1")
-        conn = oracledb.connect(
-            user="PAOLA_TORRENT",
-            password="12345",
-            dsn=dsn
-        )
-        return conn
-    except oracledb.DatabaseError as e:
-        error, = e.args
-        print(f"Error al conectar con la base de datos: {error.message}")
+        import oracledb
+        clases.append(getattr(oracledb, atributo))
+    except ImportError:
+        pass
+    import sqlite3
+    clases.append(getattr(sqlite3, "Error" if atributo == "DatabaseError" else atributo))
+    return tuple(clases)
+
+
+IntegrityError = _errores("IntegrityError")
+DatabaseError = _errores("DatabaseError")
+
+
+def mensaje_error(e):
+    error = e.args[0] if e.args else e
+    return getattr(error, "message", None) or str(e)
+
+
+# ==============================
+# CONEXIONES
+# ==============================
+def get_connection():
+    backend = get_backend()
+    if not instrumentacion.ACTIVA:
+        return backend.get_connection()
+    inicio = time.perf_counter()
+    connection = backend.get_connection()
+    if connection is None:
         return None
+    return instrumentacion.envolver_conexion(connection, time.perf_counter() - inicio)
+
+
+# Uso: with conexion() as connection: ...
+# Si no se pudo obtener una sesión entrega None.
+@contextmanager
+def conexion():
+    connection = get_connection()
+    try:
+        yield connection
+    finally:
+        if connection:
+            connection.close()
+
+
+async def get_connection_async():
+    backend = get_backend_async()
+    if not instrumentacion.ACTIVA:
+        return await backend.get_connection()
+    inicio = time.perf_counter()
+    connection = await backend.get_connection()
+    if connection is not None:
+        instrumentacion.registrar_conexion(time.perf_counter() - inicio)
+    return connection
+
+
+# Uso: async with conexion_async() as connection: ...
+@asynccontextmanager
+async def conexion_async():
+    connection = await get_connection_async()
+    try:
+        yield connection
+    finally:
+        if connection:
+            await connection.close()
@@ -0,0 +1,400 @@
+# API asyncio de empleado, cliente y usuario.
+#
+# Mismas operaciones y valores de retorno que los programas CRUD, pero con
+# await: mientras una consulta espera a la base el event loop atiende otras
+# solicitudes, sin un hilo por solicitud. Usa conexion.get_backend_async()
+# (pool asíncrono de oracledb, o el backend SQLite local en un pool de hilos)
+# y comparte los caché de lectura con la API síncrona.
+#
+# Ejemplo:
+#   import asyncio, crud_async
+#   emp = asyncio.run(crud_async.read_empleado("12345678-5"))
+#
+# A diferencia de los menús, solo se imprimen los errores.
+import auditoria
+from autenticacion import get_servicio
+from conexion import DatabaseError, IntegrityError, get_connection_async, mensaje_error
+from filas import usar_clase
+from instrumentacion import medir
+from modelo import ACTUALIZADO, CONFLICTO
+from programa_crud_cliente_exception import INSERT_CLIENTE, Cliente, cache_clientes, indice_clientes
+from programa_crud_empleado import (
+    INSERT_EMPLEADO, TAMANO_PAGINA, Empleado, cache_empleados, consulta_pagina,
+    indice_empleados
+)
+from programa_crud_usuario import (
+    DESACTIVAR_USUARIO, INSERT_USUARIO, LOGIN_CLAVE_INCORRECTA, LOGIN_INACTIVO,
+    LOGIN_NO_ENCONTRADO, LOGIN_OK
+)
+from referencias import validar_rol
+from validacion_rut import normalizar_rut
+
+# Por clase de modelo: INSERT, caché de lectura e índice de búsqueda
+_INSERTS = {Empleado: INSERT_EMPLEADO, Cliente: INSERT_CLIENTE}
+_CACHES = {Empleado: cache_empleados, Cliente: cache_clientes}
+_INDICES = {Empleado: indice_empleados, Cliente: indice_clientes}
+
+
+# ==============================
+# CREAR / ACTUALIZAR (Empleado o Cliente)
+# ==============================
+@medir(lambda obj: f"{obj.TABLA}.create")
+async def crear(obj):
+    error = obj.normalizar_ruts() or obj.validar_referencias()
+    if error:
+        print(f"Error al crear {obj.TABLA}:", error)
+        return False
+
+    connection = await get_connection_async()
+    if not connection:
+        return False
+
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        await cursor.execute(_INSERTS[type(obj)], obj.binds())
+        await connection.commit()
+        obj.marcar_guardado()
+        _CACHES[type(obj)].invalidar(getattr(obj, obj.CLAVE))
+        _INDICES[type(obj)].guardar(obj)
+        auditoria.registrar(auditoria.CREAR, obj.TABLA, getattr(obj, obj.CLAVE))
+        return True
+    except IntegrityError as e:
+        print(f"Error de integridad al crear {obj.TABLA}:", mensaje_error(e))
+    except DatabaseError as e:
+        print(f"Error al crear {obj.TABLA}:", mensaje_error(e))
+    finally:
+        if cursor:
+            cursor.close()
+        await connection.close()
+    return False
+
+
+# Solo columnas modificadas y condicional a la versión leída, como
+# Empleado.update / Cliente.update (obj.conflicto indica un conflicto)
+@medir(lambda obj: f"{obj.TABLA}.update")
+async def actualizar(obj):
+    columnas = obj.campos_modificados()
+    if columnas is None:
+        columnas = obj.COLUMNAS[1:]
+    elif not columnas:
+        return True
+
+    error = obj.normalizar_ruts(columnas) or obj.validar_referencias()
+    if error:
+        print(f"Error al actualizar {obj.TABLA}:", error)
+        return False
+
+    connection = await get_connection_async()
+    if not connection:
+        return False
+
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        clave = getattr(obj, obj.CLAVE)
+        sql, binds, nueva = obj.preparar_update(cursor, columnas)
+        await cursor.execute(sql, binds)
+        if cursor.rowcount or nueva is None:
+            resultado = obj.resultado_update(cursor.rowcount, nueva)
+        else:
+            await cursor.execute(obj.sql_version(), {"clave": clave})
+            fila = await cursor.fetchone()
+            resultado = obj.resultado_update(0, nueva, fila[0] if fila else None)
+        if resultado == ACTUALIZADO:
+            await connection.commit()
+            obj.marcar_guardado()
+            _CACHES[type(obj)].invalidar(clave)
+            _INDICES[type(obj)].guardar(obj)
+            auditoria.registrar(auditoria.ACTUALIZAR, obj.TABLA, clave, ", ".join(columnas))
+            return True
+        _CACHES[type(obj)].invalidar(clave)
+        if resultado == CONFLICTO:
+            print(f"El {obj.TABLA} fue modificado por otro usuario desde que se leyó.")
+        else:
+            print(f"No se encontró el {obj.TABLA} para actualizar.")
+    except DatabaseError as e:
+        print(f"Error al actualizar {obj.TABLA}:", mensaje_error(e))
+    finally:
+        if cursor:
+            cursor.close()
+        await connection.close()
+    return False
+
+
+# ==============================
+# LEER / ELIMINAR
+# ==============================
+async def _leer(clase, clave):
+    clave = normalizar_rut(clave)
+    if clave is None:
+        print("RUT inválido.")
+        return None
+    cache = _CACHES[clase]
+    encontrado, obj = cache.obtener(clave)
+    if encontrado:
+        return obj
+
+    connection = await get_connection_async()
+    if not connection:
+        return None
+
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        columnas = ", ".join(clase.COLUMNAS + ("version",))
+        await cursor.execute(
+            f"SELECT {columnas} FROM {clase.TABLA} WHERE {clase.CLAVE} = :clave",
+            {"clave": clave}
+        )
+        usar_clase(cursor, clase)
+        obj = await cursor.fetchone()
+        cache.guardar(clave, obj)
+        return obj
+    except DatabaseError as e:
+        print(f"Error al leer {clase.TABLA}:", mensaje_error(e))
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        await connection.close()
+
+
+async def _eliminar(clase, clave):
+    clave = normalizar_rut(clave)
+    if clave is None:
+        print("RUT inválido.")
+        return False
+
+    connection = await get_connection_async()
+    if not connection:
+        return False
+
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        await cursor.execute(f"DELETE FROM {clase.TABLA} WHERE {clase.CLAVE} = :clave", {"clave": clave})
+        if cursor.rowcount == 0:
+            print(f"No se encontró el {clase.TABLA} para eliminar.")
+        else:
+            await connection.commit()
+            _CACHES[clase].invalidar(clave)
+            _INDICES[clase].eliminar(clave)
+            auditoria.registrar(auditoria.ELIMINAR, clase.TABLA, clave)
+            return True
+    except DatabaseError as e:
+        print(f"Error al eliminar {clase.TABLA}:", mensaje_error(e))
+    finally:
+        if cursor:
+            cursor.close()
+        await connection.close()
+    return False
+
+
+@medir("empleado.read")
+async def read_empleado(rut_empleado):
+    return await _leer(Empleado, rut_empleado)
+
+
+@medir("empleado.delete")
+async def delete_empleado(rut_empleado):
+    return await _eliminar(Empleado, rut_empleado)
+
+
+@medir("cliente.read")
+async def read_cliente(rut_cliente):
+    return await _leer(Cliente, rut_cliente)
+
+
+@medir("cliente.delete")
+async def delete_cliente(rut_cliente):
+    return await _eliminar(Cliente, rut_cliente)
+
+
+# Misma paginación por clave que programa_crud_empleado.pagina_empleados
+@medir("empleado.listar")
+async def pagina_empleados(tamano_pagina=TAMANO_PAGINA, despues_de=None):
+    connection = await get_connection_async()
+    if not connection:
+        return [], None
+
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        cursor.arraysize = tamano_pagina
+        cursor.prefetchrows = tamano_pagina + 1
+        await cursor.execute(*consulta_pagina(tamano_pagina, despues_de))
+        rows = await cursor.fetchall()
+        siguiente = (rows[-1][1], rows[-1][0]) if len(rows) == tamano_pagina else None
+        return rows, siguiente
+    except DatabaseError as e:
+        print("Error al listar empleados:", mensaje_error(e))
+        return [], None
+    finally:
+        if cursor:
+            cursor.close()
+        await connection.close()
+
+
+# ==============================
+# USUARIOS
+# ==============================
+# El hash y la verificación corren en el pool de procesos de autenticación;
+# la sesión solo se toma para la consulta, no mientras se calcula bcrypt.
+# Los resultados son los de la versión síncrona (None si la base falló).
+@medir("usuario.create")
+async def registrar_usuario(rut, password, codigo_rol):
+    rut = normalizar_rut(rut)
+    if rut is None:
+        print("Error al crear usuario: RUT inválido.")
+        return False
+
+    # rol inexistente: se rechaza antes de calcular bcrypt, como la versión síncrona
+    error = validar_rol(codigo_rol)
+    if error:
+        print(f"Error al crear usuario: {error}")
+        return False
+
+    try:
+        password_hash = await get_servicio().hashear_async(password)
+    except TimeoutError as e:
+        print(f"Error al crear usuario: {e}")
+        return None
+
+    connection = await get_connection_async()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    try:
+        await cursor.execute(INSERT_USUARIO, {'rut': rut, 'hash': password_hash, 'rol': codigo_rol})
+        await connection.commit()
+        auditoria.registrar(auditoria.CREAR, "usuario", rut, f"rol {codigo_rol}")
+        return True
+    except IntegrityError:
+        print("El RUT ingresado ya existe.")
+        return False
+    except DatabaseError as e:
+        print(f"Error al crear usuario: {e}")
+        return None
+    finally:
+        cursor.close()
+        await connection.close()
+
+
+async def _rehash_si_corresponde(rut, password, stored_hash):
+    servicio = get_servicio()
+    if not servicio.necesita_rehash(stored_hash):
+        return
+    try:
+        nuevo_hash = await servicio.hashear_async(password)
+    except TimeoutError as e:
+        print(f"No se pudo actualizar el hash de la contraseña: {e}")
+        return
+
+    connection = await get_connection_async()
+    if not connection:
+        return
+    cursor = connection.cursor()
+    try:
+        await cursor.execute("""
+            UPDATE usuario SET password_hash = :nuevo
+            WHERE rut_usuario = :rut AND password_hash = :anterior
+        """, {'nuevo': nuevo_hash, 'rut': rut, 'anterior': stored_hash})
+        await connection.commit()
+    except DatabaseError as e:
+        print(f"No se pudo actualizar el hash de la contraseña: {e}")
+    finally:
+        cursor.close()
+        await connection.close()
+
+
+# Devuelve una de las constantes LOGIN_*, o None si hubo un error.
+@medir("usuario.login")
+async def autenticar_usuario(rut, password):
+    rut = normalizar_rut(rut)
+    if rut is None:
+        return LOGIN_NO_ENCONTRADO
+
+    connection = await get_connection_async()
+    if not connection:
+        return None
+
+    cursor = connection.cursor()
+    try:
+        await cursor.execute(
+            "SELECT password_hash, estado FROM usuario WHERE rut_usuario = :rut",
+            {'rut': rut}
+        )
+        result = await cursor.fetchone()
+    except DatabaseError as e:
+        print(f"Error al autenticar: {e}")
+        return None
+    finally:
+        cursor.close()
+        await connection.close()
+
+    if not result:
+        return LOGIN_NO_ENCONTRADO
+    stored_hash, estado = result
+    if estado == 'I':
+        return LOGIN_INACTIVO
+    try:
+        if not await get_servicio().verificar_async(password, stored_hash):
+            return LOGIN_CLAVE_INCORRECTA
+    except TimeoutError as e:
+        print(f"Error al autenticar: {e}")
+        return None
+    await _rehash_si_corresponde(rut, password, stored_hash)
+    return LOGIN_OK
+
+
+# Lista de (rut, rol, fecha_ingreso, estado), la más reciente primero
+@medir("usuario.listar")
+async def listar_usuarios():
+    connection = await get_connection_async()
+    if not connection:
+        return []
+
+    cursor = connection.cursor()
+    try:
+        await cursor.execute("""
+            SELECT rut_usuario, codigo_rol, fecha_ingreso, estado
+            FROM usuario
+            ORDER BY fecha_ingreso DESC
+        """)
+        return await cursor.fetchall()
+    except DatabaseError as e:
+        print(f"Error al listar usuarios: {e}")
+        return []
+    finally:
+        cursor.close()
+        await connection.close()
+
+
+@medir("usuario.desactivar")
+async def desactivar_usuario_rut(rut):
+    rut = normalizar_rut(rut)
+    if rut is None:
+        print("RUT inválido.")
+        return False
+
+    connection = await get_connection_async()
+    if not connection:
+        return False
+
+    cursor = connection.cursor()
+    try:
+        await cursor.execute(DESACTIVAR_USUARIO, {'rut': rut})
+        if cursor.rowcount == 0:
+            print("No se encontró el usuario.")
+        else:
+            await connection.commit()
+            auditoria.registrar(auditoria.DESACTIVAR, "usuario", rut)
+            return True
+    except DatabaseError as e:
+        print(f"Error al desactivar usuario: {e}")
+    finally:
+        cursor.close()
+        await connection.close()
+    return False
@@ -0,0 +1,258 @@
+# Exportación de empleado, cliente o usuario a CSV, JSONL o Parquet.
+#
+# Uso:
+#   python exportar.py empleado empleados.csv
+#   python exportar.py cliente clientes.jsonl.gz --columnas rut_cliente,razon_social
+#   python exportar.py empleado altos.parquet --where "salario > :minimo" --bind minimo=3000000
+#   python exportar.py usuario usuarios.csv.zst --formato csv --lote 10000
+#
+# Las filas se leen con fetchmany de a --lote filas y se escriben de
+# inmediato, así la memoria usada depende del tamaño del lote y no de la
+# tabla. El formato se deduce de la extensión (.csv, .jsonl, .parquet) y la
+# compresión de .gz / .zst. Parquet necesita pyarrow (comprime por dentro,
+# con gzip o zstd según --compresion) y .zst necesita zstandard.
+#
+# password_hash de usuario no se exporta.
+import argparse
+import csv
+import gzip
+import io
+import json
+import time
+from datetime import date, datetime
+
+from conexion import DatabaseError, get_connection, mensaje_error
+from instrumentacion import medir
+from programa_crud_cliente_exception import Cliente
+from programa_crud_empleado import Empleado
+
+TAMANO_LOTE = 5000
+FORMATOS = ("csv", "jsonl", "parquet")
+COMPRESIONES = ("gzip", "zstd")
+
+# Columnas exportables y orden por clave de cada tabla
+TABLAS = {
+    "empleado": (Empleado.COLUMNAS, Empleado.CLAVE),
+    "cliente": (Cliente.COLUMNAS, Cliente.CLAVE),
+    "usuario": (("rut_usuario", "codigo_rol", "fecha_ingreso", "estado"), "rut_usuario"),
+}
+
+# Tipos Parquet; las columnas que no están aquí son texto
+TIPOS_PARQUET = {
+    "fecha_inicio": "date32",
+    "fecha_ingreso": "timestamp",
+    "salario": "float64",
+    "codigo_cargo": "int64",
+    "id_departamento": "int64",
+    "cantidad_trabajadores": "int64",
+}
+
+
+# ==============================
+# FORMATO Y COMPRESIÓN
+# ==============================
+def deducir_formato(ruta):
+    nombre = ruta.lower()
+    compresion = None
+    if nombre.endswith(".gz"):
+        compresion, nombre = "gzip", nombre[:-3]
+    elif nombre.endswith(".zst"):
+        compresion, nombre = "zstd", nombre[:-4]
+    for formato in FORMATOS:
+        if nombre.endswith("." + formato):
+            return formato, compresion
+    return None, compresion
+
+
+def _abrir_binario(ruta, compresion):
+    if compresion == "gzip":
+        return gzip.open(ruta, "wb", compresslevel=6)
+    if compresion == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(ruta, "wb"), closefd=True)
+    return open(ruta, "wb")
+
+
+def _valor_json(valor):
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    raise TypeError(f"No se puede convertir a JSON: {type(valor).__name__}")
+
+
+# ==============================
+# ESCRITORES
+# ==============================
+# Cada escritor recibe bloques de filas (tuplas en el orden de columnas).
+class EscritorCSV:
+    def __init__(self, ruta, columnas, compresion):
+        self._binario = _abrir_binario(ruta, compresion)
+        self._texto = io.TextIOWrapper(self._binario, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._texto)
+        self._writer.writerow(columnas)
+
+    def escribir(self, filas):
+        self._writer.writerows(filas)
+
+    def cerrar(self):
+        self._texto.close()
+
+
+class EscritorJSONL:
+    def __init__(self, ruta, columnas, compresion):
+        self._binario = _abrir_binario(ruta, compresion)
+        self._texto = io.TextIOWrapper(self._binario, encoding="utf-8", newline="\n")
+        self._columnas = columnas
+
+    def escribir(self, filas):
+        columnas = self._columnas
+        self._texto.write("".join(
+            json.dumps(dict(zip(columnas, fila)), default=_valor_json, ensure_ascii=False) + "\n"
+            for fila in filas
+        ))
+
+    def cerrar(self):
+        self._texto.close()
+
+
+# Un row group por bloque leído
+class EscritorParquet:
+    def __init__(self, ruta, columnas, compresion):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        tipos = {
+            "date32": pa.date32(), "timestamp": pa.timestamp("s"),
+            "float64": pa.float64(), "int64": pa.int64()
+        }
+        self._pa = pa
+        self._columnas = columnas
+        self._esquema = pa.schema([(col, tipos.get(TIPOS_PARQUET.get(col), pa.string())) for col in columnas])
+        self._writer = pq.ParquetWriter(ruta, self._esquema, compression=compresion or "snappy")
+
+    def escribir(self, filas):
+        arreglos = [
+            self._pa.array([fila[i] for fila in filas], type=self._esquema.field(i).type)
+            for i in range(len(self._columnas))
+        ]
+        self._writer.write_table(self._pa.Table.from_arrays(arreglos, schema=self._esquema))
+
+    def cerrar(self):
+        self._writer.close()
+
+
+ESCRITORES = {"csv": EscritorCSV, "jsonl": EscritorJSONL, "parquet": EscritorParquet}
+
+
+# ==============================
+# EXPORTACIÓN
+# ==============================
+def _consulta(tabla, columnas, where):
+    _, clave = TABLAS[tabla]
+    sql = f"SELECT {', '.join(columnas)} FROM {tabla}"
+    if where:
+        sql += f" WHERE {where}"
+    return sql + f" ORDER BY {clave}"
+
+
+# Exporta la tabla y devuelve {'filas', 'segundos', 'filas_por_segundo', 'ruta'}
+# o None si hubo un error. "where" es una condición SQL con binds (:nombre)
+# cuyos valores van en "binds"; no debe armarse con datos de usuarios.
+@medir("exportar")
+def exportar(tabla, ruta, formato=None, compresion=None, columnas=None, where=None, binds=None,
+             tamano_lote=TAMANO_LOTE):
+    if tabla not in TABLAS:
+        print(f"Tabla desconocida: {tabla} (usar {', '.join(TABLAS)})")
+        return None
+    permitidas, _ = TABLAS[tabla]
+    columnas = tuple(columnas or permitidas)
+    desconocidas = [col for col in columnas if col not in permitidas]
+    if desconocidas:
+        print(f"Columnas no exportables en {tabla}: {', '.join(desconocidas)}")
+        return None
+
+    formato_ruta, compresion_ruta = deducir_formato(ruta)
+    formato = formato or formato_ruta
+    compresion = compresion or compresion_ruta
+    if formato not in FORMATOS:
+        print(f"No se reconoce el formato de {ruta} (usar --formato {'/'.join(FORMATOS)})")
+        return None
+
+    try:
+        escritor = ESCRITORES[formato](ruta, columnas, compresion)
+    except ImportError as e:
+        print(f"Falta una dependencia para exportar a {formato}"
+              f"{' con ' + compresion if compresion else ''}: {e.name}")
+        return None
+
+    connection = get_connection()
+    if not connection:
+        escritor.cerrar()
+        return None
+
+    filas = 0
+    inicio = time.perf_counter()
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        cursor.arraysize = tamano_lote
+        cursor.prefetchrows = tamano_lote + 1
+        cursor.execute(_consulta(tabla, columnas, where), binds or {})
+        while True:
+            bloque = cursor.fetchmany(tamano_lote)
+            if not bloque:
+                break
+            escritor.escribir(bloque)
+            filas += len(bloque)
+    except DatabaseError as e:
+        print(f"Error al exportar {tabla}:", mensaje_error(e))
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+        escritor.cerrar()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "filas": filas,
+        "segundos": segundos,
+        "filas_por_segundo": filas / segundos if segundos > 0 else 0.0,
+        "ruta": ruta
+    }
+
+
+# "nombre=valor"; los valores numéricos se envían como número
+def argumento_bind(texto):
+    nombre, _, valor = texto.partition("=")
+    if not nombre or not _:
+        raise argparse.ArgumentTypeError(f"Se espera nombre=valor: {texto}")
+    for tipo in (int, float):
+        try:
+            return nombre, tipo(valor)
+        except ValueError:
+            pass
+    return nombre, valor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta empleado, cliente o usuario a CSV, JSONL o Parquet.")
+    parser.add_argument("tabla", choices=tuple(TABLAS))
+    parser.add_argument("salida", help="archivo de salida (.csv, .jsonl, .parquet, con .gz o .zst opcional)")
+    parser.add_argument("--formato", choices=FORMATOS, help="si no se deduce de la extensión")
+    parser.add_argument("--compresion", choices=COMPRESIONES, help="si no se deduce de la extensión")
+    parser.add_argument("--columnas", help="lista separada por comas (por defecto todas)")
+    parser.add_argument("--where", help="condición SQL, ej. \"codigo_cargo = :cargo\"")
+    parser.add_argument("--bind", type=argumento_bind, action="append", default=[], help="valor de un bind: nombre=valor")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="filas por fetch")
+    args = parser.parse_args()
+
+    columnas = [col.strip() for col in args.columnas.split(",")] if args.columnas else None
+    resultado = exportar(args.tabla, args.salida, args.formato, args.compresion, columnas,
+                         args.where, dict(args.bind), args.lote)
+    if resultado is None:
+        return
+    print(f"Filas exportadas: {resultado['filas']} en {resultado['ruta']}")
+    print(f"Tiempo: {resultado['segundos']:.2f} s ({resultado['filas_por_segundo']:.0f} filas/s)")
+
+
+if __name__ == "__main__":
+    main()
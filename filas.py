@@ -0,0 +1,49 @@
+# Construcción de objetos a partir de filas de un cursor, por nombre de
+# columna. Se usa con subclases de modelo.Modelo.
+
+
+# Devuelve una función fila -> objeto según cursor.description. Si la
+# consulta trae la columna "version", se entrega al final (ver
+# Modelo.desde_fila). Debe llamarse después de cursor.execute().
+def rowfactory_por_nombre(cursor, clase):
+    nombres = [col[0].lower() for col in cursor.description]
+    try:
+        posiciones = [nombres.index(col) for col in clase.COLUMNAS]
+    except ValueError:
+        faltantes = [col for col in clase.COLUMNAS if col not in nombres]
+        raise ValueError(f"Faltan columnas para {clase.__name__}: {', '.join(faltantes)}")
+    if "version" in nombres:
+        posiciones.append(nombres.index("version"))
+
+    desde_fila = clase.desde_fila
+    if posiciones == list(range(len(nombres))):
+        return desde_fila
+    return lambda *row: desde_fila(*[row[i] for i in posiciones])
+
+
+# Configura el cursor para que entregue objetos de la clase.
+def usar_clase(cursor, clase):
+    cursor.rowfactory = rowfactory_por_nombre(cursor, clase)
+    return cursor
+
+
+# Generador de objetos directamente desde un cursor ya ejecutado.
+def objetos_desde_cursor(cursor, clase):
+    usar_clase(cursor, clase)
+    yield from cursor
+
+
+# Oracle admite hasta 1000 elementos en una lista IN
+MAXIMO_IN = 1000
+
+
+# Genera los objetos de la clase cuya clave está en "claves", con un SELECT
+# ... WHERE clave IN (...) por cada MAXIMO_IN claves. Los objetos traen su
+# versión, como los de read_empleado/read_cliente (van al mismo caché).
+def objetos_por_claves(cursor, clase, claves):
+    columnas = ", ".join(clase.COLUMNAS + ("version",))
+    for i in range(0, len(claves), MAXIMO_IN):
+        parte = claves[i:i + MAXIMO_IN]
+        nombres = ", ".join(f":k{j}" for j in range(len(parte)))
+        cursor.execute(f"SELECT {columnas} FROM {clase.TABLA} WHERE {clase.CLAVE} IN ({nombres})", parte)
+        yield from objetos_desde_cursor(cursor, clase)
@@ -0,0 +1,373 @@
+# Instantánea de empleado o cliente en un archivo ordenado por RUT, para
+# procesos por lote que leen millones de RUT sobre datos que cambian una vez
+# al día.
+#
+# Uso:
+#   python instantanea_rut.py empleado empleados.rut
+#   python instantanea_rut.py cliente clientes.rut
+#
+#   with InstantaneaRUT("empleados.rut") as instantanea:
+#       emp = instantanea.leer("12.345.678-5")     # Empleado o None
+#
+# Formato (enteros little-endian):
+#   cabecera   CABECERA: "CRUDRUT1", formato, largo del JSON de metadatos,
+#              filas e inicio de cada sección
+#   metadatos  JSON: tabla, columnas, tipos y formato struct del registro
+#   índice     un uint32 por fila: el número del RUT (sin dígito
+#              verificador), ordenado
+#   registros  uno de ancho fijo por fila, en el orden del índice: los
+#              números (int64 o float64, NULO_ENTERO / NaN para NULL) y
+#              luego inicio y largo de los textos de la fila en el heap y
+#              un bit por texto que es NULL
+#   heap       los textos (y fechas ISO) de cada fila en UTF-8, unidos con
+#              SEPARADOR: se decodifican con un solo decode() y split()
+#
+# El lector mapea el archivo con mmap y busca con búsqueda binaria sobre el
+# índice: solo toca las páginas que necesita y no carga el archivo. El
+# dígito verificador no se calcula: se compara con el RUT guardado. Varios
+# procesos que abren el mismo archivo comparten esas páginas (son del caché
+# de páginas del sistema). construir() escribe un archivo nuevo y lo
+# reemplaza de una vez: los lectores que ya lo tenían abierto siguen con el
+# anterior hasta que lo vuelvan a abrir.
+#
+# Los objetos traen la versión de la fila al construir: un update() sobre
+# datos que cambiaron desde entonces termina en conflicto, como con
+# read_empleado.
+import argparse
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime
+
+from conexion import DatabaseError, get_connection, mensaje_error
+from instrumentacion import medir
+from mensajes import informar
+from programa_crud_cliente_exception import Cliente
+from programa_crud_empleado import Empleado
+from validacion_rut import normalizar_rut, normalizar_ruts
+
+MAGIA = b"CRUDRUT1"
+FORMATO = 1
+CABECERA = struct.Struct("<8sHIQQQQ")   # magia, formato, largo_meta, filas, índice, registros, heap
+TAMANO_LOTE = 5000
+NULO_ENTERO = -2**63
+SEPARADOR = "\x1f"
+
+CLASES = {"empleado": Empleado, "cliente": Cliente}
+
+# Tipos de las columnas que no son texto
+TIPOS = {
+    "fecha_inicio": "fecha",
+    "salario": "real",
+    "codigo_cargo": "entero",
+    "id_departamento": "entero",
+    "cantidad_trabajadores": "entero",
+    "version": "entero",
+}
+_CODIGOS = {"real": "d", "entero": "q"}
+
+
+def _alinear(posicion):
+    return (posicion + 7) & ~7
+
+
+def _fecha(texto):
+    return date.fromisoformat(texto) if len(texto) == 10 else datetime.fromisoformat(texto)
+
+
+# ==============================
+# CONSTRUCCIÓN
+# ==============================
+def _formato_registro(tipos):
+    return "<" + "".join(_CODIGOS[tipo] for tipo in tipos if tipo in _CODIGOS) + "III"
+
+
+# Campos del registro de una fila, agregando sus textos al heap del bloque
+# ("base" es la posición del bloque en el heap completo). Devuelve None si
+# algún texto contiene SEPARADOR.
+def _campos(valores, tipos, heap, base):
+    numeros = []
+    textos = []
+    nulos = 0
+    for valor, tipo in zip(valores, tipos):
+        if tipo == "real":
+            numeros.append(float("nan") if valor is None else float(valor))
+        elif tipo == "entero":
+            numeros.append(NULO_ENTERO if valor is None else int(valor))
+        elif valor is None:
+            nulos |= 1 << len(textos)
+            textos.append("")
+        else:
+            texto = valor.isoformat() if tipo == "fecha" else str(valor)
+            if SEPARADOR in texto:
+                return None
+            textos.append(texto)
+    bloque = SEPARADOR.join(textos).encode()
+    inicio = base + len(heap)
+    heap += bloque
+    return numeros + [inicio, len(bloque), nulos]
+
+
+# Índice ordenado sin números repetidos (queda la primera fila leída) y la
+# posición de cada uno entre los registros escritos
+def _ordenar(claves):
+    unicas, posiciones = array("I"), []
+    for i in sorted(range(len(claves)), key=claves.__getitem__):
+        if unicas and unicas[-1] == claves[i]:
+            continue
+        unicas.append(claves[i])
+        posiciones.append(i)
+    return unicas, posiciones
+
+
+def _copiar_registros(registros, archivo, tamano, posiciones):
+    registros.flush()
+    registros.seek(0)
+    if posiciones is None:
+        shutil.copyfileobj(registros, archivo)
+        return
+    with mmap.mmap(registros.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        for i in posiciones:
+            archivo.write(mapa[i * tamano:(i + 1) * tamano])
+
+
+# Lee la tabla de "clase" y escribe la instantánea en "ruta". Se omiten las
+# filas con RUT inválido o repetido (mismo número) y las que tienen
+# SEPARADOR en un texto. Devuelve un diccionario con filas, omitidas, bytes
+# y segundos, o None si falló.
+#
+# Las filas se piden ordenadas por RUT y sus registros y textos se escriben
+# a archivos temporales a medida que llegan: en memoria solo queda el índice
+# (4 bytes por fila). Los RUT de la base están normalizados, sin ceros a la
+# izquierda, así que ordenar por largo y luego por texto es ordenar por
+# número. Si aun así alguna fila llega fuera de orden (un RUT guardado en
+# otro formato), los registros se reordenan al copiarlos.
+@medir("instantanea_rut.construir")
+def construir(ruta, clase, tamano_lote=TAMANO_LOTE):
+    columnas = clase.COLUMNAS + ("version",)
+    tipos = [TIPOS.get(columna, "texto") for columna in columnas]
+    registro = struct.Struct(_formato_registro(tipos))
+    posicion_clave = columnas.index(clase.CLAVE)
+    claves = array("I")
+    largo_heap = 0
+    omitidas = 0
+    ordenado = True
+    inicio = time.perf_counter()
+
+    connection = get_connection()
+    if not connection:
+        return None
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    cursor = None
+    with tempfile.TemporaryFile(dir=directorio) as registros, tempfile.TemporaryFile(dir=directorio) as heap:
+        try:
+            cursor = connection.cursor()
+            cursor.arraysize = tamano_lote
+            cursor.prefetchrows = tamano_lote + 1
+            cursor.execute(f"SELECT {', '.join(columnas)} FROM {clase.TABLA} "
+                           f"ORDER BY LENGTH({clase.CLAVE}), {clase.CLAVE}")
+            while True:
+                bloque = cursor.fetchmany(tamano_lote)
+                if not bloque:
+                    break
+                registros_bloque = bytearray()
+                heap_bloque = bytearray()
+                for fila, rut in zip(bloque, normalizar_ruts([fila[posicion_clave] for fila in bloque])):
+                    if rut is None:
+                        omitidas += 1
+                        continue
+                    numero = int(rut[:-2])
+                    if claves and claves[-1] >= numero:
+                        if claves[-1] == numero:
+                            omitidas += 1
+                            continue
+                        ordenado = False
+                    valores = list(fila)
+                    valores[posicion_clave] = rut
+                    campos = _campos(valores, tipos, heap_bloque, largo_heap)
+                    if campos is None:
+                        omitidas += 1
+                        continue
+                    claves.append(numero)
+                    registros_bloque += registro.pack(*campos)
+                registros.write(registros_bloque)
+                heap.write(heap_bloque)
+                largo_heap += len(heap_bloque)
+        except DatabaseError as e:
+            print(f"Error al leer {clase.TABLA}:", mensaje_error(e))
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            connection.close()
+
+        posiciones = None
+        if not ordenado:
+            leidas = len(claves)
+            claves, posiciones = _ordenar(claves)
+            omitidas += leidas - len(claves)
+
+        meta = json.dumps({
+            "tabla": clase.TABLA,
+            "columnas": columnas,
+            "tipos": tipos,
+            "registro": registro.format,
+            "creado": datetime.now().isoformat()
+        }).encode()
+        inicio_indice = _alinear(CABECERA.size + len(meta))
+        inicio_registros = _alinear(inicio_indice + len(claves) * claves.itemsize)
+        inicio_heap = inicio_registros + len(claves) * registro.size
+
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(CABECERA.pack(MAGIA, FORMATO, len(meta), len(claves),
+                                        inicio_indice, inicio_registros, inicio_heap))
+            archivo.write(meta)
+            archivo.write(b"\0" * (inicio_indice - archivo.tell()))
+            archivo.write(claves.tobytes())
+            archivo.write(b"\0" * (inicio_registros - archivo.tell()))
+            if claves:
+                _copiar_registros(registros, archivo, registro.size, posiciones)
+            heap.flush()
+            heap.seek(0)
+            shutil.copyfileobj(heap, archivo)
+        os.replace(temporal, ruta)
+    return {
+        "filas": len(claves),
+        "omitidas": omitidas,
+        "bytes": inicio_heap + largo_heap,
+        "segundos": time.perf_counter() - inicio
+    }
+
+
+# ==============================
+# LECTURA
+# ==============================
+# Lanza ValueError si el archivo no es una instantánea o si sus columnas no
+# son las de la clase actual (hay que volver a construirla).
+class InstantaneaRUT:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._abrir()
+        except (ValueError, struct.error):
+            self._mapa.close()
+            raise
+
+    def _abrir(self):
+        magia, formato, largo_meta, filas, inicio_indice, inicio_registros, inicio_heap = \
+            CABECERA.unpack_from(self._mapa, 0)
+        if magia != MAGIA or formato != FORMATO:
+            raise ValueError(f"{self.ruta} no es una instantánea por RUT (formato {FORMATO}).")
+        meta = json.loads(self._mapa[CABECERA.size:CABECERA.size + largo_meta])
+        self.clase = CLASES.get(meta["tabla"])
+        if self.clase is None or tuple(meta["columnas"]) != self.clase.COLUMNAS + ("version",):
+            raise ValueError(f"Las columnas de {self.ruta} no coinciden con {meta['tabla']}: vuelva a construirla.")
+        self.creado = meta["creado"]
+        self._registro = struct.Struct(meta["registro"])
+        # por columna: (tipo, posición entre los números o entre los textos)
+        self._plan = []
+        numeros = textos = 0
+        for tipo in meta["tipos"]:
+            if tipo in _CODIGOS:
+                self._plan.append((tipo, numeros))
+                numeros += 1
+            else:
+                self._plan.append((tipo, textos))
+                textos += 1
+        self._numeros = numeros
+        self._posicion_clave = meta["columnas"].index(self.clase.CLAVE)
+        self._filas = filas
+        self._inicio_registros = inicio_registros
+        self._inicio_heap = inicio_heap
+        self._vista = memoryview(self._mapa)
+        self._claves = self._vista[inicio_indice:inicio_indice + filas * 4].cast("I")
+
+    def __len__(self):
+        return self._filas
+
+    def _valores(self, i):
+        campos = self._registro.unpack_from(self._mapa, self._inicio_registros + i * self._registro.size)
+        inicio, largo, nulos = campos[self._numeros:]
+        inicio += self._inicio_heap
+        textos = self._mapa[inicio:inicio + largo].decode().split(SEPARADOR)
+        valores = []
+        for tipo, j in self._plan:
+            if tipo == "texto":
+                valores.append(None if nulos >> j & 1 else textos[j])
+            elif tipo == "entero":
+                valor = campos[j]
+                valores.append(None if valor == NULO_ENTERO else valor)
+            elif tipo == "real":
+                valor = campos[j]
+                valores.append(None if valor != valor else valor)
+            else:
+                valores.append(None if nulos >> j & 1 else _fecha(textos[j]))
+        return valores
+
+    def _buscar(self, numero):
+        i = bisect_left(self._claves, numero)
+        if i == self._filas or self._claves[i] != numero:
+            return None
+        return self._valores(i)
+
+    # Devuelve el Empleado/Cliente del RUT (cualquier formato) o None
+    def leer(self, rut):
+        # camino rápido "12.345.678-5": sin calcular el dígito verificador,
+        # que se compara con el del RUT guardado
+        numero, guion, dv = rut.strip().rpartition("-") if isinstance(rut, str) else ("", "", "")
+        numero = numero.replace(".", "")
+        if guion and len(dv) == 1 and numero.isdigit() and numero.isascii():
+            numero = int(numero)
+            valores = self._buscar(numero)
+            if valores is not None and valores[self._posicion_clave] == f"{numero}-{dv.upper()}":
+                return self.clase.desde_fila(*valores)
+
+        normalizado = normalizar_rut(rut)
+        if normalizado is None:
+            informar("RUT inválido.")
+            return None
+        valores = self._buscar(int(normalizado[:-2]))
+        return None if valores is None else self.clase.desde_fila(*valores)
+
+    def cerrar(self):
+        if self._mapa is not None:
+            self._claves.release()
+            self._vista.release()
+            self._mapa.close()
+            self._mapa = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye la instantánea por RUT de empleado o cliente.")
+    parser.add_argument("tabla", choices=tuple(CLASES))
+    parser.add_argument("salida", help="archivo de la instantánea")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="filas por fetch")
+    args = parser.parse_args()
+
+    resultado = construir(args.salida, CLASES[args.tabla], args.lote)
+    if resultado is None:
+        return
+    print(f"Filas: {resultado['filas']} en {args.salida} ({resultado['bytes'] / 2**20:.1f} MiB)")
+    if resultado["omitidas"]:
+        print(f"Omitidas por RUT inválido o repetido: {resultado['omitidas']}")
+    print(f"Tiempo: {resultado['segundos']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
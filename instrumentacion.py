@@ -0,0 +1,386 @@
+# Métricas por operación: tiempo de conexión, ejecución y fetch, filas e
+# idas y vueltas (round trips) estimadas, con histogramas de latencia y un
+# log de consultas lentas con los binds ocultos.
+#
+# Está desactivada por defecto. Se activa con activar() o con la variable
+# de entorno CRUD_METRICAS=1. Desactivada, get_connection entrega la conexión
+# sin envolver y @medir solo agrega una comprobación de un flag.
+#
+# Si CRUD_METRICAS_ARCHIVO está definida, al terminar el proceso se escribe
+# ahí el snapshot (JSON, o formato Prometheus si termina en .prom).
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+
+ACTIVA = os.environ.get("CRUD_METRICAS") == "1"
+UMBRAL_LENTO_MS = float(os.environ.get("CRUD_UMBRAL_LENTO_MS", "200"))
+ARCHIVO_LENTAS = os.environ.get("CRUD_LOG_LENTAS", "consultas_lentas.log")
+
+# (nombre de la operación, API): "sync" o "async"
+_operacion = contextvars.ContextVar("operacion", default=("sin_nombre", "sync"))
+_lock = threading.Lock()
+_lock_archivo = threading.Lock()    # solo el log de lentas: la escritura no frena a _registrar
+_metricas = {}      # (nombre, api) -> _MetricasOperacion
+
+
+def activar(umbral_lento_ms=None, archivo_lentas=None):
+    global ACTIVA, UMBRAL_LENTO_MS, ARCHIVO_LENTAS
+    if umbral_lento_ms is not None:
+        UMBRAL_LENTO_MS = umbral_lento_ms
+    if archivo_lentas is not None:
+        ARCHIVO_LENTAS = archivo_lentas
+    ACTIVA = True
+
+
+def desactivar():
+    global ACTIVA
+    ACTIVA = False
+
+
+def reiniciar():
+    with _lock:
+        _metricas.clear()
+
+
+# ==============================
+# HISTOGRAMA
+# ==============================
+# Histograma log-lineal al estilo HDR: cada potencia de 2 (en microsegundos)
+# se divide en SUBDIVISIONES partes iguales, con error relativo acotado.
+class Histograma:
+    SUBDIVISIONES = 16
+
+    def __init__(self):
+        self.cubetas = {}
+        self.cantidad = 0
+        self.suma = 0.0
+        self.minimo = None
+        self.maximo = 0.0
+
+    def _indice(self, us):
+        if us < self.SUBDIVISIONES:
+            return int(us)
+        exponente = int(math.log2(us)) - int(math.log2(self.SUBDIVISIONES))
+        return self.SUBDIVISIONES * exponente + int(us / (1 << exponente))
+
+    def _limite_superior(self, indice):
+        if indice < self.SUBDIVISIONES:
+            return indice + 1
+        exponente, resto = divmod(indice, self.SUBDIVISIONES)
+        return (self.SUBDIVISIONES + resto + 1) * (1 << (exponente - 1))
+
+    def registrar(self, segundos):
+        us = segundos * 1e6
+        indice = self._indice(us)
+        self.cubetas[indice] = self.cubetas.get(indice, 0) + 1
+        self.cantidad += 1
+        self.suma += segundos
+        self.minimo = segundos if self.minimo is None else min(self.minimo, segundos)
+        self.maximo = max(self.maximo, segundos)
+
+    # Percentil en milisegundos (cota superior de la cubeta)
+    def percentil(self, p):
+        if not self.cantidad:
+            return 0.0
+        objetivo = max(1, math.ceil(self.cantidad * p / 100))
+        acumulado = 0
+        for indice in sorted(self.cubetas):
+            acumulado += self.cubetas[indice]
+            if acumulado >= objetivo:
+                return min(self._limite_superior(indice) / 1000, self.maximo * 1000)
+        return self.maximo * 1000
+
+    def resumen(self):
+        return {
+            "cantidad": self.cantidad,
+            "promedio_ms": self.suma / self.cantidad * 1000 if self.cantidad else 0.0,
+            "min_ms": (self.minimo or 0.0) * 1000,
+            "p50_ms": self.percentil(50),
+            "p95_ms": self.percentil(95),
+            "p99_ms": self.percentil(99),
+            "max_ms": self.maximo * 1000
+        }
+
+
+class _MetricasOperacion:
+    def __init__(self):
+        self.conexion = Histograma()
+        self.ejecucion = Histograma()
+        self.fetch = Histograma()
+        self.filas = 0
+        self.idas_y_vueltas = 0
+        self.errores = 0
+
+
+def _registrar(tipo, segundos, filas=0, idas_y_vueltas=1, error=False):
+    clave = _operacion.get()
+    with _lock:
+        metricas = _metricas.get(clave)
+        if metricas is None:
+            metricas = _metricas[clave] = _MetricasOperacion()
+        getattr(metricas, tipo).registrar(segundos)
+        metricas.filas += filas
+        metricas.idas_y_vueltas += idas_y_vueltas
+        if error:
+            metricas.errores += 1
+
+
+def _log_lenta(sql, binds, segundos):
+    if segundos * 1000 < UMBRAL_LENTO_MS:
+        return
+    if isinstance(binds, dict):
+        ocultos = {clave: "?" for clave in binds}
+    elif isinstance(binds, (list, tuple)):
+        ocultos = f"<{len(binds)} binds>"
+    else:
+        ocultos = None
+    nombre, api = _operacion.get()
+    linea = json.dumps({
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "operacion": nombre,
+        "api": api,
+        "ms": round(segundos * 1000, 3),
+        "sql": " ".join(sql.split()),
+        "binds": ocultos
+    }, ensure_ascii=False)
+    with _lock_archivo:
+        with open(ARCHIVO_LENTAS, "a", encoding="utf-8") as archivo:
+            archivo.write(linea + "\n")
+
+
+# ==============================
+# NOMBRE DE OPERACIÓN
+# ==============================
+# Ejecuta un paso del generador (send, throw o close) con el nombre de la
+# operación asignado, y lo quita antes de volver a quien lo consume.
+def _paso_generador(operacion, paso, *args):
+    token = _operacion.set(operacion)
+    try:
+        return paso(*args)
+    finally:
+        _operacion.reset(token)
+
+
+# Decorador que asigna un nombre de operación (ej. "empleado.create") a las
+# consultas hechas dentro de la función. Soporta funciones generadoras y async;
+# las async se registran con el mismo nombre y la API "async" (etiqueta
+# api="async" en Prometheus), separadas de la versión síncrona.
+# En un generador el nombre vale solo mientras avanza: lo que consulte quien
+# lo consume entre una fila y otra (un PATCH durante un listado en streaming)
+# no se cuenta en el generador.
+# "nombre" también puede ser una función que recibe los argumentos de la
+# llamada y devuelve el nombre (operaciones genéricas, como crud_async.crear).
+def medir(nombre):
+    def _nombre(args, kwargs):
+        return nombre(*args, **kwargs) if callable(nombre) else nombre
+
+    def decorador(funcion):
+        if inspect.isgeneratorfunction(funcion):
+            @functools.wraps(funcion)
+            def envoltura_generador(*args, **kwargs):
+                if not ACTIVA:
+                    yield from funcion(*args, **kwargs)
+                    return
+                operacion = (_nombre(args, kwargs), "sync")
+                generador = funcion(*args, **kwargs)
+                paso, argumento = generador.send, None
+                while True:
+                    try:
+                        valor = _paso_generador(operacion, paso, argumento)
+                    except StopIteration as fin:
+                        return fin.value
+                    try:
+                        argumento = yield valor
+                        paso = generador.send
+                    except GeneratorExit:
+                        _paso_generador(operacion, generador.close)
+                        raise
+                    except BaseException as e:
+                        paso, argumento = generador.throw, e
+            return envoltura_generador
+
+        if inspect.iscoroutinefunction(funcion):
+            @functools.wraps(funcion)
+            async def envoltura_async(*args, **kwargs):
+                if not ACTIVA:
+                    return await funcion(*args, **kwargs)
+                token = _operacion.set((_nombre(args, kwargs), "async"))
+                try:
+                    return await funcion(*args, **kwargs)
+                finally:
+                    _operacion.reset(token)
+            return envoltura_async
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not ACTIVA:
+                return funcion(*args, **kwargs)
+            token = _operacion.set((_nombre(args, kwargs), "sync"))
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _operacion.reset(token)
+        return envoltura
+    return decorador
+
+
+# ==============================
+# CONEXIÓN Y CURSOR MEDIDOS
+# ==============================
+def envolver_conexion(connection, segundos_conexion):
+    _registrar("conexion", segundos_conexion)
+    return ConexionMedida(connection)
+
+
+# Conexiones async: por ahora solo se mide el tiempo de obtener la sesión
+def registrar_conexion(segundos_conexion):
+    _registrar("conexion", segundos_conexion)
+
+
+class ConexionMedida:
+    def __init__(self, connection):
+        object.__setattr__(self, "_connection", connection)
+
+    def __getattr__(self, nombre):
+        return getattr(self._connection, nombre)
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._connection, nombre, valor)
+
+    def cursor(self, *args, **kwargs):
+        return CursorMedido(self._connection.cursor(*args, **kwargs))
+
+    def _medir_llamada(self, metodo):
+        inicio = time.perf_counter()
+        try:
+            metodo()
+        finally:
+            _registrar("ejecucion", time.perf_counter() - inicio)
+
+    def commit(self):
+        self._medir_llamada(self._connection.commit)
+
+    def rollback(self):
+        self._medir_llamada(self._connection.rollback)
+
+
+class CursorMedido:
+    def __init__(self, cursor):
+        object.__setattr__(self, "_cursor", cursor)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._cursor, nombre, valor)
+
+    def _ejecutar(self, metodo, sql, binds, *args, **kwargs):
+        inicio = time.perf_counter()
+        error = False
+        try:
+            return metodo(sql, binds, *args, **kwargs) if binds is not None \
+                else metodo(sql, *args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            segundos = time.perf_counter() - inicio
+            _registrar("ejecucion", segundos, error=error)
+            _log_lenta(sql, binds, segundos)
+
+    def execute(self, sql, parameters=None, **kwargs):
+        return self._ejecutar(self._cursor.execute, sql, parameters, **kwargs)
+
+    def executemany(self, sql, parameters, **kwargs):
+        return self._ejecutar(self._cursor.executemany, sql, parameters, **kwargs)
+
+    # Cada bloque de arraysize filas se cuenta como una ida y vuelta
+    def _idas_fetch(self, filas):
+        tamano = getattr(self._cursor, "arraysize", 100) or 100
+        return max(1, math.ceil(filas / tamano))
+
+    def _medir_fetch(self, metodo, *args):
+        inicio = time.perf_counter()
+        resultado = metodo(*args)
+        filas = len(resultado) if isinstance(resultado, list) else int(resultado is not None)
+        _registrar("fetch", time.perf_counter() - inicio, filas=filas,
+                   idas_y_vueltas=self._idas_fetch(filas) if isinstance(resultado, list) else 0)
+        return resultado
+
+    def fetchone(self):
+        return self._medir_fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._medir_fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._medir_fetch(self._cursor.fetchall)
+
+    def __iter__(self):
+        inicio = time.perf_counter()
+        filas = 0
+        try:
+            for row in self._cursor:
+                filas += 1
+                yield row
+        finally:
+            _registrar("fetch", time.perf_counter() - inicio, filas=filas,
+                       idas_y_vueltas=self._idas_fetch(filas))
+
+
+# ==============================
+# SNAPSHOT
+# ==============================
+# {nombre: {api: métricas}}, con api "sync" o "async" según las que haya
+def snapshot():
+    resultado = {}
+    with _lock:
+        for (nombre, api), m in _metricas.items():
+            resultado.setdefault(nombre, {})[api] = {
+                "conexion": m.conexion.resumen(),
+                "ejecucion": m.ejecucion.resumen(),
+                "fetch": m.fetch.resumen(),
+                "filas": m.filas,
+                "idas_y_vueltas": m.idas_y_vueltas,
+                "errores": m.errores
+            }
+    return resultado
+
+
+def exportar_json():
+    return json.dumps(snapshot(), indent=2, ensure_ascii=False)
+
+
+def exportar_prometheus():
+    lineas = []
+    for nombre, por_api in sorted(snapshot().items()):
+        for api, datos in sorted(por_api.items()):
+            operacion = f'operacion="{nombre}",api="{api}"'
+            for fase in ("conexion", "ejecucion", "fetch"):
+                resumen = datos[fase]
+                etiquetas = f'{operacion},fase="{fase}"'
+                for p in ("p50", "p95", "p99"):
+                    cuantil = int(p[1:]) / 100
+                    lineas.append(f'crud_latencia_ms{{{etiquetas},quantile="{cuantil}"}} {resumen[p + "_ms"]:.3f}')
+                lineas.append(f"crud_latencia_ms_count{{{etiquetas}}} {resumen['cantidad']}")
+                lineas.append(f"crud_latencia_ms_sum{{{etiquetas}}} {resumen['promedio_ms'] * resumen['cantidad']:.3f}")
+            lineas.append(f'crud_filas_total{{{operacion}}} {datos["filas"]}')
+            lineas.append(f'crud_idas_y_vueltas_total{{{operacion}}} {datos["idas_y_vueltas"]}')
+            lineas.append(f'crud_errores_total{{{operacion}}} {datos["errores"]}')
+    return "\n".join(lineas) + "\n"
+
+
+def volcar(ruta):
+    contenido = exportar_prometheus() if ruta.endswith(".prom") else exportar_json()
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write(contenido)
+
+
+if os.environ.get("CRUD_METRICAS_ARCHIVO"):
+    atexit.register(volcar, os.environ["CRUD_METRICAS_ARCHIVO"])
@@ -0,0 +1,23 @@
+# Mensajes de resultado de las operaciones CRUD ("Empleado actualizado
+# correctamente.", "No se encontró el cliente para eliminar.", etc.). Son
+# para quien usa los menús; el servicio HTTP responde con el estado y los
+# apaga en cada solicitud con "with sin_mensajes():". Es una variable de
+# contexto: apagarlos en un hilo no afecta a los demás.
+import contextvars
+from contextlib import contextmanager
+
+_activos = contextvars.ContextVar("mensajes_crud", default=True)
+
+
+def informar(*partes):
+    if _activos.get():
+        print(*partes)
+
+
+@contextmanager
+def sin_mensajes():
+    token = _activos.set(False)
+    try:
+        yield
+    finally:
+        _activos.reset(token)
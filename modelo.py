@@ -0,0 +1,188 @@
+from functools import lru_cache
+
+from validacion_rut import normalizar_rut, normalizar_ruts
+
+# Resultado de Modelo.ejecutar_update
+ACTUALIZADO = "ACTUALIZADO"
+NO_ENCONTRADO = "NO_ENCONTRADO"
+CONFLICTO = "CONFLICTO"
+
+
+# ==============================
+# MODELO BASE
+# ==============================
+# Base de Empleado y Cliente. Cada subclase declara TABLA, CLAVE y COLUMNAS
+# (en el orden de su __init__) y usa COLUMNAS como __slots__. RUTS son las
+# columnas que guardan un RUT (se normalizan antes de escribir).
+# Los objetos leídos de la base guardan los valores originales para saber
+# qué columnas cambiaron antes de un UPDATE.
+#
+# Concurrencia optimista: empleado y cliente tienen una columna "version"
+# que cada UPDATE incrementa. Si la lectura incluye la columna (read_empleado,
+# read_cliente), el objeto la guarda y su UPDATE solo se aplica si la fila
+# sigue en esa versión; si otro la modificó antes, es un conflicto.
+class Modelo:
+    __slots__ = ("_originales", "_version", "_conflicto")
+    TABLA = None
+    CLAVE = None
+    COLUMNAS = ()
+    RUTS = ()
+
+    # Construye el objeto desde una fila de la base (en orden de COLUMNAS,
+    # más la versión al final si la consulta la incluye)
+    @classmethod
+    def desde_fila(cls, *valores):
+        if len(valores) > len(cls.COLUMNAS):
+            *valores, version = valores
+            obj = cls(*valores)
+            obj._originales = tuple(valores)
+            obj._version = version
+            return obj
+        obj = cls(*valores)
+        obj._originales = valores
+        return obj
+
+    # Versión de la fila cuando se leyó (None si no se conoce)
+    @property
+    def version(self):
+        return getattr(self, "_version", None)
+
+    # True si el último update falló porque otro modificó la fila antes
+    @property
+    def conflicto(self):
+        return getattr(self, "_conflicto", False)
+
+    def valores(self):
+        return tuple(getattr(self, col) for col in self.COLUMNAS)
+
+    # Toma los valores actuales como los guardados en la base
+    def marcar_guardado(self):
+        self._originales = self.valores()
+
+    # Columnas distintas a las leídas, sin la clave. None si el objeto
+    # no viene de la base (no se sabe qué cambió).
+    def campos_modificados(self):
+        originales = getattr(self, "_originales", None)
+        if originales is None:
+            return None
+        return tuple(
+            col for col, valor in zip(self.COLUMNAS, originales)
+            if col != self.CLAVE and getattr(self, col) != valor
+        )
+
+    # Normaliza las columnas RUT indicadas (todas por defecto). Devuelve el
+    # mensaje de error del primer RUT inválido, o None. Solo la clave es
+    # obligatoria; en otra columna un RUT vacío queda como NULL.
+    def normalizar_ruts(self, columnas=None):
+        for col in self.RUTS:
+            if columnas is not None and col not in columnas:
+                continue
+            valor = getattr(self, col)
+            if valor in (None, "") and col != self.CLAVE:
+                setattr(self, col, None)
+                continue
+            normalizado = normalizar_rut(valor)
+            if normalizado is None:
+                return f"RUT inválido en {col}: {valor}"
+            setattr(self, col, normalizado)
+        return None
+
+    # Igual que normalizar_ruts para una lista de objetos, validando cada
+    # columna de una vez (validacion_rut.normalizar_ruts). Devuelve el error
+    # de cada objeto en el mismo orden (None si es válido).
+    @classmethod
+    def normalizar_ruts_lote(cls, objetos):
+        errores = [None] * len(objetos)
+        for col in cls.RUTS:
+            valores = [getattr(obj, col) for obj in objetos]
+            for i, (valor, normalizado) in enumerate(zip(valores, normalizar_ruts(valores))):
+                if normalizado is None and valor in (None, "") and col != cls.CLAVE:
+                    setattr(objetos[i], col, None)
+                elif normalizado is not None:
+                    setattr(objetos[i], col, normalizado)
+                elif errores[i] is None:
+                    errores[i] = f"RUT inválido en {col}: {valor}"
+        return errores
+
+    # Claves foráneas contra el caché de referencias (referencias.py).
+    # Devuelve el mensaje de error o None; el modelo base no tiene.
+    def validar_referencias(self):
+        return None
+
+    def binds(self, columnas=None):
+        columnas = self.COLUMNAS if columnas is None else columnas + (self.CLAVE,)
+        return {col: getattr(self, col) for col in columnas}
+
+    # ==============================
+    # UPDATE
+    # ==============================
+    # Sentencia, binds y variable de salida del UPDATE de "columnas". Con
+    # versión, el UPDATE es condicional y devuelve la nueva con RETURNING en
+    # la misma ida y vuelta; sin versión es el UPDATE simple. "version" es la
+    # versión esperada si no es la leída (la que envía un cliente del servicio).
+    def preparar_update(self, cursor, columnas, version=None):
+        binds = self.binds(columnas)
+        if version is None:
+            version = self.version
+        if version is None:
+            return sql_update(self.TABLA, self.CLAVE, columnas), binds, None
+        nueva = cursor.var(int)
+        binds["version"] = version
+        binds["version_nueva"] = nueva
+        return sql_update_version(self.TABLA, self.CLAVE, columnas), binds, nueva
+
+    # Con filas == 0 y versión, una consulta más (solo en ese caso) distingue
+    # si la fila no existe o si cambió de versión. "actual" es la versión
+    # leída en esa consulta (None si no existe).
+    def resultado_update(self, filas, nueva, actual=None):
+        self._conflicto = False
+        if filas:
+            if nueva is not None:
+                self._version = nueva.getvalue()[0]
+            return ACTUALIZADO
+        if nueva is None or actual is None:
+            return NO_ENCONTRADO
+        self._conflicto = True
+        return CONFLICTO
+
+    def sql_version(self):
+        return f"SELECT version FROM {self.TABLA} WHERE {self.CLAVE} = :clave"
+
+    # Ejecuta el UPDATE en el cursor (sin commit). Devuelve ACTUALIZADO,
+    # NO_ENCONTRADO o CONFLICTO.
+    def ejecutar_update(self, cursor, columnas, version=None):
+        sql, binds, nueva = self.preparar_update(cursor, columnas, version)
+        cursor.execute(sql, binds)
+        if cursor.rowcount or nueva is None:
+            return self.resultado_update(cursor.rowcount, nueva)
+        cursor.execute(self.sql_version(), {"clave": getattr(self, self.CLAVE)})
+        fila = cursor.fetchone()
+        return self.resultado_update(0, nueva, fila[0] if fila else None)
+
+    # Versiones async de create/update (ver crud_async)
+    async def create_async(self):
+        import crud_async
+        return await crud_async.crear(self)
+
+    async def update_async(self):
+        import crud_async
+        return await crud_async.actualizar(self)
+
+
+# UPDATE solo con las columnas indicadas; siempre incrementa la versión. Se
+# guarda en caché por conjunto de columnas para que el texto SQL se repita y
+# Oracle reutilice el cursor. Con condicional=True solo se aplica si la fila
+# sigue en la versión :version.
+@lru_cache(maxsize=256)
+def sql_update(tabla, clave, columnas, condicional=False):
+    asignaciones = ",\n    ".join([f"{col} = :{col}" for col in columnas] + ["version = version + 1"])
+    sql = f"UPDATE {tabla}\nSET {asignaciones}\nWHERE {clave} = :{clave}"
+    if condicional:
+        sql += "\nAND version = :version"
+    return sql
+
+
+# UPDATE condicional que devuelve la nueva versión en :version_nueva
+@lru_cache(maxsize=256)
+def sql_update_version(tabla, clave, columnas):
+    return sql_update(tabla, clave, columnas, True) + "\nRETURNING version INTO :version_nueva"
@@ -1,7 +1,99 @@
-import oracledb
-from conexion import get_connection
+import auditoria
+from archivos import FilaInvalida, leer_filas
+from busqueda import IndiceBusqueda
+from cache import CacheLRU
+from conexion import DatabaseError, IntegrityError, conexion, equivalente_sqlite, mensaje_error
+from filas import objetos_desde_cursor, objetos_por_claves, usar_clase
+from instrumentacion import medir
+from mensajes import informar
+from modelo import ACTUALIZADO, CONFLICTO, Modelo, sql_update
+from validacion_rut import normalizar_rut, normalizar_ruts
+
+# caché de read_cliente por RUT
+cache_clientes = CacheLRU()
+# búsqueda por razón social, contacto o email (buscar_clientes)
+indice_clientes = IndiceBusqueda(
+    "cliente", "rut_cliente", ("razon_social", "nombre_contacto", "email_contacto")
+)
+
+TAMANO_LOTE_UPSERT = 500
+
+INSERT_CLIENTE = """
+INSERT INTO cliente (
+    rut_cliente, rut_vendedor, razon_social,
+    cantidad_trabajadores, nombre_contacto,
+    email_contacto, telefono_contacto
+)
+VALUES (
+    :rut_cliente, :rut_vendedor, :razon_social,
+    :cantidad_trabajadores, :nombre_contacto,
+    :email_contacto, :telefono_contacto
+)
+"""
+
+MERGE_CLIENTE = """
+MERGE INTO cliente c
+USING (
+    SELECT :rut_cliente AS rut_cliente, :rut_vendedor AS rut_vendedor,
+           :razon_social AS razon_social,
+           :cantidad_trabajadores AS cantidad_trabajadores,
+           :nombre_contacto AS nombre_contacto,
+           :email_contacto AS email_contacto,
+           :telefono_contacto AS telefono_contacto
+    FROM dual
+) s
+ON (c.rut_cliente = s.rut_cliente)
+WHEN MATCHED THEN UPDATE SET
+    c.rut_vendedor = s.rut_vendedor,
+    c.razon_social = s.razon_social,
+    c.cantidad_trabajadores = s.cantidad_trabajadores,
+    c.nombre_contacto = s.nombre_contacto,
+    c.email_contacto = s.email_contacto,
+    c.telefono_contacto = s.telefono_contacto,
+    c.version = c.version + 1
+WHEN NOT MATCHED THEN INSERT (
+    rut_cliente, rut_vendedor, razon_social,
+    cantidad_trabajadores, nombre_contacto,
+    email_contacto, telefono_contacto
+)
+VALUES (
+    s.rut_cliente, s.rut_vendedor, s.razon_social,
+    s.cantidad_trabajadores, s.nombre_contacto,
+    s.email_contacto, s.telefono_contacto
+)
+"""
+
+# Primer paso del upsert por lote (ver _upsert_lote)
+UPDATE_UPSERT_CLIENTE = sql_update("cliente", "rut_cliente", (
+    "rut_vendedor", "razon_social", "cantidad_trabajadores",
+    "nombre_contacto", "email_contacto", "telefono_contacto"
+))
+
+# Equivalente del MERGE para el backend SQLite
+UPSERT_CLIENTE_SQLITE = INSERT_CLIENTE + """
+ON CONFLICT (rut_cliente) DO UPDATE SET
+    rut_vendedor = excluded.rut_vendedor,
+    razon_social = excluded.razon_social,
+    cantidad_trabajadores = excluded.cantidad_trabajadores,
+    nombre_contacto = excluded.nombre_contacto,
+    email_contacto = excluded.email_contacto,
+    telefono_contacto = excluded.telefono_contacto,
+    version = cliente.version + 1
+"""
+equivalente_sqlite(MERGE_CLIENTE, UPSERT_CLIENTE_SQLITE)
+
+class Cliente(Modelo):
+    TABLA = "cliente"
+    CLAVE = "rut_cliente"
+    COLUMNAS = (
+        "rut_cliente", "rut_vendedor", "razon_social",
+        "cantidad_trabajadores", "nombre_contacto",
+        "email_contacto", "telefono_contacto"
+    )
+    RUTS = ("rut_cliente", "rut_vendedor")
+    # sin __dict__ por instancia: ocupa bastante menos memoria en lecturas masivas
+    __slots__ = COLUMNAS
 
-class Cliente:
     def __init__(self, rut_cliente, rut_vendedor, razon_social,
                  cantidad_trabajadores, nombre_contacto,
                  email_contacto, telefono_contacto):
@@ -13,131 +105,426 @@ class Cliente:
         self.email_contacto = email_contacto
         self.telefono_contacto = telefono_contacto
 
+    @medir("cliente.create")
     def create(self):
-        connection = get_connection()
+        error = self.normalizar_ruts()
+        if error:
+            informar(f"Error al crear el cliente: {error}")
+            return False
+
+        with conexion() as connection:
+            if not connection:
+                return False
+
+            cursor = None
+            try:
+                cursor = connection.cursor()
+                cursor.execute(INSERT_CLIENTE, self.binds())
+                connection.commit()
+                self.marcar_guardado()
+                cache_clientes.invalidar(self.rut_cliente)
+                indice_clientes.guardar(self)
+                auditoria.registrar(auditoria.CREAR, "cliente", self.rut_cliente)
+                informar("Cliente creado exitosamente.")
+                return True
+            except IntegrityError:
+                informar("Error: El RUT del cliente ya existe en la base de datos.")
+            except DatabaseError as e:
+                print(f"Error al crear el cliente: {e}")
+            finally:
+                if cursor:
+                    cursor.close()
+        return False
+
+    # Solo envía las columnas modificadas desde read_cliente; sin cambios no
+    # hace nada. Con la versión leída en read_cliente, si otro modificó el
+    # cliente desde entonces no se pisa su cambio (cliente.conflicto es True).
+    # Con version se exige esa versión en lugar de la leída.
+    @medir("cliente.update")
+    def update(self, version=None):
+        columnas = self.campos_modificados()
+        if columnas is None:
+            columnas = self.COLUMNAS[1:]
+        elif not columnas:
+            informar("No hay cambios para actualizar.")
+            return True
+
+        # solo se valida el RUT del vendedor si se modificó
+        error = self.normalizar_ruts(columnas)
+        if error:
+            informar(f"Error al actualizar el cliente: {error}")
+            return False
+
+        with conexion() as connection:
+            if not connection:
+                return False
+
+            cursor = None
+            try:
+                cursor = connection.cursor()
+                resultado = self.ejecutar_update(cursor, columnas, version)
+                if resultado == ACTUALIZADO:
+                    connection.commit()
+                    self.marcar_guardado()
+                    cache_clientes.invalidar(self.rut_cliente)
+                    indice_clientes.guardar(self)
+                    auditoria.registrar(auditoria.ACTUALIZAR, "cliente", self.rut_cliente, ", ".join(columnas))
+                    informar("Cliente actualizado exitosamente.")
+                    return True
+                cache_clientes.invalidar(self.rut_cliente)
+                if resultado == CONFLICTO:
+                    informar("El cliente fue modificado por otro usuario desde que se leyó. "
+                          "Vuelva a leerlo e intente de nuevo.")
+                else:
+                    informar("No se encontró el cliente para actualizar.")
+            except DatabaseError as e:
+                print(f"Error al actualizar el cliente: {e}")
+            finally:
+                if cursor:
+                    cursor.close()
+        return False
+
+
+@medir("cliente.read")
+def read_cliente(rut_cliente):
+    rut_cliente = normalizar_rut(rut_cliente)
+    if rut_cliente is None:
+        informar("RUT inválido.")
+        return None
+    encontrado, cliente = cache_clientes.obtener(rut_cliente)
+    if encontrado:
+        return cliente
+
+    with conexion() as connection:
         if not connection:
-            return
+            return None
 
         cursor = None
         try:
             cursor = connection.cursor()
-            query = """
-            INSERT INTO cliente (
-                rut_cliente, rut_vendedor, razon_social,
-                cantidad_trabajadores, nombre_contacto,
-                email_contacto, telefono_contacto
-            )
-            VALUES (
-                :rut_cliente, :rut_vendedor, :razon_social,
-                :cantidad_trabajadores, :nombre_contacto,
-                :email_contacto, :telefono_contacto
-            )
-            """
-            cursor.execute(query, {
-                'rut_cliente': self.rut_cliente,
-                'rut_vendedor': self.rut_vendedor,
-                'razon_social': self.razon_social,
-                'cantidad_trabajadores': self.cantidad_trabajadores,
-                'nombre_contacto': self.nombre_contacto,
-                'email_contacto': self.email_contacto,
-                'telefono_contacto': self.telefono_contacto
-            })
-            connection.commit()
-            print("Cliente creado exitosamente.")
-        except oracledb.IntegrityError:
-            print("Error: El RUT del cliente ya existe en la base de datos.")
-        except oracledb.DatabaseError as e:
-            print(f"Error al crear el cliente: {e}")
+            query = "SELECT * FROM cliente WHERE rut_cliente = :rut_cliente"
+            cursor.execute(query, {'rut_cliente': rut_cliente})
+            usar_clase(cursor, Cliente)     # por nombre de columna, no por posición
+            cliente = cursor.fetchone()
+            cache_clientes.guardar(rut_cliente, cliente)
+            return cliente
+        except DatabaseError as e:
+            print(f"Error al leer el cliente: {e}")
+            return None
         finally:
             if cursor:
                 cursor.close()
-            connection.close()
 
-    def update(self):
-        connection = get_connection()
+
+# Genera objetos Cliente desde un cursor ya ejecutado
+def clientes_desde_cursor(cursor):
+    return objetos_desde_cursor(cursor, Cliente)
+
+
+@medir("cliente.delete")
+def delete_cliente(rut_cliente):
+    rut_cliente = normalizar_rut(rut_cliente)
+    if rut_cliente is None:
+        informar("RUT inválido.")
+        return False
+
+    with conexion() as connection:
         if not connection:
-            return
+            return False
 
         cursor = None
         try:
             cursor = connection.cursor()
-            query = """
-            UPDATE cliente
-            SET rut_vendedor = :rut_vendedor,
-                razon_social = :razon_social,
-                cantidad_trabajadores = :cantidad_trabajadores,
-                nombre_contacto = :nombre_contacto,
-                email_contacto = :email_contacto,
-                telefono_contacto = :telefono_contacto
-            WHERE rut_cliente = :rut_cliente
-            """
-            cursor.execute(query, {
-                'rut_cliente': self.rut_cliente,
-                'rut_vendedor': self.rut_vendedor,
-                'razon_social': self.razon_social,
-                'cantidad_trabajadores': self.cantidad_trabajadores,
-                'nombre_contacto': self.nombre_contacto,
-                'email_contacto': self.email_contacto,
-                'telefono_contacto': self.telefono_contacto
-            })
+            query = "DELETE FROM cliente WHERE rut_cliente = :rut_cliente"
+            cursor.execute(query, {'rut_cliente': rut_cliente})
             if cursor.rowcount == 0:
-                print("No se encontró el cliente para actualizar.")
+                informar("No se encontró el cliente para eliminar.")
             else:
                 connection.commit()
-                print("Cliente actualizado exitosamente.")
-        except oracledb.DatabaseError as e:
-            print(f"Error al actualizar el cliente: {e}")
+                cache_clientes.invalidar(rut_cliente)
+                indice_clientes.eliminar(rut_cliente)
+                auditoria.registrar(auditoria.ELIMINAR, "cliente", rut_cliente)
+                informar("Cliente eliminado exitosamente.")
+                return True
+        except DatabaseError as e:
+            print(f"Error al eliminar el cliente: {e}")
         finally:
             if cursor:
                 cursor.close()
-            connection.close()
+    return False
 
 
-def read_cliente(rut_cliente):
-    connection = get_connection()
-    if not connection:
-        return None
+# ==============================
+# OPERACIONES POR LOTE
+# ==============================
+# Devuelve un diccionario rut normalizado -> Cliente con los que existen
+# (caché + SELECT ... IN); los RUT inválidos no se consultan.
+@medir("cliente.read_lote")
+def read_clientes(ruts):
+    encontrados = {}
+    faltantes = []
+    for rut in dict.fromkeys(normalizar_ruts(ruts)):
+        if rut is None:
+            continue
+        en_cache, cliente = cache_clientes.obtener(rut)
+        if not en_cache:
+            faltantes.append(rut)
+        elif cliente is not None:
+            encontrados[rut] = cliente
+    if not faltantes:
+        return encontrados
 
-    cursor = None
-    try:
-        cursor = connection.cursor()
-        query = "SELECT * FROM cliente WHERE rut_cliente = :rut_cliente"
-        cursor.execute(query, {'rut_cliente': rut_cliente})
-        result = cursor.fetchone()
-        if result:
-            return Cliente(*result)
-        else:
+    with conexion() as connection:
+        if not connection:
             return None
-    except oracledb.DatabaseError as e:
-        print(f"Error al leer el cliente: {e}")
-        return None
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
 
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            leidos = {c.rut_cliente: c for c in objetos_por_claves(cursor, Cliente, faltantes)}
+            for rut in faltantes:
+                cache_clientes.guardar(rut, leidos.get(rut))
+            encontrados.update(leidos)
+            return encontrados
+        except DatabaseError as e:
+            print(f"Error al leer los clientes: {e}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
 
-def delete_cliente(rut_cliente):
-    connection = get_connection()
-    if not connection:
+
+# Inserta varios clientes con un executemany; los de RUT inválido no se
+# envían. Devuelve el error de cada cliente en el mismo orden (None si se
+# creó), o None si no hubo conexión.
+@medir("cliente.create_lote")
+def create_clientes(clientes):
+    errores = Cliente.normalizar_ruts_lote(clientes)
+    validos = [i for i, error in enumerate(errores) if error is None]
+    if not validos:
+        return errores
+
+    with conexion() as connection:
+        if not connection:
+            return None
+
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            cursor.executemany(INSERT_CLIENTE, [clientes[i].binds() for i in validos], batcherrors=True)
+            for error in cursor.getbatcherrors():
+                errores[validos[error.offset]] = error.message
+            connection.commit()
+            for i in validos:
+                cache_clientes.invalidar(clientes[i].rut_cliente)
+                if errores[i] is None:
+                    clientes[i].marcar_guardado()
+                    indice_clientes.guardar(clientes[i])
+                    auditoria.registrar(auditoria.CREAR, "cliente", clientes[i].rut_cliente)
+        except DatabaseError as e:
+            connection.rollback()
+            for i in validos:
+                errores[i] = mensaje_error(e)
+        finally:
+            if cursor:
+                cursor.close()
+    return errores
+
+
+# Todos los clientes ordenados por RUT, por páginas de tamano_pagina filas
+# en una sola conexión (paginación por clave, como iterar_empleados; igual
+# que allí, propagar=True lanza los errores en lugar de imprimirlos).
+@medir("cliente.listar")
+def iterar_clientes(tamano_pagina=500, propagar=False):
+    with conexion() as connection:
+        if not connection:
+            if propagar:
+                raise ConnectionError("No se pudo conectar con la base de datos.")
+            return
+
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            cursor.arraysize = tamano_pagina
+            despues_de = None
+            while True:
+                cursor.execute("""
+                    SELECT * FROM cliente
+                    WHERE (:rut IS NULL OR rut_cliente > :rut)
+                    ORDER BY rut_cliente
+                    FETCH FIRST :tamano ROWS ONLY
+                """, {'rut': despues_de, 'tamano': tamano_pagina})
+                usar_clase(cursor, Cliente)
+                clientes = cursor.fetchall()
+                yield from clientes
+                if len(clientes) < tamano_pagina:
+                    break
+                despues_de = clientes[-1].rut_cliente
+        except DatabaseError as e:
+            if propagar:
+                raise
+            print(f"Error al listar los clientes: {e}")
+        finally:
+            if cursor:
+                cursor.close()
+
+
+# Búsqueda por parte de la razón social, del nombre o del email de contacto,
+# con tolerancia a errores de tipeo. Devuelve diccionarios con rut_cliente,
+# esos tres campos y el puntaje.
+def buscar_clientes(texto, limite=10):
+    return indice_clientes.buscar(texto, limite)
+
+
+# ==============================
+# UPSERT MASIVO (MERGE)
+# ==============================
+# Cada lote va primero como UPDATE (array DML): getarraydmlrowcounts() dice
+# qué clientes existían (1 fila) y quedaron actualizados. Solo los que no
+# existían van al MERGE, que los inserta; si otro los creó entre medio, el
+# MERGE los actualiza en lugar de fallar. Un lote de clientes que ya existen
+# es una sola ida y vuelta, y no hace falta consultar antes cuáles existen.
+def _upsert_lote(connection, lote, resultado):
+    # RUT validados de una vez para todo el lote; los inválidos no se envían
+    validos = []
+    for cliente, error in zip(lote, Cliente.normalizar_ruts_lote(lote)):
+        if error is None:
+            validos.append(cliente)
+        else:
+            resultado['errores'].append((cliente.rut_cliente, error))
+    resultado['fallidos'] += len(lote) - len(validos)
+    lote = validos
+    if not lote:
         return
 
-    cursor = None
+    cursor = connection.cursor()
     try:
-        cursor = connection.cursor()
-        query = "DELETE FROM cliente WHERE rut_cliente = :rut_cliente"
-        cursor.execute(query, {'rut_cliente': rut_cliente})
-        if cursor.rowcount == 0:
-            print("No se encontró el cliente para eliminar.")
-        else:
-            connection.commit()
-            print("Cliente eliminado exitosamente.")
-    except oracledb.DatabaseError as e:
-        print(f"Error al eliminar el cliente: {e}")
+        binds = [c.binds() for c in lote]
+        errores = {}
+        cursor.executemany(UPDATE_UPSERT_CLIENTE, binds, batcherrors=True, arraydmlrowcounts=True)
+        for error in cursor.getbatcherrors():
+            errores[error.offset] = error.message
+        conteos = cursor.getarraydmlrowcounts()
+        nuevos = [i for i, filas in enumerate(conteos) if not filas and i not in errores]
+        if nuevos:
+            cursor.executemany(MERGE_CLIENTE, [binds[i] for i in nuevos], batcherrors=True)
+            for error in cursor.getbatcherrors():
+                errores[nuevos[error.offset]] = error.message
+        connection.commit()
+
+        # un RUT repetido en el lote se inserta la primera vez; las
+        # siguientes el MERGE lo actualiza
+        insertados = {}
+        for i in nuevos:
+            if i not in errores:
+                insertados.setdefault(binds[i]['rut_cliente'], i)
+        insertados = set(insertados.values())
+        for i, b in enumerate(binds):
+            cache_clientes.invalidar(b['rut_cliente'])
+            if i in errores:
+                resultado['errores'].append((b['rut_cliente'], errores[i]))
+                continue
+            indice_clientes.guardar(b)
+            if i in insertados:
+                resultado['insertados'] += 1
+                auditoria.registrar(auditoria.CREAR, "cliente", b['rut_cliente'], "upsert")
+            else:
+                resultado['actualizados'] += 1
+                auditoria.registrar(auditoria.ACTUALIZAR, "cliente", b['rut_cliente'], "upsert")
+        resultado['fallidos'] += len(errores)
+    except DatabaseError as e:
+        connection.rollback()
+        for c in lote:
+            resultado['errores'].append((c.rut_cliente, str(e)))
+        resultado['fallidos'] += len(lote)
     finally:
-        if cursor:
-            cursor.close()
-        connection.close()
+        cursor.close()
+
+
+# Inserta o actualiza clientes con un MERGE por lote (array DML).
+# Devuelve un diccionario con los conteos insertados/actualizados/fallidos
+# y la lista de errores (rut_cliente, mensaje).
+@medir("cliente.upsert")
+def upsert_clientes(clientes, tamano_lote=TAMANO_LOTE_UPSERT):
+    resultado = {'insertados': 0, 'actualizados': 0, 'fallidos': 0, 'errores': []}
+    with conexion() as connection:
+        if not connection:
+            return None
+
+        lote = []
+        for cliente in clientes:
+            lote.append(cliente)
+            if len(lote) >= tamano_lote:
+                _upsert_lote(connection, lote, resultado)
+                lote = []
+        if lote:
+            _upsert_lote(connection, lote, resultado)
+    return resultado
+
+
+# Texto del archivo o número del JSON; un decimal o un booleano no se
+# redondean a entero, se rechazan.
+def _cantidad_trabajadores(valor):
+    if valor is None or valor == '':
+        return None
+    if isinstance(valor, bool) or (isinstance(valor, float) and not valor.is_integer()):
+        raise ValueError(f"cantidad_trabajadores debe ser un número entero: {valor}")
+    try:
+        cantidad = int(valor)
+    except (ValueError, TypeError):
+        raise ValueError(f"cantidad_trabajadores debe ser un número entero: {valor}")
+    if cantidad < 0:
+        raise ValueError(f"cantidad_trabajadores no puede ser negativa: {valor}")
+    return cantidad
+
+
+# Cliente desde un diccionario (fila de archivo o cuerpo JSON del servicio).
+# Lanza ValueError si falta el RUT o la cantidad de trabajadores no es un
+# entero mayor o igual a cero.
+def cliente_desde_fila(fila):
+    rut = fila.get('rut_cliente')
+    if rut is None or not str(rut).strip():
+        raise ValueError("Falta rut_cliente.")
+    cantidad = _cantidad_trabajadores(fila.get('cantidad_trabajadores'))
+    return Cliente(
+        str(rut).strip(), fila.get('rut_vendedor'), fila.get('razon_social'), cantidad,
+        fila.get('nombre_contacto'), fila.get('email_contacto'), fila.get('telefono_contacto')
+    )
+
+
+# Filas del archivo como Cliente. Las que no se pueden convertir no se
+# entregan: quedan en "invalidas" como (RUT o número de fila, mensaje).
+def _clientes_del_archivo(ruta, invalidas):
+    for numero_fila, fila in enumerate(leer_filas(ruta, errores=True), start=1):
+        if isinstance(fila, FilaInvalida):
+            invalidas.append((f"fila {numero_fila}", fila.mensaje))
+            continue
+        try:
+            yield cliente_desde_fila(fila)
+        except ValueError as e:
+            invalidas.append((fila.get('rut_cliente') or f"fila {numero_fila}", str(e)))
+
+
+# Las filas inválidas se cuentan en fallidos/errores y la sincronización
+# sigue con el resto.
+def sincronizar_clientes(ruta, tamano_lote=TAMANO_LOTE_UPSERT):
+    invalidas = []
+    try:
+        resultado = upsert_clientes(_clientes_del_archivo(ruta, invalidas), tamano_lote)
+    except (OSError, ValueError) as e:
+        print(f"Error al leer el archivo: {e}")
+        return None
+    if resultado is None:
+        return None
+    resultado['fallidos'] += len(invalidas)
+    resultado['errores'].extend(invalidas)
+
+    print(f"Clientes insertados: {resultado['insertados']}")
+    print(f"Clientes actualizados: {resultado['actualizados']}")
+    print(f"Clientes con error: {resultado['fallidos']}")
+    for rut, mensaje in resultado['errores'][:20]:
+        print(f"  {rut}: {mensaje}")
+    return resultado
 
 
 def print_menu():
@@ -146,17 +533,22 @@ def print_menu():
     print("2. Leer Cliente")
     print("3. Actualizar Cliente")
     print("4. Eliminar Cliente")
-    print("5. Salir")
+    print("5. Sincronizar Clientes desde archivo")
+    print("6. Buscar Clientes por razón social, contacto o email")
+    print("7. Salir")
 
 
 def main():
     while True:
         print_menu()
-        choice = input("Elige una opción (1-5): ")
+        choice = input("Elige una opción (1-7): ")
 
         if choice == '1':
             try:
-                rut_cliente = input("Ingrese RUT del cliente: ")
+                rut_cliente = normalizar_rut(input("Ingrese RUT del cliente: "))
+                if rut_cliente is None:
+                    print("Error: RUT del cliente inválido.")
+                    continue
                 rut_vendedor = input("Ingrese RUT del vendedor: ")
                 razon_social = input("Ingrese razón social: ")
                 cantidad_trabajadores = int(input("Ingrese cantidad de trabajadores: "))
@@ -216,11 +608,24 @@ def main():
             delete_cliente(rut_cliente)
 
         elif choice == '5':
+            ruta = input("Ingrese ruta del archivo (.csv o .jsonl): ").strip()
+            sincronizar_clientes(ruta)
+
+        elif choice == '6':
+            texto = input("Ingrese parte de la razón social, contacto o email: ").strip()
+            encontrados = buscar_clientes(texto)
+            if not encontrados:
+                print("No se encontraron clientes.")
+            for fila in encontrados:
+                print(f"RUT: {fila['rut_cliente']:<12} | {fila['razon_social'] or '':<30} | "
+                      f"{fila['nombre_contacto'] or ''} <{fila['email_contacto'] or ''}>")
+
+        elif choice == '7':
             print("Saliendo del programa.")
             break
 
         else:
-            print("Opción no válida. Por favor, elige una opción entre 1 y 5.")
+            print("Opción no válida. Por favor, elige una opción entre 1 y 7.")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,49 @@
-import oracledb
+import argparse
+import sys
 from datetime import datetime
-from conexion import get_connection
+import auditoria
+from busqueda import IndiceBusqueda
+from cache import CacheLRU
+from conexion import DatabaseError, IntegrityError, conexion, mensaje_error
+from filas import objetos_desde_cursor, objetos_por_claves, usar_clase
+from instrumentacion import medir
+from mensajes import informar
+from modelo import ACTUALIZADO, CONFLICTO, Modelo
+from referencias import nombre_cargo, nombre_departamento, precargar, validar_empleado
+from validacion_rut import normalizar_rut, normalizar_ruts
+
+# caché de read_empleado por RUT
+cache_empleados = CacheLRU()
+# búsqueda por nombre o email (buscar_empleados)
+indice_empleados = IndiceBusqueda("empleado", "rut_empleado", ("nombre", "email"))
+
+
+INSERT_EMPLEADO = """
+    INSERT INTO empleado (
+        rut_empleado, nombre, direccion,
+        telefono, email, fecha_inicio,
+        salario, codigo_cargo, id_departamento
+    )
+    VALUES (
+        :rut_empleado, :nombre, :direccion,
+        :telefono, :email, :fecha_inicio,
+        :salario, :codigo_cargo, :id_departamento
+    )
+"""
+
+
+class Empleado(Modelo):
+    TABLA = "empleado"
+    CLAVE = "rut_empleado"
+    COLUMNAS = (
+        "rut_empleado", "nombre", "direccion",
+        "telefono", "email", "fecha_inicio",
+        "salario", "codigo_cargo", "id_departamento"
+    )
+    RUTS = ("rut_empleado",)
+    # sin __dict__ por instancia: ocupa bastante menos memoria en lecturas masivas
+    __slots__ = COLUMNAS
 
-
-class Empleado:
     def __init__(self, rut_empleado, nombre, direccion,
                  telefono, email, fecha_inicio,
                  salario, codigo_cargo, id_departamento):
@@ -17,191 +57,384 @@ class Empleado:
         self.codigo_cargo = codigo_cargo
         self.id_departamento = id_departamento
 
+    def validar_referencias(self):
+        return validar_empleado(self.codigo_cargo, self.id_departamento)
+
     
     # crear o create
+    @medir("empleado.create")
     def create(self):
-        connection = get_connection()
+        # el RUT se normaliza y valida aquí; cargo y departamento contra el
+        # caché de referencias, sin ir a la base a recibir el error
+        error = self.normalizar_ruts() or self.validar_referencias()
+        if error:
+            informar("Error de integridad al crear empleado:", error)
+            return False
+
+        with conexion() as connection:
+            if not connection:
+                return False
+
+            cursor = None
+            try:
+                cursor = connection.cursor()
+                cursor.execute(INSERT_EMPLEADO, self.binds())
+                connection.commit()
+                self.marcar_guardado()
+                cache_empleados.invalidar(self.rut_empleado)
+                indice_empleados.guardar(self)
+                auditoria.registrar(auditoria.CREAR, "empleado", self.rut_empleado)
+                informar("Empleado creado correctamente.")
+                return True
+            except IntegrityError as e:
+                print("Error de integridad al crear empleado:", mensaje_error(e))
+            except DatabaseError as e:
+                print("Error al crear empleado:", mensaje_error(e))
+            finally:
+                if cursor:
+                    cursor.close()
+        return False
+
+    
+    # actualizar o update
+    # Si el empleado viene de read_empleado solo se envían las columnas
+    # modificadas; si no cambió nada no se va a la base. Además trae la
+    # versión leída: si otro lo modificó desde entonces no se pisa su cambio
+    # (conflicto, emp.conflicto es True) y hay que volver a leerlo. Con
+    # version se exige esa versión en lugar de la leída.
+    @medir("empleado.update")
+    def update(self, version=None):
+        columnas = self.campos_modificados()
+        if columnas is None:
+            columnas = self.COLUMNAS[1:]
+        elif not columnas:
+            informar("No hay cambios para actualizar.")
+            return True
+
+        error = self.validar_referencias()
+        if error:
+            informar("Error al actualizar empleado:", error)
+            return False
+
+        with conexion() as connection:
+            if not connection:
+                return False
+
+            cursor = None
+            try:
+                cursor = connection.cursor()
+                resultado = self.ejecutar_update(cursor, columnas, version)
+                if resultado == ACTUALIZADO:
+                    connection.commit()
+                    self.marcar_guardado()
+                    cache_empleados.invalidar(self.rut_empleado)
+                    indice_empleados.guardar(self)
+                    auditoria.registrar(auditoria.ACTUALIZAR, "empleado", self.rut_empleado, ", ".join(columnas))
+                    informar("Empleado actualizado correctamente.")
+                    return True
+                cache_empleados.invalidar(self.rut_empleado)
+                if resultado == CONFLICTO:
+                    informar("El empleado fue modificado por otro usuario desde que se leyó. "
+                          "Vuelva a leerlo e intente de nuevo.")
+                else:
+                    informar("No se encontró el empleado para actualizar.")
+            except DatabaseError as e:
+                print("Error al actualizar empleado:", mensaje_error(e))
+            finally:
+                if cursor:
+                    cursor.close()
+        return False
+
+
+#read funcion externa
+@medir("empleado.read")
+def read_empleado(rut_empleado):
+    rut_empleado = normalizar_rut(rut_empleado)
+    if rut_empleado is None:
+        informar("RUT inválido.")
+        return None
+    encontrado, emp = cache_empleados.obtener(rut_empleado)
+    if encontrado:
+        return emp
+
+    with conexion() as connection:
         if not connection:
-            return
+            return None
 
         cursor = None
         try:
             cursor = connection.cursor()
             query = """
-                INSERT INTO empleado (
-                    rut_empleado, nombre, direccion,
-                    telefono, email, fecha_inicio,
-                    salario, codigo_cargo, id_departamento
-                )
-                VALUES (
-                    :rut_empleado, :nombre, :direccion,
-                    :telefono, :email, :fecha_inicio,
-                    :salario, :codigo_cargo, :id_departamento
-                )
+                SELECT rut_empleado, nombre, direccion,
+                       telefono, email, fecha_inicio,
+                       salario, codigo_cargo, id_departamento,
+                       version
+                FROM empleado
+                WHERE rut_empleado = :rut_empleado
             """
-            cursor.execute(query, {
-                "rut_empleado": self.rut_empleado,
-                "nombre": self.nombre,
-                "direccion": self.direccion,
-                "telefono": self.telefono,
-                "email": self.email,
-                "fecha_inicio": self.fecha_inicio,
-                "salario": self.salario,
-                "codigo_cargo": self.codigo_cargo,
-                "id_departamento": self.id_departamento
-            })
-            connection.commit()
-            print("Empleado creado correctamente.")
-        except oracledb.IntegrityError as e:
-            error, = e.args
-            print("Error de integridad al crear empleado:", error.message)
-        except oracledb.DatabaseError as e:
-            error, = e.args
-            print("Error al crear empleado:", error.message)
+            cursor.execute(query, {"rut_empleado": rut_empleado})
+            usar_clase(cursor, Empleado)
+            emp = cursor.fetchone()
+            cache_empleados.guardar(rut_empleado, emp)
+            return emp
+        except DatabaseError as e:
+            print("Error al leer empleado:", mensaje_error(e))
+            return None
         finally:
             if cursor:
                 cursor.close()
-            connection.close()
 
-    
-    # actualizar o update
-    def update(self):
-        connection = get_connection()
+
+# Genera objetos Empleado desde un cursor ya ejecutado (SELECT con las columnas de Empleado.COLUMNAS)
+def empleados_desde_cursor(cursor):
+    return objetos_desde_cursor(cursor, Empleado)
+
+
+#borrar delete
+@medir("empleado.delete")
+def delete_empleado(rut_empleado):
+    rut_empleado = normalizar_rut(rut_empleado)
+    if rut_empleado is None:
+        informar("RUT inválido.")
+        return False
+
+    with conexion() as connection:
         if not connection:
-            return
+            return False
 
         cursor = None
         try:
             cursor = connection.cursor()
-            query = """
-                UPDATE empleado
-                SET nombre = :nombre,
-                    direccion = :direccion,
-                    telefono = :telefono,
-                    email = :email,
-                    fecha_inicio = :fecha_inicio,
-                    salario = :salario,
-                    codigo_cargo = :codigo_cargo,
-                    id_departamento = :id_departamento
-                WHERE rut_empleado = :rut_empleado
-            """
-            cursor.execute(query, {
-                "rut_empleado": self.rut_empleado,
-                "nombre": self.nombre,
-                "direccion": self.direccion,
-                "telefono": self.telefono,
-                "email": self.email,
-                "fecha_inicio": self.fecha_inicio,
-                "salario": self.salario,
-                "codigo_cargo": self.codigo_cargo,
-                "id_departamento": self.id_departamento
-            })
+            query = "DELETE FROM empleado WHERE rut_empleado = :rut_empleado"
+            cursor.execute(query, {"rut_empleado": rut_empleado})
             if cursor.rowcount == 0:
-                print("No se encontró el empleado para actualizar.")
+                informar("No se encontró el empleado para eliminar.")
             else:
                 connection.commit()
-                print("Empleado actualizado correctamente.")
-        except oracledb.DatabaseError as e:
-            error, = e.args
-            print("Error al actualizar empleado:", error.message)
+                cache_empleados.invalidar(rut_empleado)
+                indice_empleados.eliminar(rut_empleado)
+                auditoria.registrar(auditoria.ELIMINAR, "empleado", rut_empleado)
+                informar("Empleado eliminado correctamente.")
+                return True
+        except DatabaseError as e:
+            print("Error al eliminar empleado:", mensaje_error(e))
         finally:
             if cursor:
                 cursor.close()
-            connection.close()
-
-
-#read funcion externa
-def read_empleado(rut_empleado):
-    connection = get_connection()
-    if not connection:
-        return None
+    return False
+
+
+
+# ==============================
+# OPERACIONES POR LOTE
+# ==============================
+# Lee varios empleados: primero del caché y el resto con SELECT ... IN.
+# Devuelve un diccionario rut normalizado -> Empleado (sin los RUT que no
+# existen ni los inválidos, que no se consultan).
+@medir("empleado.read_lote")
+def read_empleados(ruts):
+    encontrados = {}
+    faltantes = []
+    for rut in dict.fromkeys(normalizar_ruts(ruts)):
+        if rut is None:
+            continue
+        en_cache, emp = cache_empleados.obtener(rut)
+        if not en_cache:
+            faltantes.append(rut)
+        elif emp is not None:
+            encontrados[rut] = emp
+    if not faltantes:
+        return encontrados
+
+    with conexion() as connection:
+        if not connection:
+            return None
 
-    cursor = None
-    try:
-        cursor = connection.cursor()
-        query = """
-            SELECT rut_empleado, nombre, direccion,
-                   telefono, email, fecha_inicio,
-                   salario, codigo_cargo, id_departamento
-            FROM empleado
-            WHERE rut_empleado = :rut_empleado
-        """
-        cursor.execute(query, {"rut_empleado": rut_empleado})
-        row = cursor.fetchone()
-        if row:
-            return Empleado(*row)
-        else:
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            leidos = {emp.rut_empleado: emp for emp in objetos_por_claves(cursor, Empleado, faltantes)}
+            for rut in faltantes:
+                cache_empleados.guardar(rut, leidos.get(rut))
+            encontrados.update(leidos)
+            return encontrados
+        except DatabaseError as e:
+            print("Error al leer empleados:", mensaje_error(e))
             return None
-    except oracledb.DatabaseError as e:
-        error, = e.args
-        print("Error al leer empleado:", error.message)
-        return None
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
+        finally:
+            if cursor:
+                cursor.close()
 
 
-#borrar delete
-def delete_empleado(rut_empleado):
-    connection = get_connection()
-    if not connection:
-        return
+# Inserta varios empleados con un executemany (array DML). Las filas que
+# fallan no detienen al resto; las que tienen RUT inválido o cargo o
+# departamento inexistente ni se envían. Devuelve una lista con el error de cada
+# empleado, en el mismo orden (None si se creó), o None si no hubo conexión.
+@medir("empleado.create_lote")
+def create_empleados(empleados):
+    errores = [
+        error or emp.validar_referencias()
+        for emp, error in zip(empleados, Empleado.normalizar_ruts_lote(empleados))
+    ]
+    validos = [i for i, error in enumerate(errores) if error is None]
+    if not validos:
+        return errores
+
+    with conexion() as connection:
+        if not connection:
+            return None
 
-    cursor = None
-    try:
-        cursor = connection.cursor()
-        query = "DELETE FROM empleado WHERE rut_empleado = :rut_empleado"
-        cursor.execute(query, {"rut_empleado": rut_empleado})
-        if cursor.rowcount == 0:
-            print("No se encontró el empleado para eliminar.")
-        else:
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            cursor.executemany(INSERT_EMPLEADO, [empleados[i].binds() for i in validos], batcherrors=True)
+            for error in cursor.getbatcherrors():
+                errores[validos[error.offset]] = error.message
             connection.commit()
-            print("Empleado eliminado correctamente.")
-    except oracledb.DatabaseError as e:
-        error, = e.args
-        print("Error al eliminar empleado:", error.message)
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
+            for i in validos:
+                cache_empleados.invalidar(empleados[i].rut_empleado)
+                if errores[i] is None:
+                    empleados[i].marcar_guardado()
+                    indice_empleados.guardar(empleados[i])
+                    auditoria.registrar(auditoria.CREAR, "empleado", empleados[i].rut_empleado)
+        except DatabaseError as e:
+            connection.rollback()
+            for i in validos:
+                errores[i] = mensaje_error(e)
+        finally:
+            if cursor:
+                cursor.close()
+    return errores
+
 
+# Búsqueda por parte del nombre o del email, con tolerancia a errores de
+# tipeo. Devuelve diccionarios {rut_empleado, nombre, email, puntaje}.
+def buscar_empleados(texto, limite=10):
+    return indice_empleados.buscar(texto, limite)
 
 
 # lista empleados
-def listar_empleados():
-    connection = get_connection()
-    if not connection:
-        return
+TAMANO_PAGINA = 500
+
+# Paginación por clave (nombre, rut_empleado): cada página continúa desde la
+# última clave leída, así Oracle no recorre las filas anteriores como con OFFSET.
+# Supone nombre NOT NULL (las filas con nombre NULL no se comparan).
+#
+# La primera página y las siguientes son consultas distintas: con un solo
+# texto y "(:nombre IS NULL OR ...)" el optimizador arma un plan que sirva
+# para los dos casos y no usa el índice como rango. Cada consulta recorre el
+# índice INDICE_PAGINA_EMPLEADOS en orden y se detiene en :tamano filas, sin
+# ordenar la tabla. En Oracle hay que crearlo una vez (SQLite lo crea solo).
+INDICE_PAGINA_EMPLEADOS = "CREATE INDEX empleado_nombre_ix ON empleado (nombre, rut_empleado)"
+
+QUERY_PRIMERA_PAGINA_EMPLEADOS = """
+    SELECT rut_empleado, nombre, telefono,
+           email, fecha_inicio, salario
+    FROM empleado
+    ORDER BY nombre, rut_empleado
+    FETCH FIRST :tamano ROWS ONLY
+"""
+
+QUERY_PAGINA_EMPLEADOS = """
+    SELECT rut_empleado, nombre, telefono,
+           email, fecha_inicio, salario
+    FROM empleado
+    WHERE nombre > :nombre
+       OR (nombre = :nombre AND rut_empleado > :rut_empleado)
+    ORDER BY nombre, rut_empleado
+    FETCH FIRST :tamano ROWS ONLY
+"""
+
+
+# Consulta y binds de la página que sigue a la clave despues_de (la primera
+# si es None). La usa también crud_async.pagina_empleados.
+def consulta_pagina(tamano_pagina, despues_de):
+    if not despues_de:
+        return QUERY_PRIMERA_PAGINA_EMPLEADOS, {"tamano": tamano_pagina}
+    nombre, rut = despues_de
+    return QUERY_PAGINA_EMPLEADOS, {"nombre": nombre, "rut_empleado": rut, "tamano": tamano_pagina}
+
+
+def _leer_pagina(cursor, tamano_pagina, despues_de):
+    cursor.execute(*consulta_pagina(tamano_pagina, despues_de))
+    return cursor.fetchall()
+
+
+def _cursor_paginado(connection, tamano_pagina):
+    cursor = connection.cursor()
+    cursor.arraysize = tamano_pagina
+    cursor.prefetchrows = tamano_pagina + 1
+    return cursor
+
+
+# Devuelve una página (lista de filas) y la clave para pedir la siguiente,
+# o None como clave si ya no quedan filas.
+@medir("empleado.listar")
+def pagina_empleados(tamano_pagina=TAMANO_PAGINA, despues_de=None):
+    with conexion() as connection:
+        if not connection:
+            return [], None
+
+        cursor = None
+        try:
+            cursor = _cursor_paginado(connection, tamano_pagina)
+            rows = _leer_pagina(cursor, tamano_pagina, despues_de)
+            siguiente = (rows[-1][1], rows[-1][0]) if len(rows) == tamano_pagina else None
+            return rows, siguiente
+        except DatabaseError as e:
+            print("Error al listar empleados:", mensaje_error(e))
+            return [], None
+        finally:
+            if cursor:
+                cursor.close()
 
-    cursor = None
-    try:
-        cursor = connection.cursor()
-        query = """
-            SELECT rut_empleado, nombre, telefono,
-                   email, fecha_inicio, salario
-            FROM empleado
-            ORDER BY nombre
-        """
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        if not rows:
-            print("No hay empleados registrados.")
+
+# Generador: entrega las filas página a página usando una sola conexión,
+# sin cargar la tabla completa en memoria. Un error de la base termina el
+# listado con un mensaje; con propagar=True se lanza (ConnectionError si no
+# hubo conexión), para que quien consume sepa que el listado quedó incompleto.
+@medir("empleado.listar")
+def iterar_empleados(tamano_pagina=TAMANO_PAGINA, despues_de=None, propagar=False):
+    with conexion() as connection:
+        if not connection:
+            if propagar:
+                raise ConnectionError("No se pudo conectar con la base de datos.")
             return
 
-        print("\nLista de empleados")
-        print("-" * 70)
-        for rut, nombre, telefono, email, fecha, salario in rows:
-            fecha_str = fecha.strftime("%Y-%m-%d") if fecha else "-"
-            print(f"RUT: {rut:<15} | Nombre: {nombre:<25} | Tel: {telefono:<12} | "
-                  f"Email: {email:<25} | Inicio: {fecha_str} | Salario: {salario}")
-    except oracledb.DatabaseError as e:
-        error, = e.args
-        print("Error al listar empleados:", error.message)
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
+        cursor = None
+        try:
+            cursor = _cursor_paginado(connection, tamano_pagina)
+            while True:
+                rows = _leer_pagina(cursor, tamano_pagina, despues_de)
+                yield from rows
+                if len(rows) < tamano_pagina:
+                    break
+                despues_de = (rows[-1][1], rows[-1][0])
+        except DatabaseError as e:
+            if propagar:
+                raise
+            print("Error al listar empleados:", mensaje_error(e))
+        finally:
+            if cursor:
+                cursor.close()
+
+
+def _imprimir_fila_empleado(rut, nombre, telefono, email, fecha, salario):
+    fecha_str = fecha.strftime("%Y-%m-%d") if fecha else "-"
+    print(f"RUT: {rut:<15} | Nombre: {nombre:<25} | Tel: {telefono:<12} | "
+          f"Email: {email:<25} | Inicio: {fecha_str} | Salario: {salario}")
+
+
+def listar_empleados(tamano_pagina=TAMANO_PAGINA, despues_de=None):
+    hay_filas = False
+    for row in iterar_empleados(tamano_pagina, despues_de):
+        if not hay_filas:
+            print("\nLista de empleados")
+            print("-" * 70)
+            hay_filas = True
+        _imprimir_fila_empleado(*row)
+    if not hay_filas:
+        print("No hay empleados registrados.")
 
 
 #menu
@@ -212,16 +445,21 @@ def print_menu():
     print("3. Actualizar Empleado")
     print("4. Eliminar Empleado")
     print("5. Listar Empleados")
-    print("6. Salir")
+    print("6. Buscar Empleados por nombre o email")
+    print("7. Salir")
 
 
 def main():
+    precargar()     # cargos y departamentos para mostrar nombres y validar
     while True:
         print_menu()
-        opcion = input("Elige una opción (1-6): ").strip()
+        opcion = input("Elige una opción (1-7): ").strip()
 
         if opcion == "1":
-            rut = input("RUT empleado: ").strip()
+            rut = normalizar_rut(input("RUT empleado: "))
+            if rut is None:
+                print("RUT inválido.")
+                continue
             nombre = input("Nombre: ").strip()
             direccion = input("Dirección: ").strip()
             telefono = input("Teléfono: ").strip()
@@ -265,8 +503,8 @@ def main():
                 print(f"Email: {emp.email}")
                 print(f"Fecha inicio: {emp.fecha_inicio}")
                 print(f"Salario: {emp.salario}")
-                print(f"Código cargo: {emp.codigo_cargo}")
-                print(f"ID departamento: {emp.id_departamento}")
+                print(f"Cargo: {emp.codigo_cargo} ({nombre_cargo(emp.codigo_cargo) or '-'})")
+                print(f"Departamento: {emp.id_departamento} ({nombre_departamento(emp.id_departamento) or '-'})")
             else:
                 print("Empleado no encontrado.")
 
@@ -328,6 +566,15 @@ def main():
             listar_empleados()
 
         elif opcion == "6":
+            texto = input("Nombre o email (puede ser parcial): ").strip()
+            encontrados = buscar_empleados(texto)
+            if not encontrados:
+                print("No se encontraron empleados.")
+            for fila in encontrados:
+                print(f"RUT: {fila['rut_empleado']:<15} | Nombre: {fila['nombre'] or '':<25} | "
+                      f"Email: {fila['email'] or ''}")
+
+        elif opcion == "7":
             print("Saliendo del programa de empleados.")
             break
 
@@ -335,5 +582,33 @@ def main():
             print("Opción no válida. Intente nuevamente.")
 
 
+# Uso sin menú:
+#   python programa_crud_empleado.py listar [--pagina 100] [--despues NOMBRE RUT]
+# Con --pagina se imprime una sola página y la clave para continuar.
+def main_listar(argv):
+    parser = argparse.ArgumentParser(prog="programa_crud_empleado.py listar")
+    parser.add_argument("--pagina", type=int, help="cantidad de filas por página")
+    parser.add_argument("--despues", nargs=2, metavar=("NOMBRE", "RUT"),
+                        help="continuar después de esta clave")
+    args = parser.parse_args(argv)
+
+    despues_de = tuple(args.despues) if args.despues else None
+    if not args.pagina:
+        listar_empleados(despues_de=despues_de)
+        return
+
+    rows, siguiente = pagina_empleados(args.pagina, despues_de)
+    if not rows:
+        print("No hay empleados registrados.")
+        return
+    for row in rows:
+        _imprimir_fila_empleado(*row)
+    if siguiente:
+        print(f'\nSiguiente página: --despues "{siguiente[0]}" "{siguiente[1]}"')
+
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "listar":
+        main_listar(sys.argv[2:])
+    else:
+        main()
@@ -1,138 +1,546 @@
-import oracledb
-import bcrypt
+import argparse
+import sys
+import time
 from datetime import datetime
-from conexion import get_connection
+import auditoria
+from archivos import FilaInvalida, leer_filas
+from autenticacion import get_servicio, cerrar_servicio
+from conexion import DatabaseError, IntegrityError, conexion, mensaje_error
+from filas import MAXIMO_IN
+from instrumentacion import medir
+from mensajes import informar
+from referencias import nombre_rol, precargar, validar_rol
+from validacion_rut import normalizar_rut, normalizar_ruts
+
+INSERT_USUARIO = """
+    INSERT INTO usuario (rut_usuario, password_hash, codigo_rol)
+    VALUES (:rut, :hash, :rol)
+"""
+
+DESACTIVAR_USUARIO = "UPDATE usuario SET estado = 'I' WHERE rut_usuario = :rut"
 
 
 # ==============================
 # CREAR USUARIO
 # ==============================
-def crear_usuario():
-    connection = get_connection()
-    if not connection:
-        return
+# Devuelve True si el usuario quedó creado, False si se rechazó (RUT
+# inválido, rol inexistente o RUT repetido) y None si no hubo conexión, la
+# base falló o bcrypt no respondió a tiempo.
+@medir("usuario.create")
+def registrar_usuario(rut, password, codigo_rol):
+    rut = normalizar_rut(rut)
+    if rut is None:
+        informar("Error al crear usuario: RUT inválido.")
+        return False
 
-    rut = input("Ingrese RUT del usuario: ").strip()
-    password = input("Ingrese contraseña: ").strip()
-    codigo_rol = input("Ingrese código de rol (por ejemplo: ADMIN o USER): ").strip().upper()
+    # Rol inexistente: se rechaza antes de calcular bcrypt y de ir a la base
+    error = validar_rol(codigo_rol)
+    if error:
+        informar(f"Error al crear usuario: {error}")
+        return False
 
-    # Hashear contraseña
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-
-    cursor = connection.cursor()
+    # Hashear contraseña (en el pool de procesos de autenticación)
     try:
-        cursor.execute("""
-            INSERT INTO usuario (rut_usuario, password_hash, codigo_rol)
-            VALUES (:rut, :hash, :rol)
-        """, {
-            'rut': rut,
-            'hash': password_hash.decode('utf-8'),
-            'rol': codigo_rol
-        })
-        connection.commit()
-        print("Usuario creado exitosamente.")
-    except oracledb.IntegrityError:
-        print("El RUT ingresado ya existe.")
-    except oracledb.DatabaseError as e:
+        password_hash = get_servicio().hashear(password)
+    except TimeoutError as e:
         print(f"Error al crear usuario: {e}")
-    finally:
-        cursor.close()
-        connection.close()
+        return None
+
+    with conexion() as connection:
+        if not connection:
+            return None
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute(INSERT_USUARIO, {
+                'rut': rut,
+                'hash': password_hash,
+                'rol': codigo_rol
+            })
+            connection.commit()
+            auditoria.registrar(auditoria.CREAR, "usuario", rut, f"rol {codigo_rol}")
+            informar("Usuario creado exitosamente.")
+            return True
+        except IntegrityError:
+            informar("El RUT ingresado ya existe.")
+            return False
+        except DatabaseError as e:
+            print(f"Error al crear usuario: {e}")
+            return None
+        finally:
+            cursor.close()
+
+
+def crear_usuario():
+    rut = input("Ingrese RUT del usuario: ").strip()
+    password = input("Ingrese contraseña: ").strip()
+    codigo_rol = input("Ingrese código de rol (por ejemplo: ADMIN o USER): ").strip().upper()
+    registrar_usuario(rut, password, codigo_rol)
 
 
 # ==============================
 # LOGIN (AUTENTICACIÓN)
 # ==============================
-def login_usuario():
-    connection = get_connection()
-    if not connection:
+LOGIN_OK = "OK"
+LOGIN_INACTIVO = "INACTIVO"
+LOGIN_CLAVE_INCORRECTA = "CLAVE_INCORRECTA"
+LOGIN_NO_ENCONTRADO = "NO_ENCONTRADO"
+
+MENSAJES_LOGIN = {
+    LOGIN_OK: "Autenticación exitosa.",
+    LOGIN_INACTIVO: "El usuario está inactivo.",
+    LOGIN_CLAVE_INCORRECTA: "Contraseña incorrecta.",
+    LOGIN_NO_ENCONTRADO: "Usuario no encontrado."
+}
+
+
+# Si el hash guardado usa un costo distinto al configurado se regenera.
+# La condición sobre el hash anterior evita pisar un cambio de clave concurrente.
+# El hash se calcula sin sesión; la sesión se toma solo para el UPDATE.
+def _rehash_si_corresponde(rut, password, stored_hash):
+    servicio = get_servicio()
+    if not servicio.necesita_rehash(stored_hash):
+        return
+    try:
+        nuevo_hash = servicio.hashear(password)
+    except TimeoutError as e:
+        # el login ya fue válido; el rehash se reintenta en el próximo login
+        print(f"No se pudo actualizar el hash de la contraseña: {e}")
         return
 
-    rut = input("Ingrese RUT de usuario: ").strip()
-    password = input("Ingrese contraseña: ").strip()
+    with conexion() as connection:
+        if not connection:
+            return
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                UPDATE usuario SET password_hash = :nuevo
+                WHERE rut_usuario = :rut AND password_hash = :anterior
+            """, {'nuevo': nuevo_hash, 'rut': rut, 'anterior': stored_hash})
+            connection.commit()
+        except DatabaseError as e:
+            print(f"No se pudo actualizar el hash de la contraseña: {e}")
+        finally:
+            if cursor:
+                cursor.close()
+
+
+# Devuelve una de las constantes LOGIN_*, o None si hubo un error. La
+# sesión se devuelve al pool después del SELECT: bcrypt (y la espera en su
+# pool de procesos) no la retiene, así los logins concurrentes no agotan
+# el pool de sesiones.
+@medir("usuario.login")
+def autenticar_usuario(rut, password):
+    # un RUT mal formado no puede existir: no se consulta la base
+    rut = normalizar_rut(rut)
+    if rut is None:
+        return LOGIN_NO_ENCONTRADO
+
+    with conexion() as connection:
+        if not connection:
+            return None
 
-    cursor = connection.cursor()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(
+                "SELECT password_hash, estado FROM usuario WHERE rut_usuario = :rut",
+                {'rut': rut}
+            )
+            result = cursor.fetchone()
+        except DatabaseError as e:
+            print(f"Error al autenticar: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    if not result:
+        return LOGIN_NO_ENCONTRADO
+    stored_hash, estado = result
+    if estado == 'I':
+        return LOGIN_INACTIVO
     try:
-        cursor.execute(
-            "SELECT password_hash, estado FROM usuario WHERE rut_usuario = :rut",
-            {'rut': rut}
-        )
-        result = cursor.fetchone()
-        if result:
-            stored_hash, estado = result
-            if estado == 'I':
-                print("El usuario está inactivo.")
-            elif bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8')):
-                print("Autenticación exitosa.")
-            else:
-                print("Contraseña incorrecta.")
-        else:
-            print("Usuario no encontrado.")
-    except oracledb.DatabaseError as e:
+        if not get_servicio().verificar(password, stored_hash):
+            return LOGIN_CLAVE_INCORRECTA
+    except TimeoutError as e:
         print(f"Error al autenticar: {e}")
-    finally:
-        cursor.close()
-        connection.close()
+        return None
+    _rehash_si_corresponde(rut, password, stored_hash)
+    return LOGIN_OK
+
+
+def login_usuario():
+    rut = input("Ingrese RUT de usuario: ").strip()
+    password = input("Ingrese contraseña: ").strip()
+    resultado = autenticar_usuario(rut, password)
+    if resultado:
+        print(MENSAJES_LOGIN[resultado])
 
 
 # ==============================
 # LISTAR USUARIOS
 # ==============================
+@medir("usuario.listar")
 def listar_usuarios():
-    connection = get_connection()
-    if not connection:
-        return
+    with conexion() as connection:
+        if not connection:
+            return
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT rut_usuario, codigo_rol, fecha_ingreso, estado 
+                FROM usuario 
+                ORDER BY fecha_ingreso DESC
+            """)
+            rows = cursor.fetchall()
+            if rows:
+                print("\nUsuarios registrados:")
+                print("-" * 60)
+                for rut, rol, fecha, estado in rows:
+                    estado_str = "Activo" if estado == 'A' else "Inactivo"
+                    fecha_fmt = fecha.strftime("%Y-%m-%d %H:%M:%S") if fecha else "-"
+                    print(f"RUT: {rut:<15} | Rol: {rol:<8} ({nombre_rol(rol) or '-'}) | Fecha: {fecha_fmt} | Estado: {estado_str}")
+            else:
+                print("No hay usuarios registrados.")
+        except DatabaseError as e:
+            print(f"Error al listar usuarios: {e}")
+        finally:
+            cursor.close()
 
-    cursor = connection.cursor()
-    try:
-        cursor.execute("""
-            SELECT rut_usuario, codigo_rol, fecha_ingreso, estado 
-            FROM usuario 
-            ORDER BY fecha_ingreso DESC
-        """)
-        rows = cursor.fetchall()
-        if rows:
-            print("\nUsuarios registrados:")
-            print("-" * 60)
-            for rut, rol, fecha, estado in rows:
-                estado_str = "Activo" if estado == 'A' else "Inactivo"
-                fecha_fmt = fecha.strftime("%Y-%m-%d %H:%M:%S") if fecha else "-"
-                print(f"RUT: {rut:<15} | Rol: {rol:<8} | Fecha: {fecha_fmt} | Estado: {estado_str}")
-        else:
-            print("No hay usuarios registrados.")
-    except oracledb.DatabaseError as e:
-        print(f"Error al listar usuarios: {e}")
-    finally:
-        cursor.close()
-        connection.close()
+
+# Generador de (rut, rol, fecha_ingreso, estado) sin cargar todas las filas:
+# el cursor las trae de a "arraysize" por ida y vuelta. Con propagar=True
+# los errores se lanzan en lugar de imprimirse (como en iterar_empleados).
+@medir("usuario.listar")
+def iterar_usuarios(arraysize=500, propagar=False):
+    with conexion() as connection:
+        if not connection:
+            if propagar:
+                raise ConnectionError("No se pudo conectar con la base de datos.")
+            return
+
+        cursor = connection.cursor()
+        try:
+            cursor.arraysize = arraysize
+            cursor.execute("""
+                SELECT rut_usuario, codigo_rol, fecha_ingreso, estado
+                FROM usuario
+                ORDER BY fecha_ingreso DESC
+            """)
+            yield from cursor
+        except DatabaseError as e:
+            if propagar:
+                raise
+            print(f"Error al listar usuarios: {e}")
+        finally:
+            cursor.close()
 
 
 # ==============================
 # DESACTIVAR USUARIO
 # ==============================
-def desactivar_usuario():
-    connection = get_connection()
-    if not connection:
-        return
+# Devuelve True si el usuario quedó desactivado.
+@medir("usuario.desactivar")
+def desactivar_usuario_rut(rut):
+    rut = normalizar_rut(rut)
+    if rut is None:
+        informar("RUT inválido.")
+        return False
+
+    with conexion() as connection:
+        if not connection:
+            return False
 
+        cursor = connection.cursor()
+        try:
+            cursor.execute(DESACTIVAR_USUARIO, {'rut': rut})
+            if cursor.rowcount == 0:
+                informar("No se encontró el usuario.")
+            else:
+                connection.commit()
+                auditoria.registrar(auditoria.DESACTIVAR, "usuario", rut)
+                informar("Usuario desactivado correctamente.")
+                return True
+        except DatabaseError as e:
+            print(f"Error al desactivar usuario: {e}")
+        finally:
+            cursor.close()
+    return False
+
+
+def desactivar_usuario():
     rut = input("Ingrese RUT del usuario a desactivar: ").strip()
+    desactivar_usuario_rut(rut)
 
-    cursor = connection.cursor()
-    try:
-        cursor.execute(
-            "UPDATE usuario SET estado = 'I' WHERE rut_usuario = :rut",
-            {'rut': rut}
-        )
-        if cursor.rowcount == 0:
-            print("No se encontró el usuario.")
+
+# ==============================
+# OPERACIONES POR LOTE
+# ==============================
+TAMANO_LOTE_USUARIOS = 1000
+
+# Resultado por RUT de desactivar_usuarios
+DESACTIVACION_OK = "DESACTIVADO"
+DESACTIVACION_YA_INACTIVO = "YA_INACTIVO"
+DESACTIVACION_NO_ENCONTRADO = "NO_ENCONTRADO"
+DESACTIVACION_RUT_INVALIDO = "RUT_INVALIDO"
+
+DESACTIVAR_POR_CRITERIO = """
+    UPDATE usuario SET estado = 'I'
+    WHERE estado = 'A'
+      AND (:rol IS NULL OR codigo_rol = :rol)
+      AND (:antes IS NULL OR fecha_ingreso < :antes)
+    RETURNING rut_usuario INTO :desactivados
+"""
+
+
+def _marcadores(cantidad):
+    return ", ".join(f":k{i}" for i in range(cantidad))
+
+
+# RUT de la lista que existen en usuario (un SELECT ... IN por cada MAXIMO_IN)
+def _ruts_existentes(cursor, ruts):
+    existentes = set()
+    for i in range(0, len(ruts), MAXIMO_IN):
+        parte = ruts[i:i + MAXIMO_IN]
+        cursor.execute(f"SELECT rut_usuario FROM usuario WHERE rut_usuario IN ({_marcadores(len(parte))})", parte)
+        existentes.update(rut for rut, in cursor.fetchall())
+    return existentes
+
+
+# Crea muchos usuarios. "usuarios" es una secuencia de (rut, password,
+# codigo_rol). Antes de calcular bcrypt se descartan las filas con RUT
+# inválido, repetido o que ya existe, rol inexistente o contraseña vacía.
+# Los hash se calculan en todos los procesos del servicio de autenticación
+# y los usuarios se insertan con executemany por lotes y un solo commit.
+# Devuelve {"errores": [None o mensaje por fila], "creados", "segundos_hash",
+# "segundos_base", "segundos"}, o None si no hay conexión.
+@medir("usuario.create_lote")
+def registrar_usuarios(usuarios):
+    inicio = time.perf_counter()
+    usuarios = list(usuarios)
+    ruts = normalizar_ruts([rut for rut, _, _ in usuarios])
+    errores = [None] * len(usuarios)
+    vistos = set()
+    for i, ((rut_original, password, codigo_rol), rut) in enumerate(zip(usuarios, ruts)):
+        if rut is None:
+            errores[i] = f"RUT inválido: {rut_original}"
+        elif rut in vistos:
+            errores[i] = "RUT repetido en el lote."
+        elif not password:
+            errores[i] = "Contraseña vacía."
+        else:
+            errores[i] = validar_rol(codigo_rol)
+            vistos.add(rut)
+
+    # la sesión no queda tomada mientras se calcula bcrypt
+    candidatos = [i for i, error in enumerate(errores) if error is None]
+    with conexion() as connection:
+        if not connection:
+            return None
+        cursor = connection.cursor()
+        try:
+            existentes = _ruts_existentes(cursor, [ruts[i] for i in candidatos])
+        except DatabaseError as e:
+            print(f"Error al crear usuarios: {mensaje_error(e)}")
+            return None
+        finally:
+            cursor.close()
+    for i in candidatos:
+        if ruts[i] in existentes:
+            errores[i] = "El RUT ya existe."
+    validos = [i for i in candidatos if errores[i] is None]
+
+    inicio_hash = time.perf_counter()
+    hashes = get_servicio().hashear_lote([usuarios[i][1] for i in validos]) if validos else []
+    segundos_hash = time.perf_counter() - inicio_hash
+
+    filas = []
+    binds = []
+    for i, password_hash in zip(validos, hashes):
+        if password_hash is None:
+            errores[i] = "No se pudo calcular el hash: servicio de autenticación saturado."
+        else:
+            filas.append(i)
+            binds.append({'rut': ruts[i], 'hash': password_hash, 'rol': usuarios[i][2]})
+
+    inicio_base = time.perf_counter()
+    if binds:
+        with conexion() as connection:
+            if not connection:
+                return None
+            cursor = connection.cursor()
+            try:
+                for inicio_lote in range(0, len(binds), TAMANO_LOTE_USUARIOS):
+                    cursor.executemany(INSERT_USUARIO, binds[inicio_lote:inicio_lote + TAMANO_LOTE_USUARIOS],
+                                       batcherrors=True)
+                    for error in cursor.getbatcherrors():
+                        errores[filas[inicio_lote + error.offset]] = error.message
+                connection.commit()
+                for i in filas:
+                    if errores[i] is None:
+                        auditoria.registrar(auditoria.CREAR, "usuario", ruts[i], f"rol {usuarios[i][2]}")
+            except DatabaseError as e:
+                connection.rollback()
+                for i in filas:
+                    errores[i] = mensaje_error(e)
+            finally:
+                cursor.close()
+
+    fin = time.perf_counter()
+    return {
+        "errores": errores,
+        "creados": sum(1 for i in filas if errores[i] is None),
+        "segundos_hash": segundos_hash,
+        "segundos_base": fin - inicio_base,
+        "segundos": fin - inicio
+    }
+
+
+def _desactivar_por_ruts(cursor, ruts):
+    normalizados = normalizar_ruts(ruts)
+    validos = list(dict.fromkeys(rut for rut in normalizados if rut is not None))
+    desactivados = set()
+    for i in range(0, len(validos), MAXIMO_IN):
+        parte = validos[i:i + MAXIMO_IN]
+        variable = cursor.var(str)
+        binds = {f"k{j}": rut for j, rut in enumerate(parte)}
+        binds["desactivados"] = variable
+        cursor.execute(f"""
+            UPDATE usuario SET estado = 'I'
+            WHERE estado = 'A' AND rut_usuario IN ({_marcadores(len(parte))})
+            RETURNING rut_usuario INTO :desactivados
+        """, binds)
+        desactivados.update(variable.getvalue() or [])
+
+    # solo si alguno no se desactivó: ¿no existe o ya estaba inactivo?
+    resto = [rut for rut in validos if rut not in desactivados]
+    existentes = _ruts_existentes(cursor, resto) if resto else set()
+    resultados = []
+    for original, rut in zip(ruts, normalizados):
+        if rut is None:
+            resultados.append((original, DESACTIVACION_RUT_INVALIDO))
+        elif rut in desactivados:
+            resultados.append((rut, DESACTIVACION_OK))
+        elif rut in existentes:
+            resultados.append((rut, DESACTIVACION_YA_INACTIVO))
         else:
+            resultados.append((rut, DESACTIVACION_NO_ENCONTRADO))
+    return resultados
+
+
+# Desactiva muchos usuarios con UPDATE por conjunto: los RUT de "ruts" (un
+# UPDATE ... IN por cada MAXIMO_IN) o todos los activos con ese codigo_rol
+# y/o con fecha_ingreso anterior a ingreso_antes_de (un solo UPDATE).
+# RETURNING entrega los RUT desactivados en la misma ida y vuelta. Devuelve
+# {"resultados": [(rut, DESACTIVACION_*)], "desactivados", "segundos"}, o
+# None si hubo un error (en ese caso no se desactiva ninguno).
+@medir("usuario.desactivar_lote")
+def desactivar_usuarios(ruts=None, codigo_rol=None, ingreso_antes_de=None):
+    criterio = codigo_rol is not None or ingreso_antes_de is not None
+    if (ruts is None) == (not criterio):
+        print("Indique una lista de RUT o un criterio (rol o fecha de ingreso), no ambos.")
+        return None
+
+    inicio = time.perf_counter()
+    with conexion() as connection:
+        if not connection:
+            return None
+
+        cursor = connection.cursor()
+        try:
+            if criterio:
+                variable = cursor.var(str)
+                cursor.execute(DESACTIVAR_POR_CRITERIO, {
+                    'rol': codigo_rol,
+                    'antes': ingreso_antes_de,
+                    'desactivados': variable
+                })
+                resultados = [(rut, DESACTIVACION_OK) for rut in variable.getvalue() or []]
+            else:
+                resultados = _desactivar_por_ruts(cursor, list(ruts))
             connection.commit()
-            print("Usuario desactivado correctamente.")
-    except oracledb.DatabaseError as e:
-        print(f"Error al desactivar usuario: {e}")
-    finally:
-        cursor.close()
-        connection.close()
+        except DatabaseError as e:
+            connection.rollback()
+            print(f"Error al desactivar usuarios: {mensaje_error(e)}")
+            return None
+        finally:
+            cursor.close()
+
+    desactivados = {rut for rut, resultado in resultados if resultado == DESACTIVACION_OK}
+    for rut in desactivados:
+        auditoria.registrar(auditoria.DESACTIVAR, "usuario", rut, "lote")
+    return {
+        "resultados": resultados,
+        "desactivados": len(desactivados),
+        "segundos": time.perf_counter() - inicio
+    }
+
+
+def _texto(valor):
+    return str(valor).strip() if valor is not None else ""
+
+
+# Archivo CSV o JSONL con columnas rut_usuario, password y codigo_rol. Las
+# líneas ilegibles no detienen la carga: se informan con su número de fila
+# junto a los rechazos de registrar_usuarios. En el resultado, "errores"
+# tiene un elemento por fila del archivo.
+def crear_usuarios_desde_archivo(ruta):
+    filas = []          # (número de fila, (rut, password, rol))
+    errores = []
+    try:
+        for numero_fila, fila in enumerate(leer_filas(ruta, errores=True), start=1):
+            if isinstance(fila, FilaInvalida):
+                errores.append(fila.mensaje)
+                continue
+            errores.append(None)
+            filas.append((numero_fila, (
+                fila.get("rut_usuario"), _texto(fila.get("password")), _texto(fila.get("codigo_rol")).upper()
+            )))
+    except OSError as e:
+        print(f"No se pudo leer el archivo: {mensaje_error(e)}")
+        return None
+
+    resultado = registrar_usuarios([usuario for _, usuario in filas])
+    if resultado is None:
+        return None
+    ruts = {}
+    for (numero_fila, (rut, _, _)), error in zip(filas, resultado["errores"]):
+        errores[numero_fila - 1] = error
+        ruts[numero_fila] = rut
+    resultado["errores"] = errores
+    for numero_fila, error in enumerate(errores, start=1):
+        if error:
+            print(f"Fila {numero_fila} ({ruts.get(numero_fila, '-')}): {error}")
+    print(f"Usuarios creados: {resultado['creados']} de {len(errores)}")
+    print(f"Tiempo: {resultado['segundos']:.2f} s (bcrypt {resultado['segundos_hash']:.2f} s, "
+          f"base {resultado['segundos_base']:.2f} s)")
+    return resultado
+
+
+def _imprimir_desactivacion(resultado):
+    for rut, estado in resultado["resultados"]:
+        if estado != DESACTIVACION_OK:
+            print(f"{rut}: {estado}")
+    print(f"Usuarios desactivados: {resultado['desactivados']}")
+    print(f"Tiempo: {resultado['segundos']:.3f} s")
+
+
+def desactivar_usuarios_lote():
+    texto = input("RUT separados por coma (en blanco para usar un criterio): ").strip()
+    if texto:
+        resultado = desactivar_usuarios([rut for rut in texto.split(",") if rut.strip()])
+    else:
+        codigo_rol = input("Código de rol (en blanco para cualquiera): ").strip().upper() or None
+        fecha_txt = input("Ingresados antes de (YYYY-MM-DD, en blanco para cualquier fecha): ").strip()
+        try:
+            antes = datetime.strptime(fecha_txt, "%Y-%m-%d") if fecha_txt else None
+        except ValueError:
+            print("Fecha inválida.")
+            return
+        resultado = desactivar_usuarios(codigo_rol=codigo_rol, ingreso_antes_de=antes)
+    if resultado:
+        _imprimir_desactivacion(resultado)
 
 
 # ==============================
@@ -144,13 +552,16 @@ def print_menu():
     print("2. Iniciar Sesión (Login)")
     print("3. Listar Usuarios")
     print("4. Desactivar Usuario")
-    print("5. Salir")
+    print("5. Crear Usuarios desde archivo")
+    print("6. Desactivar Usuarios por lote")
+    print("7. Salir")
 
 
 def main():
+    precargar()
     while True:
         print_menu()
-        opcion = input("Seleccione una opción (1-5): ")
+        opcion = input("Seleccione una opción (1-7): ")
 
         if opcion == '1':
             crear_usuario()
@@ -161,11 +572,63 @@ def main():
         elif opcion == '4':
             desactivar_usuario()
         elif opcion == '5':
+            ruta = input("Ruta del archivo (.csv o .jsonl con rut_usuario, password, codigo_rol): ").strip()
+            crear_usuarios_desde_archivo(ruta)
+        elif opcion == '6':
+            desactivar_usuarios_lote()
+        elif opcion == '7':
             print("Saliendo del sistema de usuarios.")
+            cerrar_servicio()
             break
         else:
             print("Opción no válida. Intente nuevamente.")
 
 
+# Uso sin menú:
+#   python programa_crud_usuario.py crear-lote usuarios.csv
+#   python programa_crud_usuario.py desactivar-lote [RUT ...] [--archivo ruts.txt]
+#                                   [--rol USER] [--antes 2024-01-01]
+def main_crear_lote(argv):
+    parser = argparse.ArgumentParser(prog="programa_crud_usuario.py crear-lote")
+    parser.add_argument("archivo", help=".csv o .jsonl con rut_usuario, password y codigo_rol")
+    args = parser.parse_args(argv)
+    try:
+        crear_usuarios_desde_archivo(args.archivo)
+    finally:
+        cerrar_servicio()
+
+
+def main_desactivar_lote(argv):
+    parser = argparse.ArgumentParser(prog="programa_crud_usuario.py desactivar-lote")
+    parser.add_argument("ruts", nargs="*", help="RUT a desactivar")
+    parser.add_argument("--archivo", help="archivo con un RUT por línea")
+    parser.add_argument("--rol", help="desactivar los usuarios activos con este rol")
+    parser.add_argument("--antes", help="desactivar los ingresados antes de esta fecha (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    try:
+        antes = datetime.strptime(args.antes, "%Y-%m-%d") if args.antes else None
+    except ValueError as e:
+        print(f"Fecha inválida en --antes: {mensaje_error(e)}")
+        sys.exit(1)
+    ruts = list(args.ruts)
+    if args.archivo:
+        try:
+            with open(args.archivo, encoding="utf-8") as archivo:
+                ruts += [linea.strip() for linea in archivo if linea.strip()]
+        except OSError as e:
+            print(f"No se pudo leer el archivo: {mensaje_error(e)}")
+            sys.exit(1)
+    rol = args.rol.upper() if args.rol else None
+    resultado = desactivar_usuarios(ruts or None, rol, antes)
+    if resultado:
+        _imprimir_desactivacion(resultado)
+
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "crear-lote":
+        main_crear_lote(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "desactivar-lote":
+        main_desactivar_lote(sys.argv[2:])
+    else:
+        main()
@@ -0,0 +1,183 @@
+# Caché de las tablas de referencia: cargo, departamento y rol.
+#
+# Son tablas pequeñas que casi no cambian, así que se leen completas una vez
+# (al llamar precargar() o en el primer uso) y se guardan como diccionarios.
+# Con eso los menús muestran nombres sin consultas extra, y las cargas y los
+# create/update rechazan un código inexistente antes de enviar el INSERT o
+# UPDATE a la base.
+#
+# Refresco: cada REFRESCO segundos se vuelven a leer las tablas en el
+# siguiente uso. La versión aumenta solo si el contenido cambió, así quien
+# guarda datos derivados puede comparar get_referencias().version. Si un
+# código no aparece y la copia tiene más de REFRESCO_POR_FALTANTE segundos,
+# se relee antes de rechazarlo (por si el código se acaba de crear).
+#
+# Si una lectura falla (base caída), no se vuelve a intentar en el uso
+# normal hasta pasados REINTENTO_TRAS_FALLO segundos: una carga masiva no
+# paga un intento de conexión (y su timeout) por fila. Mientras tanto se
+# sigue con la copia anterior o, si no hay, la base valida las claves
+# foráneas. precargar() y refrescar() siempre intentan.
+import threading
+import time
+
+import conexion
+from conexion import DatabaseError, get_connection, mensaje_error
+from instrumentacion import medir
+
+REFRESCO = 600                  # s entre relecturas periódicas
+REFRESCO_POR_FALTANTE = 5       # s mínimos entre relecturas por un código desconocido
+REINTENTO_TRAS_FALLO = 30       # s sin reintentar la lectura después de un fallo
+
+
+class Referencias:
+    __slots__ = ("cargos", "departamentos", "roles", "version", "leido_en", "_backend")
+
+    def __init__(self, cargos, departamentos, roles, version, backend):
+        self.cargos = cargos                    # codigo_cargo -> nombre_cargo
+        self.departamentos = departamentos      # id_departamento -> nombre_departamento
+        self.roles = roles                      # codigo_rol -> nombre_rol
+        self.version = version
+        self.leido_en = time.monotonic()
+        self._backend = backend
+
+    def mismo_contenido(self, otras):
+        return (self.cargos, self.departamentos, self.roles) == (otras.cargos, otras.departamentos, otras.roles)
+
+
+_actuales = None
+_fallo = None       # (backend, time.monotonic()) de la última lectura fallida
+_lock = threading.Lock()
+
+
+def _leer_tabla(cursor, sql):
+    cursor.execute(sql)
+    return dict(cursor.fetchall())
+
+
+# Lee las tres tablas en una sola conexión. Devuelve una copia nueva
+# (los lectores siguen usando la anterior mientras tanto) o None si falla.
+@medir("referencias.leer")
+def _leer(version_anterior):
+    connection = get_connection()
+    if not connection:
+        return None
+
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        cargos = _leer_tabla(cursor, "SELECT codigo_cargo, nombre_cargo FROM cargo")
+        departamentos = _leer_tabla(cursor, "SELECT id_departamento, nombre_departamento FROM departamento")
+        roles = _leer_tabla(cursor, "SELECT codigo_rol, nombre_rol FROM rol")
+        return Referencias(cargos, departamentos, roles, version_anterior + 1, conexion.get_backend())
+    except DatabaseError as e:
+        print("Error al leer las tablas de referencia:", mensaje_error(e))
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+def _fallo_reciente():
+    fallo = _fallo
+    return fallo is not None and fallo[0] is conexion.get_backend() \
+        and time.monotonic() - fallo[1] < REINTENTO_TRAS_FALLO
+
+
+def _refrescar(respetar_fallo):
+    global _actuales, _fallo
+    with _lock:
+        anteriores = _actuales
+        # otro hilo pudo fallar mientras se esperaba el lock
+        if respetar_fallo and _fallo_reciente():
+            return anteriores
+        nuevas = _leer(anteriores.version if anteriores else 0)
+        if nuevas is None:
+            _fallo = (conexion.get_backend(), time.monotonic())
+            return anteriores
+        _fallo = None
+        if anteriores is not None and nuevas.mismo_contenido(anteriores) \
+                and nuevas._backend is anteriores._backend:
+            nuevas.version = anteriores.version
+        _actuales = nuevas
+        return nuevas
+
+
+def refrescar():
+    return _refrescar(False)
+
+
+def precargar():
+    return refrescar()
+
+
+# Copia vigente. Se relee si venció, si aún no se cargó o si se cambió de
+# backend (conexion.usar_backend), salvo que la última lectura haya fallado
+# hace menos de REINTENTO_TRAS_FALLO segundos. None si no hay copia del
+# backend actual.
+def get_referencias():
+    actuales = _actuales
+    backend = conexion.get_backend()
+    if actuales is None or actuales._backend is not backend \
+            or time.monotonic() - actuales.leido_en > REFRESCO:
+        actuales = _refrescar(True)
+        if actuales is not None and actuales._backend is not backend:
+            return None
+    return actuales
+
+
+def invalidar():
+    global _actuales, _fallo
+    with _lock:
+        _actuales = None
+        _fallo = None
+
+
+def _buscar(atributo, clave):
+    actuales = get_referencias()
+    if actuales is None:
+        return None, None
+    valores = getattr(actuales, atributo)
+    if clave is not None and clave not in valores and time.monotonic() - actuales.leido_en > REFRESCO_POR_FALTANTE:
+        actuales = _refrescar(True) or actuales
+        valores = getattr(actuales, atributo)
+    return actuales, valores.get(clave)
+
+
+# ==============================
+# NOMBRES
+# ==============================
+def nombre_cargo(codigo_cargo):
+    return _buscar("cargos", codigo_cargo)[1]
+
+
+def nombre_departamento(id_departamento):
+    return _buscar("departamentos", id_departamento)[1]
+
+
+def nombre_rol(codigo_rol):
+    return _buscar("roles", codigo_rol)[1]
+
+
+# ==============================
+# VALIDACIÓN DE CLAVES FORÁNEAS
+# ==============================
+# Devuelven el mensaje de error, o None si el valor es válido. NULL es
+# válido (lo decide la base). Si las referencias no se pudieron leer no se
+# rechaza nada y la base hace la validación.
+def _validar(atributo, clave, descripcion):
+    if clave is None:
+        return None
+    actuales, nombre = _buscar(atributo, clave)
+    if actuales is None or nombre is not None:
+        return None
+    return f"No existe {descripcion} {clave}."
+
+
+def validar_empleado(codigo_cargo, id_departamento):
+    return _validar("cargos", codigo_cargo, "el cargo") \
+        or _validar("departamentos", id_departamento, "el departamento")
+
+
+def validar_rol(codigo_rol):
+    return _validar("roles", codigo_rol, "el rol")
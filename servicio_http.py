@@ -0,0 +1,583 @@
+# Servicio HTTP/JSON con las operaciones de empleado, cliente y usuario.
+#
+# Uso: python servicio_http.py [--host 127.0.0.1] [--puerto 8080] [--backend sqlite]
+#
+# Es un proceso de larga vida: las sesiones salen del pool del backend
+# (conexion.py) y los caché y el pool de bcrypt se mantienen entre
+# solicitudes. Cada solicitud se atiende en un hilo; la cantidad de sesiones
+# abiertas la limita el pool, no la cantidad de hilos.
+#
+# Rutas:
+#   GET    /salud                         estado del backend y del pool
+#   GET    /metricas[?formato=prometheus] pool, caché, bcrypt, auditoría y métricas por operación
+#   GET    /referencias                   cargos, departamentos y roles (con versión)
+#   GET    /empleados[?pagina=500]        listado completo en JSON Lines (streaming)
+#   GET    /empleados/<rut>               incluye "version"
+#   POST   /empleados                     un objeto o una lista (executemany)
+#   POST   /empleados/buscar              {"ruts": [...]} -> SELECT ... IN
+#   GET    /empleados/buscar?q=texto      por nombre o email parcial (índice en memoria)
+#   PATCH  /empleados/<rut>               solo los campos enviados; con "version"
+#                                         responde 409 si la fila cambió desde esa versión
+#   DELETE /empleados/<rut>
+#   (lo mismo para /clientes, más POST /clientes/upsert con MERGE por lotes)
+#   GET    /usuarios                      JSON Lines (streaming)
+#   POST   /usuarios                      {"rut", "password", "codigo_rol"}
+#   POST   /usuarios/login                {"rut", "password"}
+#   POST   /usuarios/<rut>/desactivar
+#
+# El encabezado X-Usuario, si viene, es el usuario que queda en la auditoría
+# de los cambios de esa solicitud. Los mensajes de resultado de los CRUD
+# ("Empleado actualizado correctamente.", etc.) no se imprimen: la respuesta
+# ya los informa.
+#
+# No tiene autenticación propia: por defecto escucha solo en 127.0.0.1.
+import argparse
+import json
+import threading
+import re
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import auditoria
+import conexion
+import instrumentacion
+import referencias
+from mensajes import sin_mensajes
+from referencias import validar_rol
+from autenticacion import cerrar_servicio, get_servicio
+from carga_masiva_empleado import convertir_fila
+from programa_crud_cliente_exception import (
+    buscar_clientes, cache_clientes, cliente_desde_fila, create_clientes, delete_cliente,
+    indice_clientes, iterar_clientes, read_cliente, read_clientes, upsert_clientes
+)
+from programa_crud_empleado import (
+    TAMANO_PAGINA, Empleado, buscar_empleados, cache_empleados, create_empleados,
+    delete_empleado, indice_empleados, iterar_empleados, read_empleado, read_empleados
+)
+from programa_crud_usuario import (
+    LOGIN_OK, MENSAJES_LOGIN, autenticar_usuario, desactivar_usuario_rut,
+    iterar_usuarios, registrar_usuario
+)
+from validacion_rut import normalizar_rut, normalizar_ruts
+
+HOST = "127.0.0.1"
+PUERTO = 8080
+MAX_LOTE = 10000                # filas o RUT por solicitud
+MAX_CUERPO = 16 * 2**20         # bytes por solicitud
+TAMANO_BLOQUE = 64 * 1024       # bytes por chunk en las respuestas streaming
+
+COLUMNAS_LISTADO_EMPLEADOS = ("rut_empleado", "nombre", "telefono", "email", "fecha_inicio", "salario")
+COLUMNAS_LISTADO_USUARIOS = ("rut_usuario", "codigo_rol", "fecha_ingreso", "estado")
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+# ==============================
+# CONVERSIONES JSON
+# ==============================
+def _json_default(valor):
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    raise TypeError(f"No se puede convertir a JSON: {type(valor).__name__}")
+
+
+def _a_json(datos):
+    return json.dumps(datos, default=_json_default, ensure_ascii=False)
+
+
+def _a_dict(obj):
+    return dict(zip(obj.COLUMNAS, obj.valores()))
+
+
+def _empleado_desde_json(datos):
+    if not isinstance(datos, dict):
+        raise ErrorHTTP(400, "Cada empleado debe ser un objeto JSON.")
+    try:
+        return Empleado(**convertir_fila(datos))
+    except (ValueError, TypeError) as e:
+        raise ErrorHTTP(400, f"Formato inválido: {e}")
+
+
+def _cliente_desde_json(datos):
+    if not isinstance(datos, dict):
+        raise ErrorHTTP(400, "Cada cliente debe ser un objeto JSON.")
+    try:
+        return cliente_desde_fila(datos)
+    except ValueError as e:
+        raise ErrorHTTP(400, f"Formato inválido: {e}")
+
+
+def _lista(datos, nombre):
+    filas = datos if isinstance(datos, list) else [datos]
+    if len(filas) > MAX_LOTE:
+        raise ErrorHTTP(413, f"Máximo {MAX_LOTE} {nombre} por solicitud.")
+    return filas
+
+
+def _ruts(datos):
+    ruts = datos.get("ruts") if isinstance(datos, dict) else None
+    if not isinstance(ruts, list):
+        raise ErrorHTTP(400, 'Se espera {"ruts": [...]}.')
+    return _lista(ruts, "RUT")
+
+
+# ==============================
+# OPERACIONES
+# ==============================
+# Cada operación recibe (coincidencia de la ruta, parámetros de la URL,
+# cuerpo JSON) y devuelve (estado, datos) o un generador de líneas JSON.
+def _crear_lote(crear, objetos):
+    errores = crear(objetos)
+    if errores is None:
+        raise ErrorHTTP(503, "Base de datos no disponible.")
+    resultados = [
+        {"rut": getattr(obj, obj.CLAVE), "ok": error is None, "error": error}
+        for obj, error in zip(objetos, errores)
+    ]
+    creados = sum(1 for r in resultados if r["ok"])
+    estado = 201 if creados == len(resultados) else 207 if creados else 409
+    return estado, {"creados": creados, "fallidos": len(resultados) - creados, "resultados": resultados}
+
+
+# leer() devuelve los RUT normalizados; "no_encontrados" conserva el texto
+# recibido (incluye los RUT inválidos)
+def _buscar_lote(leer, ruts):
+    encontrados = leer(ruts)
+    if encontrados is None:
+        raise ErrorHTTP(503, "Base de datos no disponible.")
+    normalizados = dict(zip(ruts, normalizar_ruts(ruts)))
+    return 200, {
+        "encontrados": [_a_dict(encontrados[n]) for n in dict.fromkeys(normalizados.values()) if n in encontrados],
+        "no_encontrados": [rut for rut, n in normalizados.items() if n not in encontrados]
+    }
+
+
+# RUT de la URL: uno mal formado es 400, sin consultar la base
+def _rut(rut):
+    normalizado = normalizar_rut(rut)
+    if normalizado is None:
+        raise ErrorHTTP(400, f"RUT inválido: {rut}")
+    return normalizado
+
+
+# ?q=texto[&limite=10]
+def _buscar_texto(buscar, parametros):
+    texto = parametros.get("q", [""])[0].strip()
+    if not texto:
+        raise ErrorHTTP(400, "Falta el parámetro q.")
+    try:
+        limite = int(parametros.get("limite", [10])[0])
+    except ValueError:
+        raise ErrorHTTP(400, "limite debe ser un número.")
+    return 200, {"resultados": buscar(texto, max(1, min(limite, 100)))}
+
+
+def _con_version(obj):
+    return {**_a_dict(obj), "version": obj.version}
+
+
+def _leer_uno(leer, rut):
+    obj = leer(_rut(rut))
+    if obj is None:
+        raise ErrorHTTP(404, "No encontrado.")
+    return 200, _con_version(obj)
+
+
+# Con "version" en el cuerpo el UPDATE es condicional a esa versión (la que
+# leyó el cliente); sin ella, a la que tiene el servicio en su caché.
+# Las claves foráneas se revisan en el objeto ya convertido, antes de
+# modificar el leído: un valor inexistente es 400, no un error de la base.
+def _actualizar(leer, rut, datos, convertir):
+    if not isinstance(datos, dict):
+        raise ErrorHTTP(400, "Se espera un objeto JSON.")
+    datos = dict(datos)
+    version = datos.pop("version", None)
+    if version is not None and (not isinstance(version, int) or isinstance(version, bool)):
+        raise ErrorHTTP(400, "version debe ser un número entero.")
+    obj = leer(_rut(rut))
+    if obj is None:
+        raise ErrorHTTP(404, "No encontrado.")
+    desconocidas = [col for col in datos if col not in obj.COLUMNAS or col == obj.CLAVE]
+    if desconocidas:
+        raise ErrorHTTP(400, f"Campos no actualizables: {', '.join(desconocidas)}")
+    nuevos = convertir({**_a_dict(obj), **datos})
+    error = nuevos.validar_referencias()
+    if error:
+        raise ErrorHTTP(400, error)
+    for col in datos:
+        setattr(obj, col, getattr(nuevos, col))
+    if not obj.update(version):
+        if obj.conflicto:
+            raise ErrorHTTP(409, "La fila cambió desde que se leyó; vuelva a leerla.")
+        raise ErrorHTTP(409, "No se pudo actualizar.")
+    return 200, _con_version(obj)
+
+
+def _eliminar(eliminar, rut):
+    rut = _rut(rut)
+    if not eliminar(rut):
+        raise ErrorHTTP(404, "No encontrado o no se pudo eliminar.")
+    return 200, {"eliminado": rut}
+
+
+def _pagina(parametros):
+    try:
+        tamano = int(parametros.get("pagina", [TAMANO_PAGINA])[0])
+    except ValueError:
+        raise ErrorHTTP(400, "pagina debe ser un número.")
+    return max(1, min(tamano, MAX_LOTE))
+
+
+# Los listados piden propagar=True: un error de la base no debe verse como
+# un listado vacío o completo (ver Manejador._enviar_lineas).
+def listar_empleados(coincidencia, parametros, datos):
+    for row in iterar_empleados(_pagina(parametros), propagar=True):
+        yield dict(zip(COLUMNAS_LISTADO_EMPLEADOS, row))
+
+
+def listar_clientes(coincidencia, parametros, datos):
+    for cliente in iterar_clientes(_pagina(parametros), propagar=True):
+        yield _a_dict(cliente)
+
+
+def listar_usuarios(coincidencia, parametros, datos):
+    for row in iterar_usuarios(_pagina(parametros), propagar=True):
+        yield dict(zip(COLUMNAS_LISTADO_USUARIOS, row))
+
+
+# MERGE por lotes: cuenta insertados/actualizados y entrega los errores por RUT
+def upsert(coincidencia, parametros, datos):
+    resultado = upsert_clientes([_cliente_desde_json(f) for f in _lista(datos, "clientes")])
+    if resultado is None:
+        raise ErrorHTTP(503, "Base de datos no disponible.")
+    resultado["errores"] = [{"rut": rut, "error": error} for rut, error in resultado["errores"]]
+    return 200, resultado
+
+
+# RUT o rol inválido: 400; RUT repetido: 409; sin base o sin bcrypt: 503
+def crear_usuario(coincidencia, parametros, datos):
+    if not isinstance(datos, dict) or not all(datos.get(c) for c in ("rut", "password", "codigo_rol")):
+        raise ErrorHTTP(400, 'Se espera {"rut", "password", "codigo_rol"}.')
+    rut = _rut(datos["rut"])
+    error = validar_rol(datos["codigo_rol"])
+    if error:
+        raise ErrorHTTP(400, error)
+    creado = registrar_usuario(rut, datos["password"], datos["codigo_rol"])
+    if creado is None:
+        raise ErrorHTTP(503, "No se pudo crear el usuario.")
+    if not creado:
+        raise ErrorHTTP(409, "El usuario ya existe.")
+    return 201, {"creado": rut}
+
+
+def desactivar_usuario(coincidencia, parametros, datos):
+    rut = _rut(coincidencia["rut"])
+    if not desactivar_usuario_rut(rut):
+        raise ErrorHTTP(404, "No encontrado o no se pudo desactivar.")
+    return 200, {"desactivado": rut}
+
+
+def login(coincidencia, parametros, datos):
+    if not isinstance(datos, dict) or not datos.get("rut") or datos.get("password") is None:
+        raise ErrorHTTP(400, 'Se espera {"rut", "password"}.')
+    resultado = autenticar_usuario(datos["rut"], datos["password"])
+    if resultado is None:
+        raise ErrorHTTP(503, "No se pudo autenticar.")
+    estado = 200 if resultado == LOGIN_OK else 401
+    return estado, {"resultado": resultado, "mensaje": MENSAJES_LOGIN[resultado]}
+
+
+def salud(coincidencia, parametros, datos):
+    backend = conexion.get_backend()
+    with conexion.conexion() as connection:
+        ok = False
+        if connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1 FROM dual")
+                ok = cursor.fetchone() is not None
+            except conexion.DatabaseError as e:
+                print("Error en chequeo de salud:", conexion.mensaje_error(e))
+            finally:
+                cursor.close()
+    return (200 if ok else 503), {
+        "estado": "ok" if ok else "error",
+        "backend": backend.nombre,
+        "pool": backend.estadisticas()
+    }
+
+
+def obtener_referencias(coincidencia, parametros, datos):
+    actuales = referencias.get_referencias()
+    if actuales is None:
+        raise ErrorHTTP(503, "Base de datos no disponible.")
+    return 200, {
+        "version": actuales.version,
+        "cargos": actuales.cargos,
+        "departamentos": actuales.departamentos,
+        "roles": actuales.roles
+    }
+
+
+def _metricas_generales():
+    return {
+        "pool": conexion.get_backend().estadisticas(),
+        "autenticacion": get_servicio().estadisticas(),
+        "cache": {
+            "empleados": cache_empleados.estadisticas(),
+            "clientes": cache_clientes.estadisticas()
+        },
+        "busqueda": {
+            "empleados": indice_empleados.estadisticas(),
+            "clientes": indice_clientes.estadisticas()
+        },
+        "auditoria": auditoria.estadisticas()
+    }
+
+
+def _prometheus(generales):
+    lineas = []
+    for clave, valor in generales["pool"].items():
+        lineas.append(f"crud_pool_{clave} {valor}")
+    for clave, valor in generales["autenticacion"].items():
+        lineas.append(f"crud_bcrypt_{clave} {valor}")
+    for nombre, estadisticas in generales["cache"].items():
+        for clave, valor in estadisticas.items():
+            if isinstance(valor, (int, float)):
+                lineas.append(f'crud_cache_{clave}{{cache="{nombre}"}} {valor}')
+    for clave, valor in generales["auditoria"].items():
+        if not isinstance(valor, bool):
+            lineas.append(f"crud_auditoria_{clave} {valor}")
+    return "\n".join(lineas) + "\n" + instrumentacion.exportar_prometheus()
+
+
+def metricas(coincidencia, parametros, datos):
+    generales = _metricas_generales()
+    if parametros.get("formato", [""])[0] == "prometheus":
+        return 200, _prometheus(generales)
+    return 200, {**generales, "operaciones": instrumentacion.snapshot()}
+
+
+RUT = r"(?P<rut>[^/]+)"
+
+RUTAS = [
+    ("GET", r"/salud", salud),
+    ("GET", r"/metricas", metricas),
+    ("GET", r"/referencias", obtener_referencias),
+
+    ("GET", r"/empleados", listar_empleados),
+    ("POST", r"/empleados", lambda c, p, d: _crear_lote(
+        create_empleados, [_empleado_desde_json(f) for f in _lista(d, "empleados")])),
+    ("POST", r"/empleados/buscar", lambda c, p, d: _buscar_lote(read_empleados, _ruts(d))),
+    ("GET", r"/empleados/buscar", lambda c, p, d: _buscar_texto(buscar_empleados, p)),
+    ("GET", rf"/empleados/{RUT}", lambda c, p, d: _leer_uno(read_empleado, c["rut"])),
+    ("PATCH", rf"/empleados/{RUT}", lambda c, p, d: _actualizar(read_empleado, c["rut"], d, _empleado_desde_json)),
+    ("DELETE", rf"/empleados/{RUT}", lambda c, p, d: _eliminar(delete_empleado, c["rut"])),
+
+    ("GET", r"/clientes", listar_clientes),
+    ("POST", r"/clientes", lambda c, p, d: _crear_lote(
+        create_clientes, [_cliente_desde_json(f) for f in _lista(d, "clientes")])),
+    ("POST", r"/clientes/buscar", lambda c, p, d: _buscar_lote(read_clientes, _ruts(d))),
+    ("GET", r"/clientes/buscar", lambda c, p, d: _buscar_texto(buscar_clientes, p)),
+    ("POST", r"/clientes/upsert", upsert),
+    ("GET", rf"/clientes/{RUT}", lambda c, p, d: _leer_uno(read_cliente, c["rut"])),
+    ("PATCH", rf"/clientes/{RUT}", lambda c, p, d: _actualizar(read_cliente, c["rut"], d, _cliente_desde_json)),
+    ("DELETE", rf"/clientes/{RUT}", lambda c, p, d: _eliminar(delete_cliente, c["rut"])),
+
+    ("GET", r"/usuarios", listar_usuarios),
+    ("POST", r"/usuarios", crear_usuario),
+    ("POST", r"/usuarios/login", login),
+    ("POST", rf"/usuarios/{RUT}/desactivar", desactivar_usuario),
+]
+RUTAS = [(metodo, re.compile(patron + "$"), operacion) for metodo, patron, operacion in RUTAS]
+
+
+# ==============================
+# SERVIDOR
+# ==============================
+class Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # conexiones persistentes y respuestas chunked
+
+    def _buscar_ruta(self, ruta):
+        metodos = set()
+        for metodo, patron, operacion in RUTAS:
+            coincidencia = patron.match(ruta)
+            if coincidencia:
+                if metodo == self.command:
+                    return coincidencia, operacion
+                metodos.add(metodo)
+        if metodos:
+            raise ErrorHTTP(405, f"Método no permitido (usar {', '.join(sorted(metodos))}).")
+        raise ErrorHTTP(404, "Ruta no encontrada.")
+
+    def _largo_cuerpo(self):
+        if self.headers.get("Transfer-Encoding"):
+            self.close_connection = True
+            raise ErrorHTTP(411, "Se requiere Content-Length.")
+        try:
+            largo = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            largo = -1
+        if largo < 0:
+            self.close_connection = True    # no se sabe dónde termina el cuerpo
+            raise ErrorHTTP(400, "Content-Length inválido.")
+        return largo
+
+    # Se lee siempre, aunque la solicitud termine en error: lo que quede sin
+    # leer en una conexión persistente se tomaría como la próxima solicitud.
+    # Un cuerpo demasiado grande no se lee: se cierra la conexión.
+    def _leer_cuerpo(self):
+        largo = self._largo_cuerpo()
+        if largo > MAX_CUERPO:
+            self.close_connection = True
+            raise ErrorHTTP(413, "Cuerpo demasiado grande.")
+        if not largo:
+            return None
+        contenido = self.rfile.read(largo)
+        if self.command not in ("POST", "PATCH"):
+            return None
+        try:
+            return json.loads(contenido)
+        except ValueError as e:
+            raise ErrorHTTP(400, f"JSON inválido: {e}")
+
+    def _responder(self, estado, datos):
+        if isinstance(datos, str):
+            cuerpo, tipo = datos.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            cuerpo, tipo = _a_json(datos).encode("utf-8"), "application/json; charset=utf-8"
+        self.send_response(estado)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _escribir_chunk(self, datos):
+        self.wfile.write(f"{len(datos):x}\r\n".encode("ascii") + datos + b"\r\n")
+
+    # Envía cada elemento del generador como una línea JSON, agrupadas en
+    # chunks de TAMANO_BLOQUE para no hacer una escritura por fila.
+    def _responder_streaming(self, filas):
+        try:
+            self._enviar_lineas(filas)
+        finally:
+            filas.close()       # si el cliente corta, libera el cursor y la sesión
+
+    # La conexión, la consulta y la primera fila se piden antes de enviar los
+    # encabezados: si la base falla ahí se responde 503 como cualquier otra
+    # operación. Si falla después, ya se envió el 200: la respuesta se corta
+    # sin el chunk final y se cierra la conexión, así el cliente sabe que el
+    # listado quedó incompleto.
+    def _enviar_lineas(self, filas):
+        try:
+            primera = next(filas, None)
+        except conexion.DatabaseError + (ConnectionError,) as e:
+            print(f"Error al listar {self.path}:", conexion.mensaje_error(e))
+            raise ErrorHTTP(503, "Base de datos no disponible.")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        bloque = []
+        tamano = 0
+        try:
+            if primera is not None:
+                for fila in _encadenar(primera, filas):
+                    linea = (_a_json(fila) + "\n").encode("utf-8")
+                    bloque.append(linea)
+                    tamano += len(linea)
+                    if tamano >= TAMANO_BLOQUE:
+                        self._escribir_chunk(b"".join(bloque))
+                        bloque, tamano = [], 0
+        except (BrokenPipeError, ConnectionResetError):
+            raise
+        except Exception as e:
+            print(f"Listado {self.path} interrumpido:", conexion.mensaje_error(e))
+            self.close_connection = True
+            return
+        if bloque:
+            self._escribir_chunk(b"".join(bloque))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _atender(self):
+        partes = urlsplit(self.path)
+        try:
+            datos = self._leer_cuerpo()
+            coincidencia, operacion = self._buscar_ruta(partes.path.rstrip("/") or "/")
+            # los listados se recorren dentro del bloque: sus mensajes
+            # también quedan apagados
+            with auditoria.como(self.headers.get("X-Usuario")), sin_mensajes():
+                resultado = operacion(coincidencia, parse_qs(partes.query), datos)
+                if isinstance(resultado, tuple):
+                    self._responder(*resultado)
+                else:
+                    self._responder_streaming(resultado)
+        except ErrorHTTP as e:
+            self._responder(e.estado, {"error": e.mensaje})
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except Exception as e:
+            print(f"Error no controlado en {self.command} {self.path}: {e!r}")
+            self._responder(500, {"error": "Error interno."})
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _atender
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def _encadenar(primera, resto):
+    yield primera
+    yield from resto
+
+
+def crear_servidor(host=HOST, puerto=PUERTO):
+    servidor = ThreadingHTTPServer((host, puerto), Manejador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON de empleados, clientes y usuarios.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--backend", choices=("oracle", "sqlite"), help="por defecto CRUD_BACKEND")
+    parser.add_argument("--sqlite-ruta", default=conexion.SQLITE_RUTA)
+    parser.add_argument("--sin-metricas", action="store_true", help="no registrar métricas por operación")
+    args = parser.parse_args()
+
+    if args.backend == "sqlite":
+        conexion.usar_backend("sqlite", ruta=args.sqlite_ruta)
+    elif args.backend == "oracle":
+        conexion.usar_backend("oracle")
+    if not args.sin_metricas:
+        instrumentacion.activar()
+    referencias.precargar()
+    # los índices de búsqueda se arman en segundo plano; una búsqueda que
+    # llegue antes espera a que terminen
+    for indice in (indice_empleados, indice_clientes):
+        threading.Thread(target=indice.preparar, daemon=True).start()
+
+    servidor = crear_servidor(args.host, args.puerto)
+    print(f"Servicio escuchando en http://{args.host}:{args.puerto} (backend {conexion.BACKEND})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nDeteniendo servicio...")
+    finally:
+        servidor.server_close()
+        auditoria.detener()
+        cerrar_servicio()
+        conexion.cerrar_backend()
+
+
+if __name__ == "__main__":
+    main()
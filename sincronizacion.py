@@ -0,0 +1,264 @@
+# Sincronización incremental de empleado, cliente y usuario a una
+# instantánea local (un archivo SQLite) para los procesos que hoy releen
+# las tablas completas.
+#
+# Uso:
+#   python sincronizacion.py instantanea.db
+#   python sincronizacion.py instantanea.db --tablas empleado,cliente --diferencia-cada 5
+#   python sincronizacion.py instantanea.db --completa
+#
+# Cada tabla guarda su marca de agua: el mayor ORA_ROWSCN copiado. Cada
+# ejecución trae solo las filas con ORA_ROWSCN mayor (insertadas o
+# modificadas desde entonces) y las reemplaza en la instantánea. ORA_ROWSCN
+# es por bloque salvo que la tabla se cree con ROWDEPENDENCIES: puede traer
+# de más filas vecinas sin cambios, nunca de menos. Para usuario no sirve
+# fecha_ingreso, que no cambia al desactivarlo.
+#
+# Eliminaciones: cada ejecución revisa los eventos ELIMINAR de la tabla
+# auditoria desde la última y quita de la instantánea las claves que ya no
+# están en la base. Como la auditoría puede perder eventos (ver
+# auditoria.py), cada DIFERENCIA_CADA ejecuciones (y con --completa) se
+# comparan además todas las claves de la tabla con las de la instantánea.
+#
+# Cada tabla se aplica con un commit en la instantánea junto con su marca:
+# si la ejecución falla, la siguiente retoma desde la marca anterior. El
+# resultado y la tabla historial de la instantánea informan las filas
+# transferidas por ejecución. password_hash de usuario no se copia.
+import argparse
+import sqlite3
+import time
+from datetime import datetime
+
+from conexion import DatabaseError, get_connection, mensaje_error
+from exportar import TABLAS
+from filas import MAXIMO_IN
+from instrumentacion import medir
+
+TAMANO_LOTE = 5000
+DIFERENCIA_CADA = 10    # cada cuántas ejecuciones se comparan todas las claves
+
+# Tipos declarados en la instantánea (para leer fechas con PARSE_DECLTYPES)
+TIPOS_INSTANTANEA = {"fecha_inicio": "DATE", "fecha_ingreso": "TIMESTAMP"}
+
+ESQUEMA_CONTROL = """
+CREATE TABLE IF NOT EXISTS marcas (
+    tabla TEXT PRIMARY KEY,
+    scn INTEGER NOT NULL,
+    auditoria INTEGER,
+    ejecuciones INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS historial (
+    fecha TIMESTAMP,
+    tabla TEXT,
+    cambiadas INTEGER,
+    eliminadas INTEGER,
+    claves_comparadas INTEGER,
+    transferidas INTEGER,
+    filas INTEGER,
+    segundos REAL
+);
+"""
+
+
+# ==============================
+# INSTANTÁNEA
+# ==============================
+def abrir_instantanea(ruta):
+    destino = sqlite3.connect(ruta, detect_types=sqlite3.PARSE_DECLTYPES)
+    destino.execute("PRAGMA journal_mode=WAL")     # se puede leer mientras se sincroniza
+    for tabla, (columnas, clave) in TABLAS.items():
+        definicion = ", ".join(f"{col} {TIPOS_INSTANTANEA.get(col, '')}".rstrip() for col in columnas)
+        destino.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({definicion}, PRIMARY KEY ({clave}))")
+    destino.executescript(ESQUEMA_CONTROL)
+    destino.commit()
+    return destino
+
+
+def _marca(destino, tabla):
+    fila = destino.execute("SELECT scn, auditoria, ejecuciones FROM marcas WHERE tabla = ?", (tabla,)).fetchone()
+    return fila or (None, None, 0)
+
+
+# ==============================
+# CAMBIOS
+# ==============================
+# Copia las filas con ORA_ROWSCN mayor que la marca. Devuelve (filas, nueva marca).
+def _copiar_cambios(cursor, destino, tabla, columnas, marca, tamano_lote):
+    cursor.execute(
+        f"SELECT ORA_ROWSCN, {', '.join(columnas)} FROM {tabla} WHERE ORA_ROWSCN > :marca",
+        {"marca": marca}
+    )
+    insertar = (f"INSERT OR REPLACE INTO {tabla} ({', '.join(columnas)}) "
+                f"VALUES ({', '.join('?' * len(columnas))})")
+    copiadas = 0
+    while True:
+        filas = cursor.fetchmany(tamano_lote)
+        if not filas:
+            break
+        marca = max(marca, max(fila[0] for fila in filas))
+        destino.executemany(insertar, [fila[1:] for fila in filas])
+        copiadas += len(filas)
+    return copiadas, marca
+
+
+def _ultimo_evento(cursor):
+    try:
+        cursor.execute("SELECT MAX(id) FROM auditoria")
+        return cursor.fetchone()[0] or 0
+    except DatabaseError:
+        return None     # sin tabla auditoria: las eliminaciones solo por diferencia de claves
+
+
+# Claves con un evento ELIMINAR en (desde, hasta] que ya no están en la
+# base. Devuelve (eliminadas, filas leídas).
+def _eliminar_auditados(cursor, destino, tabla, clave, desde, hasta):
+    cursor.execute("""
+        SELECT DISTINCT clave FROM auditoria
+        WHERE id > :desde AND id <= :hasta AND tabla = :tabla AND operacion = 'ELIMINAR'
+    """, {"desde": desde, "hasta": hasta, "tabla": tabla})
+    candidatas = [valor for valor, in cursor.fetchall()]
+    existentes = set()
+    for i in range(0, len(candidatas), MAXIMO_IN):
+        parte = candidatas[i:i + MAXIMO_IN]
+        binds = {f"k{j}": valor for j, valor in enumerate(parte)}
+        cursor.execute(
+            f"SELECT {clave} FROM {tabla} WHERE {clave} IN ({', '.join(':' + nombre for nombre in binds)})",
+            binds
+        )
+        existentes.update(valor for valor, in cursor)
+    borrar = [(valor,) for valor in candidatas if valor not in existentes]
+    destino.executemany(f"DELETE FROM {tabla} WHERE {clave} = ?", borrar)
+    return len(borrar), len(candidatas) + len(existentes)
+
+
+# Quita de la instantánea las claves que no están en la base. Las claves se
+# cargan en una tabla temporal de la instantánea, no en memoria. Devuelve
+# (eliminadas, claves leídas).
+def _diferencia_claves(cursor, destino, tabla, clave, tamano_lote):
+    destino.execute("CREATE TEMP TABLE IF NOT EXISTS claves_origen (clave TEXT PRIMARY KEY)")
+    destino.execute("DELETE FROM claves_origen")
+    cursor.execute(f"SELECT {clave} FROM {tabla}")
+    leidas = 0
+    while True:
+        filas = cursor.fetchmany(tamano_lote)
+        if not filas:
+            break
+        destino.executemany("INSERT OR IGNORE INTO claves_origen VALUES (?)", filas)
+        leidas += len(filas)
+    eliminadas = destino.execute(
+        f"DELETE FROM {tabla} WHERE {clave} NOT IN (SELECT clave FROM claves_origen)"
+    ).rowcount
+    destino.execute("DELETE FROM claves_origen")
+    return eliminadas, leidas
+
+
+# ==============================
+# SINCRONIZACIÓN
+# ==============================
+# Sincroniza una tabla con una conexión ya abierta. Devuelve un diccionario
+# con cambiadas, eliminadas, claves_comparadas, transferidas (filas leídas
+# de la base), filas (total en la instantánea), segundos y diferencia (si se
+# compararon todas las claves), o None si falló.
+@medir("sincronizacion.tabla")
+def sincronizar_tabla(connection, destino, tabla, completa=False,
+                      diferencia_cada=DIFERENCIA_CADA, tamano_lote=TAMANO_LOTE):
+    columnas, clave = TABLAS[tabla]
+    scn, desde, ejecuciones = _marca(destino, tabla)
+    if completa:
+        scn, desde = None, None
+    ejecuciones += 1
+    diferencia = completa or (scn is not None and ejecuciones % diferencia_cada == 0)
+    resultado = {"cambiadas": 0, "eliminadas": 0, "claves_comparadas": 0, "transferidas": 0}
+    inicio = time.perf_counter()
+
+    cursor = connection.cursor()
+    cursor.arraysize = tamano_lote
+    cursor.prefetchrows = tamano_lote + 1
+    try:
+        # el último evento se lee antes que los cambios: lo que se elimine
+        # mientras tanto queda para la próxima ejecución
+        hasta = _ultimo_evento(cursor)
+        if scn is not None and desde is not None and hasta is not None:
+            eliminadas, leidas = _eliminar_auditados(cursor, destino, tabla, clave, desde, hasta)
+            resultado["eliminadas"] += eliminadas
+            resultado["transferidas"] += leidas
+
+        copiadas, scn = _copiar_cambios(cursor, destino, tabla, columnas, scn or 0, tamano_lote)
+        resultado["cambiadas"] = copiadas
+        resultado["transferidas"] += copiadas
+
+        if diferencia:
+            eliminadas, leidas = _diferencia_claves(cursor, destino, tabla, clave, tamano_lote)
+            resultado["eliminadas"] += eliminadas
+            resultado["claves_comparadas"] = leidas
+            resultado["transferidas"] += leidas
+
+        resultado["filas"] = destino.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+        resultado["segundos"] = time.perf_counter() - inicio
+        resultado["diferencia"] = diferencia
+        destino.execute("INSERT OR REPLACE INTO marcas VALUES (?, ?, ?, ?)", (tabla, scn, hasta, ejecuciones))
+        destino.execute(
+            "INSERT INTO historial VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (datetime.now(), tabla, resultado["cambiadas"], resultado["eliminadas"],
+             resultado["claves_comparadas"], resultado["transferidas"], resultado["filas"],
+             resultado["segundos"])
+        )
+        destino.commit()
+        return resultado
+    except (DatabaseError, sqlite3.Error) as e:
+        destino.rollback()
+        print(f"Error al sincronizar {tabla}:", mensaje_error(e))
+        return None
+    finally:
+        cursor.close()
+
+
+# Sincroniza las tablas (por defecto todas) en la instantánea "ruta".
+# Devuelve {tabla: resultado o None}, o None si no hubo conexión.
+def sincronizar(ruta, tablas=None, completa=False, diferencia_cada=DIFERENCIA_CADA, tamano_lote=TAMANO_LOTE):
+    tablas = list(tablas or TABLAS)
+    desconocidas = [tabla for tabla in tablas if tabla not in TABLAS]
+    if desconocidas:
+        print(f"Tablas desconocidas: {', '.join(desconocidas)} (usar {', '.join(TABLAS)})")
+        return None
+
+    connection = get_connection()
+    if not connection:
+        return None
+    destino = abrir_instantanea(ruta)
+    try:
+        return {
+            tabla: sincronizar_tabla(connection, destino, tabla, completa, diferencia_cada, tamano_lote)
+            for tabla in tablas
+        }
+    finally:
+        destino.close()
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sincroniza empleado, cliente y usuario a una instantánea SQLite.")
+    parser.add_argument("instantanea", help="archivo SQLite de la instantánea")
+    parser.add_argument("--tablas", help=f"lista separada por comas (por defecto {','.join(TABLAS)})")
+    parser.add_argument("--completa", action="store_true", help="copia todo y compara todas las claves")
+    parser.add_argument("--diferencia-cada", type=int, default=DIFERENCIA_CADA,
+                        help="cada cuántas ejecuciones se comparan todas las claves")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="filas por fetch")
+    args = parser.parse_args()
+
+    tablas = [tabla.strip() for tabla in args.tablas.split(",")] if args.tablas else None
+    resultados = sincronizar(args.instantanea, tablas, args.completa, args.diferencia_cada, args.lote)
+    if resultados is None:
+        return
+    print(f"{'tabla':<10} | {'cambiadas':>9} | {'eliminadas':>10} | {'claves':>8} | "
+          f"{'transferidas':>12} | {'filas':>9} | {'segundos':>8}")
+    for tabla, r in resultados.items():
+        if r is None:
+            print(f"{tabla:<10} | error")
+            continue
+        print(f"{tabla:<10} | {r['cambiadas']:9d} | {r['eliminadas']:10d} | {r['claves_comparadas']:8d} | "
+              f"{r['transferidas']:12d} | {r['filas']:9d} | {r['segundos']:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import auditoria
+import autenticacion
+import conexion
+import instrumentacion
+import referencias
+from benchmarks import datos
+from programa_crud_cliente_exception import cache_clientes
+from programa_crud_empleado import cache_empleados
+
+
+# Base SQLite en memoria con 20 empleados, clientes y usuarios (los de
+# benchmarks.datos). Los caché se vacían para que cada prueba vaya a la base.
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    monkeypatch.setattr(auditoria, "ARCHIVO", str(tmp_path / "auditoria_pendiente.jsonl"))
+    monkeypatch.setattr(autenticacion, "COSTO_BCRYPT", 4)
+    conexion.usar_backend("sqlite", ruta=":memory:")
+    datos.poblar(20)
+    cache_empleados.limpiar()
+    cache_clientes.limpiar()
+    referencias.invalidar()
+    yield
+    autenticacion.cerrar_servicio()
+    conexion.cerrar_backend()
+    referencias.invalidar()
+
+
+# Métricas activas durante la prueba, vacías al empezar; el log de consultas
+# lentas va a un archivo temporal
+@pytest.fixture
+def metricas(tmp_path, monkeypatch):
+    monkeypatch.setattr(instrumentacion, "ARCHIVO_LENTAS", str(tmp_path / "lentas.log"))
+    monkeypatch.setattr(instrumentacion, "UMBRAL_LENTO_MS", instrumentacion.UMBRAL_LENTO_MS)
+    instrumentacion.reiniciar()
+    instrumentacion.activar()
+    yield
+    instrumentacion.desactivar()
+    instrumentacion.reiniciar()
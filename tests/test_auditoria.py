@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+import auditoria
+import conexion
+from benchmarks import datos
+from programa_crud_empleado import Empleado, delete_empleado, read_empleado
+
+pytestmark = pytest.mark.usefixtures("base")
+
+RUT = "11111111-1"
+
+
+def eventos(clave):
+    assert auditoria.vaciar()
+    with conexion.conexion() as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT operacion, tabla, usuario, detalle FROM auditoria "
+                       "WHERE clave = :clave ORDER BY id", {"clave": clave})
+        filas = cursor.fetchall()
+        cursor.close()
+    return [tuple(fila) for fila in filas]
+
+
+def test_registra_crear_actualizar_y_eliminar():
+    emp = Empleado(RUT, "Ana Pérez", None, None, None, None, 1.0, 1, 1)
+    with auditoria.como("22222222-2"):
+        assert emp.create()
+        emp.salario = 2.0
+        emp.nombre = "Ana María Pérez"
+        assert emp.update()
+        assert delete_empleado(RUT)
+    assert eventos(RUT) == [
+        ("CREAR", "empleado", "22222222-2", None),
+        ("ACTUALIZAR", "empleado", "22222222-2", "nombre, salario"),
+        ("ELIMINAR", "empleado", "22222222-2", None),
+    ]
+
+
+def test_sin_usuario_usa_el_del_sistema():
+    emp = read_empleado(datos.rut_empleado(1))
+    emp.salario = 3.0
+    assert emp.update()
+    assert eventos(emp.rut_empleado) == [("ACTUALIZAR", "empleado", auditoria.usuario_actual(), "salario")]
+
+
+def test_sin_base_desborda_y_luego_reenvia(monkeypatch):
+    get_connection = auditoria.get_connection
+    monkeypatch.setattr(auditoria, "get_connection", lambda: None)
+    auditoria.registrar(auditoria.CREAR, "empleado", RUT)
+    assert auditoria.vaciar()
+    with open(auditoria.ARCHIVO, encoding="utf-8") as archivo:
+        assert json.loads(archivo.readline())["clave"] == RUT
+
+    # una línea cortada (el proceso terminó a mitad de la escritura)
+    with open(auditoria.ARCHIVO, "a", encoding="utf-8") as archivo:
+        archivo.write('{"fecha": "2024-01-')
+
+    monkeypatch.setattr(auditoria, "get_connection", get_connection)
+    auditoria.registrar(auditoria.ELIMINAR, "empleado", RUT)
+    assert [operacion for operacion, *_ in eventos(RUT)] == ["ELIMINAR", "CREAR"]
+    assert not os.path.exists(auditoria.ARCHIVO)
+    with open(auditoria.ARCHIVO + ".descartados", encoding="utf-8") as archivo:
+        assert archivo.read() == '{"fecha": "2024-01-\n'
+
+
+def test_desactivada_no_registra(monkeypatch):
+    monkeypatch.setattr(auditoria, "ACTIVA", False)
+    assert Empleado(RUT, "Ana Pérez", None, None, None, None, 1.0, 1, 1).create()
+    assert eventos(RUT) == []
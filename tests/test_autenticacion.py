@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from autenticacion import ServicioAutenticacion
+
+
+@pytest.fixture
+def servicio():
+    servicio = ServicioAutenticacion(procesos=1, max_pendientes=1, timeout=2, costo=4)
+    yield servicio
+    servicio.cerrar()
+
+
+def test_hashear_y_verificar(servicio):
+    password_hash = asyncio.run(servicio.hashear_async("clave"))
+    assert servicio.verificar("clave", password_hash)
+    assert not asyncio.run(servicio.verificar_async("otra", password_hash))
+    assert not servicio.necesita_rehash(password_hash)
+
+
+def test_cancelar_espera_no_pierde_el_cupo(servicio):
+    servicio._cupos.acquire()       # el único cupo, ocupado
+
+    async def cancelar_en_espera():
+        tarea = asyncio.create_task(servicio.hashear_async("clave"))
+        await asyncio.sleep(0.1)
+        tarea.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tarea
+        # el hilo que esperaba toma el cupo liberado y debe devolverlo
+        servicio._cupos.release()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(cancelar_en_espera())
+    assert servicio.verificar("clave", servicio.hashear("clave"))
+    assert servicio.estadisticas()["rechazos"] == 0
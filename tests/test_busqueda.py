@@ -0,0 +1,77 @@
+import pytest
+
+import busqueda
+from busqueda import IndiceBusqueda, palabras
+from programa_crud_empleado import Empleado, buscar_empleados, delete_empleado, indice_empleados, read_empleado
+
+pytestmark = pytest.mark.usefixtures("base")
+
+RUT = "11111111-1"
+
+
+def crear(rut=RUT, nombre="Ñuñoa Bernardita Zúñiga", email="bzuniga@empresa.cl"):
+    assert Empleado(rut, nombre, None, None, email, None, 1.0, 1, 1).create()
+
+
+def ruts(resultados):
+    return [r["rut_empleado"] for r in resultados]
+
+
+def test_palabras_sin_tildes_ni_puntuacion():
+    assert palabras("José Pérez-Núñez, S.A.") == ["jose", "perez", "nunez", "s", "a"]
+    assert palabras(None) == []
+
+
+def test_encuentra_con_errores_de_tipeo_y_prefijo():
+    crear()
+    assert ruts(buscar_empleados("bernardita zuñiga"))[0] == RUT
+    assert ruts(buscar_empleados("BERNARDITA ZUNIGA"))[0] == RUT
+    assert ruts(buscar_empleados("bernardta zuniga"))[0] == RUT       # falta una letra
+    assert ruts(buscar_empleados("bernar"))[0] == RUT                 # prefijo
+    assert ruts(buscar_empleados("bzuniga"))[0] == RUT                # email
+    assert buscar_empleados("xqzw") == []
+    assert buscar_empleados("") == []
+
+
+def test_mismo_orden_de_palabras_primero():
+    crear(nombre="Zúñiga Bernardita")
+    crear("22222222-2", "Bernardita Zúñiga")
+    resultados = buscar_empleados("bernardita zuniga")
+    assert ruts(resultados)[:2] == ["22222222-2", RUT]
+    assert resultados[0]["puntaje"] > resultados[1]["puntaje"]
+
+
+def test_escrituras_mantienen_el_indice():
+    assert indice_empleados.preparar()
+    crear()
+    assert RUT in ruts(buscar_empleados("bernardita"))
+
+    emp = read_empleado(RUT)
+    emp.nombre = "Eulalia Cifuentes"
+    assert emp.update()
+    assert RUT not in ruts(buscar_empleados("bernardita"))
+    assert ruts(buscar_empleados("eulalia cifuentes"))[0] == RUT
+
+    assert delete_empleado(RUT)
+    assert RUT not in ruts(buscar_empleados("eulalia cifuentes"))
+
+
+def test_numpy_y_counter_dan_lo_mismo(monkeypatch):
+    indice = IndiceBusqueda("empleado", "rut_empleado", ("nombre", "email"))
+    assert indice.construir() == 20
+    consultas = ["gonzalez", "gonzales", "empresa", "alvaro flores", "cristobal gonzales"]
+    con_numpy = [indice.buscar(texto) for texto in consultas]
+    assert all(con_numpy)
+    monkeypatch.setattr(busqueda, "np", None)
+    assert [indice.buscar(texto) for texto in consultas] == con_numpy
+
+
+def test_compactar_no_pierde_filas():
+    indice = IndiceBusqueda("empleado", "rut_empleado", ("nombre",))
+    assert indice.construir() == 20
+    for i in range(1500):
+        indice.guardar({"rut_empleado": RUT, "nombre": f"Eulalia Cifuentes {i}"})
+    estadisticas = indice.estadisticas()
+    assert estadisticas["filas"] == 21
+    assert estadisticas["muertas"] < 1500
+    assert [r["nombre"] for r in indice.buscar("eulalia cifuentes 1499")][0] == "Eulalia Cifuentes 1499"
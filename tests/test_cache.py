@@ -0,0 +1,64 @@
+import pytest
+
+import conexion
+from benchmarks import datos
+from cache import CacheLRU
+from programa_crud_empleado import cache_empleados, delete_empleado, read_empleado
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+def sin_base(monkeypatch):
+    monkeypatch.setattr(conexion, "get_connection", lambda: None)
+
+
+def aciertos():
+    return cache_empleados.estadisticas()["aciertos"]
+
+
+def test_segunda_lectura_sale_del_cache(monkeypatch):
+    rut = datos.rut_empleado(1)
+    emp = read_empleado(rut)
+    antes = aciertos()
+    sin_base(monkeypatch)
+    leido = read_empleado(rut)
+    assert leido.valores() == emp.valores()
+    assert aciertos() == antes + 1
+
+    # se entrega una copia: modificarla no altera el caché
+    leido.nombre = "Otro"
+    assert read_empleado(rut).nombre == emp.nombre
+
+
+def test_no_encontrado_tambien_se_recuerda(monkeypatch):
+    assert read_empleado("11111111-1") is None
+    antes = aciertos()
+    sin_base(monkeypatch)
+    assert read_empleado("11.111.111-1") is None
+    assert aciertos() == antes + 1
+
+
+def test_escrituras_invalidan():
+    rut = datos.rut_empleado(2)
+    emp = read_empleado(rut)
+    emp.salario = 1.0
+    assert emp.update()
+    assert read_empleado(rut).salario == 1.0
+
+    assert delete_empleado(rut)
+    assert read_empleado(rut) is None
+
+
+def test_desalojo_lru_y_expiracion():
+    cache = CacheLRU(maximo=2, ttl=60, ttl_negativo=-1)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    assert cache.obtener("a") == (True, 1)
+    cache.guardar("c", 3)           # desaloja "b", la menos usada
+    assert cache.obtener("b") == (False, None)
+    assert cache.obtener("a") == (True, 1)
+
+    cache.guardar("d", None)        # el "no encontrado" ya venció
+    assert cache.obtener("d") == (False, None)
+    estadisticas = cache.estadisticas()
+    assert (estadisticas["desalojos"], estadisticas["expiradas"]) == (2, 1)
@@ -0,0 +1,74 @@
+import csv
+import json
+
+import pytest
+
+from benchmarks import datos
+from carga_masiva_empleado import COLUMNAS, cargar_empleados
+from programa_crud_empleado import read_empleado
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+def fila(rut, **cambios):
+    return {"rut_empleado": rut, "nombre": "Ana Pérez", "direccion": "Calle 1",
+            "telefono": "911111111", "email": "ana@empresa.cl", "fecha_inicio": "2020-01-15",
+            "salario": "1000000", "codigo_cargo": "1", "id_departamento": "1", **cambios}
+
+
+def escribir_csv(ruta, filas):
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        writer = csv.DictWriter(archivo, COLUMNAS)
+        writer.writeheader()
+        writer.writerows(filas)
+
+
+def rechazos(ruta):
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        return {int(f["fila"]): f["error"] for f in csv.DictReader(archivo)}
+
+
+def test_carga_csv_con_rechazos(tmp_path):
+    ruta = str(tmp_path / "empleados.csv")
+    escribir_csv(ruta, [
+        fila("11.111.111-1"),
+        fila("11111111-2"),                         # dígito verificador incorrecto
+        fila("22222222-2", salario="mucho"),
+        fila("33333333-3", codigo_cargo="999"),
+        fila(datos.rut_empleado(1)),                # ya existe
+        fila("44.444.444-4", fecha_inicio=""),
+    ])
+    resultado = cargar_empleados(ruta, tamano_lote=2)
+    assert (resultado["leidas"], resultado["insertadas"], resultado["rechazadas"]) == (6, 2, 4)
+
+    errores = rechazos(resultado["archivo_rechazos"])
+    assert sorted(errores) == [2, 3, 4, 5]
+    assert errores[2] == "RUT inválido: 11111111-2"
+    assert errores[3].startswith("Formato inválido:")
+    assert errores[4] == "No existe el cargo 999."
+
+    assert read_empleado("11111111-1").nombre == "Ana Pérez"
+    assert read_empleado("44444444-4").fecha_inicio is None
+    assert read_empleado("22222222-2") is None
+
+
+def test_carga_jsonl_con_linea_mal_formada(tmp_path):
+    ruta = tmp_path / "empleados.jsonl"
+    ruta.write_text("\n".join([
+        json.dumps(fila("11111111-1")),
+        "{no es json",
+        "[1, 2]",
+        json.dumps(fila("22222222-2", salario=1500.5, codigo_cargo=1)),
+    ]), encoding="utf-8")
+    resultado = cargar_empleados(str(ruta), ruta_rechazos=str(tmp_path / "rechazos.csv"))
+    assert (resultado["insertadas"], resultado["rechazadas"]) == (2, 2)
+    assert all(e.startswith("JSON inválido") for e in rechazos(str(tmp_path / "rechazos.csv")).values())
+    assert read_empleado("22222222-2").salario == 1500.5
+
+
+def test_carga_sin_rechazos_no_crea_archivo(tmp_path):
+    ruta = str(tmp_path / "empleados.csv")
+    escribir_csv(ruta, [fila("11111111-1")])
+    resultado = cargar_empleados(ruta)
+    assert resultado["archivo_rechazos"] is None
+    assert not (tmp_path / "empleados.csv.rechazos.csv").exists()
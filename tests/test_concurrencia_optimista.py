@@ -0,0 +1,70 @@
+import pytest
+
+import instrumentacion
+from benchmarks import datos
+from programa_crud_cliente_exception import read_cliente
+from programa_crud_empleado import Empleado, read_empleado
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+def ejecuciones(nombre):
+    return instrumentacion.snapshot()[nombre]["sync"]["ejecucion"]["cantidad"]
+
+
+def test_update_sin_leer_la_version(metricas):
+    emp = read_empleado(datos.rut_empleado(1))
+    version = emp.version
+    emp.salario = 1.0
+    assert emp.update()
+    # UPDATE ... RETURNING: la nueva versión sin volver a leer la fila
+    assert emp.version == version + 1
+    assert ejecuciones("empleado.update") == 2       # UPDATE y commit
+
+
+def test_conflicto_no_pisa_el_cambio_de_otro():
+    rut = datos.rut_empleado(2)
+    primero, segundo = read_empleado(rut), read_empleado(rut)
+    primero.salario = 1.0
+    assert primero.update()
+
+    segundo.salario = 2.0
+    assert segundo.update() is False
+    assert segundo.conflicto
+    assert read_empleado(rut).salario == 1.0
+
+    # leído de nuevo, el mismo cambio se aplica
+    tercero = read_empleado(rut)
+    tercero.salario = 2.0
+    assert tercero.update()
+    assert not tercero.conflicto
+    assert read_empleado(rut).version == primero.version + 1
+
+
+def test_update_con_version_explicita():
+    rut = datos.rut_empleado(3)
+    version = read_empleado(rut).version
+    emp = read_empleado(rut)
+    emp.nombre = "Otro Nombre"
+    assert emp.update(version + 1) is False
+    assert emp.conflicto
+    assert emp.update(version)
+    assert read_empleado(rut).nombre == "Otro Nombre"
+
+
+def test_no_encontrado_no_es_conflicto():
+    emp = Empleado.desde_fila("11111111-1", "Ana", None, None, None, None, 1.0, 1, 1, 0)
+    emp.salario = 2.0
+    assert emp.update() is False
+    assert not emp.conflicto
+
+
+def test_conflicto_cliente():
+    rut = read_cliente(datos.rut_cliente(1)).rut_cliente
+    primero, segundo = read_cliente(rut), read_cliente(rut)
+    primero.cantidad_trabajadores = 1
+    assert primero.update()
+    segundo.cantidad_trabajadores = 2
+    assert segundo.update() is False
+    assert segundo.conflicto
+    assert read_cliente(rut).cantidad_trabajadores == 1
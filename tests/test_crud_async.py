@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+
+import crud_async
+from benchmarks import datos
+from programa_crud_cliente_exception import Cliente
+from programa_crud_empleado import Empleado
+from programa_crud_usuario import (
+    LOGIN_CLAVE_INCORRECTA, LOGIN_INACTIVO, LOGIN_NO_ENCONTRADO, LOGIN_OK
+)
+
+pytestmark = pytest.mark.usefixtures("base")
+
+NUEVO = "11.111.111-1"
+
+
+def ejecutar(corrutina):
+    return asyncio.run(corrutina)
+
+
+def nuevo_empleado(rut=NUEVO, codigo_cargo=1, id_departamento=1):
+    return Empleado(rut, "Ana Pérez", "Calle 1", "911111111", "ana@empresa.cl",
+                    None, 1000000.0, codigo_cargo, id_departamento)
+
+
+# ==============================
+# EMPLEADO
+# ==============================
+def test_crear_y_leer_empleado():
+    emp = nuevo_empleado()
+    assert ejecutar(emp.create_async()) is True
+    assert emp.rut_empleado == "11111111-1"
+
+    leido = ejecutar(crud_async.read_empleado("111111111"))
+    assert leido.valores() == emp.valores()
+    assert leido.version is not None
+
+
+def test_crear_empleado_repetido():
+    assert ejecutar(nuevo_empleado().create_async()) is True
+    assert ejecutar(nuevo_empleado().create_async()) is False
+
+
+def test_crear_empleado_rut_invalido():
+    assert ejecutar(nuevo_empleado(rut="11111111-2").create_async()) is False
+
+
+def test_crear_empleado_cargo_inexistente(capsys):
+    assert ejecutar(nuevo_empleado(codigo_cargo=999).create_async()) is False
+    assert "No existe el cargo 999." in capsys.readouterr().out
+    # el mismo rechazo que la API síncrona, antes de ir a la base
+    assert nuevo_empleado(codigo_cargo=999).create() is False
+    assert "No existe el cargo 999." in capsys.readouterr().out
+    assert ejecutar(crud_async.read_empleado(NUEVO)) is None
+
+
+def test_leer_empleado_inexistente_o_invalido():
+    assert ejecutar(crud_async.read_empleado(NUEVO)) is None
+    assert ejecutar(crud_async.read_empleado("no es un rut")) is None
+
+
+def test_actualizar_empleado():
+    emp = ejecutar(crud_async.read_empleado(datos.rut_empleado(3)))
+    version = emp.version
+    emp.salario = 1234.0
+    assert ejecutar(emp.update_async()) is True
+    assert emp.version == version + 1
+
+    leido = ejecutar(crud_async.read_empleado(datos.rut_empleado(3)))
+    assert leido.salario == 1234.0
+    assert leido.version == version + 1
+
+
+def test_actualizar_empleado_sin_cambios():
+    emp = ejecutar(crud_async.read_empleado(datos.rut_empleado(3)))
+    assert ejecutar(emp.update_async()) is True
+    assert ejecutar(crud_async.read_empleado(datos.rut_empleado(3))).version == emp.version
+
+
+def test_actualizar_empleado_conflicto():
+    primero = ejecutar(crud_async.read_empleado(datos.rut_empleado(4)))
+    segundo = Empleado.desde_fila(*primero.valores(), primero.version)
+    primero.salario = 1.0
+    assert ejecutar(primero.update_async()) is True
+
+    segundo.salario = 2.0
+    assert ejecutar(segundo.update_async()) is False
+    assert segundo.conflicto
+    assert ejecutar(crud_async.read_empleado(datos.rut_empleado(4))).salario == 1.0
+
+
+def test_actualizar_empleado_inexistente():
+    emp = Empleado.desde_fila(*nuevo_empleado().valores(), 0)
+    emp.salario = 5.0
+    assert ejecutar(emp.update_async()) is False
+    assert not emp.conflicto
+
+
+def test_actualizar_empleado_departamento_inexistente():
+    emp = ejecutar(crud_async.read_empleado(datos.rut_empleado(5)))
+    emp.id_departamento = 999
+    assert ejecutar(emp.update_async()) is False
+    assert ejecutar(crud_async.read_empleado(datos.rut_empleado(5))).id_departamento != 999
+
+
+def test_eliminar_empleado():
+    rut = datos.rut_empleado(6)
+    assert ejecutar(crud_async.delete_empleado(rut)) is True
+    assert ejecutar(crud_async.read_empleado(rut)) is None
+    assert ejecutar(crud_async.delete_empleado(rut)) is False
+    assert ejecutar(crud_async.delete_empleado("123")) is False
+
+
+# ==============================
+# CLIENTE
+# ==============================
+def test_crud_cliente():
+    cliente = Cliente("11111111-1", datos.rut_empleado(1), "Ferretería Pérez SpA", 10,
+                      "Ana Pérez", "ana@ferreteria.cl", "911111111")
+    assert ejecutar(cliente.create_async()) is True
+    assert ejecutar(cliente.create_async()) is False
+
+    leido = ejecutar(crud_async.read_cliente("11111111-1"))
+    assert leido.valores() == cliente.valores()
+    leido.cantidad_trabajadores = 12
+    assert ejecutar(leido.update_async()) is True
+    assert ejecutar(crud_async.read_cliente("11111111-1")).cantidad_trabajadores == 12
+
+    assert ejecutar(crud_async.delete_cliente("11111111-1")) is True
+    assert ejecutar(crud_async.read_cliente("11111111-1")) is None
+    assert ejecutar(crud_async.delete_cliente("11111111-1")) is False
+
+
+# ==============================
+# USUARIO
+# ==============================
+def test_login_usuario_existente():
+    rut = datos.rut_usuario(2)
+    assert ejecutar(crud_async.autenticar_usuario(rut, datos.PASSWORD)) == LOGIN_OK
+    assert ejecutar(crud_async.autenticar_usuario(rut, "otra")) == LOGIN_CLAVE_INCORRECTA
+    assert ejecutar(crud_async.autenticar_usuario(NUEVO, datos.PASSWORD)) == LOGIN_NO_ENCONTRADO
+    assert ejecutar(crud_async.autenticar_usuario("no es un rut", "x")) == LOGIN_NO_ENCONTRADO
+
+
+def test_registrar_login_y_desactivar_usuario():
+    assert ejecutar(crud_async.registrar_usuario(NUEVO, "secreta", "USER")) is True
+    assert ejecutar(crud_async.registrar_usuario(NUEVO, "secreta", "USER")) is False
+    assert ejecutar(crud_async.autenticar_usuario(NUEVO, "secreta")) == LOGIN_OK
+
+    assert ejecutar(crud_async.desactivar_usuario_rut(NUEVO)) is True
+    assert ejecutar(crud_async.autenticar_usuario(NUEVO, "secreta")) == LOGIN_INACTIVO
+    assert ejecutar(crud_async.desactivar_usuario_rut("22222222-2")) is False
+
+
+def test_registrar_usuario_rol_inexistente(capsys):
+    assert ejecutar(crud_async.registrar_usuario(NUEVO, "secreta", "NO_EXISTE")) is False
+    assert "No existe el rol NO_EXISTE." in capsys.readouterr().out
+    assert ejecutar(crud_async.autenticar_usuario(NUEVO, "secreta")) == LOGIN_NO_ENCONTRADO
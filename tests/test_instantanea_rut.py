@@ -0,0 +1,94 @@
+import pytest
+
+import conexion
+from benchmarks import datos
+from instantanea_rut import InstantaneaRUT, construir
+from mensajes import sin_mensajes
+from programa_crud_cliente_exception import Cliente, iterar_clientes, read_cliente
+from programa_crud_empleado import Empleado, iterar_empleados, read_empleado
+from validacion_rut import formatear_rut
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / "empleados.rut")
+
+
+def insertar_empleado(rut, nombre):
+    with conexion.conexion() as connection:
+        cursor = connection.cursor()
+        cursor.execute("INSERT INTO empleado (rut_empleado, nombre, salario, codigo_cargo, id_departamento) "
+                       "VALUES (:rut, :nombre, 1.0, 1, 1)", {"rut": rut, "nombre": nombre})
+        connection.commit()
+        cursor.close()
+
+
+def test_lee_lo_mismo_que_read_empleado(ruta):
+    resultado = construir(ruta, Empleado, tamano_lote=7)
+    assert (resultado["filas"], resultado["omitidas"]) == (20, 0)
+    with InstantaneaRUT(ruta) as instantanea:
+        assert len(instantanea) == 20
+        for rut, *_ in iterar_empleados(tamano_pagina=5):
+            leido = instantanea.leer(rut)
+            esperado = read_empleado(rut)
+            assert leido.valores() == esperado.valores()
+            assert leido.version == esperado.version
+        # con puntos, dígito en minúscula o sin guion
+        numero = int(datos.rut_empleado(5)[:-2])
+        assert instantanea.leer(f"{numero:,}".replace(",", ".") + datos.rut_empleado(5)[-2:].lower()) is not None
+        assert instantanea.leer(datos.rut_empleado(5).replace("-", "")) is not None
+
+
+def test_rut_inexistente_o_invalido(ruta, capsys):
+    construir(ruta, Empleado)
+    with InstantaneaRUT(ruta) as instantanea:
+        assert instantanea.leer("11111111-1") is None
+        numero = int(datos.rut_empleado(1)[:-2])
+        otro_dv = "0" if datos.rut_empleado(1)[-1] != "0" else "1"
+        assert instantanea.leer(f"{numero}-{otro_dv}") is None
+        assert instantanea.leer("no es un rut") is None
+        assert "RUT inválido." in capsys.readouterr().out
+        with sin_mensajes():
+            assert instantanea.leer("no es un rut") is None
+        assert capsys.readouterr().out == ""
+
+
+def test_filas_fuera_de_orden_y_repetidas(ruta):
+    # guardados sin normalizar: llegan después de los demás
+    insertar_empleado(f"{5_000_000:,}".replace(",", ".") + formatear_rut(5_000_000)[-2:], "Con Puntos")
+    insertar_empleado("0" + datos.rut_empleado(3), "Repetido")
+    insertar_empleado("11111111-2", "RUT Inválido")
+
+    resultado = construir(ruta, Empleado)
+    assert (resultado["filas"], resultado["omitidas"]) == (21, 2)
+    with InstantaneaRUT(ruta) as instantanea:
+        assert instantanea.leer(formatear_rut(5_000_000)).nombre == "Con Puntos"
+        assert instantanea.leer(datos.rut_empleado(3)).nombre == read_empleado(datos.rut_empleado(3)).nombre
+        assert all(instantanea.leer(datos.rut_empleado(i)) for i in range(20))
+
+
+def test_clientes_y_tabla_vacia(tmp_path):
+    ruta = str(tmp_path / "clientes.rut")
+    construir(ruta, Cliente)
+    with InstantaneaRUT(ruta) as instantanea:
+        for cliente in iterar_clientes():
+            assert instantanea.leer(cliente.rut_cliente).valores() == read_cliente(cliente.rut_cliente).valores()
+
+    with conexion.conexion() as connection:
+        cursor = connection.cursor()
+        cursor.execute("DELETE FROM cliente")
+        connection.commit()
+        cursor.close()
+    assert construir(ruta, Cliente)["filas"] == 0
+    with InstantaneaRUT(ruta) as instantanea:
+        assert len(instantanea) == 0
+        assert instantanea.leer(datos.rut_cliente(1)) is None
+
+
+def test_archivo_que_no_es_instantanea(tmp_path):
+    ruta = tmp_path / "otro.rut"
+    ruta.write_bytes(b"\0" * 128)
+    with pytest.raises(ValueError, match="no es una instantánea"):
+        InstantaneaRUT(str(ruta))
@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+import pytest
+
+import crud_async
+import instrumentacion
+from benchmarks import datos
+from programa_crud_empleado import Empleado, read_empleado
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+def test_async_usa_el_nombre_de_la_tabla(metricas):
+    emp = Empleado("11.111.111-1", "Ana Pérez", "Calle 1", "911111111", "ana@empresa.cl",
+                   None, 1000000.0, 1, 1)
+    assert asyncio.run(emp.create_async()) is True
+    emp.salario = 5.0
+    assert asyncio.run(emp.update_async()) is True
+    assert read_empleado(datos.rut_empleado(1)) is not None
+    assert asyncio.run(crud_async.read_empleado(datos.rut_empleado(2))) is not None
+
+    resumen = instrumentacion.snapshot()
+    assert "async.create" not in resumen and "async.update" not in resumen
+    assert resumen["empleado.create"]["async"]["errores"] == 0
+    assert resumen["empleado.update"]["async"]["idas_y_vueltas"] >= 1
+    # la misma operación síncrona y async quedan separadas
+    assert set(resumen["empleado.read"]) == {"sync", "async"}
+
+    texto = instrumentacion.exportar_prometheus()
+    assert 'crud_errores_total{operacion="empleado.create",api="async"} 0' in texto
+    assert 'operacion="empleado.read",api="sync"' in texto
+
+
+def test_log_de_consultas_lentas(metricas):
+    instrumentacion.activar(umbral_lento_ms=0)
+    assert read_empleado(datos.rut_empleado(1)) is not None
+    with open(instrumentacion.ARCHIVO_LENTAS, encoding="utf-8") as archivo:
+        lineas = [json.loads(linea) for linea in archivo]
+    assert lineas and all(linea["operacion"] == "empleado.read" for linea in lineas)
+    assert lineas[0]["api"] == "sync"
+    # sin los valores de los binds
+    assert lineas[0]["binds"] == {"rut_empleado": "?"}
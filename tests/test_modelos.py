@@ -0,0 +1,90 @@
+import pytest
+
+import conexion
+from benchmarks import datos
+from filas import objetos_desde_cursor, rowfactory_por_nombre
+from programa_crud_cliente_exception import Cliente
+from programa_crud_empleado import Empleado, read_empleado
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+# ==============================
+# __SLOTS__ Y ROWFACTORY
+# ==============================
+def test_modelos_sin_dict():
+    emp = read_empleado(datos.rut_empleado(1))
+    assert not hasattr(emp, "__dict__")
+    with pytest.raises(AttributeError):
+        emp.otro_campo = 1
+    assert not hasattr(Cliente("11111111-1", None, "X", 1, None, None, None), "__dict__")
+
+
+def test_rowfactory_por_nombre_de_columna():
+    rut = datos.rut_empleado(1)
+    esperado = read_empleado(rut)
+    with conexion.conexion() as connection:
+        cursor = connection.cursor()
+        # columnas en otro orden y con la versión en medio
+        cursor.execute("""
+            SELECT version, id_departamento, codigo_cargo, salario, fecha_inicio,
+                   email, telefono, direccion, nombre, rut_empleado
+            FROM empleado WHERE rut_empleado = :rut
+        """, {"rut": rut})
+        emp, = objetos_desde_cursor(cursor, Empleado)
+        cursor.close()
+    assert emp.valores() == esperado.valores()
+    assert emp.version == esperado.version
+    assert emp.campos_modificados() == ()
+
+
+def test_rowfactory_faltan_columnas():
+    with conexion.conexion() as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT rut_empleado, nombre FROM empleado")
+        with pytest.raises(ValueError, match="Faltan columnas para Empleado: direccion"):
+            rowfactory_por_nombre(cursor, Empleado)
+        cursor.close()
+
+
+# ==============================
+# SOLO COLUMNAS MODIFICADAS
+# ==============================
+def ejecutar(sql, binds=None):
+    with conexion.conexion() as connection:
+        cursor = connection.cursor()
+        cursor.execute(sql, binds or {})
+        connection.commit()
+        cursor.close()
+
+
+def test_campos_modificados():
+    emp = read_empleado(datos.rut_empleado(1))
+    assert emp.campos_modificados() == ()
+    emp.salario = 1.0
+    emp.nombre = emp.nombre
+    assert emp.campos_modificados() == ("salario",)
+    # un objeto que no viene de la base no sabe qué cambió
+    assert Empleado(*emp.valores()).campos_modificados() is None
+
+
+def test_update_envia_solo_lo_modificado():
+    rut = datos.rut_empleado(2)
+    emp = Empleado.desde_fila(*read_empleado(rut).valores())     # sin versión
+    # otro cambia el nombre después de la lectura
+    ejecutar("UPDATE empleado SET nombre = 'Otro Nombre' WHERE rut_empleado = :rut", {"rut": rut})
+
+    emp.salario = 1.0
+    assert emp.update()
+    assert emp.campos_modificados() == ()
+    leido = read_empleado(rut)
+    assert (leido.nombre, leido.salario) == ("Otro Nombre", 1.0)
+
+
+def test_update_sin_cambios_no_va_a_la_base(monkeypatch):
+    emp = read_empleado(datos.rut_empleado(3))
+    monkeypatch.setattr(conexion, "get_connection", lambda: None)
+    assert emp.update() is True
+
+    cliente = Cliente.desde_fila("11111111-1", None, "X", 1, None, None, None)
+    assert cliente.update() is True
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+import crud_async
+from programa_crud_empleado import iterar_empleados, pagina_empleados
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+def claves(rows):
+    return [(row[1], row[0]) for row in rows]
+
+
+def test_paginas_recorren_la_tabla_en_orden():
+    completas = claves(iterar_empleados(1000))
+    assert len(completas) == 20
+    assert completas == sorted(completas)
+
+    leidas = []
+    rows, siguiente = pagina_empleados(6)
+    while True:
+        leidas.extend(claves(rows))
+        if siguiente is None:
+            break
+        rows, siguiente = pagina_empleados(6, siguiente)
+    assert leidas == completas
+
+
+def test_iterar_con_paginas_chicas_y_desde_una_clave():
+    completas = claves(iterar_empleados(1000))
+    assert claves(iterar_empleados(3)) == completas
+    # la última página justo del tamaño pedido no repite ni pierde filas
+    assert claves(iterar_empleados(5)) == completas
+    assert claves(iterar_empleados(4, despues_de=completas[9])) == completas[10:]
+
+
+def test_pagina_async_igual_a_la_sincronica():
+    rows, siguiente = pagina_empleados(7)
+    rows_async, siguiente_async = asyncio.run(crud_async.pagina_empleados(7))
+    assert claves(rows_async) == claves(rows)
+    assert siguiente_async == siguiente
+    assert claves(asyncio.run(crud_async.pagina_empleados(7, siguiente))[0]) == \
+        claves(pagina_empleados(7, siguiente)[0])
@@ -0,0 +1,46 @@
+import pytest
+
+import referencias
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+@pytest.fixture
+def base_caida(monkeypatch):
+    lecturas = []
+
+    def leer(version_anterior):
+        lecturas.append(version_anterior)
+        return None
+    monkeypatch.setattr(referencias, "_leer", leer)
+    return lecturas
+
+
+def test_sin_base_no_reintenta_por_cada_validacion(base_caida):
+    for _ in range(1000):
+        assert referencias.validar_empleado(999, 999) is None      # la base valida
+    assert len(base_caida) == 1
+
+
+def test_reintenta_pasado_el_intervalo(base_caida, monkeypatch):
+    referencias.validar_rol("NO_EXISTE")
+    monkeypatch.setattr(referencias, "REINTENTO_TRAS_FALLO", 0)
+    referencias.validar_rol("NO_EXISTE")
+    assert len(base_caida) == 2
+
+
+def test_refrescar_siempre_intenta(base_caida):
+    referencias.get_referencias()
+    assert referencias.refrescar() is None
+    assert len(base_caida) == 2
+
+
+def test_mantiene_la_copia_anterior_si_falla(monkeypatch):
+    actuales = referencias.precargar()
+    assert referencias.validar_rol("NO_EXISTE") == "No existe el rol NO_EXISTE."
+    lecturas = []
+    monkeypatch.setattr(referencias, "_leer", lambda version: lecturas.append(version))
+    monkeypatch.setattr(referencias, "REFRESCO", 0)
+    for _ in range(100):
+        assert referencias.get_referencias() is actuales
+    assert len(lecturas) == 1
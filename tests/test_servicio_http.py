@@ -0,0 +1,146 @@
+import http.client
+import json
+import sqlite3
+import threading
+
+import pytest
+
+import conexion
+import servicio_http
+from benchmarks import datos
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+@pytest.fixture
+def servidor():
+    servidor = servicio_http.crear_servidor("127.0.0.1", 0)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def pedir(servidor, metodo, ruta, cuerpo=None):
+    cliente = http.client.HTTPConnection("127.0.0.1", servidor.server_address[1], timeout=10)
+    try:
+        contenido = None if cuerpo is None else json.dumps(cuerpo)
+        cliente.request(metodo, ruta, body=contenido,
+                        headers={"Content-Type": "application/json"} if contenido else {})
+        respuesta = cliente.getresponse()
+        return respuesta.status, respuesta.read().decode("utf-8")
+    finally:
+        cliente.close()
+
+
+# ==============================
+# LISTADOS
+# ==============================
+def test_listar_empleados(servidor):
+    estado, cuerpo = pedir(servidor, "GET", "/empleados?pagina=7")
+    assert estado == 200
+    filas = [json.loads(linea) for linea in cuerpo.splitlines()]
+    assert len(filas) == 20
+    assert [f["nombre"] for f in filas] == sorted(f["nombre"] for f in filas)
+
+
+def test_listar_sin_base_responde_503(servidor, monkeypatch):
+    monkeypatch.setattr(conexion, "get_connection", lambda: None)
+    estado, cuerpo = pedir(servidor, "GET", "/empleados")
+    assert estado == 503
+    assert json.loads(cuerpo) == {"error": "Base de datos no disponible."}
+
+
+def test_listado_interrumpido_queda_incompleto(servidor, monkeypatch):
+    def iterar_con_falla(*args, **kwargs):
+        yield (datos.rut_empleado(1), "Ana", None, None, None, 1.0)
+        raise sqlite3.OperationalError("se perdió la conexión")
+
+    monkeypatch.setattr(servicio_http, "iterar_empleados", iterar_con_falla)
+    # sin el chunk final el cliente no puede dar la respuesta por completa
+    with pytest.raises(http.client.IncompleteRead):
+        pedir(servidor, "GET", "/empleados")
+
+
+# ==============================
+# CLIENTES
+# ==============================
+def nuevo_cliente(**cambios):
+    return {"rut_cliente": "11111111-1", "rut_vendedor": datos.rut_empleado(1),
+            "razon_social": "Ferretería Pérez SpA", "cantidad_trabajadores": 10,
+            "nombre_contacto": "Ana Pérez", "email_contacto": "ana@ferreteria.cl",
+            "telefono_contacto": "911111111", **cambios}
+
+
+def test_crear_cliente_convierte_cantidad(servidor):
+    estado, _ = pedir(servidor, "POST", "/clientes", nuevo_cliente(cantidad_trabajadores="12"))
+    assert estado == 201
+    estado, cuerpo = pedir(servidor, "GET", "/clientes/11111111-1")
+    assert estado == 200
+    assert json.loads(cuerpo)["cantidad_trabajadores"] == 12
+
+
+@pytest.mark.parametrize("cantidad", ["muchos", -1, 2.5, True])
+def test_cantidad_trabajadores_invalida(servidor, cantidad):
+    estado, _ = pedir(servidor, "POST", "/clientes", nuevo_cliente(cantidad_trabajadores=cantidad))
+    assert estado == 400
+    estado, _ = pedir(servidor, "POST", "/clientes/upsert", [nuevo_cliente(cantidad_trabajadores=cantidad)])
+    assert estado == 400
+
+    rut = "11111111-1"
+    assert pedir(servidor, "POST", "/clientes", nuevo_cliente())[0] == 201
+    estado, _ = pedir(servidor, "PATCH", f"/clientes/{rut}", {"cantidad_trabajadores": cantidad})
+    assert estado == 400
+    assert json.loads(pedir(servidor, "GET", f"/clientes/{rut}")[1])["cantidad_trabajadores"] == 10
+
+
+# ==============================
+# PATCH CON VERSIÓN
+# ==============================
+def test_patch_empleado_con_version(servidor):
+    rut = datos.rut_empleado(3)
+    leido = json.loads(pedir(servidor, "GET", f"/empleados/{rut}")[1])
+
+    estado, cuerpo = pedir(servidor, "PATCH", f"/empleados/{rut}", {"salario": 1.0, "version": leido["version"]})
+    assert estado == 200
+    assert json.loads(cuerpo)["version"] == leido["version"] + 1
+
+    # la misma versión ya no es la actual
+    estado, _ = pedir(servidor, "PATCH", f"/empleados/{rut}", {"salario": 2.0, "version": leido["version"]})
+    assert estado == 409
+    assert json.loads(pedir(servidor, "GET", f"/empleados/{rut}")[1])["salario"] == 1.0
+
+
+def test_patch_empleado_departamento_inexistente(servidor):
+    rut = datos.rut_empleado(4)
+    estado, cuerpo = pedir(servidor, "PATCH", f"/empleados/{rut}", {"id_departamento": 999})
+    assert estado == 400
+    assert json.loads(cuerpo)["error"] == "No existe el departamento 999."
+    assert json.loads(pedir(servidor, "GET", f"/empleados/{rut}")[1])["id_departamento"] != 999
+
+
+# ==============================
+# USUARIOS
+# ==============================
+def test_crear_y_desactivar_usuario(servidor):
+    usuario = {"rut": "11111111-1", "password": "secreta", "codigo_rol": "USER"}
+    assert pedir(servidor, "POST", "/usuarios", usuario) == (201, '{"creado": "11111111-1"}')
+    assert pedir(servidor, "POST", "/usuarios", usuario)[0] == 409
+
+    estado, cuerpo = pedir(servidor, "POST", "/usuarios/11.111.111-1/desactivar")
+    assert (estado, json.loads(cuerpo)) == (200, {"desactivado": "11111111-1"})
+
+
+def test_crear_usuario_rol_inexistente(servidor):
+    estado, cuerpo = pedir(servidor, "POST", "/usuarios",
+                           {"rut": "11111111-1", "password": "secreta", "codigo_rol": "NO_EXISTE"})
+    assert estado == 400
+    assert json.loads(cuerpo)["error"] == "No existe el rol NO_EXISTE."
+
+
+def test_crear_usuario_sin_base(servidor, monkeypatch):
+    monkeypatch.setattr(conexion, "get_connection", lambda: None)
+    estado, _ = pedir(servidor, "POST", "/usuarios",
+                      {"rut": "11111111-1", "password": "secreta", "codigo_rol": "USER"})
+    assert estado == 503
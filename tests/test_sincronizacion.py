@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+import auditoria
+import conexion
+import sincronizacion
+from benchmarks import datos
+from exportar import TABLAS
+from programa_crud_empleado import delete_empleado, read_empleado
+from programa_crud_usuario import desactivar_usuario_rut
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / "instantanea.db")
+
+
+def contar(tabla):
+    with conexion.conexion() as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {tabla}")
+        total = cursor.fetchone()[0]
+        cursor.close()
+    return total
+
+
+def leer(ruta, sql, binds=()):
+    destino = sqlite3.connect(ruta)
+    try:
+        return destino.execute(sql, binds).fetchall()
+    finally:
+        destino.close()
+
+
+def test_primera_ejecucion_copia_todo(ruta):
+    resultados = sincronizacion.sincronizar(ruta)
+    for tabla in TABLAS:
+        assert resultados[tabla]["cambiadas"] == resultados[tabla]["filas"] == contar(tabla)
+    columnas = [fila[1] for fila in leer(ruta, "PRAGMA table_info(usuario)")]
+    assert "password_hash" not in columnas
+
+    # sin cambios no se transfiere nada
+    resultados = sincronizacion.sincronizar(ruta)
+    assert all(r["transferidas"] == 0 for r in resultados.values())
+
+
+def test_solo_trae_lo_modificado(ruta):
+    sincronizacion.sincronizar(ruta)
+    emp = read_empleado(datos.rut_empleado(1))
+    emp.salario = 1.0
+    assert emp.update()
+    assert desactivar_usuario_rut(datos.rut_usuario(1))
+
+    resultados = sincronizacion.sincronizar(ruta)
+    assert resultados["empleado"]["cambiadas"] == 1
+    assert resultados["usuario"]["cambiadas"] == 1
+    assert resultados["cliente"]["cambiadas"] == 0
+    assert leer(ruta, "SELECT salario FROM empleado WHERE rut_empleado = ?", (emp.rut_empleado,)) == [(1.0,)]
+
+
+def test_eliminaciones_por_auditoria_y_por_diferencia(ruta):
+    sincronizacion.sincronizar(ruta, ["empleado"], diferencia_cada=3)
+    auditado, sin_auditar = datos.rut_empleado(1), datos.rut_empleado(2)
+    assert delete_empleado(auditado)
+    assert auditoria.vaciar()
+    with conexion.conexion() as connection:
+        cursor = connection.cursor()
+        cursor.execute("DELETE FROM empleado WHERE rut_empleado = :rut", {"rut": sin_auditar})
+        connection.commit()
+        cursor.close()
+
+    resultado = sincronizacion.sincronizar(ruta, ["empleado"], diferencia_cada=3)["empleado"]
+    assert (resultado["eliminadas"], resultado["diferencia"]) == (1, False)
+    assert leer(ruta, "SELECT 1 FROM empleado WHERE rut_empleado = ?", (auditado,)) == []
+
+    # la tercera ejecución compara todas las claves
+    resultado = sincronizacion.sincronizar(ruta, ["empleado"], diferencia_cada=3)["empleado"]
+    assert (resultado["eliminadas"], resultado["diferencia"]) == (1, True)
+    assert resultado["filas"] == contar("empleado")
+
+
+def test_tabla_desconocida(ruta, capsys):
+    assert sincronizacion.sincronizar(ruta, ["empleado", "otra"]) is None
+    assert "Tablas desconocidas: otra" in capsys.readouterr().out
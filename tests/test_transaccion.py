@@ -0,0 +1,79 @@
+import pytest
+
+from benchmarks import datos
+from programa_crud_empleado import Empleado, read_empleado
+from transaccion import ConflictoVersion, UnidadDeTrabajo
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+def test_eliminar_y_crear_el_mismo_rut():
+    rut = datos.rut_empleado(1)
+    emp = read_empleado(rut)
+    emp.nombre = "Nuevo Nombre"
+    with UnidadDeTrabajo() as uow:
+        uow.eliminar(Empleado, rut)
+        uow.crear(Empleado(*emp.valores()))
+    assert uow.resultado == 2
+    assert read_empleado(rut).nombre == "Nuevo Nombre"
+
+
+def test_crear_y_eliminar_el_mismo_rut():
+    emp = Empleado("11111111-1", "Ana Pérez", None, None, None, None, 1.0, 1, 1)
+    with UnidadDeTrabajo() as uow:
+        uow.crear(emp)
+        uow.eliminar(Empleado, emp.rut_empleado)
+    assert read_empleado(emp.rut_empleado) is None
+
+
+def test_consecutivas_van_en_un_executemany():
+    uow = UnidadDeTrabajo()
+    for i in range(3):
+        uow.eliminar(Empleado, datos.rut_empleado(i))
+    uow.crear(Empleado("11111111-1", "Ana Pérez", None, None, None, None, 1.0, 1, 1))
+    uow.eliminar(Empleado, datos.rut_empleado(3))
+    assert [len(binds) for _, binds in uow.operaciones] == [3, 1, 1]
+    assert uow.enviar() == 5
+
+
+def test_conflicto_hace_rollback_de_todo():
+    rut = datos.rut_empleado(2)
+    leido = read_empleado(rut)
+    otro = Empleado.desde_fila(*leido.valores(), leido.version)
+    leido.salario = 1.0
+    assert leido.update()
+
+    otro.salario = 2.0
+    with pytest.raises(ConflictoVersion):
+        with UnidadDeTrabajo() as uow:
+            uow.eliminar(Empleado, datos.rut_empleado(3))
+            uow.actualizar(otro)
+    assert read_empleado(datos.rut_empleado(3)) is not None
+    assert read_empleado(rut).salario == 1.0
+
+
+def test_actualizar_dos_veces_el_mismo_objeto():
+    rut = datos.rut_empleado(4)
+    emp = read_empleado(rut)
+    version = emp.version
+    with UnidadDeTrabajo() as uow:
+        emp.salario = 1.0
+        uow.actualizar(emp)
+        emp.nombre = "Otro Nombre"
+        uow.actualizar(emp)
+    assert emp.version == version + 2
+    leido = read_empleado(rut)
+    assert (leido.salario, leido.nombre, leido.version) == (1.0, "Otro Nombre", version + 2)
+
+
+def test_referencias_inexistentes_se_rechazan_al_agregar():
+    uow = UnidadDeTrabajo()
+    with pytest.raises(ValueError, match="No existe el cargo 999."):
+        uow.crear(Empleado("11111111-1", "Ana Pérez", None, None, None, None, 1.0, 999, 1))
+    emp = read_empleado(datos.rut_empleado(5))
+    emp.id_departamento = 999
+    with pytest.raises(ValueError, match="No existe el departamento 999."):
+        uow.actualizar(emp)
+    with pytest.raises(ValueError, match="No existe el rol NO_EXISTE."):
+        uow.crear_usuario("11111111-1", "secreta", "NO_EXISTE")
+    assert uow.pendientes() == 0
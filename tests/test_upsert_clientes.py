@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks import datos
+from programa_crud_cliente_exception import Cliente, iterar_clientes, read_cliente, upsert_clientes
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+def cliente(rut, razon_social="Ferretería Pérez SpA", cantidad=10):
+    return Cliente(rut, datos.rut_empleado(1), razon_social, cantidad,
+                   "Ana Pérez", "ana@ferreteria.cl", "911111111")
+
+
+def rut_existente():
+    return next(iterar_clientes()).rut_cliente
+
+
+def test_upsert_cuenta_insertados_y_actualizados():
+    existente = rut_existente()
+    version = read_cliente(existente).version
+    resultado = upsert_clientes([
+        cliente(existente, "Actualizada"),
+        cliente("11111111-1"),
+        cliente("22.222.222-2"),
+        cliente("11111111-1", "Repetida en el lote"),
+        cliente("11111111-2"),      # RUT inválido: no se envía
+    ], tamano_lote=3)
+    assert (resultado["insertados"], resultado["actualizados"], resultado["fallidos"]) == (2, 2, 1)
+    assert resultado["errores"] == [("11111111-2", "RUT inválido en rut_cliente: 11111111-2")]
+
+    assert read_cliente(existente).razon_social == "Actualizada"
+    assert read_cliente(existente).version == version + 1
+    assert read_cliente("11111111-1").razon_social == "Repetida en el lote"
+    assert read_cliente("22222222-2") is not None
+
+
+def test_upsert_de_nuevo_solo_actualiza():
+    clientes = [cliente("11111111-1"), cliente("22222222-2")]
+    assert upsert_clientes(clientes)["insertados"] == 2
+    resultado = upsert_clientes([cliente("11111111-1", cantidad=20), cliente("22222222-2")])
+    assert (resultado["insertados"], resultado["actualizados"]) == (0, 2)
+    assert read_cliente("11111111-1").cantidad_trabajadores == 20
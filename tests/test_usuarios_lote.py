@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from programa_crud_usuario import (
+    DESACTIVACION_NO_ENCONTRADO, DESACTIVACION_OK, LOGIN_INACTIVO, LOGIN_OK, autenticar_usuario,
+    crear_usuarios_desde_archivo, desactivar_usuarios, main_desactivar_lote
+)
+from benchmarks import datos
+
+pytestmark = pytest.mark.usefixtures("base")
+
+
+def test_crear_desde_archivo_con_filas_invalidas(tmp_path, capsys):
+    ruta = tmp_path / "usuarios.jsonl"
+    ruta.write_text("\n".join([
+        json.dumps({"rut_usuario": "11111111-1", "password": "  secreta \n", "codigo_rol": " user "}),
+        "{esto no es json",
+        json.dumps({"rut_usuario": "22222222-2", "password": "otra", "codigo_rol": "NO_EXISTE"}),
+        json.dumps([1, 2]),
+    ]), encoding="utf-8")
+
+    resultado = crear_usuarios_desde_archivo(str(ruta))
+    assert resultado["creados"] == 1
+    errores = resultado["errores"]
+    assert len(errores) == 4
+    assert errores[0] is None
+    assert errores[1].startswith("JSON inválido")
+    assert errores[2] == "No existe el rol NO_EXISTE."
+    assert errores[3].startswith("JSON inválido")
+    salida = capsys.readouterr().out
+    assert "Fila 2 (-): JSON inválido" in salida
+    assert "Usuarios creados: 1 de 4" in salida
+    # la contraseña se guarda sin los espacios del archivo
+    assert autenticar_usuario("11111111-1", "secreta") == LOGIN_OK
+
+
+def test_crear_desde_archivo_inexistente(tmp_path, capsys):
+    assert crear_usuarios_desde_archivo(str(tmp_path / "no_existe.csv")) is None
+    assert "No se pudo leer el archivo" in capsys.readouterr().out
+
+
+def test_desactivar_lote_por_ruts():
+    rut = datos.rut_usuario(3)
+    resultado = desactivar_usuarios([rut, "11111111-1"])
+    assert resultado["desactivados"] == 1
+    assert resultado["resultados"] == [(rut, DESACTIVACION_OK), ("11111111-1", DESACTIVACION_NO_ENCONTRADO)]
+    assert autenticar_usuario(rut, datos.PASSWORD) == LOGIN_INACTIVO
+
+
+@pytest.mark.parametrize("argv, mensaje", [
+    (["--antes", "2024-13-40"], "Fecha inválida en --antes"),
+    (["--archivo", "no_existe.txt"], "No se pudo leer el archivo"),
+])
+def test_desactivar_lote_argumentos_invalidos(tmp_path, monkeypatch, capsys, argv, mensaje):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as salida:
+        main_desactivar_lote(argv)
+    assert salida.value.code == 1
+    assert mensaje in capsys.readouterr().out
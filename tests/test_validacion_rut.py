@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+import validacion_rut
+from validacion_rut import digito_verificador, formatear_rut, normalizar_rut, normalizar_ruts
+
+con_numpy = pytest.mark.skipif(validacion_rut.np is None, reason="requiere NumPy")
+
+
+def _con_puntos(numero):
+    return f"{numero:,}".replace(",", ".")
+
+
+def _variantes(numero, dv):
+    return [f"{numero}-{dv}", f"{_con_puntos(numero)}-{dv}", f"{numero}{dv}",
+            f" {numero}-{dv.lower()} ", f"0{numero}-{dv}"]
+
+
+def _ruts_aleatorios(semilla, cantidad=2000):
+    aleatorio = random.Random(semilla)
+    textos = []
+    for _ in range(cantidad):
+        numero = aleatorio.randint(1, 99_999_999)
+        dv = digito_verificador(numero)
+        textos.extend(_variantes(numero, dv))
+        # un dígito verificador distinto nunca es válido
+        otro = aleatorio.choice([d for d in "0123456789K" if d != dv])
+        textos.append(f"{numero}-{otro}")
+    return textos
+
+
+# RUT cuyo dígito verificador es K, más el mismo número con otros dígitos
+def _ruts_con_k():
+    textos = []
+    for numero in range(1, 200_000):
+        if digito_verificador(numero) == "K":
+            textos.extend(_variantes(numero, "K"))
+            textos.extend([f"{numero}-0", f"{numero}-1"])
+            if len(textos) > 2000:
+                break
+    return textos
+
+
+BORDES = [
+    "", "-", "K", "0-0", "00000000-0", "1-9", "1-K", "12345678901", "1234567890-1",
+    "12.345.678-5", "12.345.678-K", "12345678-k", "1a345678-5", "12345678-Ñ", "１２３-4",
+    "12\t345\t678-5", "--12345678-5", None, 123456785, "99.999.999-9", "100000000-0",
+]
+
+
+@con_numpy
+@pytest.mark.parametrize("textos", [
+    _ruts_aleatorios(1), _ruts_aleatorios(2), _ruts_con_k(), BORDES
+], ids=["aleatorios-1", "aleatorios-2", "digito-k", "bordes"])
+def test_numpy_igual_a_escalar(textos):
+    limpio = validacion_rut._limpiar(textos)
+    assert limpio is not None
+    assert validacion_rut._normalizar_numpy(limpio, len(textos)) == [normalizar_rut(t) for t in textos]
+
+
+def test_normalizar_ruts_igual_a_escalar(monkeypatch):
+    textos = _ruts_aleatorios(3, 200) + BORDES
+    esperado = [normalizar_rut(t) for t in textos]
+    assert normalizar_ruts(textos) == esperado
+    # sin NumPy se usa el ciclo simple, con el mismo resultado
+    monkeypatch.setattr(validacion_rut, "np", None)
+    assert normalizar_ruts(textos) == esperado
+
+
+def test_normalizar_ruts_salto_de_linea():
+    textos = ["12.345.678-5", "12345678\n-5", "12345678-K"]
+    assert normalizar_ruts(textos) == [normalizar_rut(t) for t in textos]
+    assert normalizar_ruts([]) == []
+
+
+def test_normalizar_rut():
+    assert normalizar_rut(" 12.345.678-5 ") == "12345678-5"
+    assert normalizar_rut("012345678-5") == "12345678-5"
+    assert normalizar_rut("12345678-6") is None
+    numero_k = next(n for n in range(1, 1000) if digito_verificador(n) == "K")
+    assert normalizar_rut(f"{numero_k}-k") == formatear_rut(numero_k)
@@ -0,0 +1,204 @@
+# Unidad de trabajo: junta creaciones, actualizaciones y eliminaciones de
+# empleados, clientes y usuarios y las envía al salir del bloque "with",
+# sobre una sola conexión y con un único commit. Se envían en el orden en
+# que se agregaron; las consecutivas con la misma sentencia van en un solo
+# executemany. Por eso eliminar y volver a crear el mismo RUT funciona, y
+# para claves foráneas se agrega primero el padre.
+#
+#   with UnidadDeTrabajo() as uow:
+#       uow.crear(Empleado(...))
+#       uow.actualizar(cliente)
+#       uow.eliminar(Empleado, "12345678-9")
+#       uow.desactivar_usuario("11111111-1")
+#
+# Si ocurre un error (dentro del bloque o al enviar) se hace rollback y la
+# excepción se propaga. Un RUT inválido, un cargo, departamento o rol que no
+# existe lanzan ValueError al agregarlo, como rechazan create/update. Los
+# métodos create/update/delete de cada programa siguen funcionando igual
+# para el uso interactivo.
+#
+# Los objetos leídos con su versión (read_empleado, read_cliente) se
+# actualizan solo si la fila sigue en esa versión; si alguno cambió, se hace
+# rollback de todo y se lanza ConflictoVersion. Actualizar dos veces el mismo
+# objeto en la unidad es válido: la segunda espera la versión que deja la
+# primera.
+import auditoria
+from autenticacion import get_servicio
+from conexion import get_connection
+from instrumentacion import medir
+from modelo import sql_update
+from programa_crud_cliente_exception import INSERT_CLIENTE, Cliente, cache_clientes, indice_clientes
+from programa_crud_empleado import INSERT_EMPLEADO, Empleado, cache_empleados, indice_empleados
+from programa_crud_usuario import DESACTIVAR_USUARIO, INSERT_USUARIO
+from referencias import validar_rol
+from validacion_rut import normalizar_rut
+
+INSERTS = {Empleado: INSERT_EMPLEADO, Cliente: INSERT_CLIENTE}
+CACHES = {Empleado: cache_empleados, Cliente: cache_clientes}
+INDICES = {Empleado: indice_empleados, Cliente: indice_clientes}
+
+
+class ConflictoVersion(Exception):
+    pass
+
+
+def _rut(rut):
+    normalizado = normalizar_rut(rut)
+    if normalizado is None:
+        raise ValueError(f"RUT inválido: {rut}")
+    return normalizado
+
+
+class UnidadDeTrabajo:
+    def __init__(self):
+        self.operaciones = []   # [sql, lista de binds], en el orden en que se agregaron
+        self._guardados = []    # objetos a marcar como guardados tras el commit
+        self._invalidar = []    # (caché, rut) a invalidar tras el commit
+        self._indices = []      # (índice.guardar o índice.eliminar, objeto o rut), en orden
+        self._eventos = []      # eventos de auditoría a registrar tras el commit
+        self._condicionales = set()     # sentencias con "AND version = :version"
+        self._versiones = {}    # id(objeto) -> (objeto, versión que tendrá tras sus UPDATE)
+        self.resultado = None
+
+    # Se suma al executemany anterior solo si es la misma sentencia
+    def _agregar(self, sql, binds):
+        if self.operaciones and self.operaciones[-1][0] == sql:
+            self.operaciones[-1][1].append(binds)
+        else:
+            self.operaciones.append([sql, [binds]])
+
+    # ==============================
+    # EMPLEADO / CLIENTE
+    # ==============================
+    def crear(self, obj):
+        error = obj.normalizar_ruts() or obj.validar_referencias()
+        if error:
+            raise ValueError(error)
+        self._agregar(INSERTS[type(obj)], obj.binds())
+        self._guardados.append(obj)
+        self._indices.append((INDICES[type(obj)].guardar, obj))
+        self._invalidar.append((CACHES[type(obj)], getattr(obj, obj.CLAVE)))
+        self._eventos.append((auditoria.CREAR, obj.TABLA, getattr(obj, obj.CLAVE), None))
+
+    # Solo se envían las columnas modificadas; sin cambios no se agrega nada
+    def actualizar(self, obj):
+        columnas = obj.campos_modificados()
+        if columnas is None:
+            columnas = obj.COLUMNAS[1:]
+        elif not columnas:
+            return
+        error = obj.normalizar_ruts(columnas) or obj.validar_referencias()
+        if error:
+            raise ValueError(error)
+        binds = obj.binds(columnas)
+        # si ya tiene un UPDATE en la unidad, la fila estará en la versión siguiente
+        _, version = self._versiones.get(id(obj), (obj, obj.version))
+        if version is None:
+            sql = sql_update(obj.TABLA, obj.CLAVE, columnas)
+        else:
+            sql = sql_update(obj.TABLA, obj.CLAVE, columnas, True)
+            binds["version"] = version
+            self._condicionales.add(sql)
+            self._versiones[id(obj)] = (obj, version + 1)
+        self._agregar(sql, binds)
+        self._guardados.append(obj)
+        self._indices.append((INDICES[type(obj)].guardar, obj))
+        self._invalidar.append((CACHES[type(obj)], getattr(obj, obj.CLAVE)))
+        self._eventos.append((auditoria.ACTUALIZAR, obj.TABLA, getattr(obj, obj.CLAVE), ", ".join(columnas)))
+
+    def eliminar(self, clase, rut):
+        rut = _rut(rut)
+        sql = f"DELETE FROM {clase.TABLA} WHERE {clase.CLAVE} = :{clase.CLAVE}"
+        self._agregar(sql, {clase.CLAVE: rut})
+        self._invalidar.append((CACHES[clase], rut))
+        self._indices.append((INDICES[clase].eliminar, rut))
+        self._eventos.append((auditoria.ELIMINAR, clase.TABLA, rut, None))
+
+    # ==============================
+    # USUARIO
+    # ==============================
+    def crear_usuario(self, rut, password, codigo_rol):
+        rut = _rut(rut)
+        error = validar_rol(codigo_rol)
+        if error:
+            raise ValueError(error)
+        password_hash = get_servicio().hashear(password)
+        self._agregar(INSERT_USUARIO, {'rut': rut, 'hash': password_hash, 'rol': codigo_rol})
+        self._eventos.append((auditoria.CREAR, "usuario", rut, f"rol {codigo_rol}"))
+
+    def desactivar_usuario(self, rut):
+        rut = _rut(rut)
+        self._agregar(DESACTIVAR_USUARIO, {'rut': rut})
+        self._eventos.append((auditoria.DESACTIVAR, "usuario", rut, None))
+
+    # ==============================
+    # ENVÍO
+    # ==============================
+    def pendientes(self):
+        return sum(len(binds) for _, binds in self.operaciones)
+
+    # Envía todo con un commit. Devuelve la cantidad de filas afectadas.
+    @medir("transaccion.enviar")
+    def enviar(self):
+        if not self.pendientes():
+            self.resultado = 0
+            return 0
+
+        connection = get_connection()
+        if not connection:
+            raise ConnectionError("No se pudo conectar con la base de datos.")
+
+        cursor = connection.cursor()
+        filas = 0
+        try:
+            for sql, binds in self.operaciones:
+                cursor.executemany(sql, binds)
+                if sql in self._condicionales and cursor.rowcount < len(binds):
+                    raise ConflictoVersion(
+                        f"{len(binds) - cursor.rowcount} fila(s) cambiaron desde que se leyeron "
+                        "o ya no existen."
+                    )
+                filas += cursor.rowcount
+            connection.commit()
+        except BaseException as e:
+            connection.rollback()
+            if isinstance(e, ConflictoVersion):
+                for cache, rut in self._invalidar:
+                    cache.invalidar(rut)
+            raise
+        finally:
+            cursor.close()
+            connection.close()
+
+        for obj in self._guardados:
+            obj.marcar_guardado()
+        for obj, version in self._versiones.values():
+            obj._version = version
+        for cache, rut in self._invalidar:
+            cache.invalidar(rut)
+        for funcion, valor in self._indices:
+            funcion(valor)
+        for evento in self._eventos:
+            auditoria.registrar(*evento)
+        self.descartar()
+        self.resultado = filas
+        return filas
+
+    def descartar(self):
+        self.operaciones.clear()
+        self._guardados.clear()
+        self._invalidar.clear()
+        self._indices.clear()
+        self._eventos.clear()
+        self._condicionales.clear()
+        self._versiones.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is not None:
+            self.descartar()
+            return False
+        self.enviar()
+        return False
@@ -0,0 +1,132 @@
+# Normalización y validación de RUT chilenos (dígito verificador módulo 11).
+#
+# Forma normal: número sin puntos ni ceros a la izquierda, guion y dígito
+# verificador en mayúscula ("12.345.678-k" -> "12345678-K"). Se acepta el
+# RUT con o sin puntos, con o sin guion y con espacios alrededor.
+#
+# normalizar_rut() valida uno; normalizar_ruts() valida una lista completa.
+# Con NumPy la lista se valida con operaciones vectorizadas sobre una
+# matriz de bytes (millones de RUT por segundo); sin NumPy usa el ciclo
+# simple.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LARGO_MAXIMO = 10           # dígitos del número + dígito verificador
+_SEPARADORES = ". -\t"
+_LIMPIAR = str.maketrans("", "", _SEPARADORES)
+
+
+def digito_verificador(numero):
+    suma, factor = 0, 2
+    while numero:
+        numero, digito = divmod(numero, 10)
+        suma += digito * factor
+        factor = 2 if factor == 7 else factor + 1
+    dv = 11 - suma % 11
+    return "0" if dv == 11 else "K" if dv == 10 else str(dv)
+
+
+def formatear_rut(numero):
+    return f"{numero}-{digito_verificador(numero)}"
+
+
+# Devuelve el RUT normalizado, o None si el formato o el dígito verificador
+# no son válidos.
+def normalizar_rut(texto):
+    if texto is None:
+        return None
+    limpio = str(texto).translate(_LIMPIAR).upper()
+    if not 2 <= len(limpio) <= LARGO_MAXIMO or not limpio.isascii() or not limpio[:-1].isdigit():
+        return None
+    numero = int(limpio[:-1])
+    if numero == 0 or digito_verificador(numero) != limpio[-1]:
+        return None
+    return f"{numero}-{limpio[-1]}"
+
+
+def rut_valido(texto):
+    return normalizar_rut(texto) is not None
+
+
+# ==============================
+# VALIDACIÓN POR LOTES
+# ==============================
+# Factores del módulo 11 según la distancia al dígito verificador
+_FACTORES = [2, 3, 4, 5, 6, 7] * 2
+
+
+# Limpia todos los textos de una vez: se unen con saltos de línea, se pasan
+# a bytes y se quitan los separadores con bytes.translate (mucho más rápido
+# que un str.translate por RUT). Lo que no es ASCII queda como "?", que no
+# es válido en ninguna posición. None si algún texto trae un salto de línea.
+def _limpiar(textos):
+    try:
+        unidos = "\n".join(textos)
+    except TypeError:       # None o números entre los textos
+        unidos = "\n".join("" if texto is None else str(texto) for texto in textos)
+    limpio = unidos.encode("ascii", "replace").translate(None, _SEPARADORES.encode()).upper()
+    if limpio.count(b"\n") != len(textos) - 1:
+        return None
+    return limpio
+
+
+def _normalizar_numpy(limpio, n):
+    ancho = LARGO_MAXIMO + 1
+    texto = np.frombuffer(limpio + b"\n", dtype=np.uint8)
+
+    # matriz n x ancho de bytes: cada RUT alineado a la izquierda, relleno con 0
+    fines = np.flatnonzero(texto == ord("\n"))
+    inicios = np.empty(n, dtype=np.int64)
+    inicios[0] = 0
+    inicios[1:] = fines[:-1] + 1
+    largo = fines - inicios
+    columna = np.arange(ancho)
+    dentro = columna[None, :] < largo[:, None]
+    matriz = np.where(dentro, texto[np.minimum(inicios[:, None] + columna, len(texto) - 1)], 0).astype(np.uint8)
+    fila = np.arange(n)
+    dv = matriz[fila, np.clip(largo - 1, 0, LARGO_MAXIMO)]
+
+    # posición de cada carácter respecto del dígito verificador (1 = el anterior)
+    distancia = (largo - 1)[:, None] - columna[None, :]
+    en_numero = distancia >= 1
+    digitos = matriz.astype(np.int32) - 48
+    son_digitos = ((digitos >= 0) & (digitos <= 9)) | ~en_numero
+    valores = np.where(en_numero, digitos, 0)
+
+    factores = np.array([0] + _FACTORES[:LARGO_MAXIMO], dtype=np.int32)
+    suma = (valores * factores[np.clip(distancia, 0, LARGO_MAXIMO)]).sum(axis=1)
+    numero = (valores * 10 ** np.clip(distancia - 1, 0, LARGO_MAXIMO - 2).astype(np.int32)).sum(axis=1)
+    esperado = 11 - suma % 11
+    esperado = np.where(esperado == 11, ord("0"), np.where(esperado == 10, ord("K"), esperado + 48))
+
+    validos = (largo >= 2) & (largo <= LARGO_MAXIMO) & son_digitos.all(axis=1) \
+        & (numero > 0) & (dv == esperado)
+
+    # salida "número-DV" armada en la misma matriz: el número sin cambios,
+    # luego el guion y el dígito verificador
+    salida = np.zeros((n, ancho + 1), dtype=np.uint8)
+    salida[:, :ancho] = np.where(en_numero & dentro, matriz, 0)
+    posicion = np.clip(largo - 1, 0, LARGO_MAXIMO)
+    salida[fila, posicion] = ord("-")
+    salida[fila, posicion + 1] = dv
+    resultado = salida.view(f"S{ancho + 1}").ravel().astype(f"U{ancho + 1}").astype(object)
+    resultado[~validos] = None
+
+    # ceros a la izquierda (poco común): se arma el texto desde el número
+    for i in np.flatnonzero(validos & (matriz[:, 0] == ord("0"))).tolist():
+        resultado[i] = f"{numero[i]}-{chr(dv[i])}"
+    return resultado.tolist()
+
+
+# Normaliza una lista de RUT. Devuelve una lista del mismo largo con el RUT
+# normalizado o None donde no es válido.
+def normalizar_ruts(textos):
+    textos = list(textos)
+    if not textos:
+        return []
+    limpio = _limpiar(textos) if np is not None else None
+    if limpio is None:
+        return [normalizar_rut(texto) for texto in textos]
+    return _normalizar_numpy(limpio, len(textos))